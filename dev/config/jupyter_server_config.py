@@ -100,7 +100,8 @@ c.ServerApp.default_url = '/api/jupyter-server/lab'
 # See
 # https://github.com/jupyterlab/jupyterlab/pull/11841
 # https://github.com/jupyter-server/jupyter_server/pull/657
-c.ZMQChannelsWebsocketConnection.kernel_ws_protocol = None # None or ''
+# The binary protocol, its buffers are not base64 encoded.
+c.ZMQChannelsWebsocketConnection.kernel_ws_protocol = 'v1.kernel.websocket.jupyter.org' # None, '' for the legacy JSON one
 
 #################
 # JupyterLab
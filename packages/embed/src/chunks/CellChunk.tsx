@@ -9,8 +9,13 @@
  * This chunk is loaded on-demand when a Cell component is needed
  */
 
-import React from 'react';
-import { JupyterReactTheme, Cell, useJupyter } from '@datalayer/jupyter-react';
+import React, { useMemo } from 'react';
+import {
+  JupyterReactTheme,
+  Cell,
+  ExecutionCache,
+  useJupyter,
+} from '@datalayer/jupyter-react';
 import { getJupyterEmbedConfig } from '../config';
 import type { ICellEmbedOptions } from '../types';
 
@@ -28,12 +33,37 @@ const useJupyterEmbed = () => {
   });
 };
 
+/**
+ * The execution cache shared by the cells of the page.
+ */
+let executionCache: ExecutionCache | undefined;
+
+const getExecutionCache = (
+  serverSettings?: ExecutionCache.IOptions['serverSettings'],
+) => {
+  if (!executionCache) {
+    executionCache = new ExecutionCache({ serverSettings });
+  }
+  return executionCache;
+};
+
 interface ICellChunkProps {
   options: ICellEmbedOptions;
 }
 
 const CellInner: React.FC<ICellChunkProps> = ({ options }) => {
-  const { defaultKernel } = useJupyterEmbed();
+  const { defaultKernel, serviceManager } = useJupyterEmbed();
+  const cache = useMemo(
+    () =>
+      options.cache
+        ? {
+            cache: getExecutionCache(serviceManager?.serverSettings),
+            dependencies:
+              typeof options.cache === 'string' ? options.cache : undefined,
+          }
+        : undefined,
+    [options.cache, serviceManager],
+  );
 
   return (
     <div style={{ height: options.height || '200px' }}>
@@ -44,6 +74,7 @@ const CellInner: React.FC<ICellChunkProps> = ({ options }) => {
         autoStart={options.autoExecute}
         showToolbar={options.showToolbar}
         kernel={defaultKernel}
+        cache={cache}
       />
     </div>
   );
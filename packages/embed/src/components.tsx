@@ -37,6 +37,7 @@ const useJupyterEmbed = () => {
     jupyterServerToken: config.token || '',
     startDefaultKernel: config.autoStartKernel,
     defaultKernelName: config.defaultKernel,
+    multiplexWebSockets: config.multiplexWebSockets,
     terminals: true,
   });
 };
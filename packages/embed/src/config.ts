@@ -39,6 +39,12 @@ export interface IJupyterEmbedConfig {
    */
   lazyLoad?: boolean;
 
+  /**
+   * Whether the kernels and terminals of the embeds share one websocket,
+   * requires the jupyter_react server extension
+   */
+  multiplexWebSockets?: boolean;
+
   /**
    * Theme to use ('light' or 'dark')
    */
@@ -124,6 +130,15 @@ export function parseConfigFromScript(
     const val = script.dataset.lazyLoad ?? script.dataset.jupyterLazyLoad;
     config.lazyLoad = val !== 'false';
   }
+  if (
+    script.dataset.multiplexWebSockets !== undefined ||
+    script.dataset.jupyterMultiplexWebSockets !== undefined
+  ) {
+    const val =
+      script.dataset.multiplexWebSockets ??
+      script.dataset.jupyterMultiplexWebSockets;
+    config.multiplexWebSockets = val !== 'false';
+  }
   if (script.dataset.theme || script.dataset.jupyterTheme) {
     config.theme = (script.dataset.theme || script.dataset.jupyterTheme) as
       | 'light'
@@ -137,9 +137,23 @@ function parseCellOptions(
     kernel:
       getAttr(element, DATA_ATTRIBUTES.KERNEL, 'data-jupyter-kernel') ||
       undefined,
+    cache: parseCache(
+      getAttr(element, DATA_ATTRIBUTES.CACHE, 'data-jupyter-cache'),
+    ),
   };
 }
 
+/**
+ * Parse the cache attribute: absent or 'false' disables the memoization,
+ * '' or 'true' enables it, any other value is the dependencies key.
+ */
+function parseCache(value: string | null): boolean | string {
+  if (value === null || value === 'false') {
+    return false;
+  }
+  return value === '' || value === 'true' ? true : value;
+}
+
 /**
  * Parse notebook-specific options
  */
@@ -54,6 +54,14 @@ export interface ICellEmbedOptions extends IEmbedElementOptions {
    * Kernel name to use
    */
   kernel?: string;
+
+  /**
+   * Memoize the outputs of the cell: on auto-execute, the memoized outputs
+   * are shown instead of executing the code again. `true`, or the key of
+   * what the outputs depend on besides the code, e.g. a dataset version.
+   * Only for code without side effects.
+   */
+  cache?: boolean | string;
 }
 
 /**
@@ -214,12 +222,14 @@ export const DATA_ATTRIBUTES = {
   SOURCE: 'data-source',
   SHOW_TOOLBAR: 'data-show-toolbar',
   KERNEL: 'data-kernel',
+  CACHE: 'data-cache',
 
   // Cell options (prefixed form)
   JUPYTER_CELL_TYPE: 'data-jupyter-cell-type',
   JUPYTER_SOURCE: 'data-jupyter-source',
   JUPYTER_SHOW_TOOLBAR: 'data-jupyter-show-toolbar',
   JUPYTER_KERNEL: 'data-jupyter-kernel',
+  JUPYTER_CACHE: 'data-jupyter-cache',
 
   // Notebook options
   PATH: 'data-path',
@@ -3,18 +3,68 @@
 # MIT License
 
 import glob
+import gzip
+import hashlib
+import json
 import os
 import re
 
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import check_call
 
 import shutil
 
 from hatchling.builders.hooks.plugin.interface import BuildHookInterface
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 
 here = os.path.abspath(os.path.dirname(__file__))
 
+# Manifest read by the server extension static handler.
+BUILD_MANIFEST = 'build-manifest.json'
+
+# Manifest written by Vite with `build.manifest` enabled.
+VITE_MANIFEST = os.path.join('.vite', 'manifest.json')
+
+# Vite names chunks and assets `[name]-[hash]`.
+HASHED_FILE_PATTERN = re.compile(r'-[A-Za-z0-9_-]{8}\.[A-Za-z0-9.]+$')
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.html', '.js', '.json', '.map', '.mjs', '.svg', '.txt', '.wasm',
+)
+
+# Hashes of the last build, used to skip the unchanged steps.
+# Remove it to force a full build.
+BUILD_STATE = os.path.join(here, '.hatch_build_state.json')
+
+# Inputs of the Vite bundle.
+SOURCES = [
+    'index.html',
+    'package.json',
+    'postcss.config.js',
+    'public',
+    'src',
+    'style',
+    'tailwind.config.js',
+    'tsconfig.json',
+    'vite.config.ts',
+    # The examples bundle the built Jupyter React package.
+    os.path.join('..', 'react', 'lib'),
+]
+
+LOCKFILES = [
+    os.path.join(here, 'package.json'),
+    os.path.join(here, 'yarn.lock'),
+    os.path.join(here, '..', '..', 'package.json'),
+    os.path.join(here, '..', '..', 'yarn.lock'),
+]
+
+SKIPPED_DIRECTORIES = {'node_modules', '__pycache__', '.ipynb_checkpoints'}
+
 
 def patch_package_json_requires(file_path):
     """Patch built JS files to replace require('../package.json') patterns.
@@ -47,6 +97,160 @@ def patch_package_json_requires(file_path):
         print(f"Patched package.json requires in: {file_path}")
 
 
+def hash_file(file_path):
+    """Return the sha256 of a file."""
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def hash_paths(paths):
+    """Return a sha256 over the names and contents of the files under the paths."""
+    sha256 = hashlib.sha256()
+    for path in paths:
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = []
+            for root, dirs, names in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRECTORIES)
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        for file_path in files:
+            sha256.update(os.path.relpath(file_path, here).encode('utf-8'))
+            sha256.update(hash_file(file_path).encode('utf-8'))
+    return sha256.hexdigest()
+
+
+def load_build_state():
+    """Return the state recorded by the last build."""
+    if not os.path.exists(BUILD_STATE):
+        return {}
+    with open(BUILD_STATE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_build_state(state):
+    """Record the state of the build."""
+    with open(BUILD_STATE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def copy_changed_files(dist_path, static_path, copied):
+    """Copy the dist files which changed since the last copy to the static folder.
+
+    `copied` maps the copied files to their dist hash, and is updated.
+    Returns the copied files.
+    """
+    dist_files = {}
+    for root, _, names in os.walk(dist_path):
+        for name in names:
+            file_path = os.path.join(root, name)
+            dist_files[os.path.relpath(file_path, dist_path)] = hash_file(file_path)
+    # Remove the files which are not built anymore, with their compressed variants.
+    for name in set(copied) - set(dist_files):
+        for suffix in ('', '.br', '.gz'):
+            if os.path.exists(os.path.join(static_path, name + suffix)):
+                os.remove(os.path.join(static_path, name + suffix))
+        del copied[name]
+    changed = []
+    for name, sha256 in sorted(dist_files.items()):
+        target = os.path.join(static_path, name)
+        if copied.get(name) == sha256 and os.path.exists(target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(dist_path, name), target)
+        copied[name] = sha256
+        changed.append(name)
+    print(f"Copied {len(changed)} changed files of {len(dist_files)} to: {static_path}")
+    return changed
+
+
+def create_executor():
+    """Return the pool used to patch and compress the static files.
+
+    This uses threads as hatchling loads this module from its path, so its
+    functions can not be pickled to worker processes. The compressions and
+    hashes release the GIL and run in parallel.
+    """
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def get_vite_files(static_path):
+    """Return the files emitted by Vite, as listed in its manifest."""
+    vite_manifest_path = os.path.join(static_path, VITE_MANIFEST)
+    if not os.path.exists(vite_manifest_path):
+        return set()
+    with open(vite_manifest_path, 'r', encoding='utf-8') as f:
+        chunks = json.load(f)
+    files = set()
+    for chunk in chunks.values():
+        files.add(chunk['file'])
+        files.update(chunk.get('css', []))
+        files.update(chunk.get('assets', []))
+    return files
+
+
+def precompress(file_path):
+    """Write the .br and .gz variants of a file, return the encodings kept."""
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    encodings = []
+    variants = [('gzip', '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.insert(0, ('br', '.br', lambda data: brotli.compress(data, quality=11)))
+    for encoding, suffix, compress in variants:
+        compressed = compress(content)
+        # Only keep variants which are worth the negotiation.
+        if len(compressed) < len(content):
+            with open(file_path + suffix, 'wb') as f:
+                f.write(compressed)
+            encodings.append(encoding)
+    return encodings
+
+
+def write_build_manifest(static_path, changed, executor):
+    """Write the build manifest used to serve the static files.
+
+    Each file is listed with its sha256 (used as strong ETag), whether it is
+    content-hashed (served as immutable) and its precompressed encodings.
+    The entries of the files which did not change are kept from the
+    previous manifest, the others are hashed and compressed in parallel.
+    """
+    manifest_path = os.path.join(static_path, BUILD_MANIFEST)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)['files']
+    changed = set(name.replace(os.sep, '/') for name in changed)
+    vite_files = get_vite_files(static_path)
+    files = {}
+    compressions = {}
+    for file_path in sorted(glob.glob(os.path.join(static_path, '**', '*'), recursive=True)):
+        if not os.path.isfile(file_path) or file_path.endswith(('.br', '.gz')):
+            continue
+        name = os.path.relpath(file_path, static_path).replace(os.sep, '/')
+        if name == BUILD_MANIFEST:
+            continue
+        if name in previous and name not in changed:
+            files[name] = previous[name]
+            continue
+        files[name] = {
+            'hash': hash_file(file_path),
+            'size': os.path.getsize(file_path),
+            'immutable': name in vite_files and HASHED_FILE_PATTERN.search(name) is not None,
+            'encodings': [],
+        }
+        if name.endswith(COMPRESSIBLE_EXTENSIONS):
+            compressions[name] = executor.submit(precompress, file_path)
+    for name, future in compressions.items():
+        files[name]['encodings'] = future.result()
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'files': files}, f, indent=2)
+    print(f"Wrote build manifest for {len(files)} files ({len(compressions)} compressed): {static_path}")
+
+
 def clean_dist():
     """Remove the contents of the dist folder and tsconfig.tsbuildinfo."""
     dist_path = os.path.join(here, 'dist')
@@ -62,11 +266,28 @@ def clean_dist():
 
 
 def build_javascript():
-    # Install deps
-    check_call(
-        ['npm', 'i'],
-        cwd=here,
-    )
+    """Build Vite bundle for the server extension.
+
+    The install, the build, the copy to the static folder and the patches
+    are skipped when their inputs did not change since the last build.
+    """
+    state = load_build_state()
+    lockfile_hash = hash_paths([path for path in LOCKFILES if os.path.exists(path)])
+    if state.get('lockfile') != lockfile_hash or not os.path.exists(os.path.join(here, 'node_modules')):
+        # Install deps
+        check_call(
+            ['npm', 'i'],
+            cwd=here,
+        )
+        state['lockfile'] = lockfile_hash
+        state.pop('sources', None)
+        save_build_state(state)
+    dist_path = os.path.join(here, 'dist')
+    static_path = os.path.join(here, 'jupyter_lexical', 'static')
+    sources_hash = hash_paths([os.path.join(here, source) for source in SOURCES if os.path.exists(os.path.join(here, source))])
+    if state.get('sources') == sources_hash and os.path.exists(os.path.join(static_path, BUILD_MANIFEST)):
+        print(f"Vite bundle is up to date: {static_path}")
+        return
 
     clean_dist()
     vite_env = os.environ.copy()
@@ -76,15 +297,19 @@ def build_javascript():
         cwd=here,
         env=vite_env,
     )
-    # Copy built files recursively to static folder
-    dist_path = os.path.join(here, 'dist')
-    static_path = os.path.join(here, 'jupyter_lexical', 'static')
-    if os.path.exists(static_path):
+    # Copy the changed built files recursively to static folder
+    if 'files' not in state and os.path.exists(static_path):
         shutil.rmtree(static_path)
-    shutil.copytree(dist_path, static_path)
-    # Patch JS files to remove package.json requires
-    for file in glob.glob(os.path.join(static_path, '**', '*.js'), recursive=True):
-        patch_package_json_requires(file)
+    if not os.path.exists(static_path):
+        state['files'] = {}
+    changed = copy_changed_files(dist_path, static_path, state['files'])
+    with create_executor() as executor:
+        # Patch JS files to remove package.json requires
+        js_files = [os.path.join(static_path, name) for name in changed if name.endswith('.js')]
+        list(executor.map(patch_package_json_requires, js_files))
+        write_build_manifest(static_path, changed, executor)
+    state['sources'] = sources_hash
+    save_build_state(state)
 
 
 class JupyterBuildHook(BuildHookInterface):
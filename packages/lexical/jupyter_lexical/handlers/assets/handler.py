@@ -0,0 +1,212 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Cached assets handler."""
+
+import gzip
+import hashlib
+import os
+import threading
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from jupyter_server.base.handlers import JupyterHandler
+
+from ..metrics.metrics import MetricsHandlerMixin, record_cache
+from ..static.handler import IMMUTABLE_CACHE_CONTROL, parse_accept_encoding
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CachedAsset:
+    """A file loaded once in memory, with its compressed variants.
+
+    Compressed variants are read from the .br/.gz files written next to the
+    asset by hatch_build when present, else compressed on first use.
+    """
+
+    def __init__(self, path, content_type):
+        self.path = path
+        self.content_type = content_type
+        stat = os.stat(path)
+        self.mtime = stat.st_mtime
+        self.last_modified = datetime.fromtimestamp(int(stat.st_mtime), timezone.utc)
+        with open(path, "rb") as f:
+            self.body = f.read()
+        self.etag = hashlib.sha256(self.body).hexdigest()
+        self.variants = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return len(self.body) + sum(len(variant) for variant in self.variants.values())
+
+    def get_variant(self, encoding):
+        """Return the body compressed with the given encoding, or None if not worth it."""
+        with self._lock:
+            if encoding not in self.variants:
+                self.variants[encoding] = self._compress(encoding)
+            return self.variants[encoding]
+
+    def _compress(self, encoding):
+        suffix = ".br" if encoding == "br" else ".gz"
+        precompressed_path = self.path + suffix
+        if os.path.isfile(precompressed_path) and os.path.getmtime(precompressed_path) >= self.mtime:
+            with open(precompressed_path, "rb") as f:
+                return f.read()
+        if encoding == "br":
+            compressed = brotli.compress(self.body, quality=5)
+        else:
+            compressed = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return compressed if len(compressed) < len(self.body) else None
+
+
+class AssetCache:
+    """A process-wide LRU of cached assets, bounded by a bytes budget."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._assets = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return sum(asset.size for asset in self._assets.values())
+
+    def get(self, path, content_type):
+        """Return the cached asset for the path, (re)loading it if needed."""
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset is not None and asset.mtime == mtime:
+                self._assets.move_to_end(path)
+                self.hits += 1
+                record_cache("assets", True)
+                return asset
+            self.misses += 1
+            record_cache("assets", False)
+        asset = CachedAsset(path, content_type)
+        with self._lock:
+            self._assets[path] = asset
+            self._assets.move_to_end(path)
+            self.evict()
+        return asset
+
+    def evict(self):
+        """Drop the least recently used assets until the budget is met."""
+        while len(self._assets) > 1 and self.size > self.max_bytes:
+            self._assets.popitem(last=False)
+
+
+asset_cache = AssetCache()
+
+
+def parse_range(range_header, size):
+    """Return the (start, end) of a single bytes range, end exclusive.
+
+    Returns None when the header can not be honoured with a single range.
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in ranges:
+        return None
+    start, sep, end = ranges.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if start == "":
+            suffix = int(end)
+            if suffix <= 0:
+                return None
+            return max(size - suffix, 0), size
+        start = int(start)
+        end = int(end) + 1 if end else size
+    except ValueError:
+        return None
+    if start >= size or start >= end:
+        return None
+    return start, min(end, size)
+
+
+# pylint: disable=W0223
+class CachedAssetHandler(MetricsHandlerMixin, JupyterHandler):
+    """Serve a large vendored file from the process-wide asset cache.
+
+    Subclasses set `asset_path` and `content_type`.
+    """
+
+    asset_path = None
+
+    content_type = "application/octet-stream"
+
+    cache_control = IMMUTABLE_CACHE_CONTROL
+
+    static_metrics = True
+
+    def get_asset(self):
+        return asset_cache.get(self.asset_path, self.content_type)
+
+    def head(self):
+        return self.get(include_body=False)
+
+    def get(self, include_body=True):
+        asset = self.get_asset()
+        self.set_header("Content-Type", asset.content_type)
+        self.set_header("Cache-Control", self.cache_control)
+        self.set_header("Last-Modified", asset.last_modified)
+        self.set_header("Accept-Ranges", "bytes")
+        self.set_header("Vary", "Accept-Encoding")
+        body = asset.body
+        etag = asset.etag
+        range_header = self.request.headers.get("Range")
+        if range_header is None:
+            accepted = parse_accept_encoding(self.request.headers.get("Accept-Encoding", ""))
+            for encoding in ("br", "gzip"):
+                if encoding not in accepted or (encoding == "br" and brotli is None):
+                    continue
+                variant = asset.get_variant(encoding)
+                if variant is not None:
+                    self.set_header("Content-Encoding", encoding)
+                    body = variant
+                    etag = "{}-{}".format(etag, encoding)
+                    break
+        self.set_header("Etag", '"{}"'.format(etag))
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        if "If-None-Match" not in self.request.headers and self.is_not_modified_since(asset):
+            self.set_status(304)
+            return
+        if range_header is not None:
+            byte_range = parse_range(range_header, len(body))
+            if byte_range is None:
+                self.set_status(416)
+                self.set_header("Content-Range", "bytes */{}".format(len(body)))
+                return
+            start, end = byte_range
+            self.set_status(206)
+            self.set_header("Content-Range", "bytes {}-{}/{}".format(start, end - 1, len(body)))
+            body = body[start:end]
+        self.set_header("Content-Length", len(body))
+        if include_body:
+            self.write(body)
+
+    def is_not_modified_since(self, asset):
+        since = self.request.headers.get("If-Modified-Since")
+        if since is None:
+            return False
+        try:
+            return parsedate_to_datetime(since) >= asset.last_modified
+        except (TypeError, ValueError):
+            return False
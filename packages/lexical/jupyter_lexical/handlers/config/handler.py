@@ -12,9 +12,10 @@ from jupyter_server.base.handlers import APIHandler
 from jupyter_server.extension.handler import ExtensionHandlerMixin
 
 from jupyter_lexical.__version__ import __version__
+from jupyter_lexical.handlers.metrics.metrics import MetricsHandlerMixin
 
 
-class ConfigHandler(ExtensionHandlerMixin, APIHandler):
+class ConfigHandler(MetricsHandlerMixin, ExtensionHandlerMixin, APIHandler):
     """The handler for configurations."""
 
     @tornado.web.authenticated
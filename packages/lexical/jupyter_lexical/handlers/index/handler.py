@@ -4,16 +4,112 @@
 
 """Index handler."""
 
+import glob
+import hashlib
+import os
+import time
+
 import tornado
 
+from jupyter_server.utils import url_path_join
+
 from ..base import BaseTemplateHandler
+from ..metrics.metrics import TEMPLATE_RENDER_SECONDS, MetricsHandlerMixin, observe_duration, record_cache
+from ..static.handler import load_vite_manifest
+
+
+# Seconds between two checks of the installed labextensions.
+LABEXTENSIONS_CHECK_INTERVAL = 5
+
+
+def labextensions_fingerprint(labextensions_path):
+    """Return a fingerprint of the installed labextensions, from their mtimes."""
+    fingerprint = hashlib.sha256()
+    for path in labextensions_path:
+        package_jsons = glob.glob(os.path.join(path, "*", "package.json"))
+        package_jsons += glob.glob(os.path.join(path, "@*", "*", "package.json"))
+        for file_path in [path] + sorted(package_jsons):
+            try:
+                mtime = os.path.getmtime(file_path)
+            except OSError:
+                continue
+            fingerprint.update("{}:{}\n".format(file_path, mtime).encode("utf-8"))
+    return fingerprint.hexdigest()
+
+
+def get_preload_links(static_url, vite_manifest):
+    """Return the Link header values to preload the Vite entry chunks."""
+    links = {}
+    visited = set()
+
+    def visit(key):
+        if key in visited or key not in vite_manifest:
+            return
+        visited.add(key)
+        chunk = vite_manifest[key]
+        links[chunk["file"]] = "<{}{}>; rel=modulepreload; crossorigin".format(static_url, chunk["file"])
+        for css in chunk.get("css", []):
+            links[css] = "<{}{}>; rel=preload; as=style; crossorigin".format(static_url, css)
+        for imported in chunk.get("imports", []):
+            visit(imported)
+
+    for key, chunk in vite_manifest.items():
+        if chunk.get("isEntry"):
+            visit(key)
+    return list(links.values())
+
+
+class IndexPageCache:
+    """The rendered index pages, per base url and identity.
+
+    The pages are dropped, and the page config refreshed, when the installed
+    labextensions change.
+    """
+
+    def __init__(self, extensionapp):
+        self.extensionapp = extensionapp
+        self.pages = {}
+        self.fingerprint = labextensions_fingerprint(extensionapp.labextensions_path)
+        self.checked_at = time.monotonic()
+
+    def validate(self):
+        now = time.monotonic()
+        if now - self.checked_at < LABEXTENSIONS_CHECK_INTERVAL:
+            return
+        self.checked_at = now
+        fingerprint = labextensions_fingerprint(self.extensionapp.labextensions_path)
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.extensionapp.update_page_config()
+            self.pages.clear()
+
+    def get(self, key, render):
+        """Return the cached (html, links) for the key, rendering it if needed."""
+        self.validate()
+        page = self.pages.get(key)
+        record_cache("index", page is not None)
+        if page is None:
+            page = self.pages[key] = render()
+        return page
 
 
 # pylint: disable=W0223
-class IndexHandler(BaseTemplateHandler):
+class IndexHandler(MetricsHandlerMixin, BaseTemplateHandler):
     """The handler for the index."""
 
+    def render_page(self):
+        static_path = self.extensionapp.static_paths[0]
+        static_url = url_path_join(self.base_url, "static", self.name, "")
+        vite_manifest = load_vite_manifest(static_path) or {}
+        with observe_duration(TEMPLATE_RENDER_SECONDS.labels("index.html")):
+            html = self.render_template("index.html")
+        return html, get_preload_links(static_url, vite_manifest)
+
     @tornado.web.authenticated
     def get(self, path = ""):
         """The index page."""
-        self.write(self.render_template("index.html"))
+        username = getattr(self.current_user, "username", self.current_user)
+        html, links = self.extensionapp.index_page_cache.get((self.base_url, username), self.render_page)
+        if links:
+            self.set_header("Link", ", ".join(links))
+        self.write(html)
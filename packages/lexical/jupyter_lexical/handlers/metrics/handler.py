@@ -0,0 +1,64 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Metrics handlers."""
+
+import tornado
+
+from tornado import web
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from jupyter_server.base.handlers import APIHandler, JupyterHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+
+try:
+    from jupyter_server.auth.decorator import allow_unauthenticated
+except ImportError:
+    # jupyter_server < 2.13 does not check the unauthenticated handlers.
+    def allow_unauthenticated(method):
+        return method
+
+from .metrics import FRONTEND_MARK_SECONDS, FRONTEND_MARKS, REGISTRY
+
+
+def parse_marks(body):
+    """Validate the marks `{"marks": [{"name": str, "duration": ms}]}`, return the known ones in seconds."""
+    if not isinstance(body, dict) or not isinstance(body.get("marks"), list):
+        raise web.HTTPError(400, "The request must have a list of marks.")
+    marks = []
+    for mark in body["marks"]:
+        if not isinstance(mark, dict) or not isinstance(mark.get("duration"), (int, float)):
+            raise web.HTTPError(400, "Each mark must have a name and a duration.")
+        # Unknown names are ignored to bound the label cardinality.
+        if mark.get("name") in FRONTEND_MARKS and mark["duration"] >= 0:
+            marks.append((mark["name"], mark["duration"] / 1000))
+    return marks
+
+
+class MetricsHandler(ExtensionHandlerMixin, JupyterHandler):
+    """The handler exporting the extension metrics in the Prometheus text format.
+
+    Like the server `/metrics`, it requires to be logged in unless
+    `ServerApp.authenticate_prometheus` is disabled.
+    """
+
+    @allow_unauthenticated
+    def get(self):
+        if self.settings.get("authenticate_prometheus", True) and not self.logged_in:
+            raise web.HTTPError(403)
+        self.set_header("Content-Type", CONTENT_TYPE_LATEST)
+        self.set_header("Cache-Control", "no-cache")
+        self.finish(generate_latest(REGISTRY))
+
+
+class MarksHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler ingesting the frontend performance marks."""
+
+    @tornado.web.authenticated
+    def post(self):
+        for name, seconds in parse_marks(self.get_json_body()):
+            FRONTEND_MARK_SECONDS.labels(name).observe(seconds)
+        self.set_status(204)
+        self.finish()
@@ -0,0 +1,93 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Prometheus metrics of the extension."""
+
+import time
+
+from contextlib import contextmanager
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+
+# The extension metrics are exported by its own endpoint, apart from the server ones.
+REGISTRY = CollectorRegistry()
+
+REQUEST_DURATION_SECONDS = Histogram(
+    "jupyter_lexical_request_duration_seconds",
+    "Duration of the requests by handler.",
+    ["handler", "method", "status_code"],
+    registry=REGISTRY,
+)
+
+STATIC_BYTES = Counter(
+    "jupyter_lexical_static_bytes",
+    "Bytes of the static assets served, by handler and content encoding.",
+    ["handler", "encoding"],
+    registry=REGISTRY,
+)
+
+CACHE_REQUESTS = Counter(
+    "jupyter_lexical_cache_requests",
+    "Lookups of the in-memory caches, by cache and result (hit or miss).",
+    ["cache", "result"],
+    registry=REGISTRY,
+)
+
+TEMPLATE_RENDER_SECONDS = Histogram(
+    "jupyter_lexical_template_render_seconds",
+    "Duration of the template renders.",
+    ["template"],
+    registry=REGISTRY,
+)
+
+PAGE_CONFIG_SECONDS = Histogram(
+    "jupyter_lexical_page_config_seconds",
+    "Duration of the page config computations from the installed labextensions.",
+    registry=REGISTRY,
+)
+
+# The performance marks reported by the frontend, in seconds since the page navigation.
+FRONTEND_MARKS = ("kernel_ready", "first_output", "notebook_render")
+
+FRONTEND_MARK_SECONDS = Histogram(
+    "jupyter_lexical_frontend_mark_seconds",
+    "Frontend performance marks, in seconds since the page navigation.",
+    ["mark"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60),
+    registry=REGISTRY,
+)
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+@contextmanager
+def observe_duration(histogram):
+    """Observe the duration of the block in the histogram (or labelled histogram)."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started_at)
+
+
+class MetricsHandlerMixin:
+    """Record the request durations of a handler and, when `static_metrics`
+    is set, the bytes of the assets it serves."""
+
+    static_metrics = False
+
+    def on_finish(self):
+        super().on_finish()
+        handler = type(self).__name__
+        status_code = self.get_status()
+        REQUEST_DURATION_SECONDS.labels(handler, self.request.method, str(status_code)).observe(
+            self.request.request_time()
+        )
+        if self.static_metrics and self.request.method == "GET" and status_code in (200, 206):
+            size = int(self._headers.get("Content-Length", 0))
+            encoding = self._headers.get("Content-Encoding", "identity")
+            STATIC_BYTES.labels(handler, encoding).inc(size)
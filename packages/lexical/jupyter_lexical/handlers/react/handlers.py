@@ -10,22 +10,17 @@ from jupyter_server.extension.handler import (
     ExtensionHandlerJinjaMixin,
 )
 
+from ..assets.handler import CachedAssetHandler
+
+
+STATIC_FILES_PATH = os.path.join(os.path.dirname(__file__), "./../static")
+
 
 class LexicalBaseTemplateHandler(ExtensionHandlerJinjaMixin, ExtensionHandlerMixin, JupyterHandler):
     pass
 
 
-class LexicalPlotlyHandler(LexicalBaseTemplateHandler):
-    plotly_js = ""
-
-    def get(self):
-        if self.plotly_js == "":
-            f = open(
-                os.path.join(
-                    os.path.dirname(__file__), "./../static/plotly-2.3.0.min.js"
-                ),
-                "r",
-            )
-            self.plotly_js = f.read()
-        self.set_header("Content-Type", 'text/javascript; charset="utf-8"')
-        self.write(self.plotly_js)
+class LexicalPlotlyHandler(ExtensionHandlerMixin, CachedAssetHandler):
+    asset_path = os.path.join(STATIC_FILES_PATH, "plotly-2.3.0.min.js")
+
+    content_type = 'text/javascript; charset="utf-8"'
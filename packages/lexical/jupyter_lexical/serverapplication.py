@@ -11,14 +11,16 @@ from traitlets.config import Configurable
 
 from jupyter_server.utils import url_path_join
 from jupyter_server.extension.application import ExtensionApp, ExtensionAppJinjaMixin
-from jupyter_server.base.handlers import FileFindHandler
 
 from jupyterlab_server.config import get_page_config
 
 from jupyter_lexical.__version__ import __version__
 
-from jupyter_lexical.handlers.index.handler import IndexHandler
+from jupyter_lexical.handlers.index.handler import IndexHandler, IndexPageCache
 from jupyter_lexical.handlers.config.handler import ConfigHandler
+from jupyter_lexical.handlers.metrics.handler import MarksHandler, MetricsHandler
+from jupyter_lexical.handlers.metrics.metrics import PAGE_CONFIG_SECONDS, observe_duration
+from jupyter_lexical.handlers.static.handler import StaticAssetsHandler
 
 
 DEFAULT_STATIC_FILES_PATH = os.path.join(os.path.dirname(__file__), "./static")
@@ -86,12 +88,22 @@ class JupyterLexicalExtensionApp(ExtensionAppJinjaMixin, ExtensionApp):
     def initialize_settings(self):
         self.log.debug("Jupyter Lexical Config {}".format(self.config))
 
-    def initialize_templates(self):
+    @property
+    def labextensions_path(self):
+        return self.serverapp.web_app.settings.get("labextensions_path", [])
+
+    def update_page_config(self):
+        """Update the page config from the installed labextensions."""
         page_config = self.serverapp.web_app.settings.setdefault("page_config_data", {})
-        page_config.update(get_page_config(
-            labextensions_path=self.serverapp.web_app.settings.get("labextensions_path", []),
-            logger=self.log
-        ))
+        with observe_duration(PAGE_CONFIG_SECONDS):
+            page_config.update(get_page_config(
+                labextensions_path=self.labextensions_path,
+                logger=self.log
+            ))
+        return page_config
+
+    def initialize_templates(self):
+        page_config = self.update_page_config()
         httpUrl = self.serverapp.public_url.rstrip('/')
         wsUrl = httpUrl.replace('https://', 'wss://').replace('http://', 'ws://')
         fullStaticUrl = url_path_join(self.serverapp.base_url, "static", self.name)
@@ -104,18 +116,21 @@ class JupyterLexicalExtensionApp(ExtensionAppJinjaMixin, ExtensionApp):
             "jupyter_lexical_version": __version__,
             "page_config": page_config,
         })
+        self.index_page_cache = IndexPageCache(self)
 
     def initialize_handlers(self):
         self.log.debug("Jupyter Lexical Config {}".format(self.settings['jupyter_lexical_jinja2_env']))
         handlers = [
             (url_path_join(self.name, "config"), ConfigHandler),
+            (url_path_join(self.name, "metrics"), MetricsHandler),
+            (url_path_join(self.name, "metrics", "marks"), MarksHandler),
             (r"/jupyter_lexical/(.+)$", IndexHandler),
             (r"/jupyter_lexical/?", IndexHandler),
             # Serve static files at /static/jupyter_lexical/ to match vite publicPath
             (
                 url_path_join("static", self.name, "(.*)"),
-                FileFindHandler,
-                {"path": DEFAULT_STATIC_FILES_PATH, "no_cache_paths": ["/"]},
+                StaticAssetsHandler,
+                {"path": DEFAULT_STATIC_FILES_PATH},
             ),
         ]
         self.handlers.extend(handlers)
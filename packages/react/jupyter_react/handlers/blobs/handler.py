@@ -0,0 +1,92 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Blobs handler."""
+
+import json
+
+import tornado
+
+from tornado import web
+
+from jupyter_core.utils import ensure_async
+from jupyter_server.auth.decorator import authorized
+from jupyter_server.base.handlers import APIHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+from jupyter_server.utils import url_path_join
+
+from ..static.handler import IMMUTABLE_CACHE_CONTROL
+from .store import inline_outputs
+
+
+class BlobsHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler storing the JSON values of large mime bundles."""
+
+    auth_resource = "contents"
+
+    @tornado.web.authenticated
+    @authorized
+    def post(self):
+        """Store the request body, return its hash."""
+        data = self.request.body
+        try:
+            json.loads(data)
+        except ValueError as e:
+            raise web.HTTPError(400, "A blob must be a JSON value.") from e
+        digest = self.extensionapp.blob_store.put(data)
+        self.set_status(201)
+        self.set_header("Location", url_path_join(self.base_url, self.name, "blobs", digest))
+        self.finish(json.dumps({"hash": digest, "size": len(data)}))
+
+
+class BlobHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler serving a blob, immutable as it is addressed by its content."""
+
+    auth_resource = "contents"
+
+    def _get_blob(self, digest):
+        data = self.extensionapp.blob_store.get(digest)
+        if data is None:
+            raise web.HTTPError(404, "Blob does not exist: {}".format(digest))
+        self.set_header("Content-Type", "application/json")
+        self.set_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+        self.set_header("ETag", '"{}"'.format(digest))
+        return data
+
+    @tornado.web.authenticated
+    @authorized
+    def head(self, digest):
+        """Check if a blob is stored, before uploading it."""
+        self._get_blob(digest)
+        self.finish()
+
+    @tornado.web.authenticated
+    @authorized
+    def get(self, digest):
+        """Return the blob."""
+        data = self._get_blob(digest)
+        if self.check_etag_header():
+            self.set_status(304)
+            self.finish()
+            return
+        self.finish(data)
+
+
+class BlobsExportHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler returning a notebook with its blobs inlined."""
+
+    auth_resource = "contents"
+
+    @tornado.web.authenticated
+    @authorized
+    async def get(self, path):
+        """Return the notebook at path with its outputs inlined, as a download."""
+        model = await ensure_async(self.contents_manager.get(path, content=True, type="notebook"))
+        notebook = model["content"]
+        missing = inline_outputs(notebook, self.extensionapp.blob_store)
+        if missing:
+            self.log.warning("Missing blobs exporting {}: {}".format(path, ", ".join(missing)))
+        self.set_header("Content-Type", "application/x-ipynb+json")
+        self.set_header("Content-Disposition", 'attachment; filename="{}"'.format(model["name"]))
+        self.finish(json.dumps(notebook))
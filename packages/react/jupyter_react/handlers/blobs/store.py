@@ -0,0 +1,114 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Content addressed store of the large output mime bundles."""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+
+BLOBS_METADATA_KEY = "jupyter_react_blobs"
+
+DEFAULT_THRESHOLD = 64 * 1024
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def serialize(value):
+    """Serialize a mime bundle value like `JSON.stringify` does."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class BlobStore:
+    """The blobs are the JSON values of mime bundles, stored by their sha256.
+
+    Storing the same value twice is a no-op, so the figures shared by several
+    outputs or notebooks are stored once.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, digest):
+        if not DIGEST_PATTERN.match(digest):
+            raise ValueError("Invalid blob hash: {}".format(digest))
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def has(self, digest):
+        return os.path.isfile(self.path(digest))
+
+    def put(self, data):
+        """Store the bytes, return their hash."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if os.path.isfile(path):
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, a concurrent reader never sees a partial blob.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return digest
+
+    def get(self, digest):
+        """Return the bytes of a blob, or None if it is not stored."""
+        try:
+            with open(self.path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+def externalize_outputs(notebook, store, threshold=DEFAULT_THRESHOLD):
+    """Move the mime bundle values larger than threshold bytes to the store.
+
+    The values are removed from the output data and their hashes recorded in
+    the output metadata, under `jupyter_react_blobs`. Returns the number of
+    values moved.
+    """
+    count = 0
+    for cell in notebook.get("cells", []):
+        for output in cell.get("outputs", []):
+            data = output.get("data")
+            if not data:
+                continue
+            for mimetype in list(data):
+                value = serialize(data[mimetype])
+                if len(value) <= threshold:
+                    continue
+                blobs = output.setdefault("metadata", {}).setdefault(BLOBS_METADATA_KEY, {})
+                blobs[mimetype] = {"hash": store.put(value), "size": len(value)}
+                del data[mimetype]
+                count += 1
+    return count
+
+
+def inline_outputs(notebook, store):
+    """Restore the mime bundle values moved to the store, returns the hashes missing in the store."""
+    missing = []
+    for cell in notebook.get("cells", []):
+        for output in cell.get("outputs", []):
+            metadata = output.get("metadata") or {}
+            blobs = metadata.get(BLOBS_METADATA_KEY)
+            if not blobs:
+                continue
+            for mimetype, blob in list(blobs.items()):
+                value = store.get(blob["hash"])
+                if value is None:
+                    missing.append(blob["hash"])
+                    continue
+                output.setdefault("data", {})[mimetype] = json.loads(value)
+                del blobs[mimetype]
+            if not blobs:
+                del metadata[BLOBS_METADATA_KEY]
+    return missing
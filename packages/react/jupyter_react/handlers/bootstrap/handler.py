@@ -0,0 +1,100 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Bootstrap handler."""
+
+import asyncio
+import json
+
+import tornado
+
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+from jupyter_client.jsonutil import json_default
+from jupyter_core.utils import ensure_async
+from jupyter_server.base.handlers import APIHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+from jupyter_server.services.kernelspecs.handlers import kernelspec_model
+from jupyter_server.utils import url_path_join
+
+from ..config.handler import get_config
+
+
+# Request headers forwarded to the JupyterLab server APIs.
+FORWARDED_HEADERS = ("Authorization", "Cookie")
+
+
+class BootstrapHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler gathering in one response what the frontend needs at startup.
+
+    The config, kernelspecs, sessions, kernels, settings and workspaces are
+    fetched concurrently. A section which fails is null and its error is
+    reported under `errors`. Tornado sets a strong ETag from the body and
+    answers 304 to a matching If-None-Match.
+    """
+
+    async def get_kernelspecs(self):
+        ksm = self.kernel_spec_manager
+        kspecs = await ensure_async(ksm.get_all_specs())
+        specs = {}
+        for kernel_name, kernel_info in kspecs.items():
+            specs[kernel_name] = kernelspec_model(
+                self, kernel_name, kernel_info["spec"], kernel_info["resource_dir"]
+            )
+        return {
+            "default": self.kernel_manager.default_kernel_name,
+            "kernelspecs": specs,
+        }
+
+    async def get_sessions(self):
+        return await ensure_async(self.session_manager.list_sessions())
+
+    async def get_kernels(self):
+        return await ensure_async(self.kernel_manager.list_kernels())
+
+    async def fetch_api(self, path):
+        """Fetch a server API which is not provided by jupyter_server (e.g. by JupyterLab).
+
+        Returns None if the API is not available.
+        """
+        headers = {
+            name: self.request.headers[name]
+            for name in FORWARDED_HEADERS
+            if name in self.request.headers
+        }
+        token = self.get_argument("token", None)
+        if token and "Authorization" not in headers:
+            headers["Authorization"] = "token {}".format(token)
+        url = url_path_join(self.serverapp.connection_url, "api", path)
+        try:
+            response = await AsyncHTTPClient().fetch(url, headers=headers)
+        except HTTPClientError as e:
+            if e.code == 404:
+                return None
+            raise
+        return json.loads(response.body)
+
+    @tornado.web.authenticated
+    async def get(self):
+        """Returns the bootstrap document."""
+        sections = {
+            "kernelspecs": self.get_kernelspecs(),
+            "sessions": self.get_sessions(),
+            "kernels": self.get_kernels(),
+            "settings": self.fetch_api("settings"),
+            "workspaces": self.fetch_api("workspaces"),
+        }
+        results = await asyncio.gather(*sections.values(), return_exceptions=True)
+        model = {
+            "config": get_config(self),
+            "errors": {},
+        }
+        for name, result in zip(sections.keys(), results):
+            if isinstance(result, Exception):
+                self.log.warning("Failed to bootstrap {}: {}".format(name, result))
+                model["errors"][name] = str(result)
+                result = None
+            model[name] = result
+        self.set_header("Cache-Control", "no-cache")
+        self.finish(json.dumps(model, default=json_default))
@@ -12,19 +12,28 @@ from jupyter_server.base.handlers import APIHandler
 from jupyter_server.extension.handler import ExtensionHandlerMixin
 
 from jupyter_react.__version__ import __version__
+from jupyter_react.handlers.metrics.metrics import MetricsHandlerMixin
 
 
-class ConfigHandler(ExtensionHandlerMixin, APIHandler):
+def get_config(handler):
+    """Returns the configurations of the server extensions."""
+    return {
+        "extension": handler.name,
+        "version": __version__,
+        "configuration": {
+            "launcher": handler.config["launcher"].to_dict(),
+            "blobs": {
+                "threshold": handler.extensionapp.blobs_threshold,
+            },
+        }
+    }
+
+
+class ConfigHandler(MetricsHandlerMixin, ExtensionHandlerMixin, APIHandler):
     """The handler for configurations."""
 
     @tornado.web.authenticated
     def get(self):
         """Returns the configurations of the server extensions."""
-        res = json.dumps({
-            "extension": self.name,
-            "version": __version__,
-            "configuration": {
-                "launcher": self.config["launcher"].to_dict()
-            }
-        })
+        res = json.dumps(get_config(self))
         self.finish(res)
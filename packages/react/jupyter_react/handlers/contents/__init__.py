@@ -0,0 +1,4 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
@@ -0,0 +1,67 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Contents handler."""
+
+import asyncio
+import json
+import weakref
+
+import nbformat
+import tornado
+
+from tornado import web
+
+from jupyter_client.jsonutil import json_default
+from jupyter_core.utils import ensure_async
+from jupyter_server.auth.decorator import authorized
+from jupyter_server.base.handlers import APIHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+
+from .patch import PatchError, apply_patch, parse_revision
+
+
+# The patches of a notebook are applied one at a time.
+_locks = weakref.WeakValueDictionary()
+
+
+class ContentsPatchHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler saving a notebook from a JSON patch of its last saved revision."""
+
+    auth_resource = "contents"
+
+    @tornado.web.authenticated
+    @authorized
+    async def patch(self, path):
+        """Apply the patch to the notebook at path, if it is still at the revision.
+
+        The body holds the `revision`, the `last_modified` of the contents
+        model the patch was computed from, and the RFC 6902 `patch`. The
+        notebook is saved by the contents manager, so written atomically with
+        the default `use_atomic_writing`. Returns the contents model without
+        content, as a save does, or a 409 if the notebook changed since the
+        revision.
+        """
+        try:
+            body = json.loads(self.request.body)
+            revision = parse_revision(body["revision"])
+            patch = body["patch"]
+        except (KeyError, TypeError, ValueError) as e:
+            raise web.HTTPError(400, "The body must hold a revision and a patch.") from e
+        lock = _locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            cm = self.contents_manager
+            model = await ensure_async(cm.get(path, content=True, type="notebook"))
+            if model["last_modified"] != revision:
+                raise web.HTTPError(409, "The notebook {} changed since the revision.".format(path))
+            try:
+                notebook = nbformat.from_dict(apply_patch(model["content"], patch))
+                nbformat.validate(notebook)
+            except (PatchError, nbformat.ValidationError) as e:
+                raise web.HTTPError(400, "Invalid notebook patch: {}".format(e)) from e
+            saved = await ensure_async(
+                cm.save({"type": "notebook", "format": "json", "content": notebook}, path)
+            )
+        self.set_header("Content-Type", "application/json")
+        self.finish(json.dumps(saved, default=json_default))
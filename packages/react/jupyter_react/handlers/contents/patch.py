@@ -0,0 +1,92 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""JSON patches of the notebooks saved by delta."""
+
+from datetime import datetime
+
+
+class PatchError(ValueError):
+    """A patch operation does not apply to the document."""
+
+
+def parse_revision(revision):
+    """Parse the `last_modified` revision of a contents model."""
+    if not isinstance(revision, str):
+        raise ValueError("The revision must be a string.")
+    return datetime.fromisoformat(revision.replace("Z", "+00:00"))
+
+
+def _parse_pointer(pointer):
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise PatchError("Invalid JSON pointer: {}".format(pointer))
+    if pointer == "":
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(array, token, insert=False):
+    if insert and token == "-":
+        return len(array)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise PatchError("Invalid array index: {}".format(token))
+    index = int(token)
+    if index > len(array) or (index == len(array) and not insert):
+        raise PatchError("Array index out of range: {}".format(token))
+    return index
+
+
+def _resolve(document, tokens):
+    for token in tokens:
+        if isinstance(document, list):
+            document = document[_index(document, token)]
+        elif isinstance(document, dict) and token in document:
+            document = document[token]
+        else:
+            raise PatchError("Missing member: {}".format(token))
+    return document
+
+
+def apply_patch(document, patch):
+    """Apply the `add`, `remove` and `replace` operations of a RFC 6902 patch.
+
+    The document is modified in place and returned. An operation which does
+    not apply raises a PatchError, the document may then be partially patched.
+    """
+    if not isinstance(patch, list):
+        raise PatchError("A patch must be a list of operations.")
+    for operation in patch:
+        if not isinstance(operation, dict):
+            raise PatchError("A patch operation must be an object.")
+        op = operation.get("op")
+        if op not in ("add", "remove", "replace"):
+            raise PatchError("Unsupported patch operation: {}".format(op))
+        if op != "remove" and "value" not in operation:
+            raise PatchError("Missing value of the {} operation.".format(op))
+        tokens = _parse_pointer(operation.get("path"))
+        if not tokens:
+            if op == "remove":
+                raise PatchError("The document cannot be removed.")
+            document = operation["value"]
+            continue
+        parent = _resolve(document, tokens[:-1])
+        key = tokens[-1]
+        if isinstance(parent, list):
+            index = _index(parent, key, insert=op == "add")
+            if op == "add":
+                parent.insert(index, operation["value"])
+            elif op == "remove":
+                del parent[index]
+            else:
+                parent[index] = operation["value"]
+        elif isinstance(parent, dict):
+            if op != "add" and key not in parent:
+                raise PatchError("Missing member: {}".format(key))
+            if op == "remove":
+                del parent[key]
+            else:
+                parent[key] = operation["value"]
+        else:
+            raise PatchError("Cannot patch a member of a {}.".format(type(parent).__name__))
+    return document
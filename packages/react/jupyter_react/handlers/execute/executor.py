@@ -0,0 +1,186 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Batched code execution."""
+
+import asyncio
+import time
+
+from queue import Empty
+
+from jupyter_core.utils import ensure_async
+from nbformat.v4 import output_from_msg
+
+
+DEFAULT_TIMEOUT = 30
+
+OUTPUT_MSG_TYPES = ("stream", "display_data", "execute_result", "error", "update_display_data")
+
+
+class BatchItem:
+    """The execution state of one code snippet of a batch."""
+
+    def __init__(self, index, code, item_id=None):
+        self.index = index
+        self.code = code
+        self.id = item_id
+        self.msg_id = None
+        self.status = None
+        self.execution_count = None
+        self.outputs = 0
+        self.idle = False
+        self.reply = None
+        self.finished = False
+        self.reported = False
+        self.timings = {}
+
+    @property
+    def done(self):
+        return self.idle and self.reply is not None
+
+    def to_event(self):
+        return {
+            "type": "status",
+            "index": self.index,
+            "id": self.id,
+            "status": self.status,
+            "execution_count": self.execution_count,
+            "outputs": self.outputs,
+            "timings": self.timings,
+        }
+
+
+class BatchExecutor:
+    """Execute a batch of code snippets in a kernel, reporting events as they happen.
+
+    All the execute requests are sent upfront so the kernel never waits for a
+    round trip between two snippets. With `stop_on_error`, the kernel aborts
+    the queued requests after an error.
+
+    The events are dicts passed to the `emit` coroutine function:
+    - `output`: an nbformat output of the snippet `index`.
+    - `clear_output`: the outputs of the snippet `index` are cleared.
+    - `status`: the snippet `index` is done, with its status (`ok`, `error`,
+      `aborted` or `timeout`), execution count and timings in milliseconds
+      from the batch submission (`queued`, `started`, `first_output`, `finished`).
+    - `done`: the batch is done, with its duration.
+    """
+
+    def __init__(self, kernel_manager, timeout=DEFAULT_TIMEOUT, stop_on_error=True, store_history=False):
+        self.kernel_manager = kernel_manager
+        self.timeout = timeout
+        self.stop_on_error = stop_on_error
+        self.store_history = store_history
+        self.started_at = None
+
+    def elapsed(self):
+        return round((time.monotonic() - self.started_at) * 1000, 3)
+
+    async def run(self, codes, emit, ids=None):
+        """Execute the codes, return the batch items."""
+        self.started_at = time.monotonic()
+        ids = ids or [None] * len(codes)
+        items = [BatchItem(index, code, item_id) for index, (code, item_id) in enumerate(zip(codes, ids))]
+        if not items:
+            await emit({"type": "done", "duration": self.elapsed()})
+            return items
+        client = self.kernel_manager.client()
+        client.start_channels()
+        try:
+            await ensure_async(client.wait_for_ready(timeout=self.timeout))
+            by_msg_id = {}
+            for item in items:
+                item.msg_id = client.execute(
+                    item.code,
+                    store_history=self.store_history,
+                    allow_stdin=False,
+                    stop_on_error=self.stop_on_error,
+                )
+                item.timings["queued"] = self.elapsed()
+                by_msg_id[item.msg_id] = item
+            readers = [
+                asyncio.ensure_future(self._read_iopub(client, by_msg_id, items, emit)),
+                asyncio.ensure_future(self._read_shell(client, by_msg_id, items, emit)),
+            ]
+            try:
+                await asyncio.gather(*readers)
+            finally:
+                for reader in readers:
+                    reader.cancel()
+        finally:
+            client.stop_channels()
+        await emit({"type": "done", "duration": self.elapsed()})
+        return items
+
+    async def _finish(self, item, items, emit):
+        if item.finished:
+            # An aborted snippet is finished by its reply, its idle status may follow.
+            return
+        if item.status is None:
+            item.status = item.reply["content"]["status"]
+        item.execution_count = item.reply["content"].get("execution_count")
+        item.timings["finished"] = self.elapsed()
+        item.finished = True
+        # An aborted snippet may be done before the error aborting it,
+        # the statuses are emitted in the submission order.
+        for other in items:
+            if other.reported:
+                continue
+            if not other.finished:
+                break
+            other.reported = True
+            await emit(other.to_event())
+
+    async def _read_iopub(self, client, by_msg_id, items, emit):
+        while not all(item.idle for item in items):
+            await self._check_timeout(items)
+            try:
+                msg = await ensure_async(client.get_iopub_msg(timeout=1))
+            except Empty:
+                if not await ensure_async(self.kernel_manager.is_alive()):
+                    raise RuntimeError("The kernel has died.")
+                continue
+            item = by_msg_id.get(msg["parent_header"].get("msg_id"))
+            if item is None:
+                continue
+            msg_type = msg["msg_type"]
+            if msg_type == "status":
+                state = msg["content"]["execution_state"]
+                if state == "busy":
+                    item.timings.setdefault("started", self.elapsed())
+                elif state == "idle":
+                    item.idle = True
+                    if item.done:
+                        await self._finish(item, items, emit)
+            elif msg_type == "clear_output":
+                await emit({"type": "clear_output", "index": item.index, "wait": msg["content"].get("wait", False)})
+            elif msg_type in OUTPUT_MSG_TYPES:
+                item.timings.setdefault("first_output", self.elapsed())
+                item.outputs += 1
+                await emit({"type": "output", "index": item.index, "output": output_from_msg(msg)})
+
+    async def _read_shell(self, client, by_msg_id, items, emit):
+        while not all(item.reply is not None for item in items):
+            try:
+                msg = await ensure_async(client.get_shell_msg(timeout=1))
+            except Empty:
+                continue
+            item = by_msg_id.get(msg["parent_header"].get("msg_id"))
+            if item is None or msg["msg_type"] != "execute_reply":
+                continue
+            item.reply = msg
+            if msg["content"]["status"] == "aborted":
+                # Aborted requests do not always publish their idle status.
+                item.idle = True
+            if item.done:
+                await self._finish(item, items, emit)
+
+    async def _check_timeout(self, items):
+        """Interrupt the kernel when the running snippet exceeds the timeout."""
+        running = next((item for item in items if "started" in item.timings and not item.idle), None)
+        if running is None or running.status is not None:
+            return
+        if self.elapsed() - running.timings["started"] > self.timeout * 1000:
+            running.status = "timeout"
+            await ensure_async(self.kernel_manager.interrupt_kernel())
@@ -0,0 +1,123 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Execute handlers."""
+
+import json
+
+import tornado
+
+from tornado import web
+from tornado.websocket import WebSocketHandler
+
+from jupyter_client.jsonutil import json_default
+from jupyter_server.auth.decorator import authorized
+from jupyter_server.base.handlers import APIHandler, JupyterHandler
+from jupyter_server.base.websocket import WebSocketMixin
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+
+from .executor import DEFAULT_TIMEOUT, BatchExecutor
+
+
+def parse_batch(body):
+    """Validate a batch request body and return the executor arguments.
+
+    The body is `{"items": [{"code": str, "id": str?}], "timeout": number?,
+    "stop_on_error": bool?, "store_history": bool?}`.
+    """
+    if not isinstance(body, dict) or not isinstance(body.get("items"), list):
+        raise web.HTTPError(400, "The batch must have a list of items.")
+    for item in body["items"]:
+        if not isinstance(item, dict) or not isinstance(item.get("code"), str):
+            raise web.HTTPError(400, "Each batch item must have a code string.")
+    timeout = body.get("timeout", DEFAULT_TIMEOUT)
+    if not isinstance(timeout, (int, float)) or timeout <= 0:
+        raise web.HTTPError(400, "The timeout must be a positive number of seconds.")
+    return {
+        "codes": [item["code"] for item in body["items"]],
+        "ids": [item.get("id") for item in body["items"]],
+        "timeout": timeout,
+        "stop_on_error": bool(body.get("stop_on_error", True)),
+        "store_history": bool(body.get("store_history", False)),
+    }
+
+
+def get_kernel_manager(handler, kernel_id):
+    try:
+        return handler.kernel_manager.get_kernel(kernel_id)
+    except KeyError as e:
+        raise web.HTTPError(404, "Kernel does not exist: {}".format(kernel_id)) from e
+
+
+async def run_batch(handler, kernel_id, batch, emit):
+    """Run a parsed batch in the kernel, an unexpected failure is emitted as an `error` event."""
+    executor = BatchExecutor(
+        get_kernel_manager(handler, kernel_id),
+        timeout=batch["timeout"],
+        stop_on_error=batch["stop_on_error"],
+        store_history=batch["store_history"],
+    )
+    try:
+        await executor.run(batch["codes"], emit, ids=batch["ids"])
+    except Exception as e:
+        handler.log.error("Batch execution failed in kernel {}: {}".format(kernel_id, e))
+        await emit({"type": "error", "message": str(e)})
+
+
+class ExecuteHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler executing a batch of code snippets, streaming NDJSON events."""
+
+    auth_resource = "kernels"
+
+    @tornado.web.authenticated
+    @authorized
+    async def post(self, kernel_id):
+        """Execute the batch in the kernel."""
+        batch = parse_batch(self.get_json_body())
+        get_kernel_manager(self, kernel_id)
+        self.set_header("Content-Type", "application/x-ndjson")
+        self.set_header("Cache-Control", "no-cache")
+
+        async def emit(event):
+            self.write(json.dumps(event, default=json_default) + "\n")
+            await self.flush()
+
+        await run_batch(self, kernel_id, batch, emit)
+        self.finish()
+
+
+# pylint: disable=W0223
+class ExecuteWebsocketHandler(ExtensionHandlerMixin, WebSocketMixin, WebSocketHandler, JupyterHandler):
+    """The websocket executing the batches it receives, sending their events.
+
+    A batch message may carry a `batch_id`, which is added to its events.
+    """
+
+    auth_resource = "kernels"
+
+    async def get(self, kernel_id):
+        if self.current_user is None:
+            raise web.HTTPError(403)
+        if not self.authorizer.is_authorized(self, self.current_user, "execute", self.auth_resource):
+            raise web.HTTPError(403)
+        get_kernel_manager(self, kernel_id)
+        self.kernel_id = kernel_id
+        await super().get(kernel_id)
+
+    async def on_message(self, message):
+        try:
+            body = json.loads(message)
+            batch = parse_batch(body)
+        except (ValueError, web.HTTPError) as e:
+            self.write_message(json.dumps({"type": "error", "message": getattr(e, "log_message", str(e))}))
+            return
+        batch_id = body.get("batch_id")
+
+        async def emit(event):
+            if self.ws_connection is None:
+                return
+            event["batch_id"] = batch_id
+            await self.write_message(json.dumps(event, default=json_default))
+
+        await run_batch(self, self.kernel_id, batch, emit)
@@ -0,0 +1,110 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Metrics handlers."""
+
+import tornado
+
+from tornado import web
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from jupyter_server.base.handlers import APIHandler, JupyterHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+
+try:
+    from jupyter_server.auth.decorator import allow_unauthenticated
+except ImportError:
+    # jupyter_server < 2.13 does not check the unauthenticated handlers.
+    def allow_unauthenticated(method):
+        return method
+
+from .metrics import (
+    EXECUTION_MESSAGE_BYTES,
+    EXECUTION_MESSAGE_TYPES,
+    EXECUTION_MESSAGES,
+    EXECUTION_PHASE_SECONDS,
+    EXECUTION_PHASES,
+    FRONTEND_MARK_SECONDS,
+    FRONTEND_MARKS,
+    REGISTRY,
+)
+
+
+def parse_marks(body):
+    """Validate the marks `{"marks": [{"name": str, "duration": ms}]}`, return the known ones in seconds."""
+    if not isinstance(body, dict) or not isinstance(body.get("marks"), list):
+        raise web.HTTPError(400, "The request must have a list of marks.")
+    marks = []
+    for mark in body["marks"]:
+        if not isinstance(mark, dict) or not isinstance(mark.get("duration"), (int, float)):
+            raise web.HTTPError(400, "Each mark must have a name and a duration.")
+        # Unknown names are ignored to bound the label cardinality.
+        if mark.get("name") in FRONTEND_MARKS and mark["duration"] >= 0:
+            marks.append((mark["name"], mark["duration"] / 1000))
+    return marks
+
+
+def parse_traces(body):
+    """Validate the traces `{"traces": [{"phases": {name: ms}, "messages": {type: {"count", "bytes"}}}]}`."""
+    if not isinstance(body, dict) or not isinstance(body.get("traces"), list):
+        raise web.HTTPError(400, "The request must have a list of traces.")
+    for trace in body["traces"]:
+        if not isinstance(trace, dict) or not isinstance(trace.get("phases"), dict):
+            raise web.HTTPError(400, "Each trace must have phases.")
+        if not isinstance(trace.get("messages", {}), dict):
+            raise web.HTTPError(400, "The messages of a trace must be an object.")
+    return body["traces"]
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+class MetricsHandler(ExtensionHandlerMixin, JupyterHandler):
+    """The handler exporting the extension metrics in the Prometheus text format.
+
+    Like the server `/metrics`, it requires to be logged in unless
+    `ServerApp.authenticate_prometheus` is disabled.
+    """
+
+    @allow_unauthenticated
+    def get(self):
+        if self.settings.get("authenticate_prometheus", True) and not self.logged_in:
+            raise web.HTTPError(403)
+        self.set_header("Content-Type", CONTENT_TYPE_LATEST)
+        self.set_header("Cache-Control", "no-cache")
+        self.finish(generate_latest(REGISTRY))
+
+
+class MarksHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler ingesting the frontend performance marks."""
+
+    @tornado.web.authenticated
+    def post(self):
+        for name, seconds in parse_marks(self.get_json_body()):
+            FRONTEND_MARK_SECONDS.labels(name).observe(seconds)
+        self.set_status(204)
+        self.finish()
+
+
+class TracesHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler aggregating the kernel execution traces of the frontend."""
+
+    @tornado.web.authenticated
+    def post(self):
+        for trace in parse_traces(self.get_json_body()):
+            for phase, duration in trace["phases"].items():
+                # Unknown names are ignored to bound the label cardinality.
+                if phase in EXECUTION_PHASES and is_number(duration):
+                    EXECUTION_PHASE_SECONDS.labels(phase).observe(duration / 1000)
+            for msg_type, messages in trace.get("messages", {}).items():
+                if msg_type not in EXECUTION_MESSAGE_TYPES or not isinstance(messages, dict):
+                    continue
+                if is_number(messages.get("count")):
+                    EXECUTION_MESSAGES.labels(msg_type).inc(messages["count"])
+                if is_number(messages.get("bytes")):
+                    EXECUTION_MESSAGE_BYTES.labels(msg_type).inc(messages["bytes"])
+        self.set_status(204)
+        self.finish()
@@ -0,0 +1,174 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Channels of the multiplexed websocket."""
+
+import asyncio
+import json
+import struct
+
+from jupyter_client.session import Session, new_id
+from jupyter_server._tz import utcnow
+from jupyter_server.services.kernels.connection.base import (
+    deserialize_msg_from_ws_v1,
+    serialize_msg_to_ws_v1,
+)
+
+
+KERNEL_CHANNELS = ("iopub", "shell", "control", "stdin")
+
+FRAME_HEADER = struct.Struct("<I")
+
+
+def pack_frame(channel_id, payload):
+    """Prefix the payload of a channel with the length and the utf-8 bytes of its id."""
+    channel = channel_id.encode("utf-8")
+    return b"".join([FRAME_HEADER.pack(len(channel)), channel, payload])
+
+
+def unpack_frame(frame):
+    """Return the channel id and the payload of a frame."""
+    (length,) = FRAME_HEADER.unpack_from(frame)
+    start = FRAME_HEADER.size
+    return frame[start:start + length].decode("utf-8"), frame[start + length:]
+
+
+class KernelChannel:
+    """A kernel connection carrying the messages of the `v1.kernel.websocket.jupyter.org` protocol.
+
+    The ZMQ messages are forwarded without being deserialized, as the server
+    kernel websocket does for the binary protocol. The IOPub rate limits of
+    the server kernel websocket are not applied.
+    """
+
+    kind = "kernel"
+
+    def __init__(self, mux, channel_id, kernel_id, session_id=None):
+        self.mux = mux
+        self.channel_id = channel_id
+        self.kernel_id = kernel_id
+        self.session = Session(session=session_id or new_id(), config=mux.kernel_manager.config)
+        self.streams = {}
+
+    @property
+    def multi_kernel_manager(self):
+        return self.mux.kernel_manager
+
+    async def open(self):
+        if self.kernel_id not in self.multi_kernel_manager:
+            raise KeyError("Kernel does not exist: {}".format(self.kernel_id))
+        kernel_manager = self.multi_kernel_manager.get_kernel(self.kernel_id)
+        if hasattr(kernel_manager, "ready"):
+            ready = kernel_manager.ready
+            if not isinstance(ready, asyncio.Future):
+                ready = asyncio.wrap_future(ready)
+            await ready
+        self.session.key = kernel_manager.session.key
+        for channel in KERNEL_CHANNELS:
+            stream = getattr(kernel_manager, "connect_" + channel)(identity=self.session.bsession)
+            stream.channel = channel
+            stream.on_recv_stream(self._on_zmq_message)
+            self.streams[channel] = stream
+        self.multi_kernel_manager.notify_connect(self.kernel_id)
+        self.multi_kernel_manager.add_restart_callback(self.kernel_id, self._on_restarted)
+        self.multi_kernel_manager.add_restart_callback(self.kernel_id, self._on_restart_failed, "dead")
+
+    async def receive(self, payload):
+        channel, msg_list = deserialize_msg_from_ws_v1(payload)
+        stream = self.streams.get(channel)
+        if stream is None:
+            raise ValueError("Invalid kernel channel: {}".format(channel))
+        self.session.send_raw(stream, msg_list)
+
+    def close(self):
+        if not self.streams:
+            return
+        for stream in self.streams.values():
+            if not stream.closed():
+                stream.close()
+        self.streams = {}
+        if self.kernel_id in self.multi_kernel_manager:
+            self.multi_kernel_manager.notify_disconnect(self.kernel_id)
+            self.multi_kernel_manager.remove_restart_callback(self.kernel_id, self._on_restarted)
+            self.multi_kernel_manager.remove_restart_callback(self.kernel_id, self._on_restart_failed, "dead")
+
+    def _on_zmq_message(self, stream, msg_list):
+        _, fed_msg_list = self.session.feed_identities(msg_list)
+        self.mux.send(self.channel_id, serialize_msg_to_ws_v1(fed_msg_list[1:], stream.channel))
+
+    def _send_status(self, status):
+        iopub = self.streams.get("iopub")
+        if iopub is not None and not iopub.closed():
+            iopub.flush()
+        msg = self.session.msg("status", {"execution_state": status})
+        self.mux.send(self.channel_id, serialize_msg_to_ws_v1(msg, "iopub", self.session.pack))
+
+    def _on_restarted(self):
+        self._send_status("restarting")
+
+    def _on_restart_failed(self):
+        self._send_status("dead")
+
+
+class TerminalChannel:
+    """A terminal connection carrying the terminado JSON messages."""
+
+    kind = "terminal"
+
+    def __init__(self, mux, channel_id, name):
+        self.mux = mux
+        self.channel_id = channel_id
+        self.name = name
+        self.size = (None, None)
+        self.terminal = None
+
+    @property
+    def terminal_manager(self):
+        terminal_manager = self.mux.settings.get("terminal_manager")
+        if terminal_manager is None:
+            raise KeyError("The terminals are not available.")
+        return terminal_manager
+
+    async def open(self):
+        if self.name not in self.terminal_manager.terminals:
+            raise KeyError("Terminal does not exist: {}".format(self.name))
+        self.terminal = self.terminal_manager.get_terminal(self.name)
+        self.terminal.clients.append(self)
+        self._send(["setup", {}])
+        buffered = "".join(self.terminal.read_buffer)
+        if buffered:
+            self.on_pty_read(buffered)
+
+    async def receive(self, payload):
+        command = json.loads(payload)
+        if self.terminal is None:
+            return
+        if command[0] == "stdin":
+            # Writing to the pty blocks when its buffer is full.
+            await asyncio.get_running_loop().run_in_executor(
+                self.terminal_manager.blocking_io_executor, self.terminal.ptyproc.write, command[1]
+            )
+            self.terminal.last_activity = utcnow()
+        elif command[0] == "set_size":
+            self.size = command[1:3]
+            self.terminal.resize_to_smallest()
+
+    def close(self):
+        if self.terminal is not None:
+            self.terminal.clients.remove(self)
+            self.terminal.resize_to_smallest()
+            self.terminal = None
+
+    def on_pty_read(self, text):
+        """Called by the terminal manager with the terminal output."""
+        self._send(["stdout", text])
+
+    def on_pty_died(self):
+        """Called by the terminal manager when the terminal process exits."""
+        self._send(["disconnect", 1])
+        self.terminal = None
+        self.mux.close_channel(self.channel_id, "The terminal exited.")
+
+    def _send(self, message):
+        self.mux.send(self.channel_id, json.dumps(message).encode("utf-8"))
@@ -0,0 +1,147 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Multiplexed websocket handler."""
+
+import json
+
+from tornado import web
+from tornado.websocket import WebSocketHandler
+
+from jupyter_server.base.handlers import JupyterHandler
+from jupyter_server.base.websocket import WebSocketMixin
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+
+from .channels import KernelChannel, TerminalChannel, pack_frame, unpack_frame
+
+
+def parse_open(body):
+    """Validate a channel opening `{"op": "open", "channel": str, "kind": "kernel" | "terminal", ...}`.
+
+    A kernel channel has a `kernel_id` and an optional `session_id`, a terminal
+    channel a `name`.
+    """
+    if not isinstance(body, dict) or not isinstance(body.get("channel"), str):
+        raise web.HTTPError(400, "The channel must have an id.")
+    kind = body.get("kind")
+    if kind == "kernel":
+        if not isinstance(body.get("kernel_id"), str):
+            raise web.HTTPError(400, "The kernel channel must have a kernel id.")
+        session_id = body.get("session_id")
+        return kind, {"kernel_id": body["kernel_id"], "session_id": session_id if isinstance(session_id, str) else None}
+    if kind == "terminal":
+        if not isinstance(body.get("name"), str):
+            raise web.HTTPError(400, "The terminal channel must have a name.")
+        return kind, {"name": body["name"]}
+    raise web.HTTPError(400, "Invalid channel kind: {}".format(kind))
+
+
+# pylint: disable=W0223
+class MultiplexWebsocketHandler(ExtensionHandlerMixin, WebSocketMixin, WebSocketHandler, JupyterHandler):
+    """One websocket carrying the connections of many kernels and terminals.
+
+    The channels are opened and closed with JSON text messages:
+    - `{"op": "open", "channel": id, "kind": "kernel", "kernel_id": str, "session_id": str}`
+    - `{"op": "open", "channel": id, "kind": "terminal", "name": str}`
+    - `{"op": "close", "channel": id}`
+
+    answered by `{"op": "opened", "channel": id}` and `{"op": "closed",
+    "channel": id, "reason": str}`. The messages of a channel are binary
+    frames, a little endian uint32 length and the utf-8 id of the channel
+    followed by the payload: a `v1.kernel.websocket.jupyter.org` message for
+    the kernels, a terminado JSON message for the terminals.
+    """
+
+    auth_resource = "kernels"
+
+    channel_classes = {
+        "kernel": (KernelChannel, "kernels"),
+        "terminal": (TerminalChannel, "terminals"),
+    }
+
+    async def get(self):
+        if self.current_user is None:
+            raise web.HTTPError(403)
+        if not self.authorizer.is_authorized(self, self.current_user, "execute", self.auth_resource):
+            raise web.HTTPError(403)
+        self.channels = {}
+        await super().get()
+
+    async def on_message(self, message):
+        if isinstance(message, bytes):
+            channel_id, payload = unpack_frame(message)
+            channel = self.channels.get(channel_id)
+            if channel is None:
+                # The messages sent before the closing was received.
+                return
+            try:
+                await channel.receive(payload)
+            except Exception as e:
+                self.log.warning("Invalid message on the {} channel {}: {}".format(channel.kind, channel_id, e))
+            return
+        try:
+            body = json.loads(message)
+        except ValueError:
+            self.log.warning("Invalid multiplexed websocket message.")
+            return
+        if not isinstance(body, dict):
+            return
+        if body.get("op") == "open":
+            await self._open_channel(body)
+        elif body.get("op") == "close":
+            self.close_channel(body.get("channel"))
+
+    def send(self, channel_id, payload):
+        """Send the payload of a channel."""
+        if self.ws_connection is None or self.ws_connection.is_closing():
+            return
+        self.write_message(pack_frame(channel_id, payload), binary=True)
+
+    def close_channel(self, channel_id, reason=None):
+        """Close a channel, notifying the client when reason is given."""
+        channel = self.channels.pop(channel_id, None)
+        if channel is None:
+            return
+        channel.close()
+        if reason is not None:
+            self._send_op("closed", channel_id, reason=reason)
+
+    def on_close(self):
+        for channel in getattr(self, "channels", {}).values():
+            channel.close()
+        self.channels = {}
+
+    async def _open_channel(self, body):
+        channel_id = body.get("channel")
+        try:
+            kind, options = parse_open(body)
+            if channel_id in self.channels:
+                raise web.HTTPError(400, "The channel is already open: {}".format(channel_id))
+            channel_class, resource = self.channel_classes[kind]
+            if not self.authorizer.is_authorized(self, self.current_user, "execute", resource):
+                raise web.HTTPError(403, "Not authorized to open a {} channel.".format(kind))
+        except web.HTTPError as e:
+            self._send_op("closed", channel_id, reason=e.log_message)
+            return
+        channel = channel_class(self, channel_id, **options)
+        self.channels[channel_id] = channel
+        try:
+            await channel.open()
+        except Exception as e:
+            self.log.warning("Failed to open the {} channel {}: {}".format(kind, channel_id, e))
+            if self.channels.get(channel_id) is channel:
+                self.close_channel(channel_id, str(e))
+            else:
+                channel.close()
+            return
+        if self.channels.get(channel_id) is not channel:
+            # Closed while opening.
+            channel.close()
+            return
+        self._send_op("opened", channel_id)
+
+    def _send_op(self, op, channel_id, **kwargs):
+        if self.ws_connection is None or self.ws_connection.is_closing():
+            return
+        self.write_message(json.dumps({"op": op, "channel": channel_id, **kwargs}))
@@ -0,0 +1,79 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Kernel pool handlers."""
+
+import json
+
+import tornado
+
+from tornado import web
+
+from jupyter_client.jsonutil import json_default
+from jupyter_core.utils import ensure_async
+from jupyter_server.auth.decorator import authorized
+from jupyter_server.base.handlers import APIHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+from jupyter_server.utils import url_path_join
+
+
+def parse_session(body):
+    """Validate a session request body `{"path": str, "type": str?, "name": str?, "kernel": {"name": str}}`."""
+    if not isinstance(body, dict) or not isinstance(body.get("path"), str):
+        raise web.HTTPError(400, "The session must have a path.")
+    kernel = body.get("kernel")
+    if not isinstance(kernel, dict) or not isinstance(kernel.get("name"), str):
+        raise web.HTTPError(400, "The session must have a kernel name.")
+    return {
+        "path": body["path"],
+        "type": body.get("type") or "notebook",
+        "name": body.get("name") or "",
+        "kernel_name": kernel["name"],
+    }
+
+
+class KernelPoolHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler returning the state of the kernel pool."""
+
+    auth_resource = "kernels"
+
+    @tornado.web.authenticated
+    @authorized
+    def get(self):
+        """Return the size, idle and starting kernels per kernelspec name."""
+        self.finish(json.dumps(self.extensionapp.kernel_pool.status()))
+
+
+class KernelPoolSessionsHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler creating a session with a pooled kernel.
+
+    It is a drop-in of the server sessions `POST`, the kernel is claimed from
+    the pool and a new one is only started when the pool is empty, or when the
+    notebook is not in the root directory where the pooled kernels run.
+    """
+
+    auth_resource = "sessions"
+
+    @tornado.web.authenticated
+    @authorized
+    async def post(self):
+        """Create a session, return its model."""
+        session = parse_session(self.get_json_body())
+        session_manager = self.session_manager
+        if await ensure_async(session_manager.session_exists(path=session["path"])):
+            model = await ensure_async(session_manager.get_session(path=session["path"]))
+            self.set_header("X-Kernel-Pool", "existing")
+        else:
+            kernel_id = self.extensionapp.kernel_pool.claim(session["kernel_name"], session["path"])
+            model = await ensure_async(session_manager.create_session(
+                path=session["path"],
+                name=session["name"],
+                type=session["type"],
+                kernel_name=None if kernel_id else session["kernel_name"],
+                kernel_id=kernel_id,
+            ))
+            self.set_header("X-Kernel-Pool", "hit" if kernel_id else "miss")
+        self.set_status(201)
+        self.set_header("Location", url_path_join(self.base_url, "api", "sessions", model["id"]))
+        self.finish(json.dumps(model, default=json_default))
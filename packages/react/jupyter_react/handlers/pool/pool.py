@@ -0,0 +1,157 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Pool of pre-warmed kernels."""
+
+import asyncio
+import posixpath
+
+from collections import deque
+
+from traitlets import Dict, Float, Int, Unicode
+from traitlets.config import LoggingConfigurable
+
+from jupyter_core.utils import ensure_async
+
+from ..execute.executor import BatchExecutor
+from ..metrics.metrics import record_cache
+
+
+class KernelPool(LoggingConfigurable):
+    """Keep idle kernels started per kernelspec, handed out to the new sessions.
+
+    A pooled kernel is started, and warmed up with the configured code, before
+    it is requested, so a session gets a kernel ready to execute in a few
+    milliseconds instead of seconds. The pool refills in the background.
+
+    The pooled kernels are started in the server root directory, so they only
+    serve the sessions of the notebooks in that directory. The sessions of the
+    other directories start their kernel in the notebook directory as usual.
+    """
+
+    kernels = Dict(
+        key_trait=Unicode(),
+        value_trait=Int(),
+        config=True,
+        help=("Number of idle kernels kept started per kernelspec name, e.g. {'python3': 2}. "
+              "The pooled kernels run in the root directory and only serve the notebooks in it."),
+    )
+
+    warmup_code = Dict(
+        key_trait=Unicode(),
+        value_trait=Unicode(),
+        config=True,
+        help=("Code executed in the pooled kernels of a kernelspec name once started, e.g. to import the heavy libraries."),
+    )
+
+    warmup_timeout = Float(
+        60,
+        config=True,
+        help=("Seconds after which the warm up code of a pooled kernel is interrupted."),
+    )
+
+    def __init__(self, kernel_manager, **kwargs):
+        super().__init__(**kwargs)
+        self.kernel_manager = kernel_manager
+        self._idle = {}
+        self._starting = {}
+        self._tasks = set()
+        self._stopped = False
+
+    def start(self):
+        """Start filling the pool, the kernels are started in the background."""
+        self._stopped = False
+        for kernel_name in self.kernels:
+            self._refill(kernel_name)
+
+    def claim(self, kernel_name, path=""):
+        """Return the id of an idle kernel of the kernelspec, or None if the pool is empty.
+
+        The kernel is removed from the pool and a replacement started. None is
+        returned for the session path of a notebook out of the root directory,
+        the working directory of the pooled kernels.
+        """
+        cwd_for_path = self.kernel_manager.cwd_for_path
+        if cwd_for_path(posixpath.dirname(path)) != cwd_for_path(""):
+            return None
+        idle = self._idle.get(kernel_name)
+        kernel_id = None
+        while idle and kernel_id is None:
+            candidate = idle.popleft()
+            # The kernel may have been shut down or culled meanwhile.
+            if candidate in self.kernel_manager:
+                kernel_id = candidate
+        record_cache("kernel_pool", kernel_id is not None)
+        if kernel_name in self.kernels:
+            self._refill(kernel_name)
+        return kernel_id
+
+    def status(self):
+        """Return the size, idle and starting kernels per kernelspec name."""
+        return {
+            kernel_name: {
+                "size": size,
+                "idle": len(self._idle.get(kernel_name, ())),
+                "starting": self._starting.get(kernel_name, 0),
+            }
+            for kernel_name, size in self.kernels.items()
+        }
+
+    async def stop(self):
+        """Stop refilling the pool and shut down the idle kernels."""
+        self._stopped = True
+        # A kernel cancelled while starting would be left half started,
+        # the starting kernels shut themselves down once started.
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        kernel_ids = [kernel_id for idle in self._idle.values() for kernel_id in idle]
+        self._idle.clear()
+        for kernel_id in kernel_ids:
+            if kernel_id in self.kernel_manager:
+                await ensure_async(self.kernel_manager.shutdown_kernel(kernel_id, now=True))
+
+    def _refill(self, kernel_name):
+        if self._stopped:
+            return
+        idle = self._idle.setdefault(kernel_name, deque())
+        missing = self.kernels.get(kernel_name, 0) - len(idle) - self._starting.get(kernel_name, 0)
+        for _ in range(missing):
+            self._starting[kernel_name] = self._starting.get(kernel_name, 0) + 1
+            task = asyncio.ensure_future(self._start_kernel(kernel_name))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _start_kernel(self, kernel_name):
+        kernel_id = None
+        try:
+            kernel_id = await ensure_async(self.kernel_manager.start_kernel(kernel_name=kernel_name, path=""))
+            code = self.warmup_code.get(kernel_name)
+            if code:
+                await self._warm_up(kernel_id, code)
+        except Exception as e:
+            # Not retried, so a broken kernelspec does not start kernels in a loop.
+            self.log.warning("Failed to start a pooled {} kernel: {}".format(kernel_name, e))
+            if kernel_id is not None and kernel_id in self.kernel_manager:
+                await ensure_async(self.kernel_manager.shutdown_kernel(kernel_id, now=True))
+            return
+        finally:
+            self._starting[kernel_name] -= 1
+        if self._stopped:
+            await ensure_async(self.kernel_manager.shutdown_kernel(kernel_id, now=True))
+            return
+        self._idle[kernel_name].append(kernel_id)
+        self.log.debug("Pooled {} kernel {} is ready.".format(kernel_name, kernel_id))
+
+    async def _warm_up(self, kernel_id, code):
+        async def emit(event):
+            if event["type"] == "output" and event["output"]["output_type"] == "error":
+                self.log.warning("The warm up code of the pooled kernel {} failed: {}".format(
+                    kernel_id, event["output"]["ename"]
+                ))
+
+        executor = BatchExecutor(
+            self.kernel_manager.get_kernel(kernel_id),
+            timeout=self.warmup_timeout,
+            store_history=False,
+        )
+        await executor.run([code], emit)
@@ -0,0 +1,123 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Render handler."""
+
+import hashlib
+import threading
+
+from collections import OrderedDict
+
+import nbformat
+import tornado
+
+from nbconvert import HTMLExporter
+from pygments.formatters import HtmlFormatter
+from tornado.ioloop import IOLoop
+
+from jupyter_core.utils import ensure_async
+from jupyter_server.auth.decorator import authorized
+from jupyter_server.base.handlers import JupyterHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+
+from ..metrics.metrics import record_cache
+
+
+DEFAULT_MAX_ENTRIES = 64
+
+STATIC_NOTEBOOK_CLASS = "jp-ReactStaticNotebook"
+
+
+def render_notebook(notebook):
+    """Render a notebook to a static HTML fragment, with its highlighting styles.
+
+    The code is highlighted with Pygments, the markdown rendered and the
+    stored outputs included, as nbconvert does. The HTML is sanitized as it
+    is inserted in the page before the outputs are trusted.
+    """
+    exporter = HTMLExporter(template_name="basic", sanitize_html=True)
+    body, _ = exporter.from_notebook_node(notebook)
+    style = HtmlFormatter().get_style_defs(".{} .highlight".format(STATIC_NOTEBOOK_CLASS))
+    return '<style>{}</style><div class="{}">{}</div>'.format(style, STATIC_NOTEBOOK_CLASS, body)
+
+
+class RenderedNotebook:
+    """A notebook rendered to HTML, identified by the file mtime and content hash."""
+
+    def __init__(self, last_modified, digest, html):
+        self.last_modified = last_modified
+        self.digest = digest
+        self.html = html
+
+
+class RenderCache:
+    """LRU cache of the rendered notebooks by path.
+
+    A file whose mtime changed is reloaded, and rendered again only when its
+    content hash changed.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, last_modified=None):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            self._entries.move_to_end(path)
+            if last_modified is not None and entry.last_modified != last_modified:
+                return None
+            return entry
+
+    def put(self, path, entry):
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def render(self, contents_manager, path):
+        """Return the rendered notebook at path."""
+        model = await ensure_async(contents_manager.get(path, content=False, type="notebook"))
+        entry = self.get(path, model["last_modified"])
+        record_cache("render", entry is not None)
+        if entry is not None:
+            return entry
+        model = await ensure_async(contents_manager.get(path, content=True, type="notebook"))
+        digest = hashlib.sha256(nbformat.writes(model["content"]).encode("utf-8")).hexdigest()
+        entry = self.get(path)
+        if entry is None or entry.digest != digest:
+            html = await IOLoop.current().run_in_executor(None, render_notebook, model["content"])
+        else:
+            html = entry.html
+        entry = RenderedNotebook(model["last_modified"], digest, html)
+        self.put(path, entry)
+        return entry
+
+
+render_cache = RenderCache()
+
+
+class RenderHandler(ExtensionHandlerMixin, JupyterHandler):
+    """The handler rendering a notebook to static HTML, shown before the JavaScript is loaded."""
+
+    auth_resource = "contents"
+
+    @tornado.web.authenticated
+    @authorized
+    async def get(self, path):
+        """Return the HTML fragment of the notebook at path."""
+        entry = await render_cache.render(self.contents_manager, path)
+        self.set_header("Content-Type", "text/html; charset=UTF-8")
+        # Revalidated on each request, the ETag avoids sending the HTML again.
+        self.set_header("Cache-Control", "no-cache")
+        self.set_header("ETag", '"{}"'.format(entry.digest))
+        if self.check_etag_header():
+            self.set_status(304)
+            self.finish()
+            return
+        self.finish(entry.html)
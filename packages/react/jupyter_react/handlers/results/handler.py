@@ -0,0 +1,63 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Memoized execution results handler."""
+
+import json
+
+import tornado
+
+from tornado import web
+
+from jupyter_server.auth.decorator import authorized
+from jupyter_server.base.handlers import APIHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+
+
+def parse_result(body):
+    """Validate a result request body `{"outputs": [dict]}`."""
+    if not isinstance(body, dict):
+        raise web.HTTPError(400, "The result must be a JSON object.")
+    outputs = body.get("outputs")
+    if not isinstance(outputs, list) or not all(
+        isinstance(output, dict) and isinstance(output.get("output_type"), str) for output in outputs
+    ):
+        raise web.HTTPError(400, "The result must have a list of nbformat outputs.")
+    return outputs
+
+
+class ResultHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler of a memoized execution result.
+
+    The results are shared by the clients, as the outputs an execution would
+    display to the users of the server.
+    """
+
+    auth_resource = "kernels"
+
+    @tornado.web.authenticated
+    @authorized
+    def get(self, key):
+        """Return the outputs and the creation time of the result."""
+        entry = self.extensionapp.result_store.get(key)
+        if entry is None:
+            raise web.HTTPError(404, "Result does not exist: {}".format(key))
+        self.finish(json.dumps(entry))
+
+    @tornado.web.authenticated
+    @authorized
+    def put(self, key):
+        """Store the outputs of the result."""
+        outputs = parse_result(self.get_json_body())
+        entry = self.extensionapp.result_store.put(key, outputs)
+        self.finish(json.dumps({"created": entry["created"]}))
+
+    @tornado.web.authenticated
+    @authorized
+    def delete(self, key):
+        """Remove the result."""
+        if not self.extensionapp.result_store.delete(key):
+            raise web.HTTPError(404, "Result does not exist: {}".format(key))
+        self.set_status(204)
+        self.finish()
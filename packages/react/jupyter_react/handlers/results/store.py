@@ -0,0 +1,78 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Store of the memoized execution results."""
+
+import re
+import time
+
+from collections import OrderedDict
+
+from traitlets import Float, Int
+from traitlets.config import LoggingConfigurable
+
+from ..metrics.metrics import record_cache
+
+
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class ResultStore(LoggingConfigurable):
+    """Keep the nbformat outputs of the executions, by the hash the clients compute.
+
+    The key hashes the kernelspec, the code and the dependencies declared by
+    the client, so an idempotent cell of a read-mostly page shows its outputs
+    without starting a kernel. The entries expire after the ttl, and the
+    least recently used ones are evicted beyond the maximum.
+    """
+
+    ttl = Float(
+        24 * 60 * 60,
+        config=True,
+        help=("Seconds after which a memoized execution result expires, 0 to never expire."),
+    )
+
+    max_entries = Int(
+        1000,
+        config=True,
+        help=("Maximum number of memoized execution results, 0 to disable the store."),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Return the entry `{"outputs": list, "created": float}` of a key, or None."""
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(entry):
+            del self._entries[key]
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        record_cache("results", entry is not None)
+        return entry
+
+    def put(self, key, outputs):
+        """Store the outputs of a key, return the entry."""
+        if not KEY_PATTERN.match(key):
+            raise ValueError("Invalid result key: {}".format(key))
+        entry = {"outputs": outputs, "created": time.time()}
+        if self.max_entries <= 0:
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def delete(self, key):
+        """Remove the entry of a key, return whether it was stored."""
+        return self._entries.pop(key, None) is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expired(self, entry):
+        return self.ttl > 0 and time.time() - entry["created"] > self.ttl
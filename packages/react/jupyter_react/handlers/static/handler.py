@@ -0,0 +1,142 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Static assets handler."""
+
+import json
+import mimetypes
+import os
+
+from jupyter_server.base.handlers import FileFindHandler
+
+from ..metrics.metrics import MetricsHandlerMixin
+
+
+BUILD_MANIFEST = "build-manifest.json"
+
+VITE_MANIFEST = os.path.join(".vite", "manifest.json")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Precompressed variants, in order of preference.
+CONTENT_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_manifests = {}
+
+
+def load_manifest(manifest_path):
+    """Return a JSON manifest, or None if missing.
+
+    The manifest is cached per process and reloaded when its mtime changes.
+    """
+    try:
+        mtime = os.path.getmtime(manifest_path)
+    except OSError:
+        return None
+    cached = _manifests.get(manifest_path)
+    if cached is None or cached[0] != mtime:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            cached = (mtime, json.load(f))
+        _manifests[manifest_path] = cached
+    return cached[1]
+
+
+def load_build_manifest(static_path):
+    """Return the build manifest written by hatch_build, or None if missing."""
+    return load_manifest(os.path.join(static_path, BUILD_MANIFEST))
+
+
+def load_vite_manifest(static_path):
+    """Return the manifest written by Vite, or None if missing."""
+    return load_manifest(os.path.join(static_path, VITE_MANIFEST))
+
+
+def parse_accept_encoding(accept_encoding):
+    """Return the set of content codings accepted by the client."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+# pylint: disable=W0223
+class StaticAssetsHandler(MetricsHandlerMixin, FileFindHandler):
+    """The handler for the Vite bundle static files.
+
+    Files listed in the build manifest get a strong ETag from their sha256.
+    Content-hashed chunks are served as immutable, and precompressed variants
+    are negotiated via Accept-Encoding. Other files (e.g. index.html) are
+    revalidated on each request. Without a manifest, this behaves as the
+    FileFindHandler, with caching disabled.
+    """
+
+    static_metrics = True
+
+    def initialize(self, path, default_filename=None, no_cache_paths=None):
+        super().initialize(path, default_filename=default_filename, no_cache_paths=no_cache_paths)
+        self.static_path = self.root[0]
+        self.manifest = load_build_manifest(self.static_path)
+        self.manifest_entry = None
+        self.content_encoding = None
+        self.original_path = None
+
+    def validate_absolute_path(self, root, absolute_path):
+        absolute_path = super().validate_absolute_path(root, absolute_path)
+        if absolute_path is None or self.manifest is None:
+            return absolute_path
+        if not absolute_path.startswith(self.static_path):
+            return absolute_path
+        name = absolute_path[len(self.static_path):].replace(os.sep, "/")
+        self.manifest_entry = self.manifest["files"].get(name)
+        self.original_path = absolute_path
+        # Ranges apply to the identity representation only.
+        if self.manifest_entry is None or "Range" in self.request.headers:
+            return absolute_path
+        accepted = parse_accept_encoding(self.request.headers.get("Accept-Encoding", ""))
+        for encoding, suffix in CONTENT_ENCODINGS:
+            if encoding in accepted and encoding in self.manifest_entry["encodings"]:
+                variant = absolute_path + suffix
+                if os.path.isfile(variant):
+                    self.content_encoding = encoding
+                    # The size and mtime must describe the variant served.
+                    self._stat_result = os.stat(variant)
+                    return variant
+        return absolute_path
+
+    def compute_etag(self):
+        if self.manifest_entry is None:
+            return super().compute_etag()
+        etag = self.manifest_entry["hash"]
+        if self.content_encoding is not None:
+            etag = "{}-{}".format(etag, self.content_encoding)
+        return '"{}"'.format(etag)
+
+    def get_content_type(self):
+        if self.content_encoding is None:
+            return super().get_content_type()
+        mime_type, _ = mimetypes.guess_type(self.original_path)
+        return mime_type or "application/octet-stream"
+
+    def set_headers(self):
+        super().set_headers()
+        if self.manifest_entry is None:
+            return
+        if self.manifest_entry["immutable"]:
+            self.set_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+        else:
+            self.set_header("Cache-Control", "no-cache")
+        if self.manifest_entry["encodings"]:
+            self.set_header("Vary", "Accept-Encoding")
+        if self.content_encoding is not None:
+            self.set_header("Content-Encoding", self.content_encoding)
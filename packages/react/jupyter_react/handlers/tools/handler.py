@@ -0,0 +1,67 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Tools handler."""
+
+import json
+
+import tornado
+
+from tornado import web
+
+from jupyter_client.jsonutil import json_default
+from jupyter_server.auth.decorator import authorized
+from jupyter_server.base.handlers import APIHandler
+from jupyter_server.extension.handler import ExtensionHandlerMixin
+
+from jupyter_react.handlers.execute.handler import get_kernel_manager
+from jupyter_react.tools import NotebookTools, open_document
+
+
+def parse_operations(body):
+    """Validate a tools request body.
+
+    The body is `{"path": str, "operations": [{"name": str, "params": dict?}],
+    "kernel_id": str?, "format": "json" | "toon"?, "stop_on_error": bool?,
+    "auto_run": bool?}`. Without a kernel, the cells are not executed.
+    """
+    if not isinstance(body, dict) or not isinstance(body.get("path"), str):
+        raise web.HTTPError(400, "The request must have a notebook path.")
+    operations = body.get("operations")
+    if not isinstance(operations, list):
+        raise web.HTTPError(400, "The request must have a list of operations.")
+    for operation in operations:
+        if not isinstance(operation, dict) or not isinstance(operation.get("name"), str):
+            raise web.HTTPError(400, "Each operation must have a name.")
+    if body.get("format", "json") not in ("json", "toon"):
+        raise web.HTTPError(400, "The format must be json or toon.")
+    return operations
+
+
+class ToolsHandler(ExtensionHandlerMixin, APIHandler):
+    """The handler running a batch of notebook tool operations on a server side notebook."""
+
+    auth_resource = "contents"
+
+    @tornado.web.authenticated
+    @authorized
+    async def post(self):
+        """Run the operations on the notebook and return their results."""
+        body = self.get_json_body()
+        operations = parse_operations(body)
+        kernel_manager = None
+        kernel_id = body.get("kernel_id")
+        if kernel_id is not None:
+            if not self.authorizer.is_authorized(self, self.current_user, "execute", "kernels"):
+                raise web.HTTPError(403)
+            kernel_manager = get_kernel_manager(self, kernel_id)
+        # The contents manager raises a 404 when the notebook does not exist.
+        document = await open_document(self.settings, self.contents_manager, body["path"])
+        tools = NotebookTools(document, kernel_manager=kernel_manager, auto_run=bool(body.get("auto_run", True)))
+        results = await tools.run_batch(
+            operations,
+            format=body.get("format", "json"),
+            stop_on_error=bool(body.get("stop_on_error", False)),
+        )
+        self.finish(json.dumps({"path": body["path"], "results": results}, default=json_default))
@@ -9,17 +9,32 @@ import os
 from traitlets import default, CInt, Instance, Unicode
 from traitlets.config import Configurable
 
+from jupyter_core.paths import jupyter_data_dir
 from jupyter_server.utils import url_path_join
 from jupyter_server.extension.application import ExtensionApp, ExtensionAppJinjaMixin
-from jupyter_server.base.handlers import FileFindHandler
 
 from jupyterlab_server import LabServerApp
 from jupyterlab_server.config import get_page_config
 
 from jupyter_react.__version__ import __version__
 
-from jupyter_react.handlers.index.handler import IndexHandler
+from jupyter_react.handlers.index.handler import IndexHandler, IndexPageCache
 from jupyter_react.handlers.config.handler import ConfigHandler
+from jupyter_react.handlers.bootstrap.handler import BootstrapHandler
+from jupyter_react.handlers.execute.handler import ExecuteHandler, ExecuteWebsocketHandler
+from jupyter_react.handlers.tools.handler import ToolsHandler
+from jupyter_react.handlers.blobs.handler import BlobHandler, BlobsExportHandler, BlobsHandler
+from jupyter_react.handlers.blobs.store import DEFAULT_THRESHOLD, BlobStore
+from jupyter_react.handlers.contents.handler import ContentsPatchHandler
+from jupyter_react.handlers.metrics.handler import MarksHandler, MetricsHandler, TracesHandler
+from jupyter_react.handlers.metrics.metrics import PAGE_CONFIG_SECONDS, observe_duration
+from jupyter_react.handlers.mux.handler import MultiplexWebsocketHandler
+from jupyter_react.handlers.pool.handler import KernelPoolHandler, KernelPoolSessionsHandler
+from jupyter_react.handlers.pool.pool import KernelPool
+from jupyter_react.handlers.render.handler import RenderHandler
+from jupyter_react.handlers.results.handler import ResultHandler
+from jupyter_react.handlers.results.store import ResultStore
+from jupyter_react.handlers.static.handler import StaticAssetsHandler
 
 
 DEFAULT_STATIC_FILES_PATH = os.path.join(os.path.dirname(__file__), "./static")
@@ -84,15 +99,49 @@ class JupyterReactExtensionApp(ExtensionAppJinjaMixin, ExtensionApp):
         return JupyterReactExtensionApp.Launcher(parent=self, config=self.config)
 
 
+    blobs_path = Unicode(
+        config=True,
+        help=("Directory of the content addressed store of the large outputs."),
+    )
+
+    @default("blobs_path")
+    def _default_blobs_path(self):
+        return os.path.join(jupyter_data_dir(), "jupyter_react", "blobs")
+
+    blobs_threshold = CInt(
+        DEFAULT_THRESHOLD,
+        config=True,
+        help=("Size in bytes above which the clients opting in move an output mime bundle to the blob store."),
+    )
+
     def initialize_settings(self):
         self.log.debug("Jupyter React Config {}".format(self.config))
+        self.blob_store = BlobStore(self.blobs_path)
+        self.kernel_pool = KernelPool(self.serverapp.kernel_manager, parent=self, config=self.config)
+        self.result_store = ResultStore(parent=self, config=self.config)
 
-    def initialize_templates(self):
+    async def _start_jupyter_server_extension(self, serverapp):
+        self.kernel_pool.start()
+
+    async def stop_extension(self):
+        await self.kernel_pool.stop()
+
+    @property
+    def labextensions_path(self):
+        return self.serverapp.web_app.settings.get("labextensions_path", [])
+
+    def update_page_config(self):
+        """Update the page config from the installed labextensions."""
         page_config = self.serverapp.web_app.settings.setdefault("page_config_data", {})
-        page_config.update(get_page_config(
-            labextensions_path=self.serverapp.web_app.settings.get("labextensions_path", []),
-            logger=self.log
-        ))
+        with observe_duration(PAGE_CONFIG_SECONDS):
+            page_config.update(get_page_config(
+                labextensions_path=self.labextensions_path,
+                logger=self.log
+            ))
+        return page_config
+
+    def initialize_templates(self):
+        page_config = self.update_page_config()
         httpUrl = self.serverapp.public_url.rstrip('/')
         wsUrl = httpUrl.replace('https://', 'wss://').replace('http://', 'ws://')
         fullStaticUrl = url_path_join(self.serverapp.base_url, "static", self.name)
@@ -105,17 +154,34 @@ class JupyterReactExtensionApp(ExtensionAppJinjaMixin, ExtensionApp):
             "jupyter_react_version": __version__,
             "page_config": page_config,
         })
+        self.index_page_cache = IndexPageCache(self)
 
     def initialize_handlers(self):
         self.log.debug("Jupyter React Config {}".format(self.settings['jupyter_react_jinja2_env']))
         handlers = [
             (self.name, IndexHandler),
             (url_path_join(self.name, "config"), ConfigHandler),
+            (url_path_join(self.name, "bootstrap"), BootstrapHandler),
+            (url_path_join(self.name, "kernels", r"(?P<kernel_id>[\w-]+)", "execute"), ExecuteHandler),
+            (url_path_join(self.name, "kernels", r"(?P<kernel_id>[\w-]+)", "execute", "channel"), ExecuteWebsocketHandler),
+            (url_path_join(self.name, "kernels", "pool"), KernelPoolHandler),
+            (url_path_join(self.name, "kernels", "pool", "sessions"), KernelPoolSessionsHandler),
+            (url_path_join(self.name, "mux"), MultiplexWebsocketHandler),
+            (url_path_join(self.name, "tools"), ToolsHandler),
+            (url_path_join(self.name, "blobs"), BlobsHandler),
+            (url_path_join(self.name, "blobs", r"(?P<digest>[0-9a-f]{64})"), BlobHandler),
+            (url_path_join(self.name, "blobs", "export", r"(?P<path>.+)"), BlobsExportHandler),
+            (url_path_join(self.name, "contents", r"(?P<path>.+\.ipynb)"), ContentsPatchHandler),
+            (url_path_join(self.name, "render", r"(?P<path>.+\.ipynb)"), RenderHandler),
+            (url_path_join(self.name, "results", r"(?P<key>[0-9a-f]{64})"), ResultHandler),
+            (url_path_join(self.name, "metrics"), MetricsHandler),
+            (url_path_join(self.name, "metrics", "marks"), MarksHandler),
+            (url_path_join(self.name, "metrics", "traces"), TracesHandler),
             # Serve static files at /static/jupyter_react/ to match webpack publicPath
             (
                 url_path_join("static", self.name, "(.*)"),
-                FileFindHandler,
-                {"path": DEFAULT_STATIC_FILES_PATH, "no_cache_paths": ["/"]},
+                StaticAssetsHandler,
+                {"path": DEFAULT_STATIC_FILES_PATH},
             ),
         ]
         self.handlers.extend(handlers)
@@ -0,0 +1,69 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+import gzip
+import os
+
+from jupyter_server.utils import url_path_join
+
+from ..handlers.assets.handler import AssetCache, parse_range
+from ..handlers.react.handlers import STATIC_FILES_PATH, ReactPlotlyHandler
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-9", 100) == (0, 10)
+    assert parse_range("bytes=90-", 100) == (90, 100)
+    assert parse_range("bytes=-10", 100) == (90, 100)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("bytes=200-", 100) is None
+
+
+def test_asset_cache_lru(tmp_path):
+    paths = []
+    for name in ("a.js", "b.js", "c.js"):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 100)
+        paths.append(str(path))
+    cache = AssetCache(max_bytes=250)
+    first = cache.get(paths[0], "text/javascript")
+    assert cache.get(paths[0], "text/javascript") is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.get(paths[1], "text/javascript")
+    cache.get(paths[2], "text/javascript")
+    # The least recently used asset is evicted to fit the budget.
+    assert cache.size <= 250
+    assert cache.get(paths[0], "text/javascript") is not first
+
+
+def test_plotly_asset_path():
+    # The vendored plotly is read next to the handlers, as before the cache.
+    assert os.path.abspath(STATIC_FILES_PATH).endswith(os.path.join("jupyter_react", "handlers", "static"))
+    assert ReactPlotlyHandler.asset_path == os.path.join(STATIC_FILES_PATH, "plotly-2.3.0.min.js")
+
+
+async def test_plotly_handler(jp_serverapp, jp_fetch, tmp_path):
+    body = b"var Plotly = {};\n" * 1000
+    asset = tmp_path / "plotly-2.3.0.min.js"
+    asset.write_bytes(body)
+
+    class PlotlyHandler(ReactPlotlyHandler):
+        asset_path = str(asset)
+
+    jp_serverapp.web_app.add_handlers(
+        ".*$",
+        [(url_path_join(jp_serverapp.base_url, "jupyter_react", "plotly.js"), PlotlyHandler, {"name": "jupyter_react"})],
+    )
+    response = await jp_fetch("jupyter_react", "plotly.js", headers={"Accept-Encoding": "gzip"}, decompress_response=False)
+    assert response.code == 200
+    assert response.headers["Content-Type"] == 'text/javascript; charset="utf-8"'
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.body) == body
+    # Served from the cache, with the same ETag.
+    response = await jp_fetch(
+        "jupyter_react",
+        "plotly.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["Etag"]},
+        raise_error=False,
+    )
+    assert response.code == 304
@@ -0,0 +1,30 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+import nbformat
+
+from ..handlers.blobs.store import BLOBS_METADATA_KEY, BlobStore, externalize_outputs, inline_outputs
+
+
+def test_blob_store_dedupes(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.put(b'"value"')
+    assert store.put(b'"value"') == digest
+    assert store.get(digest) == b'"value"'
+    assert store.get("0" * 64) is None
+    assert len(list(tmp_path.rglob("*"))) == 2
+
+
+def test_externalize_and_inline_outputs(tmp_path):
+    store = BlobStore(str(tmp_path))
+    image = "iVBORw0KGgo" * 1000
+    output = nbformat.v4.new_output("display_data", data={"image/png": image, "text/plain": "<Figure>"})
+    notebook = nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell("plot()", outputs=[output])])
+    assert externalize_outputs(notebook, store, threshold=1024) == 1
+    output = notebook.cells[0].outputs[0]
+    assert output.data == {"text/plain": "<Figure>"}
+    assert output.metadata[BLOBS_METADATA_KEY]["image/png"]["size"] == len(image) + 2
+    assert inline_outputs(notebook, store) == []
+    assert notebook.cells[0].outputs[0].data["image/png"] == image
+    assert BLOBS_METADATA_KEY not in notebook.cells[0].outputs[0].metadata
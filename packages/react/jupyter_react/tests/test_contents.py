@@ -0,0 +1,95 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+import json
+
+import nbformat
+import pytest
+
+from tornado.httpclient import HTTPClientError
+
+from ..handlers.contents.patch import PatchError, apply_patch
+
+
+def test_apply_patch():
+    document = {"cells": [{"source": "a"}, {"source": "c"}], "metadata": {"kernel": "python3"}}
+    patched = apply_patch(document, [
+        {"op": "add", "path": "/cells/1", "value": {"source": "b"}},
+        {"op": "replace", "path": "/cells/2/source", "value": "c = 1"},
+        {"op": "add", "path": "/cells/-", "value": {"source": "d"}},
+        {"op": "remove", "path": "/metadata/kernel"},
+        {"op": "add", "path": "/metadata/a~1b", "value": 1},
+    ])
+    assert patched == {
+        "cells": [{"source": "a"}, {"source": "b"}, {"source": "c = 1"}, {"source": "d"}],
+        "metadata": {"a/b": 1},
+    }
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "move", "from": "/cells/0", "path": "/cells/1"},
+    {"op": "replace", "path": "/cells/2", "value": {}},
+    {"op": "remove", "path": "/metadata/missing"},
+    {"op": "add", "path": "/cells/01", "value": {}},
+    {"op": "replace", "path": "cells", "value": []},
+])
+def test_apply_patch_errors(operation):
+    with pytest.raises(PatchError):
+        apply_patch({"cells": [{}], "metadata": {}}, [operation])
+
+
+async def _get_model(jp_fetch, path):
+    response = await jp_fetch("api", "contents", path, params={"content": "0"})
+    return json.loads(response.body)
+
+
+async def test_patch_notebook(jp_fetch, jp_root_dir):
+    notebook = nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell("print(1)")])
+    nbformat.write(notebook, str(jp_root_dir / "delta.ipynb"))
+    model = await _get_model(jp_fetch, "delta.ipynb")
+    # When
+    response = await jp_fetch(
+        "jupyter_react", "contents", "delta.ipynb",
+        method="PATCH",
+        body=json.dumps({
+            "revision": model["last_modified"],
+            "patch": [{"op": "replace", "path": "/cells/0/source", "value": "print(2)"}],
+        }),
+    )
+    # Then
+    assert response.code == 200
+    saved = json.loads(response.body)
+    assert saved["content"] is None
+    assert saved["last_modified"] == (await _get_model(jp_fetch, "delta.ipynb"))["last_modified"]
+    notebook = nbformat.read(str(jp_root_dir / "delta.ipynb"), as_version=4)
+    assert notebook.cells[0].source == "print(2)"
+
+
+async def test_patch_notebook_conflict(jp_fetch, jp_root_dir):
+    nbformat.write(nbformat.v4.new_notebook(), str(jp_root_dir / "conflict.ipynb"))
+    body = json.dumps({
+        "revision": "2000-01-01T00:00:00Z",
+        "patch": [{"op": "add", "path": "/cells/0", "value": nbformat.v4.new_markdown_cell("# Title")}],
+    })
+    # When
+    with pytest.raises(HTTPClientError) as e:
+        await jp_fetch("jupyter_react", "contents", "conflict.ipynb", method="PATCH", body=body)
+    # Then
+    assert e.value.code == 409
+    assert nbformat.read(str(jp_root_dir / "conflict.ipynb"), as_version=4).cells == []
+
+
+async def test_patch_notebook_invalid(jp_fetch, jp_root_dir):
+    nbformat.write(nbformat.v4.new_notebook(), str(jp_root_dir / "invalid.ipynb"))
+    model = await _get_model(jp_fetch, "invalid.ipynb")
+    body = json.dumps({
+        "revision": model["last_modified"],
+        "patch": [{"op": "add", "path": "/cells/0", "value": {"cell_type": "heading"}}],
+    })
+    # When
+    with pytest.raises(HTTPClientError) as e:
+        await jp_fetch("jupyter_react", "contents", "invalid.ipynb", method="PATCH", body=body)
+    # Then
+    assert e.value.code == 400
+    assert nbformat.read(str(jp_root_dir / "invalid.ipynb"), as_version=4).cells == []
@@ -2,8 +2,11 @@
 #
 # MIT License
 
+import asyncio
 import json
 
+import nbformat
+
 from ..__version__ import __version__
 
 
@@ -17,3 +20,183 @@ async def test_config(jp_fetch):
         "extension": "jupyter_react",
         "version": __version__
     }
+
+
+async def test_bootstrap(jp_fetch):
+    # When
+    response = await jp_fetch("jupyter_react", "bootstrap")
+    # Then
+    assert response.code == 200
+    payload = json.loads(response.body)
+    assert payload["config"]["extension"] == "jupyter_react"
+    assert payload["config"]["version"] == __version__
+    assert payload["sessions"] == []
+    assert payload["kernels"] == []
+    assert "default" in payload["kernelspecs"]
+
+
+async def test_execute_batch(jp_fetch):
+    response = await jp_fetch("api", "kernels", method="POST", body=json.dumps({"name": "python3"}))
+    kernel_id = json.loads(response.body)["id"]
+    # When
+    response = await jp_fetch(
+        "jupyter_react", "kernels", kernel_id, "execute",
+        method="POST",
+        body=json.dumps({"items": [{"code": "print(1)"}, {"code": "1/0"}, {"code": "print(2)"}]}),
+    )
+    # Then
+    assert response.code == 200
+    events = [json.loads(line) for line in response.body.decode("utf-8").splitlines()]
+    assert [event["status"] for event in events if event["type"] == "status"] == ["ok", "error", "aborted"]
+    outputs = [event["output"] for event in events if event["type"] == "output" and event["index"] == 0]
+    assert outputs == [{"output_type": "stream", "name": "stdout", "text": "1\n"}]
+    assert events[-1]["type"] == "done"
+
+
+async def test_tools_batch(jp_fetch, jp_root_dir):
+    nbformat.write(nbformat.v4.new_notebook(), str(jp_root_dir / "tools.ipynb"))
+    response = await jp_fetch("api", "kernels", method="POST", body=json.dumps({"name": "python3"}))
+    kernel_id = json.loads(response.body)["id"]
+    # When
+    response = await jp_fetch(
+        "jupyter_react", "tools",
+        method="POST",
+        body=json.dumps({
+            "path": "tools.ipynb",
+            "kernel_id": kernel_id,
+            "operations": [
+                {"name": "insertCell", "params": {"type": "code", "source": "print(1 + 1)"}},
+                {"name": "readAllCells", "params": {"format": "detailed"}},
+            ],
+        }),
+    )
+    # Then
+    assert response.code == 200
+    results = [item["result"] for item in json.loads(response.body)["results"]]
+    assert results[0]["execution"]["outputs"] == ["2\n"]
+    assert results[1]["cells"][0]["outputs"] == ["2\n"]
+    notebook = nbformat.read(str(jp_root_dir / "tools.ipynb"), as_version=4)
+    assert notebook.cells[0].source == "print(1 + 1)"
+
+
+async def test_blobs(jp_fetch):
+    # When
+    response = await jp_fetch("jupyter_react", "blobs", method="POST", body=json.dumps({"data": [1, 2, 3]}))
+    # Then
+    assert response.code == 201
+    digest = json.loads(response.body)["hash"]
+    response = await jp_fetch("jupyter_react", "blobs", digest)
+    assert json.loads(response.body) == {"data": [1, 2, 3]}
+    assert "immutable" in response.headers["Cache-Control"]
+
+
+async def test_render(jp_fetch, jp_root_dir):
+    notebook = nbformat.v4.new_notebook(cells=[
+        nbformat.v4.new_markdown_cell("# Dashboard"),
+        nbformat.v4.new_code_cell("print('hello')", outputs=[
+            nbformat.v4.new_output("stream", name="stdout", text="hello\n"),
+        ]),
+    ])
+    nbformat.write(notebook, str(jp_root_dir / "render.ipynb"))
+    # When
+    response = await jp_fetch("jupyter_react", "render", "render.ipynb")
+    # Then
+    assert response.code == 200
+    html = response.body.decode("utf-8")
+    assert 'id="Dashboard"' in html
+    assert 'class="highlight' in html
+    assert "hello\n</pre>" in html
+    etag = response.headers["ETag"]
+    response = await jp_fetch("jupyter_react", "render", "render.ipynb")
+    assert response.headers["ETag"] == etag
+
+
+async def test_metrics(jp_fetch):
+    await jp_fetch("jupyter_react", "config")
+    # When
+    response = await jp_fetch(
+        "jupyter_react", "metrics", "marks",
+        method="POST",
+        body=json.dumps({"marks": [{"name": "kernel_ready", "duration": 1200}, {"name": "unknown", "duration": 1}]}),
+    )
+    # Then
+    assert response.code == 204
+    response = await jp_fetch("jupyter_react", "metrics")
+    metrics = response.body.decode("utf-8")
+    assert 'jupyter_react_request_duration_seconds_count{handler="ConfigHandler",method="GET",status_code="200"}' in metrics
+    assert 'jupyter_react_frontend_mark_seconds_count{mark="kernel_ready"} 1.0' in metrics
+    assert "unknown" not in metrics
+    assert "jupyter_react_page_config_seconds_count" in metrics
+
+
+async def test_metrics_traces(jp_fetch):
+    trace = {
+        "msgId": "1",
+        "kernelId": "k",
+        "phases": {"queue": 2, "dispatch": 15, "run": 120, "unknown": 1},
+        "messages": {"stream": {"count": 3, "bytes": 60}, "custom": {"count": 1, "bytes": 1}},
+    }
+    # When
+    response = await jp_fetch("jupyter_react", "metrics", "traces", method="POST", body=json.dumps({"traces": [trace]}))
+    # Then
+    assert response.code == 204
+    response = await jp_fetch("jupyter_react", "metrics")
+    metrics = response.body.decode("utf-8")
+    assert 'jupyter_react_execution_phase_seconds_count{phase="run"}' in metrics
+    assert 'jupyter_react_execution_messages_total{msg_type="stream"}' in metrics
+    assert "unknown" not in metrics
+    assert "custom" not in metrics
+
+
+async def test_kernel_pool(jp_fetch, jp_serverapp, jp_root_dir):
+    pool = jp_serverapp.extension_manager.extension_points["jupyter_react"].app.kernel_pool
+    pool.kernels = {"python3": 1}
+    pool.warmup_code = {"python3": "import json"}
+    pool.start()
+    for _ in range(300):
+        if pool.status()["python3"]["idle"] == 1:
+            break
+        await asyncio.sleep(0.1)
+    pooled = pool._idle["python3"][0]
+    # When
+    response = await jp_fetch(
+        "jupyter_react", "kernels", "pool", "sessions",
+        method="POST",
+        body=json.dumps({"path": "pool.ipynb", "type": "notebook", "kernel": {"name": "python3"}}),
+    )
+    # Then
+    assert response.code == 201
+    assert response.headers["X-Kernel-Pool"] == "hit"
+    assert json.loads(response.body)["kernel"]["id"] == pooled
+    response = await jp_fetch("jupyter_react", "kernels", "pool")
+    assert json.loads(response.body)["python3"]["starting"] + json.loads(response.body)["python3"]["idle"] == 1
+    # The pooled kernels run in the root directory.
+    (jp_root_dir / "sub").mkdir()
+    response = await jp_fetch(
+        "jupyter_react", "kernels", "pool", "sessions",
+        method="POST",
+        body=json.dumps({"path": "sub/pool.ipynb", "type": "notebook", "kernel": {"name": "python3"}}),
+    )
+    assert response.headers["X-Kernel-Pool"] == "miss"
+    kernel_id = json.loads(response.body)["kernel"]["id"]
+    assert kernel_id not in pool._idle["python3"]
+    kernel_manager = jp_serverapp.kernel_manager
+    assert kernel_manager.get_kernel(kernel_id).provisioner.cwd == str(jp_root_dir / "sub")
+    assert kernel_manager.get_kernel(pooled).provisioner.cwd == str(jp_root_dir)
+    await pool.stop()
+
+
+async def test_results(jp_fetch, jp_serverapp):
+    key = "a" * 64
+    outputs = [{"output_type": "stream", "name": "stdout", "text": "hello\n"}]
+    # When
+    response = await jp_fetch("jupyter_react", "results", key, method="PUT", body=json.dumps({"outputs": outputs}))
+    # Then
+    assert response.code == 200
+    response = await jp_fetch("jupyter_react", "results", key)
+    assert json.loads(response.body)["outputs"] == outputs
+    store = jp_serverapp.extension_manager.extension_points["jupyter_react"].app.result_store
+    store.max_entries = 1
+    store.put("b" * 64, [])
+    assert store.get(key) is None
+    assert store.get("b" * 64)["outputs"] == []
@@ -0,0 +1,26 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+from ..handlers.index.handler import get_preload_links, labextensions_fingerprint
+
+
+def test_get_preload_links():
+    vite_manifest = {
+        "index.html": {"file": "main.jupyter-react.js", "isEntry": True, "imports": ["_vendor.js"], "css": ["assets/main-AbCd1234.css"]},
+        "_vendor.js": {"file": "vendor-AbCd1234.js"},
+        "src/lazy.tsx": {"file": "lazy-AbCd1234.js", "isDynamicEntry": True},
+    }
+    assert get_preload_links("/static/jupyter_react/", vite_manifest) == [
+        "</static/jupyter_react/main.jupyter-react.js>; rel=modulepreload; crossorigin",
+        "</static/jupyter_react/assets/main-AbCd1234.css>; rel=preload; as=style; crossorigin",
+        "</static/jupyter_react/vendor-AbCd1234.js>; rel=modulepreload; crossorigin",
+    ]
+
+
+def test_labextensions_fingerprint(tmp_path):
+    fingerprint = labextensions_fingerprint([str(tmp_path)])
+    assert labextensions_fingerprint([str(tmp_path)]) == fingerprint
+    (tmp_path / "my-extension").mkdir()
+    (tmp_path / "my-extension" / "package.json").write_text("{}")
+    assert labextensions_fingerprint([str(tmp_path)]) != fingerprint
@@ -0,0 +1,44 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+import json
+
+from jupyter_client.session import Session
+from jupyter_server.services.kernels.connection.base import (
+    deserialize_msg_from_ws_v1,
+    serialize_msg_to_ws_v1,
+)
+
+from ..handlers.mux.channels import pack_frame, unpack_frame
+
+
+def test_frames():
+    assert unpack_frame(pack_frame("kernel-é", b"payload")) == ("kernel-é", b"payload")
+
+
+async def test_mux_kernel_channel(jp_fetch, jp_ws_fetch):
+    response = await jp_fetch("api", "kernels", method="POST", body=json.dumps({"name": "python3"}))
+    kernel_id = json.loads(response.body)["id"]
+    ws = await jp_ws_fetch("jupyter_react", "mux")
+    # When
+    await ws.write_message(json.dumps({"op": "open", "channel": "missing", "kind": "kernel", "kernel_id": "missing"}))
+    await ws.write_message(json.dumps({"op": "open", "channel": "k1", "kind": "kernel", "kernel_id": kernel_id}))
+    # Then
+    closed = json.loads(await ws.read_message())
+    assert closed["op"] == "closed" and closed["channel"] == "missing"
+    assert json.loads(await ws.read_message()) == {"op": "opened", "channel": "k1"}
+    session = Session()
+    msg = session.msg("kernel_info_request")
+    await ws.write_message(pack_frame("k1", serialize_msg_to_ws_v1(msg, "shell", session.pack)), binary=True)
+    while True:
+        channel_id, payload = unpack_frame(await ws.read_message())
+        assert channel_id == "k1"
+        channel, msg_list = deserialize_msg_from_ws_v1(payload)
+        if channel == "shell":
+            break
+    header = json.loads(msg_list[0])
+    parent_header = json.loads(msg_list[1])
+    assert header["msg_type"] == "kernel_info_reply"
+    assert parent_header["msg_id"] == msg["header"]["msg_id"]
+    ws.close()
@@ -0,0 +1,102 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+import gzip
+import json
+
+import pytest
+
+from jupyter_server.utils import url_path_join
+
+from ..handlers.static.handler import (
+    BUILD_MANIFEST,
+    IMMUTABLE_CACHE_CONTROL,
+    StaticAssetsHandler,
+    load_build_manifest,
+    parse_accept_encoding,
+)
+
+HASHED_BODY = b"console.log('hashed');\n" * 100
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert parse_accept_encoding("br;q=0, gzip;q=0.5") == {"gzip"}
+    assert parse_accept_encoding("") == set()
+
+
+def test_load_build_manifest(tmp_path):
+    assert load_build_manifest(str(tmp_path)) is None
+    manifest = {"version": 1, "files": {"main-AbCd1234.js": {"hash": "abc", "size": 1, "immutable": True, "encodings": []}}}
+    (tmp_path / BUILD_MANIFEST).write_text(json.dumps(manifest))
+    assert load_build_manifest(str(tmp_path)) == manifest
+
+
+@pytest.fixture
+def static_assets(jp_serverapp, tmp_path, monkeypatch):
+    """Route the StaticAssetsHandler to a built bundle with its manifest."""
+    # The resolved paths are cached per class, across the test servers.
+    monkeypatch.setattr(StaticAssetsHandler, "_static_paths", {})
+    (tmp_path / "main-AbCd1234.js").write_bytes(HASHED_BODY)
+    (tmp_path / "main-AbCd1234.js.gz").write_bytes(gzip.compress(HASHED_BODY, mtime=0))
+    (tmp_path / "main.jupyter-react.js").write_text("import './main-AbCd1234.js';\n")
+    manifest = {
+        "version": 1,
+        "files": {
+            "main-AbCd1234.js": {"hash": "abc", "size": len(HASHED_BODY), "immutable": True, "encodings": ["gzip"]},
+            "main.jupyter-react.js": {"hash": "def", "size": 29, "immutable": False, "encodings": []},
+        },
+    }
+    (tmp_path / BUILD_MANIFEST).write_text(json.dumps(manifest))
+    jp_serverapp.web_app.add_handlers(
+        ".*$",
+        [(url_path_join(jp_serverapp.base_url, "jupyter_react", "test-static", "(.*)"), StaticAssetsHandler, {"path": str(tmp_path)})],
+    )
+
+
+async def test_immutable_hashed_assets(static_assets, jp_fetch):
+    response = await jp_fetch("jupyter_react", "test-static", "main-AbCd1234.js")
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    response = await jp_fetch("jupyter_react", "test-static", "main.jupyter-react.js")
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "immutable" not in response.headers["Cache-Control"]
+
+
+async def test_precompressed_variants(static_assets, jp_fetch):
+    response = await jp_fetch(
+        "jupyter_react", "test-static", "main-AbCd1234.js", headers={"Accept-Encoding": "br, gzip"}, decompress_response=False
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Etag"] == '"abc-gzip"'
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert "javascript" in response.headers["Content-Type"]
+    assert gzip.decompress(response.body) == HASHED_BODY
+    # Without an accepted variant, the identity is served.
+    response = await jp_fetch(
+        "jupyter_react", "test-static", "main-AbCd1234.js", headers={"Accept-Encoding": "br"}, decompress_response=False
+    )
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Etag"] == '"abc"'
+    assert response.body == HASHED_BODY
+
+
+async def test_not_modified_on_matching_etag(static_assets, jp_fetch):
+    response = await jp_fetch(
+        "jupyter_react",
+        "test-static",
+        "main-AbCd1234.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc-gzip"'},
+        raise_error=False,
+    )
+    assert response.code == 304
+    # The ETag of another variant does not match.
+    response = await jp_fetch(
+        "jupyter_react",
+        "test-static",
+        "main-AbCd1234.js",
+        headers={"If-None-Match": '"abc-gzip"'},
+        decompress_response=False,
+        raise_error=False,
+    )
+    assert response.code == 200
@@ -0,0 +1,55 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+import asyncio
+
+import pytest
+
+from ..tools import NotebookDocument, NotebookTools, ToolValidationError, encode
+
+
+def run_batch(tools, operations, format="json"):
+    return [item["result"] for item in asyncio.run(tools.run_batch(operations, format=format))]
+
+
+def test_notebook_tools_operations():
+    tools = NotebookTools(NotebookDocument())
+    results = run_batch(tools, [
+        {"name": "insertCell", "params": {"type": "code", "source": "x = 1"}},
+        {"name": "insertCell", "params": {"type": "markdown", "source": "# Title", "index": 0}},
+        {"name": "updateCell", "params": {"index": "1", "source": "x = 2"}},
+        {"name": "readAllCells", "params": {"format": "brief"}},
+        {"name": "deleteCells", "params": {"indices": [0]}},
+        {"name": "readCell", "params": {"index": 0}},
+    ])
+    assert [result["success"] for result in results] == [True] * 6
+    assert results[1]["index"] == 0
+    assert "-x = 1" in results[2]["diff"] and "+x = 2" in results[2]["diff"]
+    assert results[3]["cells"] == [
+        {"index": 0, "type": "markdown", "preview": "# Title"},
+        {"index": 1, "type": "code", "preview": "x = 2"},
+    ]
+    assert results[5]["source"] == "x = 2"
+    assert tools.document.cell_count == 1
+
+
+def test_notebook_tools_errors():
+    tools = NotebookTools(NotebookDocument())
+    results = run_batch(tools, [
+        {"name": "deleteCells", "params": {"indices": [3]}},
+        {"name": "insertCell", "params": {"type": "image", "source": ""}},
+        {"name": "runCell", "params": {"index": 0}},
+    ])
+    assert [result["success"] for result in results] == [False] * 3
+    assert "out of range" in results[0]["error"]
+    assert "Invalid parameters for insertCell" in results[1]["error"]
+    with pytest.raises(ToolValidationError):
+        asyncio.run(tools.execute("deleteCells", {"indices": []}))
+
+
+def test_toon_format():
+    tools = NotebookTools(NotebookDocument())
+    results = run_batch(tools, [{"name": "readAllCells"}], format="toon")
+    assert results == ["success: true\ncells[0]:\ncellCount: 0"]
+    assert encode({"cells": [{"index": 0, "type": "code"}]}) == "cells[1]{index,type}:\n  0,code"
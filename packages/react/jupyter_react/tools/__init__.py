@@ -0,0 +1,17 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Server side implementation of the notebook tool operations.
+
+Example, in process::
+
+    document = await open_document(serverapp.web_app.settings, serverapp.contents_manager, "notebook.ipynb")
+    tools = NotebookTools(document, kernel_manager=serverapp.kernel_manager.get_kernel(kernel_id))
+    results = await tools.run_batch([{"name": "insertCell", "params": {"type": "code", "source": "1 + 1"}}])
+"""
+
+from .document import ContentsDocument, NotebookDocument, YNotebookDocument, open_document
+from .formatter import encode, format_response
+from .operations import NotebookTools
+from .schemas import ToolValidationError, validate
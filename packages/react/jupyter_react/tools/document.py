@@ -0,0 +1,131 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Server side notebook documents the tool operations work on."""
+
+import nbformat
+
+from jupyter_core.utils import ensure_async
+
+
+def new_cell(cell_type, source):
+    """Create a nbformat cell of the given type."""
+    if cell_type == "code":
+        return nbformat.v4.new_code_cell(source)
+    if cell_type == "markdown":
+        return nbformat.v4.new_markdown_cell(source)
+    return nbformat.v4.new_raw_cell(source)
+
+
+def join_source(source):
+    """The nbformat files may store the multiline strings as lists of lines."""
+    return "".join(source) if isinstance(source, list) else source
+
+
+class NotebookDocument:
+    """A notebook held in memory as nbformat JSON.
+
+    The cells returned by `get_cell` are nbformat dicts with a string source.
+    """
+
+    def __init__(self, notebook=None):
+        self.notebook = notebook if notebook is not None else nbformat.v4.new_notebook()
+        self.dirty = False
+
+    @property
+    def cell_count(self):
+        return len(self.notebook["cells"])
+
+    def get_cell(self, index):
+        cell = dict(self.notebook["cells"][index])
+        cell["source"] = join_source(cell.get("source", ""))
+        return cell
+
+    def insert_cell(self, index, cell):
+        self.notebook["cells"].insert(index, cell)
+        self.dirty = True
+
+    def set_source(self, index, source):
+        self.notebook["cells"][index]["source"] = source
+        self.dirty = True
+
+    def set_outputs(self, index, outputs, execution_count):
+        cell = self.notebook["cells"][index]
+        cell["outputs"] = list(outputs)
+        cell["execution_count"] = execution_count
+        self.dirty = True
+
+    def delete_cell(self, index):
+        del self.notebook["cells"][index]
+        self.dirty = True
+
+    async def save(self):
+        self.dirty = False
+
+
+class ContentsDocument(NotebookDocument):
+    """A notebook file loaded with the contents manager, saved back when modified."""
+
+    def __init__(self, contents_manager, path, notebook):
+        super().__init__(notebook)
+        self.contents_manager = contents_manager
+        self.path = path
+
+    async def save(self):
+        if not self.dirty:
+            return
+        model = {"type": "notebook", "format": "json", "content": self.notebook}
+        await ensure_async(self.contents_manager.save(model, self.path))
+        self.dirty = False
+
+
+class YNotebookDocument(NotebookDocument):
+    """The collaborative document of a notebook opened in a room.
+
+    The changes are applied to the shared model, so they are broadcast to the
+    connected clients and saved by the room.
+    """
+
+    def __init__(self, ynotebook):
+        super().__init__({"cells": []})
+        self.ynotebook = ynotebook
+
+    @property
+    def cell_count(self):
+        return self.ynotebook.cell_number
+
+    def get_cell(self, index):
+        cell = self.ynotebook.get_cell(index)
+        cell["source"] = join_source(cell.get("source", ""))
+        return cell
+
+    def insert_cell(self, index, cell):
+        self.ynotebook.ycells.insert(index, self.ynotebook.create_ycell(cell))
+
+    def set_source(self, index, source):
+        cell = self.ynotebook.get_cell(index)
+        cell["source"] = source
+        self.ynotebook.set_cell(index, cell)
+
+    def set_outputs(self, index, outputs, execution_count):
+        cell = self.ynotebook.get_cell(index)
+        cell["outputs"] = list(outputs)
+        cell["execution_count"] = execution_count
+        self.ynotebook.set_cell(index, cell)
+
+    def delete_cell(self, index):
+        del self.ynotebook.ycells[index]
+
+
+async def open_document(settings, contents_manager, path):
+    """Open the notebook at path, preferring its collaborative document when a room is open."""
+    ydoc_extension = settings.get("jupyter_server_ydoc")
+    if ydoc_extension is not None:
+        ynotebook = await ydoc_extension.get_document(
+            path=path, content_type="notebook", file_format="json", copy=False
+        )
+        if ynotebook is not None:
+            return YNotebookDocument(ynotebook)
+    model = await ensure_async(contents_manager.get(path, content=True, type="notebook"))
+    return ContentsDocument(contents_manager, path, model["content"])
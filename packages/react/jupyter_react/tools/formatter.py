@@ -0,0 +1,164 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Response formatting of the notebook tool operations.
+
+Supports JSON (structured) and TOON (human/LLM-readable, the default), like
+`src/tools/core/formatter.ts`. The TOON encoder covers the values produced by
+the operations: objects, primitive arrays, tabular arrays of flat objects and
+list arrays.
+"""
+
+import math
+import re
+
+from decimal import Decimal
+
+
+INDENT = "  "
+
+UNQUOTED_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+
+NUMERIC_LIKE = re.compile(r"^-?\d+(?:\.\d+)?(?:e[+-]?\d+)?$", re.IGNORECASE)
+
+ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def format_response(data, format=None):
+    """Format a tool result, the structured data for `json` else a TOON string."""
+    if format == "json":
+        return data
+    return encode(data)
+
+
+def encode(value):
+    """Encode a JSON value as TOON."""
+    value = normalize(value)
+    if isinstance(value, dict):
+        return "\n".join(_encode_object(value, 0))
+    if isinstance(value, list):
+        return "\n".join(_encode_array(None, value, 0))
+    return _encode_primitive(value)
+
+
+def normalize(value):
+    """Convert a value to the JSON data model."""
+    if isinstance(value, dict):
+        return {str(key): normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+def _is_primitive(value):
+    return not isinstance(value, (dict, list))
+
+
+def _encode_number(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if value == int(value) and abs(value) < 1e21:
+        return str(int(value))
+    text = repr(value)
+    if "e" in text or "E" in text:
+        text = format(Decimal(text), "f")
+    return text
+
+
+def _quote(value):
+    return '"{}"'.format("".join(ESCAPES.get(c, c) for c in value))
+
+
+def _encode_string(value):
+    if (
+        value == ""
+        or value != value.strip()
+        or value in ("true", "false", "null")
+        or NUMERIC_LIKE.match(value)
+        or value.startswith("-")
+        or any(c in value for c in ',:"\\[]{}')
+        or any(ord(c) < 32 for c in value)
+    ):
+        return _quote(value)
+    return value
+
+
+def _encode_primitive(value):
+    if value is None:
+        return "null"
+    if isinstance(value, (bool, int, float)):
+        return _encode_number(value)
+    return _encode_string(value)
+
+
+def _encode_key(key):
+    return key if UNQUOTED_KEY.match(key) else _quote(key)
+
+
+def _encode_object(value, depth):
+    lines = []
+    for key, item in value.items():
+        lines.extend(_encode_field(key, item, depth))
+    return lines
+
+
+def _encode_field(key, item, depth):
+    prefix = INDENT * depth
+    if isinstance(item, list):
+        return _encode_array(key, item, depth)
+    if isinstance(item, dict):
+        return ["{}{}:".format(prefix, _encode_key(key))] + _encode_object(item, depth + 1)
+    return ["{}{}: {}".format(prefix, _encode_key(key), _encode_primitive(item))]
+
+
+def _tabular_fields(items):
+    """Return the fields of an array of flat objects sharing the same keys, else None."""
+    if not items or not all(isinstance(item, dict) and item for item in items):
+        return None
+    fields = list(items[0].keys())
+    for item in items:
+        if list(item.keys()) != fields or not all(_is_primitive(v) for v in item.values()):
+            return None
+    return fields
+
+
+def _encode_array(key, items, depth):
+    prefix = INDENT * depth
+    name = _encode_key(key) if key is not None else ""
+    header = "{}{}[{}]".format(prefix, name, len(items))
+    if not items:
+        return [header + ":"]
+    if all(_is_primitive(item) for item in items):
+        return ["{}: {}".format(header, ",".join(_encode_primitive(item) for item in items))]
+    fields = _tabular_fields(items)
+    if fields is not None:
+        lines = ["{}{{{}}}:".format(header, ",".join(_encode_key(field) for field in fields))]
+        for item in items:
+            lines.append(INDENT * (depth + 1) + ",".join(_encode_primitive(item[field]) for field in fields))
+        return lines
+    lines = [header + ":"]
+    for item in items:
+        lines.extend(_encode_list_item(item, depth + 1))
+    return lines
+
+
+def _encode_list_item(item, depth):
+    prefix = INDENT * depth
+    if isinstance(item, list):
+        nested = _encode_array(None, item, depth)
+        nested[0] = "{}- {}".format(prefix, nested[0].lstrip())
+        return nested
+    if isinstance(item, dict):
+        if not item:
+            return [prefix + "-"]
+        lines = _encode_object(item, depth + 1)
+        lines[0] = "{}- {}".format(prefix, lines[0].lstrip())
+        return lines
+    return ["{}- {}".format(prefix, _encode_primitive(item))]
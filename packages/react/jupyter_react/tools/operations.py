@@ -0,0 +1,327 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""The notebook tool operations, mirroring `src/tools/operations`."""
+
+import difflib
+import time
+
+from jupyter_react.handlers.execute.executor import BatchExecutor
+from jupyter_react.tools.document import new_cell
+from jupyter_react.tools.formatter import format_response
+from jupyter_react.tools.schemas import validate
+
+
+PREVIEW_LENGTH = 40
+
+EXECUTE_CODE_TIMEOUT = 30
+
+
+def output_to_string(output):
+    """Convert a nbformat output to the string returned by the tools, like the MCP server."""
+    output_type = output.get("output_type")
+    if output_type == "stream":
+        text = output.get("text", "")
+        return "".join(text) if isinstance(text, list) else text
+    if output_type in ("execute_result", "display_data"):
+        text = output.get("data", {}).get("text/plain")
+        if text is None:
+            return None
+        return "".join(text) if isinstance(text, list) else text
+    if output_type == "error":
+        error = "[ERROR: {}: {}]".format(output.get("ename", "Error"), output.get("evalue", ""))
+        traceback = output.get("traceback")
+        if traceback:
+            return "{}\n{}".format(error, "\n".join(traceback))
+        return error
+    return None
+
+
+def outputs_to_strings(outputs):
+    strings = (output_to_string(output) for output in outputs or [])
+    return [string for string in strings if string is not None]
+
+
+def create_patch(name, old, new):
+    """Create a unified diff with the header of the jsdiff `createPatch`, empty without changes."""
+    if old == new:
+        return ""
+    lines = ["Index: {}".format(name), "=" * 67]
+    for line in difflib.unified_diff(
+        old.splitlines(keepends=True),
+        new.splitlines(keepends=True),
+        fromfile=name,
+        tofile=name,
+        fromfiledate="before",
+        tofiledate="after",
+    ):
+        if line.endswith("\n"):
+            lines.append(line[:-1])
+        else:
+            lines.append(line)
+            lines.append("\\ No newline at end of file")
+    return "\n".join(lines) + "\n"
+
+
+class NotebookTools:
+    """The tool operations applied on a server side notebook document.
+
+    The operations are coroutines taking the parameters of the browser tools
+    and returning the same results. The cells are executed in the kernel of
+    `kernel_manager` when one is given, else `runCell` and `executeCode` fail
+    and the inserted or updated cells are not run.
+
+    Use `execute` to run an operation by name with a response format, or
+    `run_batch` to run a list of operations and save the document once.
+    """
+
+    def __init__(self, document, kernel_manager=None, auto_run=True):
+        self.document = document
+        self.kernel_manager = kernel_manager
+        self.auto_run = auto_run
+        self.operations = {
+            "readAllCells": self.read_all_cells,
+            "readCell": self.read_cell,
+            "insertCell": self.insert_cell,
+            "updateCell": self.update_cell,
+            "deleteCells": self.delete_cells,
+            "runCell": self.run_cell,
+            "executeCode": self.execute_code,
+        }
+
+    async def execute(self, name, params=None, format=None):
+        """Validate the parameters, run the operation and format its result."""
+        if name not in self.operations:
+            raise ValueError("Unknown operation: {}".format(name))
+        result = await self.operations[name](**validate(name, params))
+        return format_response(result, format)
+
+    async def run_batch(self, operations, format=None, stop_on_error=False):
+        """Run the operations `[{"name": str, "params": dict}]` in order.
+
+        A failed operation gives a `{"success": False, "error": str}` result,
+        the following operations are skipped with `stop_on_error`. The
+        document is saved once at the end of the batch.
+        """
+        results = []
+        try:
+            for operation in operations:
+                try:
+                    result = await self.execute(operation.get("name"), operation.get("params"), "json")
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+                results.append({"name": operation.get("name"), "result": format_response(result, format)})
+                if stop_on_error and not result.get("success"):
+                    break
+        finally:
+            await self.document.save()
+        return results
+
+    def _check_index(self, index):
+        count = self.document.cell_count
+        if index < 0 or index >= count:
+            raise IndexError("Cell index {} is out of range. Notebook has {} cells.".format(index, count))
+
+    async def _auto_run(self, index):
+        """Run a cell after an insert or update, as the browser tools do."""
+        if not self.auto_run or self.kernel_manager is None:
+            return None
+        if self.document.get_cell(index)["cell_type"] != "code":
+            return None
+        result = await self.run_cell(index=index)
+        if not result["success"]:
+            raise RuntimeError(result.get("error", "Execution failed"))
+        return {"execution_count": result["execution_count"], "outputs": result["outputs"]}
+
+    async def _execute(self, code, timeout, store_history):
+        if self.kernel_manager is None:
+            raise RuntimeError("No kernel is attached to the notebook tools.")
+        outputs = []
+        clear = {"wait": False}
+
+        async def emit(event):
+            if event["type"] == "clear_output":
+                if event["wait"]:
+                    clear["wait"] = True
+                else:
+                    outputs.clear()
+            elif event["type"] == "output":
+                if clear["wait"]:
+                    outputs.clear()
+                    clear["wait"] = False
+                outputs.append(event["output"])
+
+        executor = BatchExecutor(
+            self.kernel_manager, timeout=timeout, stop_on_error=True, store_history=store_history
+        )
+        items = await executor.run([code], emit)
+        return items[0], outputs
+
+    async def read_all_cells(self, format="brief"):
+        cells = []
+        for index in range(self.document.cell_count):
+            cell = self.document.get_cell(index)
+            if format == "brief":
+                cells.append({"index": index, "type": cell["cell_type"], "preview": cell["source"][:PREVIEW_LENGTH]})
+            else:
+                cells.append({
+                    "index": index,
+                    "type": cell["cell_type"],
+                    "source": cell["source"],
+                    "execution_count": cell.get("execution_count"),
+                    "outputs": outputs_to_strings(cell.get("outputs")),
+                })
+        return {"success": True, "cells": cells, "cellCount": len(cells)}
+
+    async def read_cell(self, index, includeOutputs=True):
+        count = self.document.cell_count
+        if index >= count:
+            return {
+                "success": False,
+                "error": "Cell index {} is out of range. Notebook has {} cells.".format(index, count),
+            }
+        cell = self.document.get_cell(index)
+        result = {
+            "success": True,
+            "index": index,
+            "type": cell["cell_type"],
+            "source": cell["source"],
+            "execution_count": cell.get("execution_count"),
+        }
+        if includeOutputs:
+            result["outputs"] = outputs_to_strings(cell.get("outputs"))
+        return result
+
+    async def insert_cell(self, type, source, index=None):
+        count = self.document.cell_count
+        actual_index = count if index is None else index
+        if actual_index > count:
+            raise IndexError(
+                "Failed to insert cell: Index {} is outside valid range [-1, {}]. "
+                "Use -1 to append at end.".format(actual_index, count)
+            )
+        self.document.insert_cell(actual_index, new_cell(type, source))
+        try:
+            execution = await self._auto_run(actual_index)
+        except Exception as e:
+            return {
+                "success": True,
+                "index": actual_index,
+                "message": "Cell inserted at index {} but execution failed: {}".format(actual_index, e),
+            }
+        if execution is None:
+            return {"success": True, "index": actual_index, "message": "Cell inserted at index {}".format(actual_index)}
+        return {
+            "success": True,
+            "index": actual_index,
+            "message": "Cell inserted and executed at index {}".format(actual_index),
+            "execution": execution,
+        }
+
+    async def update_cell(self, index, source):
+        try:
+            self._check_index(index)
+        except IndexError as e:
+            raise IndexError("Failed to update cell: {}".format(e)) from e
+        old_source = self.document.get_cell(index)["source"]
+        self.document.set_source(index, source)
+        diff = create_patch("cell_{}".format(index), old_source, source)
+        if diff:
+            message = "Cell {} overwritten successfully:\n\n```diff\n{}\n```".format(index, diff)
+        else:
+            message = "Cell {} overwritten successfully - no changes detected".format(index)
+        try:
+            execution = await self._auto_run(index)
+        except Exception as e:
+            return {"success": True, "message": "{}\nExecution failed: {}".format(message, e), "diff": diff}
+        if execution is None:
+            return {"success": True, "message": message, "diff": diff}
+        return {
+            "success": True,
+            "message": "{}\nCell executed successfully.".format(message),
+            "diff": diff,
+            "execution": execution,
+        }
+
+    async def delete_cells(self, indices):
+        try:
+            for index in indices:
+                self._check_index(index)
+        except IndexError as e:
+            raise IndexError("Failed to delete cell(s): {}".format(e)) from e
+        # Delete from the highest index so the other indices do not shift.
+        for index in sorted(set(indices), reverse=True):
+            self.document.delete_cell(index)
+        return {
+            "success": True,
+            "deletedCells": [{"index": index} for index in indices],
+            "message": "\n".join("Deleted cell at index {}".format(index) for index in indices),
+        }
+
+    async def run_cell(self, index=None, timeoutSeconds=None, stream=False, progressInterval=5):
+        if index is None:
+            return {"success": False, "error": "A cell index is required, there is no active cell on the server."}
+        count = self.document.cell_count
+        if index >= count:
+            return {
+                "success": False,
+                "error": "Index {} is out of bounds. The notebook has {} cell{} (valid indices: 0-{}).".format(
+                    index, count, "" if count == 1 else "s", count - 1
+                ),
+            }
+        started_at = time.monotonic()
+        cell = self.document.get_cell(index)
+        if cell["cell_type"] != "code":
+            # Rendering a markdown cell is a browser concern.
+            elapsed_time = time.monotonic() - started_at
+            return {
+                "success": True,
+                "index": index,
+                "execution_count": None,
+                "outputs": [],
+                "elapsed_time": elapsed_time,
+                "message": "Cell at index {} executed in {:.2f}s".format(index, elapsed_time),
+            }
+        item, outputs = await self._execute(cell["source"], timeoutSeconds or float("inf"), True)
+        self.document.set_outputs(index, outputs, item.execution_count)
+        elapsed_time = time.monotonic() - started_at
+        if item.status == "timeout":
+            return {
+                "success": False,
+                "timeout": True,
+                "index": index,
+                "outputs": [
+                    "[TIMEOUT ERROR: Cell execution exceeded {} seconds. Partial outputs may be available.]".format(
+                        timeoutSeconds
+                    )
+                ] + outputs_to_strings(outputs),
+                "elapsed_time": elapsed_time,
+                "error": "Execution timed out after {} seconds".format(timeoutSeconds),
+            }
+        return {
+            "success": True,
+            "index": index,
+            "execution_count": item.execution_count,
+            "outputs": outputs_to_strings(outputs),
+            "elapsed_time": elapsed_time,
+            "message": "Cell at index {} executed in {:.2f}s".format(index, elapsed_time),
+        }
+
+    async def execute_code(self, code, timeout=EXECUTE_CODE_TIMEOUT):
+        timeout = timeout or EXECUTE_CODE_TIMEOUT
+        item, outputs = await self._execute(code, timeout, False)
+        outputs = [
+            {"type": output["output_type"], "content": {k: v for k, v in output.items() if k != "output_type"}}
+            for output in outputs
+        ]
+        if item.status == "timeout":
+            return {
+                "success": False,
+                "error": "Execution exceeded {} seconds and was interrupted".format(timeout),
+                "outputs": outputs,
+            }
+        result = {"success": True, "outputs": outputs}
+        if item.execution_count is not None:
+            result["executionCount"] = item.execution_count
+        return result
@@ -0,0 +1,163 @@
+# Copyright (c) 2021-2023 Datalayer, Inc.
+#
+# MIT License
+
+"""Parameter schemas of the notebook tool operations.
+
+These mirror the Zod schemas of `src/tools/schemas` so the same parameters
+are accepted by the browser and the server implementations.
+"""
+
+import json
+
+
+CELL_TYPES = ("code", "markdown", "raw")
+
+READ_FORMATS = ("brief", "detailed")
+
+
+class ToolValidationError(ValueError):
+    """Raised when the parameters of an operation do not match its schema."""
+
+    def __init__(self, operation, issues, params):
+        self.operation = operation
+        self.issues = issues
+        lines = "\n".join("  - {}: {}".format(path, message) for path, message in issues)
+        super().__init__(
+            "Invalid parameters for {}:\n{}\n\nReceived: {}".format(operation, lines, json.dumps(params, default=str))
+        )
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _coerce_int(value):
+    """Parse the integer strings, like the `z.preprocess` of the index fields."""
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return value
+    return value
+
+
+def _index(value, path, issues, coerce=False):
+    if coerce:
+        value = _coerce_int(value)
+    if not _is_int(value) or value < 0:
+        issues.append((path, "Expected a non negative integer"))
+    return value
+
+
+def _string(value, path, issues):
+    if not isinstance(value, str):
+        issues.append((path, "Expected string"))
+    return value
+
+
+def _boolean(value, path, issues):
+    if not isinstance(value, bool):
+        issues.append((path, "Expected boolean"))
+    return value
+
+
+def _positive(value, path, issues):
+    if not _is_number(value) or value <= 0:
+        issues.append((path, "Expected a positive number"))
+    return value
+
+
+def _insert_cell(params, issues):
+    result = {}
+    if params.get("type") not in CELL_TYPES:
+        issues.append(("type", "Expected one of {}".format(", ".join(CELL_TYPES))))
+    result["type"] = params.get("type")
+    result["source"] = _string(params.get("source"), "source", issues)
+    if params.get("index") is not None:
+        result["index"] = _index(params["index"], "index", issues)
+    return result
+
+
+def _update_cell(params, issues):
+    return {
+        "index": _index(params.get("index"), "index", issues, coerce=True),
+        "source": _string(params.get("source"), "source", issues),
+    }
+
+
+def _delete_cells(params, issues):
+    indices = params.get("indices")
+    if not isinstance(indices, list):
+        issues.append(("indices", "Expected array"))
+        return {"indices": indices}
+    if not indices:
+        issues.append(("indices", "Array must contain at least 1 element(s)"))
+    return {"indices": [_index(index, "indices.{}".format(i), issues, coerce=True) for i, index in enumerate(indices)]}
+
+
+def _read_all_cells(params, issues):
+    read_format = params.get("format", "brief")
+    if read_format not in READ_FORMATS:
+        issues.append(("format", "Expected one of {}".format(", ".join(READ_FORMATS))))
+    return {"format": read_format}
+
+
+def _read_cell(params, issues):
+    result = {"index": _index(params.get("index"), "index", issues, coerce=True)}
+    if params.get("includeOutputs") is not None:
+        result["includeOutputs"] = _boolean(params["includeOutputs"], "includeOutputs", issues)
+    return result
+
+
+def _run_cell(params, issues):
+    result = {}
+    if params.get("index") is not None:
+        result["index"] = _index(params["index"], "index", issues)
+    if params.get("timeoutSeconds") is not None:
+        result["timeoutSeconds"] = _positive(params["timeoutSeconds"], "timeoutSeconds", issues)
+    if params.get("stream") is not None:
+        result["stream"] = _boolean(params["stream"], "stream", issues)
+    if params.get("progressInterval") is not None:
+        result["progressInterval"] = _positive(params["progressInterval"], "progressInterval", issues)
+    return result
+
+
+def _execute_code(params, issues):
+    result = {"code": _string(params.get("code"), "code", issues)}
+    timeout = params.get("timeout")
+    if timeout is not None:
+        if not _is_number(timeout) or not 0 <= timeout <= 60:
+            issues.append(("timeout", "Expected a number between 0 and 60"))
+        result["timeout"] = timeout
+    return result
+
+
+SCHEMAS = {
+    "insertCell": _insert_cell,
+    "updateCell": _update_cell,
+    "deleteCells": _delete_cells,
+    "readAllCells": _read_all_cells,
+    "readCell": _read_cell,
+    "runCell": _run_cell,
+    "executeCode": _execute_code,
+}
+
+
+def validate(operation, params):
+    """Validate the parameters of an operation, returning the parsed parameters."""
+    if operation not in SCHEMAS:
+        raise ValueError("Unknown operation: {}".format(operation))
+    if params is None:
+        params = {}
+    if not isinstance(params, dict):
+        raise ToolValidationError(operation, [("root", "Expected object")], params)
+    issues = []
+    result = SCHEMAS[operation](params, issues)
+    if issues:
+        raise ToolValidationError(operation, issues, params)
+    return result
@@ -9,6 +9,7 @@ import { CodeCell, MarkdownCell } from '@jupyterlab/cells';
 import { IOutput } from '@jupyterlab/nbformat';
 import { Spinner } from '@primer/react';
 import { Box } from '@datalayer/primer-addons';
+import type { IExecutionCacheOptions } from '../../jupyter/kernel/ExecutionCache';
 import { Kernel } from '../../jupyter/kernel/Kernel';
 import { newUuid } from '../../utils';
 import { Lumino } from '../lumino';
@@ -48,12 +49,25 @@ export type ICellProps = {
    * Custom kernel for the cell.
    */
   kernel?: Kernel;
+  /**
+   * Render the source as static highlighted code until the cell is
+   * focused or clicked.
+   */
+  lazyEditor?: boolean;
+  /**
+   * Opt in the memoization of the outputs: on auto start, the memoized
+   * outputs of the code are shown instead of executing it, and the
+   * successful executions are memoized. Only for code without side effects.
+   */
+  cache?: IExecutionCacheOptions;
 };
 
 export const Cell = ({
   autoStart = true,
+  cache,
   id: providedId,
   kernel,
+  lazyEditor = false,
   outputs = [],
   showToolbar = true,
   source = '',
@@ -78,7 +92,7 @@ export const Cell = ({
     adapter.sessionContext.initialize().then(() => {
       if (autoStart && adapter.cell.model) {
         // Perform auto-start for code or markdown cells.
-        adapter.execute();
+        adapter.execute(true);
       }
     });
     adapter.sessionContext.kernelChanged.connect(() => {
@@ -100,6 +114,8 @@ export const Cell = ({
           outputs,
           kernel,
           boxOptions: { showToolbar },
+          lazyEditor,
+          cache,
         });
         setAdapter(adapter);
         cellsStore.setAdapter(id, adapter);
@@ -54,7 +54,9 @@ import {
   WidgetRenderer,
 } from '../../jupyter/ipywidgets/classic';
 import { requireLoader as loader } from '../../jupyter/ipywidgets/libembed-amd';
+import type { IExecutionCacheOptions } from '../../jupyter/kernel/ExecutionCache';
 import Kernel from '../../jupyter/kernel/Kernel';
+import { createLazyEditorFactory } from '../codemirror/LazyCodeEditor';
 import getMarked from '../notebook/marked/marked';
 import CellCommands from './CellCommands';
 import { cellsStore } from './CellState';
@@ -72,6 +74,8 @@ export class CellAdapter {
   private _sessionContext: SessionContext;
   private _type: 'code' | 'markdown' | 'raw';
   private _iPyWidgetsClassicManager?: ClassicWidgetManager;
+  private _lazyEditor: boolean;
+  private _cache?: IExecutionCacheOptions;
 
   public constructor(options: CellAdapter.ICellAdapterOptions) {
     const { id, type, source, outputs, kernel, boxOptions } = options;
@@ -79,6 +83,8 @@ export class CellAdapter {
     this._outputs = outputs;
     this._kernel = kernel;
     this._type = type;
+    this._lazyEditor = options.lazyEditor ?? false;
+    this._cache = options.cache;
     this.setupCell(type, source, kernel, boxOptions);
   }
 
@@ -232,8 +238,11 @@ export class CellAdapter {
       outputs: this._outputs,
       metadata: {},
     });
+    const editorFactory = factoryService.newInlineEditor.bind(factoryService);
     const contentFactory = new Cell.ContentFactory({
-      editorFactory: factoryService.newInlineEditor.bind(factoryService),
+      editorFactory: this._lazyEditor
+        ? createLazyEditorFactory(editorFactory, languages)
+        : editorFactory,
     });
     if (type === 'code') {
       type CodeCellOptions = NonNullable<
@@ -461,17 +470,49 @@ export class CellAdapter {
     return this._kernel;
   }
 
-  execute = () => {
+  /**
+   * Execute the cell.
+   *
+   * @param memoized Show the memoized outputs of the code instead of
+   * executing it, if the cell has a cache and they are found.
+   */
+  execute = (memoized = false) => {
     if (this._type === 'code') {
       this._iPyWidgetsClassicManager?.registerWithKernel(
         this._kernel.connection
       );
-      this._execute(this._cell as CodeCell);
+      if (memoized && this._cache) {
+        void this._executeMemoized(this._cell as CodeCell);
+      } else {
+        this._execute(this._cell as CodeCell);
+      }
     } else if (this._type === 'markdown') {
       (this._cell as MarkdownCell).rendered = true;
     }
   };
 
+  private async _executeMemoized(cell: CodeCell): Promise<void> {
+    const { cache, kernelspec, dependencies } = this._cache!;
+    const code = cell.model.sharedModel.getSource();
+    const key = await cache.key(
+      kernelspec ?? this._kernel.kernelSpecName,
+      code,
+      dependencies
+    );
+    const outputs = key ? await cache.get(key) : undefined;
+    if (!outputs || cell.isDisposed) {
+      this._execute(cell);
+      return;
+    }
+    cell.model.sharedModel.transact(() => {
+      cell.model.clearExecution();
+      cell.model.outputs.fromJSON(outputs);
+    }, false);
+    if (this._cache!.revalidate) {
+      this._execute(cell);
+    }
+  }
+
   private async _execute(
     cell: CodeCell,
     metadata?: JSONObject
@@ -511,7 +552,10 @@ export class CellAdapter {
         code,
         cell.outputArea,
         this._kernel,
-        metadata
+        metadata,
+        false,
+        undefined,
+        this._cache
       );
       // cell.outputArea.future assigned synchronously in `execute`.
       if (recordTiming) {
@@ -594,6 +638,15 @@ export namespace CellAdapter {
     outputs: IOutput[];
     kernel: Kernel;
     boxOptions?: BoxOptions;
+    /**
+     * Render the source as static highlighted code until the cell is
+     * focused or clicked.
+     */
+    lazyEditor?: boolean;
+    /**
+     * Opt in the memoization of the outputs, for code without side effects.
+     */
+    cache?: IExecutionCacheOptions;
   };
 }
 
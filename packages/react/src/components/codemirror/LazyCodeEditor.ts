@@ -0,0 +1,536 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import type { Extension } from '@codemirror/state';
+import type { EditorView } from '@codemirror/view';
+import { CodeEditor } from '@jupyterlab/codeeditor';
+import type {
+  CodeMirrorEditor,
+  EditorLanguageRegistry,
+} from '@jupyterlab/codemirror';
+import { UUID } from '@lumino/coreutils';
+import { ISignal, Signal } from '@lumino/signaling';
+import { classHighlighter, highlightTree } from '@lezer/highlight';
+
+import './LazyCodeEditor.css';
+
+/**
+ * Default milliseconds without focus after which an editor is disposed.
+ */
+export const DEFAULT_LAZY_EDITOR_IDLE_TIMEOUT = 30000;
+
+/**
+ * Maximum number of highlighted sources kept by the tokenizer cache.
+ */
+const MAX_HIGHLIGHTED_SOURCES = 2000;
+
+/**
+ * Highlighted HTML of the sources, by mimetype and source, shared by the
+ * editors of the page.
+ */
+const highlighted = new Map<string, string>();
+
+const highlighting = new Map<string, Promise<string>>();
+
+function escapeHTML(text: string): string {
+  return text
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;');
+}
+
+async function highlight(
+  languages: EditorLanguageRegistry,
+  mimeType: string,
+  source: string
+): Promise<string> {
+  const spec = languages.findBest(mimeType);
+  const language = spec ? await languages.getLanguage(spec.name) : null;
+  const parser = language?.support?.language.parser;
+  if (!parser) {
+    return escapeHTML(source);
+  }
+  let html = '';
+  let position = 0;
+  const tree = parser.parse(source);
+  highlightTree(tree, classHighlighter, (from, to, classes) => {
+    const token = escapeHTML(source.slice(from, to));
+    html += escapeHTML(source.slice(position, from));
+    html += `<span class="${classes}">${token}</span>`;
+    position = to;
+  });
+  return html + escapeHTML(source.slice(position));
+}
+
+/**
+ * Return the highlighted HTML of a source, from the cache if available.
+ */
+function getHighlighted(
+  languages: EditorLanguageRegistry,
+  mimeType: string,
+  source: string
+): string | Promise<string> {
+  const key = `${mimeType}\n${source}`;
+  const html = highlighted.get(key);
+  if (html !== undefined) {
+    // Reinsert the entry, the map is kept in the access order.
+    highlighted.delete(key);
+    highlighted.set(key, html);
+    return html;
+  }
+  let pending = highlighting.get(key);
+  if (!pending) {
+    pending = highlight(languages, mimeType, source)
+      .then(html => {
+        highlighted.set(key, html);
+        for (const key of highlighted.keys()) {
+          if (highlighted.size <= MAX_HIGHLIGHTED_SOURCES) {
+            break;
+          }
+          highlighted.delete(key);
+        }
+        return html;
+      })
+      .finally(() => highlighting.delete(key));
+    highlighting.set(key, pending);
+  }
+  return pending;
+}
+
+function lines(source: string): string[] {
+  return source.split('\n');
+}
+
+/**
+ * A code editor rendering its source as static highlighted DOM, and
+ * creating the CodeMirror editor when it is focused or clicked, or when a
+ * method needs it. The editor is disposed after the idle timeout without
+ * focus, the static source is rendered back.
+ *
+ * Most cells of a read-mostly notebook are never edited, their editors
+ * cost the mount time and the memory of a CodeMirror view each.
+ */
+export class LazyCodeEditor implements CodeEditor.IEditor {
+  readonly host: HTMLElement;
+  readonly model: CodeEditor.IModel;
+  readonly uuid: string;
+
+  private _options: CodeEditor.IOptions;
+  private _factory: CodeEditor.Factory;
+  private _languages: EditorLanguageRegistry;
+  private _idleTimeout: number;
+  private _editor: CodeEditor.IEditor | null = null;
+  private _static: HTMLElement | null = null;
+  private _config: Record<string, any>;
+  private _extensions: Extension[] = [];
+  private _selections: CodeEditor.IRange[] = [];
+  private _edgeRequested = new Signal<this, CodeEditor.EdgeLocation>(this);
+  private _idleTimer?: ReturnType<typeof setTimeout>;
+  private _renderRequested = false;
+  private _isDisposed = false;
+
+  constructor(options: LazyCodeEditor.IOptions) {
+    this._options = options;
+    this._factory = options.factory;
+    this._languages = options.languages;
+    this._idleTimeout =
+      options.idleTimeout ?? DEFAULT_LAZY_EDITOR_IDLE_TIMEOUT;
+    this.host = options.host;
+    this.model = options.model;
+    this.uuid = options.uuid ?? UUID.uuid4();
+    this._config = { ...options.config };
+    if (options.extensions) {
+      this._extensions.push(...options.extensions);
+    }
+    this.host.classList.add('dla-LazyCodeEditor-host');
+    this.host.addEventListener('focusin', this._onFocusIn);
+    this.host.addEventListener('focusout', this._onFocusOut);
+    this.host.addEventListener('mousedown', this._onMouseDown);
+    this.model.sharedModel.changed.connect(this._requestRender, this);
+    this.model.mimeTypeChanged.connect(this._requestRender, this);
+    this._render();
+  }
+
+  get edgeRequested(): ISignal<this, CodeEditor.EdgeLocation> {
+    return this._edgeRequested;
+  }
+
+  get isDisposed(): boolean {
+    return this._isDisposed;
+  }
+
+  /**
+   * Whether the CodeMirror editor is created.
+   */
+  get isMaterialized(): boolean {
+    return this._editor !== null;
+  }
+
+  /**
+   * The CodeMirror editor, created if needed.
+   */
+  get materialized(): CodeEditor.IEditor {
+    return this._materialize();
+  }
+
+  /**
+   * The CodeMirror view of the editor, created if needed, as for a
+   * `CodeMirrorEditor` cast by the JupyterLab extensions, e.g. the search.
+   */
+  get editor(): EditorView {
+    return (this._materialize() as CodeMirrorEditor).editor;
+  }
+
+  get charWidth(): number {
+    return this._editor?.charWidth ?? 0;
+  }
+
+  get lineHeight(): number {
+    return this._editor?.lineHeight ?? 0;
+  }
+
+  get lineCount(): number {
+    return this._editor?.lineCount ?? lines(this._source).length;
+  }
+
+  getOption(option: string): unknown {
+    return this._editor
+      ? this._editor.getOption(option)
+      : this._config[option];
+  }
+
+  setOption(option: string, value: unknown): void {
+    this._config[option] = value;
+    this._editor?.setOption(option, value);
+  }
+
+  setOptions(options: Record<string, any>): void {
+    Object.assign(this._config, options);
+    this._editor?.setOptions(options);
+  }
+
+  setBaseOptions(options: Record<string, any>): void {
+    this._config = { ...options, ...this._config };
+    (this._editor as any)?.setBaseOptions?.(options);
+  }
+
+  injectExtension(extension: Extension): void {
+    this._extensions.push(extension);
+    this._editor?.injectExtension(extension);
+  }
+
+  getLine(line: number): string | undefined {
+    return this._editor
+      ? this._editor.getLine(line)
+      : lines(this._source)[line];
+  }
+
+  getOffsetAt(position: CodeEditor.IPosition): number {
+    if (this._editor) {
+      return this._editor.getOffsetAt(position);
+    }
+    const all = lines(this._source);
+    let offset = 0;
+    for (let i = 0; i < Math.min(position.line, all.length); i++) {
+      offset += all[i].length + 1;
+    }
+    return offset + position.column;
+  }
+
+  getPositionAt(offset: number): CodeEditor.IPosition | undefined {
+    if (this._editor) {
+      return this._editor.getPositionAt(offset);
+    }
+    const before = lines(this._source.slice(0, offset));
+    return {
+      line: before.length - 1,
+      column: before[before.length - 1].length,
+    };
+  }
+
+  undo(): void {
+    this._materialize().undo();
+  }
+
+  redo(): void {
+    this._materialize().redo();
+  }
+
+  clearHistory(): void {
+    this._editor?.clearHistory();
+  }
+
+  focus(): void {
+    this._materialize().focus();
+  }
+
+  hasFocus(): boolean {
+    return this._editor?.hasFocus() ?? false;
+  }
+
+  blur(): void {
+    this._editor?.blur();
+  }
+
+  revealPosition(position: CodeEditor.IPosition): void {
+    this._editor?.revealPosition(position);
+  }
+
+  revealSelection(selection: CodeEditor.IRange): void {
+    this._editor?.revealSelection(selection);
+  }
+
+  getCoordinateForPosition(
+    position: CodeEditor.IPosition
+  ): CodeEditor.ICoordinate | null {
+    return this._materialize().getCoordinateForPosition(position);
+  }
+
+  getPositionForCoordinate(
+    coordinate: CodeEditor.ICoordinate
+  ): CodeEditor.IPosition | null {
+    return this._materialize().getPositionForCoordinate(coordinate);
+  }
+
+  getCursorPosition(): CodeEditor.IPosition {
+    return this._editor
+      ? this._editor.getCursorPosition()
+      : this.getSelection().end;
+  }
+
+  setCursorPosition(
+    position: CodeEditor.IPosition,
+    options?: { bias?: number; origin?: string; scroll?: boolean }
+  ): void {
+    if (this._editor) {
+      this._editor.setCursorPosition(position, options);
+    } else {
+      this._selections = [{ start: position, end: position }];
+    }
+  }
+
+  getSelection(): CodeEditor.ITextSelection {
+    return this._editor
+      ? this._editor.getSelection()
+      : { uuid: this.uuid, ...this._selectionsOrStart()[0] };
+  }
+
+  setSelection(selection: CodeEditor.IRange): void {
+    this.setSelections([selection]);
+  }
+
+  getSelections(): CodeEditor.ITextSelection[] {
+    return this._editor
+      ? this._editor.getSelections()
+      : this._selectionsOrStart().map(range => ({ uuid: this.uuid, ...range }));
+  }
+
+  setSelections(selections: CodeEditor.IRange[]): void {
+    if (this._editor) {
+      this._editor.setSelections(selections);
+    } else {
+      this._selections = selections;
+    }
+  }
+
+  replaceSelection(text: string): void {
+    this._materialize().replaceSelection?.(text);
+  }
+
+  getTokens(): CodeEditor.IToken[] {
+    return this._materialize().getTokens();
+  }
+
+  getTokenAt(offset: number): CodeEditor.IToken {
+    return this._materialize().getTokenAt(offset);
+  }
+
+  getTokenAtCursor(): CodeEditor.IToken {
+    return this._materialize().getTokenAtCursor();
+  }
+
+  newIndentedLine(): void {
+    this._materialize().newIndentedLine();
+  }
+
+  /**
+   * Dispose the CodeMirror editor, and render the static source.
+   */
+  release(): void {
+    clearTimeout(this._idleTimer);
+    const editor = this._editor;
+    if (!editor || editor.hasFocus()) {
+      return;
+    }
+    this._selections = editor.getSelections();
+    editor.edgeRequested.disconnect(this._onEdgeRequested, this);
+    this._editor = null;
+    editor.dispose();
+    this._render();
+  }
+
+  dispose(): void {
+    if (this._isDisposed) {
+      return;
+    }
+    this._isDisposed = true;
+    clearTimeout(this._idleTimer);
+    this.host.removeEventListener('focusin', this._onFocusIn);
+    this.host.removeEventListener('focusout', this._onFocusOut);
+    this.host.removeEventListener('mousedown', this._onMouseDown);
+    this.host.classList.remove('dla-LazyCodeEditor-host');
+    this._static?.remove();
+    this._static = null;
+    this._editor?.dispose();
+    this._editor = null;
+    Signal.clearData(this);
+  }
+
+  private get _source(): string {
+    return this.model.sharedModel.getSource();
+  }
+
+  private _selectionsOrStart(): CodeEditor.IRange[] {
+    return this._selections.length > 0
+      ? this._selections
+      : [{ start: { line: 0, column: 0 }, end: { line: 0, column: 0 } }];
+  }
+
+  private _materialize(): CodeEditor.IEditor {
+    if (this._editor) {
+      return this._editor;
+    }
+    this._static?.remove();
+    this._static = null;
+    const editor = this._factory({
+      ...this._options,
+      host: this.host,
+      model: this.model,
+      uuid: this.uuid,
+      config: this._config,
+      extensions: this._extensions,
+    });
+    this._editor = editor;
+    editor.edgeRequested.connect(this._onEdgeRequested, this);
+    if (this._selections.length > 0) {
+      editor.setSelections(this._selections);
+    }
+    return editor;
+  }
+
+  private _onEdgeRequested(
+    _: CodeEditor.IEditor,
+    location: CodeEditor.EdgeLocation
+  ): void {
+    this._edgeRequested.emit(location);
+  }
+
+  private _requestRender(): void {
+    if (this._editor || this._renderRequested) {
+      return;
+    }
+    this._renderRequested = true;
+    requestAnimationFrame(() => {
+      this._renderRequested = false;
+      this._render();
+    });
+  }
+
+  /**
+   * Render the static highlighted source.
+   */
+  private _render(): void {
+    if (this._editor || this._isDisposed) {
+      return;
+    }
+    if (!this._static) {
+      this._static = document.createElement('pre');
+      this._static.className = 'dla-LazyCodeEditor';
+      // Focusable, the focus creates the editor.
+      this._static.tabIndex = -1;
+      this.host.appendChild(this._static);
+    }
+    const node = this._static;
+    const source = this._source;
+    const html = getHighlighted(this._languages, this.model.mimeType, source);
+    if (typeof html === 'string') {
+      node.innerHTML = html;
+      return;
+    }
+    node.textContent = source;
+    html
+      .then(html => {
+        if (this._static === node && this._source === source) {
+          node.innerHTML = html;
+        }
+      })
+      .catch(error => console.debug('Failed to highlight the source.', error));
+  }
+
+  private _onFocusIn = (): void => {
+    clearTimeout(this._idleTimer);
+    if (!this._editor) {
+      this._materialize().focus();
+    }
+  };
+
+  private _onFocusOut = (): void => {
+    clearTimeout(this._idleTimer);
+    if (this._idleTimeout > 0) {
+      this._idleTimer = setTimeout(() => this.release(), this._idleTimeout);
+    }
+  };
+
+  private _onMouseDown = (event: MouseEvent): void => {
+    if (this._editor || event.button !== 0) {
+      return;
+    }
+    // Place the cursor under the pointer once the editor is created.
+    event.preventDefault();
+    const editor = this._materialize();
+    const position = editor.getPositionForCoordinate({
+      left: event.clientX,
+      top: event.clientY,
+    } as CodeEditor.ICoordinate);
+    editor.focus();
+    if (position) {
+      editor.setCursorPosition(position);
+    }
+  };
+}
+
+export namespace LazyCodeEditor {
+  export interface IOptions extends CodeEditor.IOptions {
+    /**
+     * Factory of the CodeMirror editor.
+     */
+    factory: CodeEditor.Factory;
+    /**
+     * Languages highlighting the static source.
+     */
+    languages: EditorLanguageRegistry;
+    /**
+     * Milliseconds without focus after which the editor is disposed, 0 to
+     * keep it.
+     */
+    idleTimeout?: number;
+  }
+}
+
+/**
+ * Return an editor factory creating lazy editors on top of a factory, e.g.
+ * the `newInlineEditor` of a `CodeMirrorEditorFactory`.
+ */
+export function createLazyEditorFactory(
+  factory: CodeEditor.Factory,
+  languages: EditorLanguageRegistry,
+  idleTimeout?: number
+): CodeEditor.Factory {
+  return options =>
+    new LazyCodeEditor({ ...options, factory, languages, idleTimeout });
+}
+
+export default LazyCodeEditor;
@@ -0,0 +1,124 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the lazy code editors against the CodeMirror ones.
+ *
+ * 1,000 python sources are mounted with the CodeMirror inline editor and
+ * with the lazy editor, and the benchmark reports:
+ * 1. The mount time
+ * 2. The number of DOM nodes, a proxy of the memory
+ * It also verifies that a lazy editor creates its CodeMirror editor on
+ * focus only, renders its static source back when released, and exposes
+ * the CodeMirror view as `editor` like a CodeMirrorEditor.
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { CodeEditor } from '@jupyterlab/codeeditor';
+import {
+  CodeMirrorEditorFactory,
+  EditorLanguageRegistry,
+} from '@jupyterlab/codemirror';
+import { LazyCodeEditor, createLazyEditorFactory } from '../LazyCodeEditor';
+
+const EDITORS = 1000;
+
+const SOURCE = [
+  'import numpy as np',
+  '',
+  'def scale(values, factor=2):',
+  '    # Scale the values.',
+  '    return np.asarray(values) * factor',
+  '',
+  'scale([1, 2, 3])',
+].join('\n');
+
+function mount(factory: CodeEditor.Factory): {
+  editors: CodeEditor.IEditor[];
+  root: HTMLElement;
+  elapsed: number;
+} {
+  const root = document.createElement('div');
+  document.body.appendChild(root);
+  const start = performance.now();
+  const editors = Array.from({ length: EDITORS }, (_, i) => {
+    const host = document.createElement('div');
+    root.appendChild(host);
+    const model = new CodeEditor.Model({ mimeType: 'text/x-python' });
+    model.sharedModel.setSource(`${SOURCE}\n# cell ${i}`);
+    return factory({ host, model });
+  });
+  return { editors, root, elapsed: performance.now() - start };
+}
+
+function unmount(editors: CodeEditor.IEditor[], root: HTMLElement): void {
+  editors.forEach(editor => {
+    editor.model.dispose();
+    editor.dispose();
+  });
+  root.remove();
+}
+
+describe('LazyCodeEditor benchmark', () => {
+  const languages = new EditorLanguageRegistry();
+  for (const language of EditorLanguageRegistry.getDefaultLanguages()) {
+    languages.addLanguage(language);
+  }
+  const factoryService = new CodeMirrorEditorFactory({ languages });
+
+  it(`mounts ${EDITORS} editors`, () => {
+    const eager = mount(factoryService.newInlineEditor);
+    const eagerNodes = eager.root.querySelectorAll('*').length;
+    expect(eager.root.querySelectorAll('.cm-editor').length).toBe(EDITORS);
+    unmount(eager.editors, eager.root);
+
+    const lazy = mount(
+      createLazyEditorFactory(factoryService.newInlineEditor, languages)
+    );
+    const lazyNodes = lazy.root.querySelectorAll('*').length;
+    expect(lazy.root.querySelectorAll('.cm-editor').length).toBe(0);
+    unmount(lazy.editors, lazy.root);
+
+    console.log(
+      `${EDITORS} editors: CodeMirror ${eager.elapsed.toFixed(1)} ms and ` +
+        `${eagerNodes} nodes, lazy ${lazy.elapsed.toFixed(1)} ms and ` +
+        `${lazyNodes} nodes`
+    );
+    expect(lazyNodes).toBeLessThan(eagerNodes);
+  });
+
+  it('creates the editor on focus and releases it', () => {
+    const { editors, root } = mount(
+      createLazyEditorFactory(factoryService.newInlineEditor, languages, 0)
+    );
+    const editor = editors[0] as LazyCodeEditor;
+    expect(editor.lineCount).toBe(SOURCE.split('\n').length + 1);
+    expect(editor.getLine(2)).toBe('def scale(values, factor=2):');
+    expect(editor.isMaterialized).toBe(false);
+
+    editor.setCursorPosition({ line: 2, column: 4 });
+    editor.focus();
+    expect(editor.isMaterialized).toBe(true);
+    expect(editor.host.querySelector('.cm-editor')).not.toBeNull();
+    expect(editor.host.querySelector('.dla-LazyCodeEditor')).toBeNull();
+    expect(editor.getCursorPosition()).toEqual({ line: 2, column: 4 });
+
+    editor.blur();
+    editor.release();
+    expect(editor.isMaterialized).toBe(false);
+    expect(editor.host.querySelector('.cm-editor')).toBeNull();
+    expect(editor.getCursorPosition()).toEqual({ line: 2, column: 4 });
+    expect(editor.host.textContent).toContain('def scale');
+
+    // As a CodeMirrorEditor cast by the JupyterLab extensions.
+    expect(editor.editor.state.doc.line(3).text).toBe(
+      'def scale(values, factor=2):'
+    );
+    expect(editor.isMaterialized).toBe(true);
+    expect(editor.editor).toBe((editor.materialized as any).editor);
+    unmount(editors, root);
+  });
+});
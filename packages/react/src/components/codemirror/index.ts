@@ -8,3 +8,4 @@ export * from './CodeMirrorEditor';
 export { CodeMirrorDatalayerEditor } from './CodeMirrorEditor';
 export * from './CodeMirrorOutputToolbar';
 export * from './CodeMirrorTheme';
+export * from './LazyCodeEditor';
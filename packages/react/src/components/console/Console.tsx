@@ -22,6 +22,7 @@ export const Console = (options: Console.IConsoleOptions) => {
         kernel: defaultKernel,
         serviceManager,
         code: options.code,
+        lazyEditors: options.lazyEditors,
       });
       setAdapter(adapter);
       store.setAdapter(adapter);
@@ -43,6 +44,11 @@ export namespace Console {
      * Initial code to run.
      */
     code?: string;
+    /**
+     * Render the sources of the cells as static highlighted code until
+     * they are focused or clicked.
+     */
+    lazyEditors?: boolean;
   }
 }
 
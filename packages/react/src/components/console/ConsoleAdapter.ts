@@ -22,16 +22,19 @@ import { ServiceManager } from '@jupyterlab/services';
 import { ConsolePanel } from '@jupyterlab/console';
 import { IYText } from '@jupyter/ydoc';
 import { Kernel } from '../../jupyter/kernel';
+import { createLazyEditorFactory } from '../codemirror/LazyCodeEditor';
 
 const DEFAULT_CONSOLE_PATH = 'console-path';
 
 export class ConsoleAdapter {
   private _panel: BoxPanel;
   private _code?: string;
+  private _lazyEditors: boolean;
 
   constructor(options: ConsoleAdapter.IConsoleAdapterOptions) {
     const { kernel, serviceManager, code } = options;
     this._code = code;
+    this._lazyEditors = options.lazyEditors ?? false;
     this._panel = new BoxPanel();
     this._panel.direction = 'top-to-bottom';
     this._panel.spacing = 0;
@@ -100,7 +103,10 @@ export class ConsoleAdapter {
     });
     const rendermime = new RenderMimeRegistry({ initialFactories });
     const mimeTypeService = new CodeMirrorMimeTypeService(languages);
-    const editorFactory = factoryService.newInlineEditor;
+    // The prompt editor is created when the console focuses it.
+    const editorFactory = this._lazyEditors
+      ? createLazyEditorFactory(factoryService.newInlineEditor, languages)
+      : factoryService.newInlineEditor;
 
     const contentFactory = new ConsolePanel.ContentFactory({ editorFactory });
 
@@ -192,6 +198,11 @@ export namespace ConsoleAdapter {
      * Initial code to run.
      */
     code?: string;
+    /**
+     * Render the sources of the cells as static highlighted code until
+     * they are focused or clicked.
+     */
+    lazyEditors?: boolean;
   }
 }
 
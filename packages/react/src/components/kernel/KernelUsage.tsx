@@ -84,7 +84,11 @@ export const KernelUsage = (props: KernelUsageProps) => {
   );
   // { "kernel_cpu": "0", "cpu_count": "4", "host_virtual_memory": {"total": 15335940096, "available": 13279002624, "percent": 13.4, "used": 1704222720, "free": 11412717568, "active": 696995840, "inactive": 2084093952, "buffers": 237412352, "cached": 1981587456, "shared": 4796416, "slab": 989294592} }
   const refreshUsage = async () => {
-    const result = await kernel!.execute(REQUEST_USAGE)?.result;
+    // The polling does not delay the interactive executions.
+    const result = await kernel!.execute(REQUEST_USAGE, {
+      priority: 'background',
+      dedupKey: REQUEST_USAGE,
+    })?.result;
     if (result) {
       const usage = JSON.parse(result.replaceAll("'", '"'));
       const v = virtualMemoryAvailable.concat([
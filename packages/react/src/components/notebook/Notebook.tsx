@@ -20,7 +20,9 @@ import { ICollaborationProvider, Kernel } from '../../jupyter';
 import type { OnSessionConnection } from '../../state';
 import { Loader } from '../utils';
 import { useKernelId, useNotebookModel, NotebookBase } from './NotebookBase';
+import { NotebookSkeleton } from './NotebookSkeleton';
 import type { NotebookExtension } from './NotebookExtensions';
+import type { INotebookWindowingOptions } from './NotebookWindowing';
 import type { INotebookToolbarProps } from './toolbar';
 
 import './Notebook.css';
@@ -132,6 +134,50 @@ export interface INotebookProps {
    * Platform-specific providers can be injected here (e.g., LSP servers).
    */
   providers?: ICompletionProvider[];
+  /**
+   * Render only the cells in and around the viewport.
+   *
+   * Recommended for large notebooks: the offscreen editors and outputs are
+   * detached, and the measured cell heights are persisted in the browser.
+   */
+  windowing?: boolean | INotebookWindowingOptions;
+  /**
+   * Render the cell sources as static highlighted code, and create their
+   * editors when they are focused or clicked.
+   *
+   * Recommended for read-mostly notebooks, the editors are disposed after
+   * a period without focus.
+   */
+  lazyEditors?: boolean;
+  /**
+   * Parse the notebook in a web worker and add its cells by chunks, with
+   * a skeleton until the first cells are loaded.
+   *
+   * Recommended for large notebooks: the page stays responsive while the
+   * notebook loads, and the outputs of the offscreen cells are created
+   * when the page is idle.
+   */
+  streamingLoad?: boolean;
+  /**
+   * Save the notebook `path` as a JSON patch of its last saved revision,
+   * falling back to a full save on a conflict. An edit then uploads the
+   * changed cells only, instead of the notebook with all its outputs.
+   * With `streamingLoad`, the notebook is not loaded through the contents
+   * manager, so its first save is a full save.
+   *
+   * Requires the `jupyter_react` server extension.
+   */
+  deltaSaves?: boolean;
+  /**
+   * Move the large outputs of the notebook `path` to the blob store when it
+   * is saved, and restore them when it is loaded, so the saves carry
+   * references instead of the full figures and images. The values above
+   * the `blobs_threshold` of the server are moved. The notebook is not
+   * streamed with it, whatever `streamingLoad`.
+   *
+   * Requires the `jupyter_react` server extension.
+   */
+  outputBlobs?: boolean;
 }
 
 /**
@@ -150,22 +196,27 @@ export function Notebook(
     children,
     collaborationProvider,
     commands,
+    deltaSaves = false,
     extensions,
     height = '100vh',
     id,
     inlineProviders,
     kernel,
+    lazyEditors = false,
     maxHeight = '100vh',
     nbformat,
     onNotebookModelChanged,
     onSessionConnection,
+    outputBlobs = false,
     path,
     providers,
     readonly = false,
     renderers,
     serviceManager,
     startDefaultKernel = false,
+    streamingLoad = false,
     url,
+    windowing = false,
   } = props;
 
   const [isLoading, setIsLoading] = useState(true);
@@ -185,6 +236,7 @@ export function Notebook(
     path,
     serviceManager,
     id,
+    streamingLoad,
   });
 
   useEffect(() => {
@@ -213,7 +265,11 @@ export function Notebook(
   }, [collaborationProvider, model, serviceManager]);
 
   return isLoading ? (
-    <Loader key="notebook-loader" />
+    streamingLoad ? (
+      <NotebookSkeleton key="notebook-loader" />
+    ) : (
+      <Loader key="notebook-loader" />
+    )
   ) : (
     <Box
       style={{ height, width: '100%', position: 'relative' }}
@@ -281,6 +337,11 @@ export function Notebook(
             renderers={renderers}
             serviceManager={serviceManager}
             onSessionConnection={onSessionConnection}
+            windowing={windowing}
+            lazyEditors={lazyEditors}
+            streamingLoad={streamingLoad}
+            deltaSaves={deltaSaves}
+            outputBlobs={outputBlobs}
           />
         )}
       </Box>
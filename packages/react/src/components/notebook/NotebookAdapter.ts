@@ -14,10 +14,58 @@ import { Context } from '@jupyterlab/docregistry';
 import { NotebookModel } from '@jupyterlab/notebook';
 import { KernelMessage } from '@jupyterlab/services';
 import * as nbformat from '@jupyterlab/nbformat';
+import type { YCodeCell } from '@jupyter/ydoc';
 import { Kernel } from '../../jupyter/kernel/Kernel';
 import { NotebookCommandIds } from './NotebookCommands';
+import {
+  runAllPipelined,
+  type ICellRunProgress,
+  type IRunAllOptions,
+} from './NotebookRunner';
+import { NotebookTocIndex } from './NotebookTocIndex';
 import * as Diff from 'diff';
 
+/**
+ * A cell mutation of a batch, the indices are the ones of the notebook
+ * after the previous operations of the batch.
+ */
+export type NotebookBatchOperation =
+  | {
+      op: 'insert';
+      type: nbformat.CellType;
+      source?: string;
+      /**
+       * Index of the new cell, the end of the notebook by default.
+       */
+      index?: number;
+    }
+  | { op: 'update'; index: number; source: string }
+  | { op: 'move'; from: number; to: number }
+  | { op: 'delete'; index: number }
+  | { op: 'clearOutputs'; index: number };
+
+/**
+ * Result of an operation of a batch.
+ */
+export type NotebookBatchResult = {
+  op: NotebookBatchOperation['op'];
+  success: boolean;
+  /**
+   * Index of the cell after the operation, of the inserted cell for an
+   * insert.
+   */
+  index?: number;
+  /**
+   * Id of the inserted cell.
+   */
+  cellId?: string;
+  /**
+   * Diff of the source for an update.
+   */
+  diff?: string;
+  error?: string;
+};
+
 export class NotebookAdapter {
   private _commands: CommandRegistry;
   private _panel: NotebookPanel;
@@ -25,6 +73,7 @@ export class NotebookAdapter {
   private _context: Context<NotebookModel>;
   private _defaultCellType: nbformat.CellType = 'code';
   private _kernelInfo: KernelMessage.IInfoReply | null = null;
+  private _tocIndex: NotebookTocIndex | null = null;
 
   constructor(
     commands: CommandRegistry,
@@ -206,6 +255,16 @@ export class NotebookAdapter {
     return this._context.model;
   }
 
+  /**
+   * Get the table of contents of the notebook, created on first access.
+   */
+  get tocIndex(): NotebookTocIndex | null {
+    if (!this._tocIndex && this._context.model) {
+      this._tocIndex = new NotebookTocIndex(this._context.model);
+    }
+    return this._tocIndex;
+  }
+
   /**
    * Undo the last change in the notebook.
    *
@@ -733,6 +792,29 @@ export class NotebookAdapter {
     this._commands.execute(NotebookCommandIds.runAll);
   }
 
+  /**
+   * Run all cells in the notebook with pipelined execute requests.
+   *
+   * @param options - The number of requests sent together, stop on error
+   * and a callback of the per-cell progress
+   * @returns The final run status of each code cell
+   *
+   * @remarks
+   * The execute requests are sent by windows of `window` cells, so a run
+   * of many short cells costs one round trip to the kernel per window
+   * instead of one per cell. After an error, the kernel aborts the
+   * requests of the window and the next cells are not sent.
+   */
+  async runAllCellsPipelined(
+    options: IRunAllOptions = {}
+  ): Promise<ICellRunProgress[]> {
+    const sessionContext = this._panel.sessionContext;
+    if (!sessionContext.isReady || !sessionContext.session?.kernel) {
+      return [];
+    }
+    return runAllPipelined(this._notebook, sessionContext, options);
+  }
+
   /**
    * Clear all outputs from all cells in the notebook.
    *
@@ -746,6 +828,120 @@ export class NotebookAdapter {
     NotebookActions.clearAllOutputs(this._notebook);
   }
 
+  /**
+   * Apply an ordered list of cell mutations in one model transaction.
+   *
+   * @param operations - Insert, update, move, delete and clear outputs
+   * operations, applied in order
+   * @returns The result of each operation, in the same order
+   *
+   * @remarks
+   * The operations mutate the shared model of the notebook in one
+   * transaction: one Y transaction and one update of the collaborators, one
+   * re-render of the notebook and one undo step.
+   *
+   * An invalid operation, e.g. an index out of range, is not applied and
+   * the following operations are skipped, as their indices may depend on
+   * it. The operations applied before are kept.
+   */
+  transact(operations: NotebookBatchOperation[]): NotebookBatchResult[] {
+    const sharedModel = this._notebook.model?.sharedModel;
+    if (!sharedModel) {
+      throw new Error('The notebook model is not available.');
+    }
+    const results = new Array<NotebookBatchResult>();
+    sharedModel.transact(() => {
+      let failed = false;
+      for (const operation of operations) {
+        if (failed) {
+          results.push({
+            op: operation.op,
+            success: false,
+            error: 'Skipped after a failed operation.',
+          });
+          continue;
+        }
+        try {
+          results.push(this._applyOperation(operation));
+        } catch (error) {
+          failed = true;
+          results.push({
+            op: operation.op,
+            success: false,
+            error: error instanceof Error ? error.message : String(error),
+          });
+        }
+      }
+    });
+    return results;
+  }
+
+  private _applyOperation(
+    operation: NotebookBatchOperation
+  ): NotebookBatchResult {
+    const sharedModel = this._notebook.model!.sharedModel;
+    const cellCount = sharedModel.cells.length;
+    const checkIndex = (index: number, count = cellCount) => {
+      if (!Number.isInteger(index) || index < 0 || index >= count) {
+        throw new Error(
+          `Cell index ${index} is out of range. Notebook has ${cellCount} cells.`
+        );
+      }
+    };
+    switch (operation.op) {
+      case 'insert': {
+        const index = operation.index ?? cellCount;
+        // The end of the notebook is a valid insertion index.
+        checkIndex(index, cellCount + 1);
+        const cell = sharedModel.insertCell(index, {
+          cell_type: operation.type,
+          source: operation.source ?? '',
+          metadata: {},
+        });
+        return { op: 'insert', success: true, index, cellId: cell.id };
+      }
+      case 'update': {
+        checkIndex(operation.index);
+        const cell = sharedModel.getCell(operation.index);
+        const oldSource = cell.getSource();
+        cell.setSource(operation.source);
+        const diff = Diff.createPatch(
+          `cell_${operation.index}`,
+          oldSource,
+          operation.source,
+          'before',
+          'after',
+          { context: 3 }
+        );
+        return { op: 'update', success: true, index: operation.index, diff };
+      }
+      case 'move': {
+        checkIndex(operation.from);
+        checkIndex(operation.to);
+        sharedModel.moveCell(operation.from, operation.to);
+        return { op: 'move', success: true, index: operation.to };
+      }
+      case 'delete': {
+        checkIndex(operation.index);
+        sharedModel.deleteCell(operation.index);
+        return { op: 'delete', success: true, index: operation.index };
+      }
+      case 'clearOutputs': {
+        checkIndex(operation.index);
+        const cell = sharedModel.getCell(operation.index);
+        if (cell.cell_type === 'code') {
+          (cell as YCodeCell).setOutputs([]);
+          (cell as YCodeCell).execution_count = null;
+        }
+        return { op: 'clearOutputs', success: true, index: operation.index };
+      }
+      default:
+        throw new Error(
+          `Unknown operation '${(operation as { op: string }).op}'.`
+        );
+    }
+  }
+
   /**
    * Execute code directly in the kernel without creating a cell.
    *
@@ -887,8 +1083,9 @@ export class NotebookAdapter {
    * Dispose of the adapter.
    */
   dispose(): void {
-    // Clean up any resources if needed
     // The panel, notebook, and context are managed by NotebookBase
+    this._tocIndex?.dispose();
+    this._tocIndex = null;
   }
 }
 
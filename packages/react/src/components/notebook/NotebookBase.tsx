@@ -7,7 +7,7 @@
 import { useEffect, useMemo, useRef, useState } from 'react';
 import type { ISessionContext } from '@jupyterlab/apputils';
 import type { Cell, CodeCell, ICellModel } from '@jupyterlab/cells';
-import { type IEditorServices } from '@jupyterlab/codeeditor';
+import { type CodeEditor, type IEditorServices } from '@jupyterlab/codeeditor';
 import {
   CodeMirrorEditorFactory,
   CodeMirrorMimeTypeService,
@@ -27,7 +27,7 @@ import {
   type IInlineCompletionProvider,
 } from '@jupyterlab/completer';
 import { nullTranslator } from '@jupyterlab/translation';
-import { PathExt, type IChangedArgs } from '@jupyterlab/coreutils';
+import { PathExt, URLExt, type IChangedArgs } from '@jupyterlab/coreutils';
 import { Context, type DocumentRegistry } from '@jupyterlab/docregistry';
 import { rendererFactory as javascriptRendererFactory } from '@jupyterlab/javascript-extension';
 import { rendererFactory as jsonRendererFactory } from '@jupyterlab/json-extension';
@@ -51,6 +51,7 @@ import {
 import type {
   Contents,
   Kernel as JupyterKernel,
+  ServerConnection,
   ServiceManager,
   Session,
   SessionManager,
@@ -72,15 +73,26 @@ import {
   WidgetLabRenderer,
   WidgetManager,
 } from '../../jupyter';
+import { markJupyter } from '../../jupyter/JupyterMetrics';
 import type { OnSessionConnection } from '../../state';
 import { newUuid, remoteUserCursors } from '../../utils';
+import { createLazyEditorFactory } from '../codemirror/LazyCodeEditor';
 import { Lumino } from '../lumino';
+import { OutputBlobs } from '../output/OutputBlobs';
 import { Loader } from '../utils';
 import { getMarked } from './marked/marked';
 import type { NotebookExtension } from './NotebookExtensions';
 import { addNotebookCommands, NotebookPanelProvider } from './NotebookCommands';
 import { NotebookAdapter } from './NotebookAdapter';
+import { NotebookDeltaSaves } from './NotebookDeltaSaves';
+import { NotebookLoader } from './NotebookLoader';
+import { createNbformatWorker } from './NotebookLoaderWorker';
 import { notebookStore } from './NotebookState';
+import {
+  DEFAULT_WINDOWING_OVERSCAN_COUNT,
+  NotebookWindowing,
+  type INotebookWindowingOptions,
+} from './NotebookWindowing';
 
 const COMPLETER_TIMEOUT_MILLISECONDS = 1000;
 
@@ -169,6 +181,31 @@ export interface INotebookBaseProps {
    * Platform-specific providers can be injected here (e.g., LSP servers).
    */
   providers?: ICompletionProvider[];
+  /**
+   * Render only the cells in and around the viewport, for large notebooks.
+   */
+  windowing?: boolean | INotebookWindowingOptions;
+  /**
+   * Render the cell sources as static highlighted code, and create their
+   * editors when they are focused or clicked.
+   */
+  lazyEditors?: boolean;
+  /**
+   * Load the notebook `path` through a web worker parsing its content, and
+   * add its cells to the model by chunks.
+   */
+  streamingLoad?: boolean;
+  /**
+   * Save the notebook `path` as a JSON patch of its last saved revision,
+   * with the `jupyter_react` server extension.
+   */
+  deltaSaves?: boolean;
+  /**
+   * Move the large outputs of the notebook `path` to the blob store of the
+   * `jupyter_react` server extension when it is saved, and restore them
+   * when it is loaded. The notebook is not streamed with it.
+   */
+  outputBlobs?: boolean;
 }
 
 /**
@@ -189,7 +226,15 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
     serviceManager,
     model,
     onSessionConnection,
+    windowing = false,
+    lazyEditors = false,
+    streamingLoad = false,
+    deltaSaves = false,
+    outputBlobs = false,
   } = props;
+  const windowingActive = windowing !== false;
+  const { overscanCount, persistHeights }: INotebookWindowingOptions =
+    typeof windowing === 'object' ? windowing : {};
 
   const [isLoading, setIsLoading] = useState(true);
   const [extensionComponents, setExtensionComponents] = useState(
@@ -204,15 +249,15 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
     [props.path]
   );
   const features = useMemo(
-    () => new CommonFeatures({ commands, renderers }),
-    [commands, renderers]
+    () => new CommonFeatures({ commands, renderers, lazyEditors }),
+    [commands, renderers, lazyEditors]
   );
   const contentFactory = useMemo(
     () =>
       new NotebookPanel.ContentFactory({
-        editorFactory: features.editorServices.factoryService.newInlineEditor,
+        editorFactory: features.editorFactory,
       }),
-    [features.editorServices.factoryService.newInlineEditor]
+    [features.editorFactory]
   );
 
   useEffect(() => {
@@ -370,9 +415,10 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
       mimeTypeService: features.editorServices.mimeTypeService,
       notebookConfig: {
         ...StaticNotebook.defaultNotebookConfig,
-        // Avoid JL windowing null-cell sizing races that cause repeated
-        // estimateWidgetSize crashes and visible editor blinking.
-        windowingMode: 'none',
+        // Without NotebookWindowing, the JL windowing null-cell sizing races
+        // cause repeated estimateWidgetSize crashes and editor blinking.
+        windowingMode: windowingActive ? 'full' : 'none',
+        overscanCount: overscanCount ?? DEFAULT_WINDOWING_OVERSCAN_COUNT,
         recordTiming: true,
       },
     });
@@ -381,7 +427,7 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
       thisFactory.dispose();
       setWidgetFactory(factory => (factory === thisFactory ? null : factory));
     };
-  }, [contentFactory, features]);
+  }, [contentFactory, features, windowingActive, overscanCount]);
 
   // Panel provider - persists across React re-renders to avoid tracker.currentWidget becoming null
   const panelProvider = useMemo(() => new NotebookPanelProvider(), []);
@@ -417,6 +463,15 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
     // Create context once for the notebook, using the initial kernelId
     // Subsequent kernel changes are handled via changeKernel() API (see useEffect below)
     const factory = new DummyModelFactory(model);
+    // Before the context loads the notebook, to record its revision and
+    // resolve its outputs. The blobs wrap the contents after the delta
+    // saves, so the patches hold the references stored on disk.
+    if (deltaSaves && serviceManager) {
+      NotebookDeltaSaves.forManager(serviceManager);
+    }
+    if (outputBlobs && serviceManager) {
+      OutputBlobs.forManager(serviceManager);
+    }
     const thisContext = new Context<NotebookModel>({
       factory,
       manager: serviceManager ?? (new NoServiceManager() as any),
@@ -444,7 +499,9 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
       // Initialization must not trigger revert in case we set up the model content
       path !== FALLBACK_NOTEBOOK_PATH ? path : undefined,
       onSessionConnection,
-      !serviceManager
+      !serviceManager,
+      // The streamed notebook would not have its outputs resolved.
+      streamingLoad && !outputBlobs ? serviceManager?.serverSettings : undefined
     );
     setContext(thisContext);
     return () => {
@@ -452,7 +509,15 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
       factory.dispose();
       setContext(context => (context === thisContext ? null : context));
     };
-  }, [id, serviceManager, model, path]);
+  }, [
+    id,
+    serviceManager,
+    model,
+    path,
+    streamingLoad,
+    deltaSaves,
+    outputBlobs,
+  ]);
 
   // Set kernel
   useEffect(() => {
@@ -474,9 +539,18 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
     let thisPanel: NotebookPanel | null = null;
     let thisAdapter: NotebookAdapter | null = null;
     let widgetsManager: WidgetManager | null = null;
+    let windowingManager: NotebookWindowing | null = null;
     if (context) {
       thisPanel = widgetFactory?.createNew(context) ?? null;
       if (thisPanel) {
+        if (windowingActive) {
+          windowingManager = new NotebookWindowing(thisPanel.content, {
+            // The generated id changes on each mount.
+            notebookId: props.path || props.id,
+            persistHeights,
+          });
+        }
+
         // Update panel provider with persistent references
         panelProvider.setPanel(thisPanel, context);
 
@@ -527,6 +601,7 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
           }
         }
 
+        markJupyter('notebook_render');
         setIsLoading(false);
       }
     }
@@ -550,6 +625,7 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
       //    already rendering."
       queueMicrotask(() => {
         widgetsManager?.dispose();
+        windowingManager?.dispose();
         if (thisAdapter) {
           thisAdapter.dispose();
         }
@@ -575,7 +651,16 @@ export function NotebookBase(props: INotebookBaseProps): JSX.Element {
       setPanel(panel => (panel === thisPanel ? null : panel));
       setAdapter(adapter => (adapter === thisAdapter ? null : adapter));
     };
-  }, [context, extensions, features.commands, widgetFactory, panelProvider]);
+  }, [
+    context,
+    extensions,
+    features.commands,
+    widgetFactory,
+    panelProvider,
+    persistHeights,
+    props.path,
+    props.id,
+  ]);
 
   // Update notebook store when adapter changes
   useEffect(() => {
@@ -996,6 +1081,11 @@ export type IOptions = {
    * Notebook ID.
    */
   id?: string;
+  /**
+   * Parse the `nbformat` or `url` notebook off the main thread and add its
+   * cells to the model by chunks. The model is returned with its first cells.
+   */
+  streamingLoad?: boolean;
 };
 
 /**
@@ -1018,6 +1108,7 @@ export function useNotebookModel(options: IOptions): NotebookModel | null {
     path,
     serviceManager,
     id,
+    streamingLoad = false,
   } = options;
 
   // Generate the notebook model
@@ -1067,6 +1158,27 @@ export function useNotebookModel(options: IOptions): NotebookModel | null {
       };
 
       setupCollaboration();
+    } else if (streamingLoad && (nbformat || url)) {
+      const model = new NotebookModel();
+      model.readOnly = readonly;
+      // The provided content is already parsed, only its cells are streamed.
+      const loader = new NotebookLoader(model, {
+        readonly,
+        worker: nbformat ? undefined : createNbformatWorker(),
+      }).load(nbformat ? { content: nbformat } : { url: url! });
+      disposable.add(loader);
+      loader.firstCells.then(
+        () => {
+          if (isMounted) {
+            setModel(model);
+          }
+        },
+        reason => {
+          if (isMounted) {
+            console.error('Failed to load the notebook.', reason);
+          }
+        }
+      );
     } else {
       const createModel = (nbformat: INotebookContent | undefined) => {
         const model = new NotebookModel();
@@ -1103,6 +1215,7 @@ export function useNotebookModel(options: IOptions): NotebookModel | null {
     path,
     serviceManager,
     id,
+    streamingLoad,
   ]);
 
   return model;
@@ -1124,12 +1237,14 @@ async function loadFromUrl(url: string) {
 class CommonFeatures {
   protected _commands: CommandRegistry;
   protected _editorServices: IEditorServices;
+  protected _editorFactory: CodeEditor.Factory;
   protected _rendermime: RenderMimeRegistry;
 
   constructor(
     options: {
       commands?: CommandRegistry;
       renderers?: IRenderMime.IRendererFactory[];
+      lazyEditors?: boolean;
     } = {}
   ) {
     this._commands = options.commands ?? new CommandRegistry();
@@ -1218,6 +1333,9 @@ class CommonFeatures {
       factoryService,
       mimeTypeService,
     };
+    this._editorFactory = options.lazyEditors
+      ? createLazyEditorFactory(factoryService.newInlineEditor, languages)
+      : factoryService.newInlineEditor;
   }
 
   get commands(): CommandRegistry {
@@ -1228,6 +1346,13 @@ class CommonFeatures {
     return this._editorServices;
   }
 
+  /**
+   * Factory of the cell editors.
+   */
+  get editorFactory(): CodeEditor.Factory {
+    return this._editorFactory;
+  }
+
   get rendermime(): RenderMimeRegistry {
     return this._rendermime;
   }
@@ -1253,10 +1378,43 @@ function initializeContext(
   id: string,
   path?: string,
   onSessionConnection?: OnSessionConnection,
-  serverLess: boolean = false
+  serverLess: boolean = false,
+  streamingSettings?: ServerConnection.ISettings
 ) {
   const shuntContentManager = path ? false : true;
 
+  if (path && streamingSettings) {
+    // Stream the notebook through the nbformat worker rather than parsing
+    // the contents model and creating all the cells on the main thread.
+    let loader: NotebookLoader | undefined;
+    context.disposed.connect(() => loader?.dispose());
+    (context as any)._revert = async (): Promise<void> => {
+      const model = context.model as NotebookModel;
+      loader?.dispose();
+      loader = new NotebookLoader(model, { worker: createNbformatWorker() });
+      const { baseUrl, token, init } = streamingSettings;
+      loader.load({
+        url:
+          URLExt.join(baseUrl, 'api/contents', URLExt.encodeParts(path)) +
+          '?type=notebook&content=1',
+        contents: true,
+        headers: token ? { Authorization: `token ${token}` } : undefined,
+        credentials: init.credentials,
+      });
+      const contents = await loader.firstCells;
+      if (context.isDisposed) {
+        return;
+      }
+      (context as any)._updateContentsModel({ ...contents, content: null });
+      model.dirty = false;
+      if (!(context as any)._isPopulated) {
+        await (context as any)._populate();
+      }
+      await loader.loaded;
+      model.sharedModel.clearUndoHistory();
+    };
+  }
+
   // TODO we should implement our own thing rather this Javascript patch.
   // These are fixes on the Context and the SessionContext to have more control on the kernel launch.
   (context.sessionContext as any)._initialize = async (): Promise<boolean> => {
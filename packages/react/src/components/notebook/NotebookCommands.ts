@@ -24,6 +24,7 @@ import { nullTranslator } from '@jupyterlab/translation';
 import { IYText } from '@jupyter/ydoc';
 import { Context } from '@jupyterlab/docregistry';
 import { INotebookModel } from '@jupyterlab/notebook';
+import { runAllPipelined } from './NotebookRunner';
 
 /**
  * Provider for notebook panel and context that persists across React re-renders.
@@ -352,7 +353,7 @@ export function addNotebookCommands(
   allCommands.add(
     commands.addCommand(NotebookCommandIds.runAll, {
       label: 'Run all',
-      execute: () => {
+      execute: args => {
         // Use panelProvider instead of tracker.currentWidget to avoid null reference after React re-renders
         const panel = panelProvider.getPanel();
         const context = panelProvider.getContext();
@@ -379,6 +380,12 @@ export function addNotebookCommands(
           return Promise.resolve();
         }
 
+        // Send the execute requests ahead of the replies when pipelined
+        if (args.pipelined) {
+          return runAllPipelined(panel.content, sessionContext, {
+            window: args.window as number | undefined,
+          });
+        }
         return NotebookActions.runAll(panel.content, sessionContext);
       },
     })
@@ -0,0 +1,324 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { URLExt } from '@jupyterlab/coreutils';
+import type { INotebookContent } from '@jupyterlab/nbformat';
+import {
+  Contents,
+  ServerConnection,
+  type ServiceManager,
+} from '@jupyterlab/services';
+import { JSONExt, type JSONValue } from '@lumino/coreutils';
+
+/**
+ * An `add`, `remove` or `replace` operation of a RFC 6902 JSON patch.
+ */
+export type JsonPatchOperation =
+  | { op: 'add' | 'replace'; path: string; value: unknown }
+  | { op: 'remove'; path: string };
+
+/**
+ * A saved revision of a notebook, its cells kept serialized.
+ */
+export interface INotebookRevision {
+  /**
+   * The `last_modified` of the saved contents model.
+   */
+  revision: string;
+  nbformat: number;
+  nbformat_minor: number;
+  metadata: string;
+  cells: string[];
+}
+
+const pointer = (key: string | number): string =>
+  `/${String(key).replace(/~/g, '~0').replace(/\//g, '~1')}`;
+
+const isObject = (value: unknown): value is Record<string, unknown> =>
+  typeof value === 'object' && value !== null && !Array.isArray(value);
+
+function diffValue(
+  previous: unknown,
+  next: unknown,
+  path: string,
+  patch: JsonPatchOperation[]
+): void {
+  if (isObject(previous) && isObject(next)) {
+    for (const key of Object.keys(previous)) {
+      if (!(key in next)) {
+        patch.push({ op: 'remove', path: path + pointer(key) });
+      }
+    }
+    for (const [key, value] of Object.entries(next)) {
+      if (!(key in previous)) {
+        patch.push({ op: 'add', path: path + pointer(key), value });
+      } else if (
+        !JSONExt.deepEqual(previous[key] as JSONValue, value as JSONValue)
+      ) {
+        diffValue(previous[key], value, path + pointer(key), patch);
+      }
+    }
+  } else if (
+    Array.isArray(previous) &&
+    Array.isArray(next) &&
+    previous.length === next.length
+  ) {
+    next.forEach((value, index) => {
+      if (!JSONExt.deepEqual(previous[index], value)) {
+        diffValue(previous[index], value, path + pointer(index), patch);
+      }
+    });
+  } else {
+    patch.push({ op: 'replace', path, value: next });
+  }
+}
+
+/**
+ * Return the revision of a saved notebook.
+ */
+export function toNotebookRevision(
+  content: INotebookContent,
+  revision: string,
+  cells = content.cells.map(cell => JSON.stringify(cell))
+): INotebookRevision {
+  return {
+    revision,
+    nbformat: content.nbformat,
+    nbformat_minor: content.nbformat_minor,
+    metadata: JSON.stringify(content.metadata),
+    cells,
+  };
+}
+
+/**
+ * Compute the JSON patch from a saved revision of a notebook to its content.
+ *
+ * The unchanged cells at the start and the end of the notebook are skipped.
+ * The cells in between are patched in place if their number is unchanged,
+ * e.g. an edited source or new outputs, and replaced otherwise.
+ *
+ * @param cells The serialized cells of the content, if already computed.
+ */
+export function diffNotebook(
+  previous: INotebookRevision,
+  content: INotebookContent,
+  cells = content.cells.map(cell => JSON.stringify(cell))
+): JsonPatchOperation[] {
+  const patch = new Array<JsonPatchOperation>();
+  for (const key of ['nbformat', 'nbformat_minor'] as const) {
+    if (previous[key] !== content[key]) {
+      patch.push({ op: 'replace', path: pointer(key), value: content[key] });
+    }
+  }
+  if (previous.metadata !== JSON.stringify(content.metadata)) {
+    diffValue(
+      JSON.parse(previous.metadata),
+      content.metadata,
+      '/metadata',
+      patch
+    );
+  }
+  let start = 0;
+  const end = Math.min(previous.cells.length, cells.length);
+  while (start < end && previous.cells[start] === cells[start]) {
+    start++;
+  }
+  let suffix = 0;
+  while (
+    suffix < end - start &&
+    previous.cells[previous.cells.length - 1 - suffix] ===
+      cells[cells.length - 1 - suffix]
+  ) {
+    suffix++;
+  }
+  const removed = previous.cells.length - suffix - start;
+  const added = cells.length - suffix - start;
+  if (removed === added) {
+    for (let index = start; index < start + added; index++) {
+      diffValue(
+        JSON.parse(previous.cells[index]),
+        content.cells[index],
+        `/cells${pointer(index)}`,
+        patch
+      );
+    }
+  } else {
+    for (let i = 0; i < removed; i++) {
+      patch.push({ op: 'remove', path: `/cells${pointer(start)}` });
+    }
+    for (let i = 0; i < added; i++) {
+      patch.push({
+        op: 'add',
+        path: `/cells${pointer(start + i)}`,
+        value: content.cells[start + i],
+      });
+    }
+  }
+  return patch;
+}
+
+/**
+ * Save the notebooks as JSON patches of their last saved revision.
+ *
+ * The `jupyter_react` server extension applies a patch to the notebook on
+ * disk if it is still at the revision the patch was computed from. A save
+ * falls back to the full content on a conflict or a failed request, or
+ * when the revision is unknown, e.g. for the first save of a notebook not
+ * loaded through the contents manager, as the streamed notebooks are. An
+ * edit of one cell then uploads that cell only, instead of the notebook
+ * with all its outputs.
+ */
+export class NotebookDeltaSaves {
+  private _serverSettings: ServerConnection.ISettings;
+  private _revisions = new Map<string, INotebookRevision>();
+
+  constructor(options: NotebookDeltaSaves.IOptions) {
+    this._serverSettings = options.serverSettings;
+  }
+
+  /**
+   * Return the delta saves of the contents of a service manager, patching
+   * them on the first call.
+   */
+  static forManager(serviceManager: ServiceManager.IManager) {
+    let deltaSaves = Private.managers.get(serviceManager);
+    if (!deltaSaves) {
+      deltaSaves = new NotebookDeltaSaves({
+        serverSettings: serviceManager.serverSettings,
+      });
+      deltaSaves.wrapContents(serviceManager.contents);
+      Private.managers.set(serviceManager, deltaSaves);
+    }
+    return deltaSaves;
+  }
+
+  /**
+   * The last saved revision of the notebook at path, if known.
+   */
+  getRevision(path: string): INotebookRevision | undefined {
+    return this._revisions.get(path);
+  }
+
+  /**
+   * Record the revisions of the notebooks loaded and saved with the contents
+   * manager, and save the notebooks with a known revision as patches.
+   *
+   * The manager is patched in place and returned. To move the large outputs
+   * to the blob store, `OutputBlobs` must wrap the manager after, so the
+   * patches hold the references stored on disk.
+   */
+  wrapContents(contents: Contents.IManager): Contents.IManager {
+    const get = contents.get.bind(contents);
+    const save = contents.save.bind(contents);
+    const rename = contents.rename.bind(contents);
+    const remove = contents.delete.bind(contents);
+    contents.get = async (path, options) => {
+      const model = await get(path, options);
+      if (model.type === 'notebook' && model.content) {
+        this._revisions.set(
+          path,
+          toNotebookRevision(model.content, model.last_modified)
+        );
+      }
+      return model;
+    };
+    contents.save = async (path, options = {}) => {
+      const content = options.content as INotebookContent | undefined;
+      if (options.type !== 'notebook' || !content) {
+        return save(path, options);
+      }
+      const cells = content.cells.map(cell => JSON.stringify(cell));
+      const previous = this._revisions.get(path);
+      let model: Contents.IModel | undefined;
+      if (previous) {
+        model = await this._patch(path, previous, content, cells);
+      }
+      if (!model) {
+        model = await save(path, options);
+      }
+      this._revisions.set(
+        path,
+        toNotebookRevision(content, model.last_modified, cells)
+      );
+      return model;
+    };
+    contents.rename = async (path, newPath) => {
+      const model = await rename(path, newPath);
+      const revision = this._revisions.get(path);
+      this._revisions.delete(path);
+      if (revision) {
+        this._revisions.set(newPath, revision);
+      }
+      return model;
+    };
+    contents.delete = async path => {
+      await remove(path);
+      this._revisions.delete(path);
+    };
+    return contents;
+  }
+
+  /**
+   * Save a notebook as a patch, undefined if it must be saved in full.
+   */
+  private async _patch(
+    path: string,
+    previous: INotebookRevision,
+    content: INotebookContent,
+    cells: string[]
+  ): Promise<Contents.IModel | undefined> {
+    const url = URLExt.join(
+      this._serverSettings.baseUrl,
+      'jupyter_react',
+      'contents',
+      URLExt.encodeParts(path)
+    );
+    let response: Response;
+    try {
+      response = await ServerConnection.makeRequest(
+        url,
+        {
+          method: 'PATCH',
+          body: JSON.stringify({
+            revision: previous.revision,
+            patch: diffNotebook(previous, content, cells),
+          }),
+        },
+        this._serverSettings
+      );
+    } catch (reason) {
+      console.debug(`Saving ${path} in full, its patch failed.`, reason);
+      return undefined;
+    }
+    if (!response.ok) {
+      // A conflict, a notebook deleted on disk or a server without the
+      // extension: the notebook is saved in full.
+      console.debug(
+        `Saving ${path} in full, its patch failed with ${response.status}.`
+      );
+      return undefined;
+    }
+    return response.json();
+  }
+}
+
+export namespace NotebookDeltaSaves {
+  export interface IOptions {
+    /**
+     * The settings of the server running the `jupyter_react` extension.
+     */
+    serverSettings: ServerConnection.ISettings;
+  }
+}
+
+namespace Private {
+  export const managers = new WeakMap<
+    ServiceManager.IManager,
+    NotebookDeltaSaves
+  >();
+}
+
+export default NotebookDeltaSaves;
@@ -0,0 +1,295 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import type { ICell, IOutput } from '@jupyterlab/nbformat';
+import type { NotebookModel } from '@jupyterlab/notebook';
+import type { YCodeCell } from '@jupyter/ydoc';
+import { PromiseDelegate } from '@lumino/coreutils';
+import type { IDisposable } from '@lumino/disposable';
+import {
+  DEFAULT_LOAD_CHUNK_SIZE,
+  streamNotebook,
+  type NotebookLoadMessage,
+  type NotebookSource,
+} from './NotebookParser';
+
+export interface INotebookLoaderOptions {
+  /**
+   * Number of cells added to the model at once.
+   */
+  chunkSize?: number;
+  /**
+   * Number of first cells loaded with their outputs, the outputs of the
+   * next cells are loaded when the page is idle. Defaults to the chunk size.
+   */
+  eagerOutputs?: number;
+  /**
+   * Whether the cells are read-only or not, set in their `editable`
+   * metadata when defined.
+   */
+  readonly?: boolean;
+  /**
+   * Worker running `nbformat.worker`, terminated with the load. Without
+   * worker, the notebook is parsed on the main thread.
+   */
+  worker?: Worker;
+  /**
+   * Called once a chunk of cells is added to the model.
+   */
+  onProgress?: (loaded: number, total: number) => void;
+}
+
+const requestIdle = (callback: () => void): number =>
+  typeof requestIdleCallback === 'function'
+    ? requestIdleCallback(callback)
+    : (setTimeout(callback, 0) as unknown as number);
+
+const cancelIdle = (handle: number): void =>
+  typeof cancelIdleCallback === 'function'
+    ? cancelIdleCallback(handle)
+    : clearTimeout(handle);
+
+/**
+ * Load a notebook in a model by chunks of cells.
+ *
+ * The notebook is parsed and validated by the worker, and its cells are
+ * added to the model by chunks, so the first cells are interactive while
+ * the next ones are loading. The outputs of the cells after the first
+ * ones are set when the page is idle.
+ *
+ * The model cannot be serialized while it is loading, so a save does not
+ * truncate the notebook; the outputs not set yet are set before.
+ */
+export class NotebookLoader implements IDisposable {
+  constructor(model: NotebookModel, options: INotebookLoaderOptions = {}) {
+    this._model = model;
+    this._chunkSize = Math.max(1, options.chunkSize ?? DEFAULT_LOAD_CHUNK_SIZE);
+    this._eagerOutputs = options.eagerOutputs ?? this._chunkSize;
+    this._readonly = options.readonly;
+    this._worker = options.worker;
+    this._onProgress = options.onProgress;
+    const toJSON = model.toJSON;
+    model.toJSON = () => {
+      if (this._isLoading) {
+        throw new Error('The notebook is still loading.');
+      }
+      this.flushOutputs();
+      return toJSON.call(model);
+    };
+    // Handled by the callers awaiting them.
+    this._firstCells.promise.catch(() => undefined);
+    this._loaded.promise.catch(() => undefined);
+  }
+
+  /**
+   * Resolved with the contents model, without its content, once the first
+   * cells are in the model.
+   */
+  get firstCells(): Promise<Record<string, unknown> | undefined> {
+    return this._firstCells.promise;
+  }
+
+  /**
+   * Resolved with the contents model, without its content, once all the
+   * cells are in the model.
+   */
+  get loaded(): Promise<Record<string, unknown> | undefined> {
+    return this._loaded.promise;
+  }
+
+  /**
+   * Whether cells are still to be added to the model.
+   */
+  get isLoading(): boolean {
+    return this._isLoading;
+  }
+
+  get isDisposed(): boolean {
+    return this._isDisposed;
+  }
+
+  /**
+   * Start the load of a notebook.
+   */
+  load(source: NotebookSource): this {
+    const request = { source, chunkSize: this._chunkSize };
+    this._isLoading = true;
+    if (this._worker) {
+      this._worker.onmessage = (event: MessageEvent<NotebookLoadMessage>) =>
+        this._onMessage(event.data);
+      this._worker.onerror = event =>
+        this._onMessage({ type: 'error', message: event.message });
+      this._worker.postMessage(request);
+    } else {
+      void (async () => {
+        for await (const message of streamNotebook(request)) {
+          if (this._isDisposed) {
+            return;
+          }
+          this._onMessage(message);
+          // Let the page render and handle the events between the chunks.
+          await new Promise(resolve => setTimeout(resolve, 0));
+        }
+      })();
+    }
+    return this;
+  }
+
+  /**
+   * Set the outputs not set yet.
+   */
+  flushOutputs(): void {
+    if (this._idleHandle !== undefined) {
+      cancelIdle(this._idleHandle);
+      this._idleHandle = undefined;
+    }
+    this._setOutputs(Infinity);
+  }
+
+  dispose(): void {
+    if (this._isDisposed) {
+      return;
+    }
+    this._isDisposed = true;
+    this._worker?.terminate();
+    this.flushOutputs();
+    delete (this._model as Partial<NotebookModel>).toJSON;
+    if (this._isLoading) {
+      this._isLoading = false;
+      const error = new Error('The notebook load was cancelled.');
+      this._firstCells.reject(error);
+      this._loaded.reject(error);
+    }
+  }
+
+  private _onMessage(message: NotebookLoadMessage): void {
+    if (this._isDisposed) {
+      return;
+    }
+    switch (message.type) {
+      case 'header':
+        this._header = message;
+        break;
+      case 'cells':
+        this._addCells(message.start, message.cells);
+        break;
+      case 'done':
+        if (this._loadedCells === 0) {
+          this._addCells(0, []);
+        }
+        this._isLoading = false;
+        this._worker?.terminate();
+        this._loaded.resolve(this._header?.contents);
+        this._scheduleOutputs();
+        break;
+      case 'error': {
+        this._isLoading = false;
+        this._worker?.terminate();
+        const error = new Error(message.message);
+        this._firstCells.reject(error);
+        this._loaded.reject(error);
+        break;
+      }
+    }
+  }
+
+  private _addCells(start: number, chunk: ICell[]): void {
+    const deferred = new Map<number, IOutput[]>();
+    const cells = chunk.map((cell, i) => {
+      if (this._readonly !== undefined) {
+        cell.metadata['editable'] = !this._readonly;
+      }
+      const outputs = cell.outputs as IOutput[] | undefined;
+      if (start + i >= this._eagerOutputs && outputs?.length) {
+        deferred.set(i, outputs);
+        return { ...cell, outputs: [] };
+      }
+      return cell;
+    });
+    const sharedModel = this._model.sharedModel;
+    if (start === 0) {
+      const header = this._header!;
+      this._model.fromJSON({
+        cells,
+        metadata: header.metadata,
+        nbformat: header.nbformat,
+        nbformat_minor: header.nbformat_minor,
+      });
+    } else {
+      const dirty = this._model.dirty;
+      sharedModel.transact(() => {
+        sharedModel.insertCells(sharedModel.cells.length, cells);
+      }, false);
+      this._model.dirty = dirty;
+    }
+    const added = sharedModel.cells.slice(-cells.length);
+    deferred.forEach((outputs, i) => {
+      const cell = added[i] as YCodeCell;
+      const executionCount = cell.execution_count;
+      this._outputs.set(cell, { outputs, executionCount });
+    });
+    this._loadedCells += cells.length;
+    this._onProgress?.(this._loadedCells, this._header!.total);
+    if (start === 0) {
+      this._firstCells.resolve(this._header!.contents);
+    }
+  }
+
+  private _scheduleOutputs(): void {
+    if (this._outputs.size === 0 || this._idleHandle !== undefined) {
+      return;
+    }
+    this._idleHandle = requestIdle(() => {
+      this._idleHandle = undefined;
+      this._setOutputs(this._chunkSize);
+      this._scheduleOutputs();
+    });
+  }
+
+  private _setOutputs(count: number): void {
+    if (this._outputs.size === 0) {
+      return;
+    }
+    const dirty = this._model.dirty;
+    this._model.sharedModel.transact(() => {
+      for (const [cell, { outputs, executionCount }] of this._outputs) {
+        if (count-- <= 0) {
+          break;
+        }
+        this._outputs.delete(cell);
+        // Skip the cells executed or deleted since their load.
+        if (
+          !cell.isDisposed &&
+          cell.execution_count === executionCount &&
+          cell.outputs.length === 0
+        ) {
+          cell.setOutputs(outputs);
+        }
+      }
+    }, false);
+    this._model.dirty = dirty;
+  }
+
+  private _model: NotebookModel;
+  private _chunkSize: number;
+  private _eagerOutputs: number;
+  private _readonly?: boolean;
+  private _worker?: Worker;
+  private _onProgress?: (loaded: number, total: number) => void;
+  private _header?: Extract<NotebookLoadMessage, { type: 'header' }>;
+  private _loadedCells = 0;
+  private _isLoading = false;
+  private _isDisposed = false;
+  private _idleHandle?: number;
+  private _outputs = new Map<
+    YCodeCell,
+    { outputs: IOutput[]; executionCount: number | null }
+  >();
+  private _firstCells = new PromiseDelegate<
+    Record<string, unknown> | undefined
+  >();
+  private _loaded = new PromiseDelegate<Record<string, unknown> | undefined>();
+}
@@ -0,0 +1,23 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Create the worker parsing the notebooks, undefined if the environment
+ * has no web workers.
+ *
+ * ### Note
+ *
+ * The worker URL must be written _exactly_ like this for webpack to
+ * bundle the worker.
+ */
+export function createNbformatWorker(): Worker | undefined {
+  if (typeof Worker === 'undefined') {
+    return undefined;
+  }
+  return new Worker(new URL('./nbformat.worker.js', import.meta.url), {
+    type: 'module',
+  });
+}
@@ -0,0 +1,188 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import type {
+  ICell,
+  INotebookContent,
+  INotebookMetadata,
+} from '@jupyterlab/nbformat';
+
+/**
+ * Default number of cells of a chunk of a streamed notebook.
+ */
+export const DEFAULT_LOAD_CHUNK_SIZE = 50;
+
+/**
+ * Source of a notebook to load.
+ *
+ * A `url` returns the nbformat JSON of the notebook, or a Jupyter contents
+ * model with the notebook as `content` when `contents` is true.
+ */
+export type NotebookSource =
+  | { content: INotebookContent }
+  | { text: string }
+  | {
+      url: string;
+      contents?: boolean;
+      headers?: Record<string, string>;
+      credentials?: RequestCredentials;
+    };
+
+/**
+ * Request of a notebook load, posted to the nbformat worker.
+ */
+export type NotebookLoadRequest = {
+  source: NotebookSource;
+  chunkSize?: number;
+};
+
+/**
+ * Messages of a streamed notebook, in order: the header, the chunks of
+ * cells and the end of the stream, or an error.
+ */
+export type NotebookLoadMessage =
+  | {
+      type: 'header';
+      nbformat: number;
+      nbformat_minor: number;
+      metadata: INotebookMetadata;
+      /**
+       * Number of cells of the notebook.
+       */
+      total: number;
+      /**
+       * The contents model without its content, for a contents source.
+       */
+      contents?: Record<string, unknown>;
+    }
+  | { type: 'cells'; start: number; cells: ICell[] }
+  | { type: 'done' }
+  | { type: 'error'; message: string };
+
+const CELL_TYPES = new Set(['code', 'markdown', 'raw']);
+
+/**
+ * Validate the nbformat 4 content of a notebook and normalize its cells:
+ * the multiline sources are joined, and the cell ids dropped before the
+ * nbformat 4.5 as `NotebookModel.fromJSON`.
+ *
+ * @throws An error describing the first invalid field.
+ */
+export function validateNotebook(value: unknown): INotebookContent {
+  if (typeof value !== 'object' || value === null || Array.isArray(value)) {
+    throw new Error('The notebook content must be a JSON object.');
+  }
+  const notebook = value as Partial<INotebookContent>;
+  if (notebook.nbformat !== 4) {
+    throw new Error(
+      `Unsupported nbformat ${notebook.nbformat}, only nbformat 4 is supported.`
+    );
+  }
+  if (!Array.isArray(notebook.cells)) {
+    throw new Error('The notebook cells must be an array.');
+  }
+  const useId = (notebook.nbformat_minor ?? 0) >= 5;
+  notebook.cells.forEach((cell: ICell, index: number) => {
+    if (typeof cell !== 'object' || cell === null) {
+      throw new Error(`The cell ${index} must be a JSON object.`);
+    }
+    if (!CELL_TYPES.has(cell.cell_type)) {
+      throw new Error(
+        `The cell ${index} has an invalid type '${cell.cell_type}'.`
+      );
+    }
+    if (Array.isArray(cell.source)) {
+      cell.source = cell.source.join('');
+    } else if (typeof cell.source !== 'string') {
+      throw new Error(`The cell ${index} source must be a string.`);
+    }
+    cell.metadata = cell.metadata ?? {};
+    if (cell.cell_type === 'code') {
+      if (cell.outputs === undefined) {
+        cell.outputs = [];
+      } else if (!Array.isArray(cell.outputs)) {
+        throw new Error(`The cell ${index} outputs must be an array.`);
+      }
+      cell.execution_count = cell.execution_count ?? null;
+    }
+    if (!useId) {
+      delete cell.id;
+    }
+  });
+  return {
+    cells: notebook.cells,
+    metadata: notebook.metadata ?? {},
+    nbformat: 4,
+    nbformat_minor: notebook.nbformat_minor ?? 0,
+  };
+}
+
+/**
+ * Read the content of a notebook source.
+ */
+export async function readNotebook(
+  source: NotebookSource
+): Promise<{ content: unknown; contents?: Record<string, unknown> }> {
+  if ('content' in source) {
+    return { content: source.content };
+  }
+  if ('text' in source) {
+    return { content: JSON.parse(source.text) };
+  }
+  const response = await fetch(source.url, {
+    headers: source.headers,
+    credentials: source.credentials,
+  });
+  if (!response.ok) {
+    throw new Error(
+      `Failed to fetch the notebook ${source.url}: ${response.status} ${response.statusText}`
+    );
+  }
+  const json = JSON.parse(await response.text());
+  if (!source.contents) {
+    return { content: json };
+  }
+  const { content, ...contents } = json;
+  return { content, contents };
+}
+
+/**
+ * Stream the messages of a notebook source.
+ */
+export async function* streamNotebook(
+  request: NotebookLoadRequest
+): AsyncGenerator<NotebookLoadMessage> {
+  const chunkSize = Math.max(1, request.chunkSize ?? DEFAULT_LOAD_CHUNK_SIZE);
+  let notebook: INotebookContent;
+  let contents: Record<string, unknown> | undefined;
+  try {
+    const read = await readNotebook(request.source);
+    notebook = validateNotebook(read.content);
+    contents = read.contents;
+  } catch (reason) {
+    yield {
+      type: 'error',
+      message: reason instanceof Error ? reason.message : String(reason),
+    };
+    return;
+  }
+  yield {
+    type: 'header',
+    nbformat: notebook.nbformat,
+    nbformat_minor: notebook.nbformat_minor,
+    metadata: notebook.metadata,
+    total: notebook.cells.length,
+    contents,
+  };
+  for (let start = 0; start < notebook.cells.length; start += chunkSize) {
+    yield {
+      type: 'cells',
+      start,
+      cells: notebook.cells.slice(start, start + chunkSize),
+    };
+  }
+  yield { type: 'done' };
+}
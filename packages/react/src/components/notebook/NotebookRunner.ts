@@ -0,0 +1,199 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import type { ISessionContext } from '@jupyterlab/apputils';
+import { CodeCell, MarkdownCell } from '@jupyterlab/cells';
+import type { Notebook } from '@jupyterlab/notebook';
+
+/**
+ * Default number of execute requests sent ahead of their completion.
+ */
+export const DEFAULT_RUN_WINDOW = 8;
+
+/**
+ * Run status of a cell:
+ * - `queued`: the execute request is sent.
+ * - `running`: the previous requests are completed, the kernel is running
+ *   the cell.
+ * - `completed`, `error`: the reply of the kernel.
+ * - `aborted`: the kernel aborted the request after a previous error.
+ * - `skipped`: the request was not sent after a previous error.
+ */
+export type CellRunStatus =
+  | 'queued'
+  | 'running'
+  | 'completed'
+  | 'error'
+  | 'aborted'
+  | 'skipped';
+
+export type ICellRunProgress = {
+  /**
+   * Index of the cell in the notebook.
+   */
+  index: number;
+  cellId: string;
+  status: CellRunStatus;
+};
+
+/**
+ * Progress of a run of the cells of a notebook.
+ */
+export type INotebookRunProgress = {
+  status: 'running' | 'completed' | 'error';
+  /**
+   * Number of the code cells of the run.
+   */
+  total: number;
+  /**
+   * Number of the cells with a reply.
+   */
+  finished: number;
+  /**
+   * Status of the cells, by cell id.
+   */
+  cells: Record<string, CellRunStatus>;
+};
+
+export type IRunPipelineOptions = {
+  /**
+   * Number of requests sent together, 1 to await each reply.
+   */
+  window?: number;
+  /**
+   * Stop sending requests after an error, true by default. The kernel
+   * aborts the requests of the window sent with `stop_on_error`.
+   */
+  stopOnError?: boolean;
+  /**
+   * Called on each status change of an item.
+   */
+  onProgress?: (index: number, status: CellRunStatus) => void;
+};
+
+export type IRunAllOptions = Omit<IRunPipelineOptions, 'onProgress'> & {
+  /**
+   * Called on each status change of a cell.
+   */
+  onProgress?: (progress: ICellRunProgress) => void;
+};
+
+const REPLY_STATUSES: Record<'ok' | 'error' | 'aborted', CellRunStatus> = {
+  ok: 'completed',
+  error: 'error',
+  aborted: 'aborted',
+};
+
+/**
+ * Execute items in order, sending them by windows of `window` requests,
+ * so a run of many short cells costs one round trip to the kernel per
+ * window instead of one per cell.
+ *
+ * The requests of a window are sent together, and the next window once
+ * all of them succeeded: as for requests sent all at once, a kernel
+ * receiving them with `stop_on_error` aborts the ones queued after an
+ * error, and no request can reach the kernel after the error is handled.
+ *
+ * @param execute Send the execution of an item and resolve with the
+ * status of its reply.
+ * @returns The final status of each item.
+ */
+export async function runPipelined<T>(
+  items: T[],
+  execute: (item: T, index: number) => Promise<'ok' | 'error' | 'aborted'>,
+  options: IRunPipelineOptions = {}
+): Promise<CellRunStatus[]> {
+  const { window = DEFAULT_RUN_WINDOW, stopOnError = true, onProgress } =
+    options;
+  const statuses = new Array<CellRunStatus>(items.length);
+  const report = (index: number, status: CellRunStatus) => {
+    statuses[index] = status;
+    onProgress?.(index, status);
+  };
+  let next = 0;
+  let stopped = false;
+  while (next < items.length && !stopped) {
+    const start = next;
+    const end = Math.min(items.length, start + Math.max(1, window));
+    const requests = new Array<Promise<void>>();
+    for (; next < end; next++) {
+      const index = next;
+      report(index, index === start ? 'running' : 'queued');
+      const request = execute(items[index], index)
+        .catch(reason => {
+          console.error(`Failed to execute the item ${index}.`, reason);
+          return 'error' as const;
+        })
+        .then(reply => {
+          report(index, REPLY_STATUSES[reply]);
+          stopped = stopped || (reply !== 'ok' && stopOnError);
+          // The kernel runs the requests in order.
+          if (reply === 'ok' && statuses[index + 1] === 'queued') {
+            report(index + 1, 'running');
+          }
+        });
+      requests.push(request);
+    }
+    await Promise.all(requests);
+  }
+  for (let index = next; index < items.length; index++) {
+    report(index, 'skipped');
+  }
+  return statuses;
+}
+
+/**
+ * Run all the cells of a notebook with pipelined execute requests.
+ *
+ * The markdown cells are rendered, and the code cells are executed in
+ * order by windows of `window` requests. As `NotebookActions.runAll` the
+ * requests are sent with `stop_on_error` and the run stops on an error,
+ * unless the cell is tagged `raises-exception`.
+ */
+export async function runAllPipelined(
+  notebook: Notebook,
+  sessionContext: ISessionContext,
+  options: IRunAllOptions = {}
+): Promise<ICellRunProgress[]> {
+  const cells = new Array<{ cell: CodeCell; index: number }>();
+  notebook.widgets.forEach((cell, index) => {
+    if (cell instanceof MarkdownCell) {
+      cell.rendered = true;
+    } else if (cell instanceof CodeCell) {
+      cells.push({ cell, index });
+    }
+  });
+  const progress = (item: { cell: CodeCell; index: number }) => ({
+    index: item.index,
+    cellId: item.cell.model.id,
+  });
+  const statuses = await runPipelined(
+    cells,
+    async ({ cell }) => {
+      const reply = await CodeCell.execute(cell, sessionContext, {
+        deletedCells: notebook.model?.deletedCells ?? [],
+        recordTiming: notebook.notebookConfig.recordTiming,
+      });
+      const status = reply?.content.status ?? 'ok';
+      if (status === 'error') {
+        const tags = cell.model.getMetadata('tags');
+        return Array.isArray(tags) && tags.includes('raises-exception')
+          ? 'ok'
+          : 'error';
+      }
+      return status === 'ok' ? 'ok' : 'aborted';
+    },
+    {
+      ...options,
+      onProgress: (index, status) =>
+        options.onProgress?.({ ...progress(cells[index]), status }),
+    }
+  );
+  return statuses.map((status, index) => ({
+    ...progress(cells[index]),
+    status,
+  }));
+}
@@ -0,0 +1,55 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import React from 'react';
+import { Box } from '@datalayer/primer-addons';
+
+/**
+ * Number of lines of the placeholder cells, in turn.
+ */
+const CELL_LINES = [3, 1, 5, 2, 4];
+
+export interface INotebookSkeletonProps {
+  /**
+   * Number of placeholder cells
+   */
+  cells?: number;
+}
+
+/**
+ * Skeleton of a notebook, displayed while its first cells are loading.
+ */
+export const NotebookSkeleton: React.FC<INotebookSkeletonProps> = ({
+  cells = 5,
+}) => {
+  return (
+    <Box
+      className="dla-NotebookSkeleton"
+      sx={{ width: '100%', paddingTop: 3 }}
+      role="status"
+      aria-busy="true"
+      aria-label="Loading the notebook..."
+    >
+      {Array.from({ length: cells }, (_, index) => (
+        <Box key={index} sx={{ display: 'flex', gap: 3, marginBottom: 3 }}>
+          <Box sx={{ width: '64px', flexShrink: 0 }} />
+          <Box
+            sx={{
+              flex: 1,
+              height: `${CELL_LINES[index % CELL_LINES.length] * 18 + 16}px`,
+              backgroundColor: 'canvas.subtle',
+              borderRadius: 2,
+              border: '1px solid',
+              borderColor: 'border.muted',
+            }}
+          />
+        </Box>
+      ))}
+    </Box>
+  );
+};
+
+export default NotebookSkeleton;
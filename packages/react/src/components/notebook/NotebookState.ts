@@ -15,7 +15,16 @@ import { NotebookChange } from '@jupyter/ydoc';
 import { Kernel as JupyterKernel } from '@jupyterlab/services';
 import { Kernel } from '../../jupyter/kernel/Kernel';
 import { NotebookCommandIds } from './NotebookCommands';
-import { NotebookAdapter } from './NotebookAdapter';
+import {
+  NotebookAdapter,
+  type NotebookBatchOperation,
+  type NotebookBatchResult,
+} from './NotebookAdapter';
+import type {
+  CellRunStatus,
+  ICellRunProgress,
+  INotebookRunProgress,
+} from './NotebookRunner';
 
 export type PortalDisplay = {
   portal: ReactPortal;
@@ -32,6 +41,7 @@ export type INotebookState = {
   notebookChange?: NotebookChange;
   portals: ReactPortal[];
   portalDisplay?: PortalDisplay;
+  runProgress?: INotebookRunProgress;
 };
 
 export interface INotebooksState {
@@ -74,6 +84,10 @@ export type PortalDisplayMutation = {
   id: string;
   portalDisplay: PortalDisplay | undefined;
 };
+export type RunProgressMutation = {
+  id: string;
+  runProgress: INotebookRunProgress | undefined;
+};
 export type DateMutation = {
   id: string;
   date: Date | undefined;
@@ -106,6 +120,10 @@ export type NotebookState = INotebooksState & {
   deleteCell: (id: string, index?: number) => void;
   deleteCells: (id: string, indices?: number[]) => void;
   updateCell: (id: string, index?: number, source?: string) => void;
+  applyBatch: (
+    id: string,
+    operations?: NotebookBatchOperation[]
+  ) => NotebookBatchResult[];
   readCell: (
     id: string,
     index?: number,
@@ -143,6 +161,10 @@ export type NotebookState = INotebooksState & {
     { execution_count?: number | null; outputs?: Array<string> } | undefined
   >;
   runAllCells: (id: string) => void;
+  runAllCellsPipelined: (
+    id: string,
+    window?: number
+  ) => Promise<ICellRunProgress[]>;
   clearAllOutputs: (id: string) => void;
 
   // Original methods (from legacy API)
@@ -164,6 +186,7 @@ export type NotebookState = INotebooksState & {
   ) => { model: INotebookModel | undefined; changed: unknown } | undefined;
   selectTocModel: (id: string) => TableOfContents.Model | undefined;
   selectKernelStatus: (id: string) => string | undefined;
+  selectRunProgress: (id: string) => INotebookRunProgress | undefined;
   selectActiveCell: (id: string) => Cell<ICellModel> | undefined;
   selectNotebookPortals: (id: string) => ReactPortal[] | undefined;
   selectSaveRequest: (id: string) => Date | undefined;
@@ -175,6 +198,7 @@ export type NotebookState = INotebooksState & {
   changeTocModel: (tocModelId: TocModelId) => void;
   changeNotebook: (notebookChangeId: NotebookChangeId) => void;
   changeKernelStatus: (kernelStatusId: KernelStatusMutation) => void;
+  changeRunProgress: (runProgressMutation: RunProgressMutation) => void;
   changeKernel: (kernelChange: KernelChangeMutation) => void;
   addPortals: (portalsId: ReactPortalsMutation) => void;
   dispose: (id: string) => void;
@@ -260,6 +284,19 @@ export const notebookStore = createStore<NotebookState>((set, get) => ({
       .notebooks.get(params.id as string)
       ?.adapter?.updateCell(params.index as number, params.source as string);
   },
+  applyBatch: (
+    id: string,
+    operations?: NotebookBatchOperation[]
+  ): NotebookBatchResult[] => {
+    const params = typeof id === 'object' ? id : { id, operations };
+    const adapter = get().notebooks.get(params.id as string)?.adapter;
+    if (!adapter) {
+      throw new Error(`Notebook '${params.id}' not found or not initialised.`);
+    }
+    return adapter.transact(
+      (params.operations as NotebookBatchOperation[] | undefined) ?? []
+    );
+  },
   readCell: (
     id: string,
     index?: number,
@@ -350,6 +387,52 @@ export const notebookStore = createStore<NotebookState>((set, get) => ({
     const params = typeof id === 'object' ? id : { id };
     get().notebooks.get(params.id)?.adapter?.runAllCells();
   },
+  runAllCellsPipelined: async (
+    id: string | { id: string; window?: number },
+    window?: number
+  ): Promise<ICellRunProgress[]> => {
+    const params = typeof id === 'object' ? id : { id, window };
+    const adapter = get().notebooks.get(params.id)?.adapter;
+    if (!adapter) {
+      console.warn(
+        `[NotebookState] runAllCellsPipelined: adapter not found for notebook '${params.id}'`
+      );
+      return [];
+    }
+    const cells: Record<string, CellRunStatus> = {};
+    let finished = 0;
+    let failed = false;
+    const total = adapter.notebook.widgets.filter(
+      cell => cell.model.type === 'code'
+    ).length;
+    const changeRunProgress = () =>
+      get().changeRunProgress({
+        id: params.id,
+        runProgress: {
+          status: failed ? 'error' : finished < total ? 'running' : 'completed',
+          total,
+          finished,
+          cells: { ...cells },
+        },
+      });
+    changeRunProgress();
+    const results = await adapter.runAllCellsPipelined({
+      window: params.window,
+      onProgress: ({ cellId, status }) => {
+        cells[cellId] = status;
+        if (status !== 'queued' && status !== 'running') {
+          finished++;
+        }
+        failed = failed || status === 'error';
+        changeRunProgress();
+      },
+    });
+    if (results.length === 0) {
+      // The kernel is not ready, nothing ran.
+      get().changeRunProgress({ id: params.id, runProgress: undefined });
+    }
+    return results;
+  },
   clearAllOutputs: (id: string): void => {
     get().notebooks.get(id)?.adapter?.clearAllOutputs();
   },
@@ -417,6 +500,9 @@ export const notebookStore = createStore<NotebookState>((set, get) => ({
   selectKernelStatus: (id: string): string | undefined => {
     return get().notebooks.get(id)?.kernelStatus;
   },
+  selectRunProgress: (id: string): INotebookRunProgress | undefined => {
+    return get().notebooks.get(id)?.runProgress;
+  },
   selectActiveCell: (id: string): Cell<ICellModel> | undefined => {
     return get().notebooks.get(id)?.activeCell;
   },
@@ -501,6 +587,14 @@ export const notebookStore = createStore<NotebookState>((set, get) => ({
       set((_state: NotebookState) => ({ notebooks }));
     }
   },
+  changeRunProgress: (runProgressMutation: RunProgressMutation) => {
+    const notebooks = get().notebooks;
+    const notebook = notebooks.get(runProgressMutation.id);
+    if (notebook) {
+      notebook.runProgress = runProgressMutation.runProgress;
+      set((_state: NotebookState) => ({ notebooks }));
+    }
+  },
   addPortals: (portalsMutation: ReactPortalsMutation) => {
     const notebooks = get().notebooks;
     const notebook = notebooks.get(portalsMutation.id);
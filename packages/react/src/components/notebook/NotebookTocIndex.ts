@@ -0,0 +1,307 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import type { ICellModel } from '@jupyterlab/cells';
+import type { INotebookModel } from '@jupyterlab/notebook';
+import type { IObservableList } from '@jupyterlab/observables';
+import { TableOfContentsUtils } from '@jupyterlab/toc';
+import type { IDisposable } from '@lumino/disposable';
+import { Signal, type ISignal } from '@lumino/signaling';
+
+/**
+ * Default milliseconds the cell changes are coalesced before an update.
+ */
+export const DEFAULT_TOC_UPDATE_DELAY = 100;
+
+/**
+ * Number of parsed sources kept in the cache beyond the cells.
+ */
+const CACHE_MARGIN = 1000;
+
+/**
+ * A heading of a markdown cell.
+ */
+export interface INotebookTocHeading {
+  text: string;
+  level: number;
+  /**
+   * Line of the heading in the cell source.
+   */
+  line: number;
+  cellId: string;
+  cellIndex: number;
+}
+
+type IMarkdownHeading = Pick<INotebookTocHeading, 'text' | 'level' | 'line'>;
+
+type ICellEntry = {
+  cell: ICellModel;
+  /**
+   * Hash of the parsed source, undefined for the cells not parsed yet.
+   */
+  hash?: string;
+  headings: IMarkdownHeading[];
+};
+
+/**
+ * Return the 53 bits cyrb53 hash of a string, in base 36.
+ */
+export function hashSource(source: string): string {
+  let h1 = 0xdeadbeef;
+  let h2 = 0x41c6ce57;
+  for (let i = 0; i < source.length; i++) {
+    const c = source.charCodeAt(i);
+    h1 = Math.imul(h1 ^ c, 2654435761);
+    h2 = Math.imul(h2 ^ c, 1597334677);
+  }
+  h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507);
+  h1 ^= Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+  h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507);
+  h2 ^= Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+  return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(36);
+}
+
+const sameHeadings = (a: IMarkdownHeading[], b: IMarkdownHeading[]) =>
+  a.length === b.length &&
+  a.every(
+    (heading, i) =>
+      heading.text === b[i].text &&
+      heading.level === b[i].level &&
+      heading.line === b[i].line
+  );
+
+/**
+ * Table of contents of the markdown cells of a notebook, maintained from
+ * the cell changes.
+ *
+ * Unlike the JupyterLab generator, which parses all the markdown cells on
+ * any change, a change parses the changed cell only, and not at all if
+ * its source hash is already known. The changes are coalesced over
+ * `updateDelay`, and `changed` is emitted only if the headings or their
+ * cell indices changed, so typing in a paragraph does not update the
+ * table of contents.
+ */
+export class NotebookTocIndex implements IDisposable {
+  private _model: INotebookModel;
+  private _maximalDepth: number;
+  private _updateDelay: number;
+  private _entries: ICellEntry[] = [];
+  private _byCell = new Map<ICellModel, ICellEntry>();
+  private _cache = new Map<string, IMarkdownHeading[]>();
+  private _dirty = new Set<ICellEntry>();
+  private _stale = false;
+  private _headings: INotebookTocHeading[] = [];
+  private _timeout?: ReturnType<typeof setTimeout>;
+  private _changed = new Signal<this, void>(this);
+  private _isDisposed = false;
+
+  constructor(model: INotebookModel, options: NotebookTocIndex.IOptions = {}) {
+    this._model = model;
+    this._maximalDepth = options.maximalDepth ?? 6;
+    this._updateDelay = options.updateDelay ?? DEFAULT_TOC_UPDATE_DELAY;
+    this._insert(0, Array.from(model.cells));
+    model.cells.changed.connect(this._onCellsChanged, this);
+    this.flush();
+  }
+
+  /**
+   * Emitted when the headings changed.
+   */
+  get changed(): ISignal<this, void> {
+    return this._changed;
+  }
+
+  /**
+   * The headings, in the order of the notebook.
+   */
+  get headings(): readonly INotebookTocHeading[] {
+    return this._headings;
+  }
+
+  get isDisposed(): boolean {
+    return this._isDisposed;
+  }
+
+  /**
+   * Return the index of the heading of the cell at index, the last heading
+   * of the cell or above it, -1 if there is none.
+   */
+  headingIndexAt(cellIndex: number): number {
+    let low = 0;
+    let high = this._headings.length;
+    while (low < high) {
+      const middle = (low + high) >>> 1;
+      if (this._headings[middle].cellIndex <= cellIndex) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+    return low - 1;
+  }
+
+  /**
+   * Apply the pending cell changes now.
+   */
+  flush(): void {
+    if (this._timeout !== undefined) {
+      clearTimeout(this._timeout);
+      this._timeout = undefined;
+    }
+    for (const entry of this._dirty) {
+      const headings = this._parse(entry);
+      if (!sameHeadings(entry.headings, headings)) {
+        entry.headings = headings;
+        this._stale = true;
+      }
+    }
+    this._dirty.clear();
+    if (!this._stale) {
+      return;
+    }
+    this._stale = false;
+    const headings = new Array<INotebookTocHeading>();
+    this._entries.forEach((entry, cellIndex) => {
+      for (const heading of entry.headings) {
+        headings.push({ ...heading, cellId: entry.cell.id, cellIndex });
+      }
+    });
+    this._headings = headings;
+    this._pruneCache();
+    this._changed.emit();
+  }
+
+  dispose(): void {
+    if (this._isDisposed) {
+      return;
+    }
+    this._isDisposed = true;
+    if (this._timeout !== undefined) {
+      clearTimeout(this._timeout);
+    }
+    if (!this._model.isDisposed) {
+      this._model.cells.changed.disconnect(this._onCellsChanged, this);
+    }
+    this._remove(0, this._entries.length);
+    this._cache.clear();
+    Signal.clearData(this);
+  }
+
+  private _parse(entry: ICellEntry): IMarkdownHeading[] {
+    const source = entry.cell.sharedModel.getSource();
+    const hash = hashSource(source);
+    if (hash === entry.hash) {
+      return entry.headings;
+    }
+    entry.hash = hash;
+    let headings = this._cache.get(hash);
+    if (headings) {
+      // Most recently used last.
+      this._cache.delete(hash);
+    } else {
+      headings = TableOfContentsUtils.Markdown.getHeadings(source)
+        .filter(heading => heading.level <= this._maximalDepth)
+        .map(({ text, level, line }) => ({ text, level, line }));
+    }
+    this._cache.set(hash, headings);
+    return headings;
+  }
+
+  private _pruneCache(): void {
+    const excess = this._cache.size - this._entries.length - CACHE_MARGIN;
+    if (excess <= 0) {
+      return;
+    }
+    const hashes = this._cache.keys();
+    for (let i = 0; i < excess; i++) {
+      this._cache.delete(hashes.next().value as string);
+    }
+  }
+
+  private _insert(index: number, cells: ICellModel[]): void {
+    const entries = cells.map(cell => {
+      const entry: ICellEntry = { cell, headings: [] };
+      this._byCell.set(cell, entry);
+      if (cell.type === 'markdown') {
+        cell.contentChanged.connect(this._onContentChanged, this);
+        this._dirty.add(entry);
+      }
+      return entry;
+    });
+    this._entries.splice(index, 0, ...entries);
+  }
+
+  private _remove(index: number, count: number): void {
+    for (const entry of this._entries.splice(index, count)) {
+      entry.cell.contentChanged.disconnect(this._onContentChanged, this);
+      this._byCell.delete(entry.cell);
+      this._dirty.delete(entry);
+    }
+  }
+
+  private _onCellsChanged(
+    _: unknown,
+    change: IObservableList.IChangedArgs<ICellModel>
+  ): void {
+    switch (change.type) {
+      case 'add':
+        this._insert(change.newIndex, change.newValues);
+        break;
+      case 'remove':
+        this._remove(change.oldIndex, change.oldValues.length);
+        break;
+      case 'move': {
+        const moved = this._entries.splice(
+          change.oldIndex,
+          change.oldValues.length
+        );
+        this._entries.splice(change.newIndex, 0, ...moved);
+        break;
+      }
+      case 'set':
+        this._remove(change.oldIndex, change.oldValues.length);
+        this._insert(change.newIndex, change.newValues);
+        break;
+      case 'clear':
+        this._remove(0, this._entries.length);
+        break;
+    }
+    this._stale = true;
+    this._schedule();
+  }
+
+  private _onContentChanged(cell: ICellModel): void {
+    const entry = this._byCell.get(cell);
+    if (entry) {
+      this._dirty.add(entry);
+      this._schedule();
+    }
+  }
+
+  private _schedule(): void {
+    if (this._timeout === undefined) {
+      this._timeout = setTimeout(() => {
+        this._timeout = undefined;
+        this.flush();
+      }, this._updateDelay);
+    }
+  }
+}
+
+export namespace NotebookTocIndex {
+  export interface IOptions {
+    /**
+     * Maximal level of the headings, 6 by default.
+     */
+    maximalDepth?: number;
+    /**
+     * Milliseconds the cell changes are coalesced before an update.
+     */
+    updateDelay?: number;
+  }
+}
+
+export default NotebookTocIndex;
@@ -0,0 +1,167 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import React, { useEffect, useRef, useState } from 'react';
+import { Box } from '@datalayer/primer-addons';
+import type { INotebookTocHeading, NotebookTocIndex } from './NotebookTocIndex';
+
+/**
+ * Default height in pixels of a heading row.
+ */
+const DEFAULT_ROW_HEIGHT = 24;
+
+export interface INotebookTocPanelProps {
+  /**
+   * Table of contents of the notebook
+   */
+  index: NotebookTocIndex;
+  /**
+   * Index of the active cell, its heading is highlighted and scrolled into
+   * view
+   */
+  activeCellIndex?: number;
+  /**
+   * Callback of a click on a heading
+   */
+  onSelect?: (heading: INotebookTocHeading) => void;
+  /**
+   * Height in pixels of a heading row
+   */
+  rowHeight?: number;
+  /**
+   * Number of rows rendered above and below the viewport
+   */
+  overscanCount?: number;
+}
+
+/**
+ * Virtualized table of contents of a notebook.
+ *
+ * Only the heading rows in and around the viewport are rendered, so the
+ * panel of a notebook with thousands of headings stays as fast as a short
+ * one. The heading of the active cell is found by a binary search.
+ */
+export const NotebookTocPanel: React.FC<INotebookTocPanelProps> = ({
+  index,
+  activeCellIndex,
+  onSelect,
+  rowHeight = DEFAULT_ROW_HEIGHT,
+  overscanCount = 10,
+}) => {
+  const [, setVersion] = useState(0);
+  const [viewport, setViewport] = useState({ top: 0, height: 0 });
+  const containerRef = useRef<HTMLDivElement>(null);
+
+  useEffect(() => {
+    const update = () => setVersion(version => version + 1);
+    index.changed.connect(update);
+    return () => {
+      index.changed.disconnect(update);
+    };
+  }, [index]);
+
+  useEffect(() => {
+    const container = containerRef.current;
+    if (!container) {
+      return;
+    }
+    const observer = new ResizeObserver(() => {
+      setViewport({
+        top: container.scrollTop,
+        height: container.clientHeight,
+      });
+    });
+    observer.observe(container);
+    return () => observer.disconnect();
+  }, []);
+
+  const headings = index.headings;
+  const active =
+    activeCellIndex === undefined ? -1 : index.headingIndexAt(activeCellIndex);
+
+  useEffect(() => {
+    const container = containerRef.current;
+    if (!container || active < 0) {
+      return;
+    }
+    const top = active * rowHeight;
+    const bottom = top + rowHeight - container.clientHeight;
+    if (top < container.scrollTop) {
+      container.scrollTop = top;
+    } else if (bottom > container.scrollTop) {
+      container.scrollTop = bottom;
+    }
+  }, [active, rowHeight]);
+
+  const start = Math.max(
+    0,
+    Math.floor(viewport.top / rowHeight) - overscanCount
+  );
+  const end = Math.min(
+    headings.length,
+    Math.ceil((viewport.top + viewport.height) / rowHeight) + overscanCount
+  );
+  const rows = new Array<JSX.Element>();
+  for (let i = start; i < end; i++) {
+    const heading = headings[i];
+    rows.push(
+      <Box
+        key={`${heading.cellId}-${heading.line}`}
+        role="treeitem"
+        aria-level={heading.level}
+        aria-selected={i === active}
+        title={heading.text}
+        onClick={() => onSelect?.(heading)}
+        sx={{
+          position: 'absolute',
+          top: `${i * rowHeight}px`,
+          left: 0,
+          right: 0,
+          height: `${rowHeight}px`,
+          lineHeight: `${rowHeight}px`,
+          paddingLeft: `${(heading.level - 1) * 12 + 8}px`,
+          paddingRight: 2,
+          overflow: 'hidden',
+          whiteSpace: 'nowrap',
+          textOverflow: 'ellipsis',
+          cursor: 'pointer',
+          fontWeight: heading.level === 1 ? 'bold' : 'normal',
+          backgroundColor: i === active ? 'accent.subtle' : 'transparent',
+          ':hover': { backgroundColor: 'canvas.subtle' },
+        }}
+      >
+        {heading.text}
+      </Box>
+    );
+  }
+
+  return (
+    <Box
+      ref={containerRef}
+      className="dla-NotebookTocPanel"
+      role="tree"
+      aria-label="Table of contents"
+      onScroll={(event: React.UIEvent<HTMLDivElement>) =>
+        setViewport({
+          top: event.currentTarget.scrollTop,
+          height: event.currentTarget.clientHeight,
+        })
+      }
+      sx={{ height: '100%', overflowY: 'auto', fontSize: 1 }}
+    >
+      <Box
+        sx={{
+          position: 'relative',
+          height: `${headings.length * rowHeight}px`,
+        }}
+      >
+        {rows}
+      </Box>
+    </Box>
+  );
+};
+
+export default NotebookTocPanel;
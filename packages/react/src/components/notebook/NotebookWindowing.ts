@@ -0,0 +1,467 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import type { Cell, ICellModel } from '@jupyterlab/cells';
+import type {
+  CellList,
+  Notebook,
+  NotebookViewModel,
+  StaticNotebook,
+} from '@jupyterlab/notebook';
+import type { IObservableList } from '@jupyterlab/observables';
+import type { IDisposable } from '@lumino/disposable';
+
+/**
+ * Default number of cells rendered above and below the viewport.
+ */
+export const DEFAULT_WINDOWING_OVERSCAN_COUNT = 4;
+
+/**
+ * Height in pixels estimated for a cell neither measured nor rendered yet.
+ */
+const DEFAULT_CELL_HEIGHT = 60;
+
+/**
+ * Milliseconds the measured heights are buffered before being persisted.
+ */
+const SAVE_DELAY = 1000;
+
+/**
+ * Number of notebooks whose heights are persisted, the least recently
+ * updated ones are evicted beyond.
+ */
+const MAX_ENTRIES = 200;
+
+/**
+ * Milliseconds the heights of a notebook are persisted after their last
+ * update.
+ */
+const MAX_AGE = 30 * 24 * 60 * 60 * 1000;
+
+const DATABASE_NAME = 'jupyter-react-cell-heights';
+
+const OBJECT_STORE_NAME = 'notebooks';
+
+/**
+ * Windowed rendering options of a notebook.
+ */
+export type INotebookWindowingOptions = {
+  /**
+   * Number of cells rendered above and below the viewport.
+   */
+  overscanCount?: number;
+  /**
+   * Persist the measured cell heights in the browser IndexedDB, so the
+   * scrollbar of a reopened notebook is right before its cells render.
+   * The heights are keyed by the notebook path, or by its id when it is
+   * given, and are not persisted without either.
+   */
+  persistHeights?: boolean;
+};
+
+type ICellHeightsEntry = {
+  id: string;
+  heights: Record<string, number>;
+  /**
+   * Epoch time in milliseconds.
+   */
+  updated: number;
+};
+
+/**
+ * Heights kept when IndexedDB is not available, per notebook.
+ */
+const memoryHeights = new Map<string, ICellHeightsEntry>();
+
+let database: Promise<IDBDatabase> | undefined;
+
+function promisify<T>(request: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+/**
+ * Delete the heights not updated for `MAX_AGE`, and the least recently
+ * updated ones beyond `MAX_ENTRIES`.
+ */
+async function evictEntries(db: IDBDatabase): Promise<void> {
+  const entries = await promisify<ICellHeightsEntry[]>(
+    db
+      .transaction(OBJECT_STORE_NAME, 'readonly')
+      .objectStore(OBJECT_STORE_NAME)
+      .getAll()
+  );
+  const expired = Date.now() - MAX_AGE;
+  const evicted = entries
+    .sort((a, b) => b.updated - a.updated)
+    .filter((entry, index) => index >= MAX_ENTRIES || entry.updated < expired);
+  if (evicted.length === 0) {
+    return;
+  }
+  const store = db
+    .transaction(OBJECT_STORE_NAME, 'readwrite')
+    .objectStore(OBJECT_STORE_NAME);
+  await Promise.all(evicted.map(entry => promisify(store.delete(entry.id))));
+}
+
+function openDatabase(): Promise<IDBDatabase> {
+  if (!database) {
+    const request = indexedDB.open(DATABASE_NAME, 1);
+    request.onupgradeneeded = () => {
+      request.result.createObjectStore(OBJECT_STORE_NAME, { keyPath: 'id' });
+    };
+    // The store is evicted once per page.
+    database = promisify(request).then(db => {
+      evictEntries(db).catch(error =>
+        console.debug('Failed to evict the cell heights.', error)
+      );
+      return db;
+    });
+  }
+  return database;
+}
+
+/**
+ * The measured heights of the cells of a notebook, by cell id.
+ *
+ * The heights are loaded from and saved to the browser IndexedDB, or kept
+ * in memory for the page when it is not available. They are not written
+ * in the cell metadata, measuring a cell does not change the document.
+ * Without a notebook id, the heights are not persisted.
+ */
+export class CellHeightCache {
+  private _notebookId?: string;
+  private _persist: boolean;
+  private _heights = new Map<string, number>();
+  private _saveTimeout?: ReturnType<typeof setTimeout>;
+  private _cellIds?: () => Iterable<string>;
+
+  constructor(notebookId?: string, persist = true) {
+    this._notebookId = notebookId;
+    this._persist = persist && notebookId !== undefined;
+  }
+
+  /**
+   * Number of measured cells.
+   */
+  get size(): number {
+    return this._heights.size;
+  }
+
+  /**
+   * Load the persisted heights, the measured ones take precedence.
+   */
+  async load(): Promise<void> {
+    if (!this._persist) {
+      return;
+    }
+    let entry: ICellHeightsEntry | undefined;
+    if (typeof indexedDB === 'undefined') {
+      entry = memoryHeights.get(this._notebookId!);
+    } else {
+      const db = await openDatabase();
+      entry = await promisify<ICellHeightsEntry | undefined>(
+        db
+          .transaction(OBJECT_STORE_NAME, 'readonly')
+          .objectStore(OBJECT_STORE_NAME)
+          .get(this._notebookId!)
+      );
+    }
+    for (const [cellId, height] of Object.entries(entry?.heights ?? {})) {
+      if (!this._heights.has(cellId)) {
+        this._heights.set(cellId, height);
+      }
+    }
+  }
+
+  get(cellId: string): number | undefined {
+    return this._heights.get(cellId);
+  }
+
+  /**
+   * Record the height of a cell, and schedule the save.
+   */
+  set(cellId: string, height: number): void {
+    if (this._heights.get(cellId) === height) {
+      return;
+    }
+    this._heights.set(cellId, height);
+    if (this._persist && this._saveTimeout === undefined) {
+      this._saveTimeout = setTimeout(() => {
+        this._saveTimeout = undefined;
+        this.save().catch(error =>
+          console.debug('Failed to save the cell heights.', error)
+        );
+      }, SAVE_DELAY);
+    }
+  }
+
+  /**
+   * Restrict the saved heights to the cells returned by a function, e.g.
+   * the current cells of the notebook.
+   */
+  retain(cellIds: () => Iterable<string>): void {
+    this._cellIds = cellIds;
+  }
+
+  /**
+   * Save the heights now.
+   */
+  async save(): Promise<void> {
+    clearTimeout(this._saveTimeout);
+    this._saveTimeout = undefined;
+    if (!this._persist) {
+      return;
+    }
+    const heights: Record<string, number> = {};
+    if (this._cellIds) {
+      for (const cellId of this._cellIds()) {
+        const height = this._heights.get(cellId);
+        if (height !== undefined) {
+          heights[cellId] = height;
+        }
+      }
+    } else {
+      this._heights.forEach((height, cellId) => (heights[cellId] = height));
+    }
+    const entry = { id: this._notebookId!, heights, updated: Date.now() };
+    if (typeof indexedDB === 'undefined') {
+      memoryHeights.set(this._notebookId, entry);
+      return;
+    }
+    const db = await openDatabase();
+    await promisify(
+      db
+        .transaction(OBJECT_STORE_NAME, 'readwrite')
+        .objectStore(OBJECT_STORE_NAME)
+        .put(entry)
+    );
+  }
+}
+
+/**
+ * Dependable windowed rendering of a notebook in the JupyterLab `full`
+ * windowing mode, where only the cells in and around the viewport are
+ * attached to the DOM, so the offscreen editors and outputs are detached.
+ *
+ * It makes the mode usable in the React components:
+ * - The size estimate of the cells tolerates the models list being ahead
+ *   of the cell widgets while cells are inserted, which crashed the
+ *   JupyterLab estimate.
+ * - The measured heights are cached by cell id, persisted, and used as the
+ *   estimates of the cells not rendered, so the scrollbar does not jump.
+ * - The first visible cell is the scroll anchor: when a cell above it
+ *   changes height, e.g. on new outputs, the scroll offset is shifted by
+ *   the difference so the visible content stays still.
+ */
+export class NotebookWindowing implements IDisposable {
+  private _notebook: Notebook;
+  private _viewModel: NotebookViewModel;
+  private _cache: CellHeightCache;
+  private _estimate: (index: number) => number;
+  private _observer?: ResizeObserver;
+  private _cells = new WeakMap<Element, Cell>();
+  private _heights = new WeakMap<Element, number>();
+  private _anchor: Cell | null = null;
+  private _scrollNode: HTMLElement;
+  private _isDisposed = false;
+
+  constructor(notebook: Notebook, options: NotebookWindowing.IOptions) {
+    this._notebook = notebook;
+    this._viewModel = notebook.viewModel;
+    this._cache =
+      options.cache ??
+      new CellHeightCache(options.notebookId, options.persistHeights ?? true);
+    this._cache.retain(() => this._cellIds());
+    this._estimate = this._viewModel.estimateWidgetSize;
+    this._viewModel.estimateWidgetSize = this.estimateCellHeight;
+    this._scrollNode = notebook.outerNode ?? notebook.node;
+    // The native anchoring would shift the offset a second time.
+    this._scrollNode.style.overflowAnchor = 'none';
+    this._scrollNode.addEventListener('scroll', this._onScroll, {
+      passive: true,
+    });
+    if (typeof ResizeObserver !== 'undefined') {
+      this._observer = new ResizeObserver(this._onResize);
+    }
+    this._observe(0, notebook.widgets.length);
+    notebook.modelChanged.connect(this._onModelChanged, this);
+    this._onModelChanged(notebook);
+    this._cache
+      .load()
+      .then(() => this._applyHeights())
+      .catch(error => console.debug('Failed to load the cell heights.', error));
+  }
+
+  get isDisposed(): boolean {
+    return this._isDisposed;
+  }
+
+  /**
+   * The cell heights cache.
+   */
+  get cache(): CellHeightCache {
+    return this._cache;
+  }
+
+  /**
+   * Estimated height of the cell of an index: the measured one, else the
+   * JupyterLab estimate when the widget of the cell exists.
+   */
+  readonly estimateCellHeight = (index: number): number => {
+    const model = this._notebook.model?.cells.get(index);
+    const height = model ? this._cache.get(model.id) : undefined;
+    if (height !== undefined) {
+      return height;
+    }
+    // The widgets are inserted after the models list changed.
+    if (model && this._notebook.widgets[index]?.model === model) {
+      try {
+        return this._estimate(index);
+      } catch {
+        // The cell may be disposed.
+      }
+    }
+    return DEFAULT_CELL_HEIGHT;
+  };
+
+  dispose(): void {
+    if (this._isDisposed) {
+      return;
+    }
+    this._isDisposed = true;
+    this._observer?.disconnect();
+    this._scrollNode.removeEventListener('scroll', this._onScroll);
+    this._notebook.modelChanged.disconnect(this._onModelChanged, this);
+    this._notebook.model?.cells.changed.disconnect(this._onCellsChanged, this);
+    if (!this._viewModel.isDisposed) {
+      this._viewModel.estimateWidgetSize = this._estimate;
+    }
+    this._cache
+      .save()
+      .catch(error => console.debug('Failed to save the cell heights.', error));
+  }
+
+  private *_cellIds(): Iterable<string> {
+    const cells = this._notebook.model?.cells;
+    for (let i = 0; i < (cells?.length ?? 0); i++) {
+      yield cells!.get(i).id;
+    }
+  }
+
+  /**
+   * Give the cached heights of the cells to the view model.
+   */
+  private _applyHeights(): void {
+    if (this._isDisposed || this._viewModel.isDisposed) {
+      return;
+    }
+    const sizes = new Array<{ index: number; size: number }>();
+    const cells = this._notebook.model?.cells;
+    for (let index = 0; index < (cells?.length ?? 0); index++) {
+      const size = this._cache.get(cells!.get(index).id);
+      if (size !== undefined) {
+        sizes.push({ index, size });
+      }
+    }
+    if (sizes.length > 0) {
+      this._viewModel.setWidgetSize(sizes);
+    }
+  }
+
+  private _observe(start: number, count: number): void {
+    const widgets = this._notebook.widgets;
+    for (let i = start; i < Math.min(start + count, widgets.length); i++) {
+      const cell = widgets[i];
+      if (!this._cells.has(cell.node)) {
+        this._cells.set(cell.node, cell);
+        this._observer?.observe(cell.node);
+      }
+    }
+  }
+
+  private _onModelChanged(notebook: StaticNotebook): void {
+    notebook.model?.cells.changed.connect(this._onCellsChanged, this);
+  }
+
+  private _onCellsChanged(
+    _: CellList,
+    args: IObservableList.IChangedArgs<ICellModel>
+  ): void {
+    // The notebook connected first, its widgets are inserted.
+    if (args.type === 'add' || args.type === 'set') {
+      this._observe(args.newIndex, args.newValues.length);
+    }
+  }
+
+  /**
+   * Keep the first cell visible in the viewport as the anchor.
+   */
+  private _onScroll = (): void => {
+    const top = this._scrollNode.getBoundingClientRect().top;
+    const viewport = this._notebook.viewportNode ?? this._scrollNode;
+    this._anchor = null;
+    for (const node of Array.from(viewport.children)) {
+      const cell = this._cells.get(node);
+      if (cell && node.getBoundingClientRect().bottom > top) {
+        this._anchor = cell;
+        break;
+      }
+    }
+  };
+
+  private _onResize = (entries: ResizeObserverEntry[]): void => {
+    const widgets = this._notebook.widgets;
+    const anchorIndex = this._anchor ? widgets.indexOf(this._anchor) : -1;
+    let shift = 0;
+    for (const entry of entries) {
+      const cell = this._cells.get(entry.target);
+      const height =
+        entry.borderBoxSize?.[0]?.blockSize ?? entry.contentRect.height;
+      // A detached cell has no height.
+      if (!cell || cell.isDisposed || height <= 0) {
+        continue;
+      }
+      const index = anchorIndex < 0 ? -1 : widgets.indexOf(cell);
+      // The estimate of a cell measured for the first time, read before
+      // the cache holds its measured height.
+      const before =
+        index >= 0 && index < anchorIndex
+          ? this._heights.get(entry.target) ?? this.estimateCellHeight(index)
+          : undefined;
+      this._heights.set(entry.target, height);
+      this._cache.set(cell.model.id, height);
+      if (before !== undefined) {
+        shift += height - before;
+      }
+    }
+    if (shift !== 0 && this._scrollNode.scrollTop > 0) {
+      this._scrollNode.scrollTop += shift;
+    }
+  };
+}
+
+export namespace NotebookWindowing {
+  export interface IOptions {
+    /**
+     * Stable id of the notebook keying the persisted heights, e.g. its
+     * path. The heights are not persisted without it.
+     */
+    notebookId?: string;
+    /**
+     * Persist the measured heights, true by default.
+     */
+    persistHeights?: boolean;
+    /**
+     * Heights cache, a new one for the notebook id by default.
+     */
+    cache?: CellHeightCache;
+  }
+}
+
+export default NotebookWindowing;
@@ -0,0 +1,176 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the delta saves of a notebook with large outputs.
+ *
+ * The cells of the NotebookNbformat example are repeated, with an image
+ * output each, and the benchmark reports the size of the request body for:
+ * 1. A full save of the notebook
+ * 2. A patch saving an edit of one character in a cell source
+ * It also verifies that the patches computed for the edits, insertions,
+ * deletions and metadata changes restore the notebook once applied, and
+ * that a save falls back to the full content when the patch request fails.
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import type { INotebookContent } from '@jupyterlab/nbformat';
+import { ServerConnection } from '@jupyterlab/services';
+import {
+  NotebookDeltaSaves,
+  diffNotebook,
+  toNotebookRevision,
+  type JsonPatchOperation,
+} from '../NotebookDeltaSaves';
+
+import NBFORMAT from '../../../examples/notebooks/NotebookExample1.ipynb.json';
+
+const CELLS = 1000;
+
+const IMAGE = 'A'.repeat(10000);
+
+function createNotebook(): INotebookContent {
+  const example = NBFORMAT as INotebookContent;
+  const cells = Array.from({ length: CELLS }, (_, i) => {
+    const cell = example.cells[i % example.cells.length];
+    return cell.cell_type === 'code'
+      ? {
+          ...cell,
+          id: `cell-${i}`,
+          outputs: [
+            {
+              output_type: 'display_data',
+              data: { 'image/png': IMAGE, 'text/plain': `<Figure ${i}>` },
+              metadata: {},
+            },
+          ],
+        }
+      : { ...cell, id: `cell-${i}` };
+  });
+  return { ...example, nbformat_minor: 5, cells };
+}
+
+/**
+ * Apply a patch as the server does, to check it restores the notebook.
+ */
+function applyPatch(document: any, patch: JsonPatchOperation[]): any {
+  for (const operation of patch) {
+    const tokens = operation.path
+      .slice(1)
+      .split('/')
+      .map(token => token.replace(/~1/g, '/').replace(/~0/g, '~'));
+    const key = tokens.pop()!;
+    const parent = tokens.reduce((value, token) => value[token], document);
+    if (Array.isArray(parent)) {
+      const index = key === '-' ? parent.length : Number(key);
+      if (operation.op === 'add') {
+        parent.splice(index, 0, operation.value);
+      } else if (operation.op === 'remove') {
+        parent.splice(index, 1);
+      } else {
+        parent[index] = operation.value;
+      }
+    } else if (operation.op === 'remove') {
+      delete parent[key];
+    } else {
+      parent[key] = operation.value;
+    }
+  }
+  return document;
+}
+
+const clone = (notebook: INotebookContent): INotebookContent =>
+  JSON.parse(JSON.stringify(notebook));
+
+describe('NotebookDeltaSaves benchmark', () => {
+  const saved = createNotebook();
+  const revision = toNotebookRevision(saved, '2023-01-01T00:00:00Z');
+
+  it(`saves an edit of a notebook of ${CELLS} cells`, () => {
+    const edited = clone(saved);
+    edited.cells[CELLS / 2].source += ' ';
+
+    let start = performance.now();
+    const full = JSON.stringify({ type: 'notebook', content: edited });
+    const fullElapsed = performance.now() - start;
+
+    start = performance.now();
+    const patch = diffNotebook(revision, edited);
+    const body = JSON.stringify({ revision: revision.revision, patch });
+    const patchElapsed = performance.now() - start;
+
+    expect(patch).toEqual([
+      {
+        op: 'replace',
+        path: `/cells/${CELLS / 2}/source`,
+        value: edited.cells[CELLS / 2].source,
+      },
+    ]);
+    console.log(
+      `${(full.length / 1e6).toFixed(1)} MB full save in ` +
+        `${fullElapsed.toFixed(0)} ms, ${body.length} B patch in ` +
+        `${patchElapsed.toFixed(0)} ms`
+    );
+    expect(body.length * 1000).toBeLessThan(full.length);
+  });
+
+  it('computes the patches restoring the notebook', () => {
+    const edits: ((notebook: INotebookContent) => void)[] = [
+      notebook => notebook.cells.splice(3, 0, { ...notebook.cells[0] }),
+      notebook => notebook.cells.splice(10, 2),
+      notebook => notebook.cells.push(notebook.cells.shift()!),
+      notebook => {
+        notebook.cells[1].metadata = { tags: ['raises-exception'] };
+        notebook.metadata['a/b~c'] = 1;
+        delete notebook.metadata.kernelspec;
+      },
+      notebook => {
+        notebook.cells = [];
+      },
+    ];
+    for (const edit of edits) {
+      const edited = clone(saved);
+      edit(edited);
+      const patch = diffNotebook(revision, edited);
+      expect(applyPatch(clone(saved), patch)).toEqual(edited);
+    }
+    expect(diffNotebook(revision, clone(saved))).toEqual([]);
+  });
+
+  it('saves in full when the patch request fails', async () => {
+    const deltaSaves = new NotebookDeltaSaves({
+      serverSettings: ServerConnection.makeSettings({
+        baseUrl: 'http://localhost:8888/',
+        fetch: () => Promise.reject(new TypeError('Failed to fetch')),
+      }),
+    });
+    const saves = new Array<string>();
+    const contents = deltaSaves.wrapContents({
+      get: async (path: string) => ({
+        path,
+        type: 'notebook',
+        content: saved,
+        last_modified: revision.revision,
+      }),
+      save: async (path: string) => {
+        saves.push(path);
+        return { path, type: 'notebook', last_modified: '2023-01-02' };
+      },
+      rename: async () => undefined,
+      delete: async () => undefined,
+    } as any);
+    await contents.get('large.ipynb');
+    const edited = clone(saved);
+    edited.cells[0].source += ' ';
+    const model = await contents.save('large.ipynb', {
+      type: 'notebook',
+      content: edited,
+    });
+    expect(saves).toEqual(['large.ipynb']);
+    expect(model.last_modified).toBe('2023-01-02');
+    expect(deltaSaves.getRevision('large.ipynb')?.revision).toBe('2023-01-02');
+  });
+});
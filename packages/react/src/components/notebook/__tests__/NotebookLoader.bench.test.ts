@@ -0,0 +1,114 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the streaming load of a large notebook.
+ *
+ * The cells of the NotebookNbformat example are repeated, with an image
+ * output each, up to a notebook of about 50 MB, and the benchmark reports
+ * the time to the first interactive cell:
+ * 1. Parsing the JSON and creating all the cells at once, as `Notebook`
+ *    does without streaming
+ * 2. Streaming the cells by chunks, the parsing being done in the worker
+ * It also verifies that:
+ * 1. The notebook cannot be serialized while it is loading
+ * 2. Once loaded, the model has all the cells and outputs of the notebook
+ * 3. The invalid notebooks are rejected
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import type { ICodeCell, INotebookContent } from '@jupyterlab/nbformat';
+import { NotebookModel } from '@jupyterlab/notebook';
+import { NotebookLoader } from '../NotebookLoader';
+import { validateNotebook } from '../NotebookParser';
+
+import NBFORMAT from '../../../examples/notebooks/NotebookExample1.ipynb.json';
+
+const CELLS = 5000;
+
+const IMAGE = 'A'.repeat(10000);
+
+function createNotebook(): string {
+  const example = NBFORMAT as INotebookContent;
+  const cells = Array.from({ length: CELLS }, (_, i) => {
+    const cell = example.cells[i % example.cells.length];
+    return cell.cell_type === 'code'
+      ? {
+          ...cell,
+          id: `cell-${i}`,
+          outputs: [
+            {
+              output_type: 'display_data',
+              data: { 'image/png': IMAGE, 'text/plain': `<Figure ${i}>` },
+              metadata: {},
+            },
+          ],
+        }
+      : { ...cell, id: `cell-${i}` };
+  });
+  return JSON.stringify({ ...example, nbformat_minor: 5, cells });
+}
+
+describe('NotebookLoader benchmark', () => {
+  const text = createNotebook();
+
+  it(`loads a notebook of ${CELLS} cells`, async () => {
+    let start = performance.now();
+    const eager = new NotebookModel();
+    eager.fromJSON(JSON.parse(text));
+    const eagerElapsed = performance.now() - start;
+
+    start = performance.now();
+    const content = JSON.parse(text);
+    const parsing = performance.now() - start;
+
+    const model = new NotebookModel();
+    start = performance.now();
+    const loader = new NotebookLoader(model).load({ content });
+    await loader.firstCells;
+    const firstCells = performance.now() - start;
+    expect(loader.isLoading).toBe(true);
+    expect(() => model.toJSON()).toThrow('The notebook is still loading.');
+    await loader.loaded;
+    const loaded = performance.now() - start;
+
+    const notebook = model.toJSON();
+    expect(notebook.cells).toHaveLength(CELLS);
+    const outputs = (notebook: INotebookContent) =>
+      notebook.cells
+        .filter(cell => cell.cell_type === 'code')
+        .map(cell => (cell as ICodeCell).outputs.length);
+    expect(outputs(notebook)).toEqual(outputs(eager.toJSON()));
+    loader.dispose();
+    model.dispose();
+    eager.dispose();
+
+    console.log(
+      `${(text.length / 1e6).toFixed(0)} MB notebook: first interactive ` +
+        `cell in ${eagerElapsed.toFixed(0)} ms at once, in ` +
+        `${firstCells.toFixed(0)} ms streamed (all the cells in ` +
+        `${loaded.toFixed(0)} ms), ${parsing.toFixed(0)} ms of parsing ` +
+        'moved to the worker'
+    );
+    expect(firstCells).toBeLessThan(eagerElapsed);
+  }, 120000);
+
+  it('rejects the invalid notebooks', () => {
+    expect(() => validateNotebook([])).toThrow(
+      'The notebook content must be a JSON object.'
+    );
+    expect(() => validateNotebook({ nbformat: 3, cells: [] })).toThrow(
+      'Unsupported nbformat 3'
+    );
+    expect(() =>
+      validateNotebook({
+        nbformat: 4,
+        nbformat_minor: 5,
+        cells: [{ cell_type: 'heading', source: '' }],
+      })
+    ).toThrow("The cell 0 has an invalid type 'heading'.");
+  });
+});
@@ -0,0 +1,137 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the pipelined run of all the cells of a notebook.
+ *
+ * A fake kernel answers the execute requests with a simulated round trip
+ * time of 50 ms, runs them one at a time in their order of arrival and,
+ * as a kernel receiving `stop_on_error` requests, aborts the queued ones
+ * after an error. The benchmark reports the time to run 40 short cells
+ * awaiting each reply, as the current run, and by windows of 8 requests.
+ * It also verifies that:
+ * 1. The cells are executed in order
+ * 2. No cell is executed after an error, the next ones of its window are
+ *    aborted and the next windows are not sent
+ * 3. The progress of each cell goes from queued to running to its reply
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { CellRunStatus, runPipelined } from '../NotebookRunner';
+
+const CELLS = 40;
+
+const ROUND_TRIP_TIME = 50;
+
+const EXECUTION_TIME = 1;
+
+const sleep = (ms: number) =>
+  new Promise<void>(resolve => setTimeout(resolve, ms));
+
+/**
+ * Fake kernel running the requests in order, `raise` fails.
+ */
+class FakeKernel {
+  executed = new Array<string>();
+  private _queue = new Array<{
+    code: string;
+    reply: (status: 'ok' | 'error' | 'aborted') => void;
+  }>();
+  private _busy = false;
+
+  execute(code: string): Promise<'ok' | 'error' | 'aborted'> {
+    return new Promise(resolve => {
+      const reply = (status: 'ok' | 'error' | 'aborted') =>
+        setTimeout(() => resolve(status), ROUND_TRIP_TIME / 2);
+      setTimeout(() => {
+        this._queue.push({ code, reply });
+        this._process();
+      }, ROUND_TRIP_TIME / 2);
+    });
+  }
+
+  private async _process(): Promise<void> {
+    if (this._busy) {
+      return;
+    }
+    this._busy = true;
+    while (this._queue.length > 0) {
+      const request = this._queue.shift()!;
+      await sleep(EXECUTION_TIME);
+      this.executed.push(request.code);
+      if (request.code === 'raise') {
+        request.reply('error');
+        this._queue.splice(0).forEach(queued => queued.reply('aborted'));
+      } else {
+        request.reply('ok');
+      }
+    }
+    this._busy = false;
+  }
+}
+
+const cells = (raiseAt?: number) =>
+  Array.from({ length: CELLS }, (_, i) =>
+    i === raiseAt ? 'raise' : `print(${i})`
+  );
+
+describe('NotebookRunner benchmark', () => {
+  it(`runs ${CELLS} cells at ${ROUND_TRIP_TIME} ms of round trip`, async () => {
+    const sources = cells();
+    const elapsed: Record<string, number> = {};
+    for (const window of [1, 8]) {
+      const kernel = new FakeKernel();
+      const start = performance.now();
+      const statuses = await runPipelined(
+        sources,
+        source => kernel.execute(source),
+        { window }
+      );
+      elapsed[window] = performance.now() - start;
+      expect(statuses.every(status => status === 'completed')).toBe(true);
+      expect(kernel.executed).toEqual(sources);
+    }
+    console.log(
+      `${CELLS} cells: ${elapsed[1].toFixed(0)} ms awaiting each reply, ` +
+        `${elapsed[8].toFixed(0)} ms by windows of 8 requests`
+    );
+    expect(elapsed[8]).toBeLessThan(elapsed[1] / 3);
+  }, 20000);
+
+  it('stops on error', async () => {
+    const kernel = new FakeKernel();
+    const statuses = await runPipelined(
+      cells(5),
+      source => kernel.execute(source),
+      { window: 8 }
+    );
+    expect(kernel.executed).toEqual(cells(5).slice(0, 6));
+    expect(statuses.slice(0, 5).every(status => status === 'completed')).toBe(
+      true
+    );
+    expect(statuses[5]).toBe('error');
+    expect(statuses.slice(6, 8)).toEqual(['aborted', 'aborted']);
+    expect(statuses.slice(8).every(status => status === 'skipped')).toBe(
+      true
+    );
+  });
+
+  it('reports the progress of each cell', async () => {
+    const kernel = new FakeKernel();
+    const progress = cells().map(() => new Array<CellRunStatus>());
+    await runPipelined(cells(), source => kernel.execute(source), {
+      window: 8,
+      onProgress: (index, status) => progress[index].push(status),
+    });
+    progress.forEach((statuses, index) => {
+      expect(statuses).toEqual(
+        index % 8 === 0
+          ? ['running', 'completed']
+          : ['queued', 'running', 'completed']
+      );
+    });
+  });
+});
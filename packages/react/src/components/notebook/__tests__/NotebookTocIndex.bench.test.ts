@@ -0,0 +1,121 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the table of contents of a notebook with many markdown cells.
+ *
+ * The benchmark types a paragraph of one markdown cell, one character at a
+ * time, and reports the time spent updating the table of contents:
+ * 1. Parsing all the markdown cells on each change, as the JupyterLab
+ *    generator does
+ * 2. Parsing the changed cell only, with NotebookTocIndex
+ * It also verifies that the index follows the heading edits and the cell
+ * insertions, deletions and moves.
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { NotebookModel } from '@jupyterlab/notebook';
+import { TableOfContentsUtils } from '@jupyterlab/toc';
+import { NotebookTocIndex } from '../NotebookTocIndex';
+
+const CELLS = 3000;
+
+const KEYSTROKES = 100;
+
+function createModel(cells: number): NotebookModel {
+  const model = new NotebookModel();
+  model.sharedModel.insertCells(
+    0,
+    Array.from({ length: cells }, (_, i) =>
+      i % 3 === 2
+        ? { cell_type: 'code' as const, source: `x = ${i}` }
+        : {
+            cell_type: 'markdown' as const,
+            source: `${i % 2 ? '##' : '#'} Section ${i}\n\nSome text ${i}.`,
+          }
+    )
+  );
+  return model;
+}
+
+describe('NotebookTocIndex benchmark', () => {
+  it(`updates the table of contents of ${CELLS} cells`, () => {
+    const model = createModel(CELLS);
+    const cell = model.sharedModel.cells[CELLS / 2];
+
+    let start = performance.now();
+    for (let i = 0; i < KEYSTROKES; i++) {
+      cell.updateSource(cell.getSource().length, cell.getSource().length, 'a');
+      for (const markdown of model.sharedModel.cells) {
+        if (markdown.cell_type === 'markdown') {
+          TableOfContentsUtils.Markdown.getHeadings(markdown.getSource());
+        }
+      }
+    }
+    const rescan = performance.now() - start;
+
+    const index = new NotebookTocIndex(model);
+    let changes = 0;
+    index.changed.connect(() => changes++);
+    start = performance.now();
+    for (let i = 0; i < KEYSTROKES; i++) {
+      cell.updateSource(cell.getSource().length, cell.getSource().length, 'a');
+      index.flush();
+    }
+    const incremental = performance.now() - start;
+
+    expect(changes).toBe(0);
+    expect(index.headings).toHaveLength((CELLS / 3) * 2);
+    console.log(
+      `${KEYSTROKES} keystrokes in a notebook of ${CELLS} cells: ` +
+        `${rescan.toFixed(0)} ms rescanning all the markdown cells, ` +
+        `${incremental.toFixed(0)} ms with the incremental index`
+    );
+    expect(incremental).toBeLessThan(rescan);
+    index.dispose();
+    model.dispose();
+  });
+
+  it('follows the headings and the cells', () => {
+    const model = createModel(6);
+    const index = new NotebookTocIndex(model, { maximalDepth: 2 });
+    const texts = () => index.headings.map(h => `${h.cellIndex}:${h.text}`);
+    expect(texts()).toEqual([
+      '0:Section 0',
+      '1:Section 1',
+      '3:Section 3',
+      '4:Section 4',
+    ]);
+
+    model.sharedModel.cells[1].setSource('### Hidden\n# Renamed\n## Sub');
+    model.sharedModel.insertCell(0, {
+      cell_type: 'markdown',
+      source: '# Title',
+    });
+    model.sharedModel.deleteCell(4);
+    model.sharedModel.moveCell(4, 1);
+    index.flush();
+    expect(texts()).toEqual([
+      '0:Title',
+      '1:Section 4',
+      '2:Section 0',
+      '3:Renamed',
+      '3:Sub',
+    ]);
+    expect(index.headings[3].line).toBe(1);
+
+    expect(index.headingIndexAt(0)).toBe(0);
+    expect(index.headingIndexAt(3)).toBe(4);
+    expect(index.headingIndexAt(5)).toBe(4);
+    model.sharedModel.deleteCell(0);
+    index.flush();
+    expect(index.headingIndexAt(0)).toBe(0);
+    expect(index.headings[0].text).toBe('Section 4');
+
+    index.dispose();
+    model.dispose();
+  });
+});
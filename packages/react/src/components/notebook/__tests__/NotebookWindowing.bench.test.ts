@@ -0,0 +1,124 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the windowed rendering of large notebooks.
+ *
+ * For notebooks of 1,000, 5,000 and 10,000 cells, the JupyterLab view
+ * model of the notebook sizes the cells through the NotebookWindowing
+ * estimate, and the benchmark reports:
+ * 1. The time to size all the cells while their widgets are not created
+ *    yet, the race which crashed the JupyterLab estimate
+ * 2. The time to load the persisted heights of a reopened notebook and to
+ *    give them to the view model
+ * 3. The number of cells rendered for a viewport, against all of them
+ *    without windowing
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import type { ICodeCell } from '@jupyterlab/nbformat';
+import { NotebookModel, NotebookViewModel } from '@jupyterlab/notebook';
+import { Signal } from '@lumino/signaling';
+import { CellHeightCache, NotebookWindowing } from '../NotebookWindowing';
+
+const SIZES = [1000, 5000, 10000];
+
+const VIEWPORT_HEIGHT = 800;
+
+const OVERSCAN_COUNT = 4;
+
+function createModel(count: number): NotebookModel {
+  const model = new NotebookModel();
+  const cells: ICodeCell[] = Array.from({ length: count }, (_, i) => ({
+    cell_type: 'code',
+    id: `cell-${i}`,
+    source: `print(${i})`,
+    metadata: {},
+    outputs: [],
+    execution_count: null,
+  }));
+  model.fromJSON({ cells, metadata: {}, nbformat: 4, nbformat_minor: 5 });
+  return model;
+}
+
+/**
+ * The parts of a notebook used by the windowing, its cell widgets not
+ * created yet.
+ */
+function createNotebook(model: NotebookModel): any {
+  const viewModel = new NotebookViewModel([], {
+    overscanCount: OVERSCAN_COUNT,
+    windowingActive: true,
+  });
+  viewModel.itemsList = model.cells;
+  viewModel.height = VIEWPORT_HEIGHT;
+  const node = document.createElement('div');
+  return {
+    model,
+    node,
+    outerNode: node,
+    viewportNode: node,
+    viewModel,
+    widgets: [],
+    modelChanged: new Signal(node),
+  };
+}
+
+describe('NotebookWindowing benchmark', () => {
+  for (const size of SIZES) {
+    it(`sizes and windows ${size} cells`, async () => {
+      const model = createModel(size);
+      const notebook = createNotebook(model);
+
+      let start = performance.now();
+      const windowing = new NotebookWindowing(notebook, {
+        notebookId: `benchmark-${size}`,
+      });
+      const estimated = notebook.viewModel.getEstimatedTotalSize();
+      const sizing = performance.now() - start;
+      expect(estimated).toBeGreaterThan(0);
+
+      // The cells measured in a previous visit of the notebook.
+      for (let i = 0; i < size; i++) {
+        windowing.cache.set(`cell-${i}`, 100 + (i % 7) * 10);
+      }
+      await windowing.cache.save();
+      windowing.dispose();
+
+      const reopened = createNotebook(model);
+      const cache = new CellHeightCache(`benchmark-${size}`);
+      start = performance.now();
+      const reopening = new NotebookWindowing(reopened, {
+        notebookId: `benchmark-${size}`,
+        cache,
+      });
+      await cache.load();
+      await Promise.resolve();
+      const loading = performance.now() - start;
+      expect(cache.size).toBe(size);
+      const expected = Array.from(
+        { length: size },
+        (_, i) => 100 + (i % 7) * 10
+      ).reduce((total, height) => total + height, 0);
+      expect(reopened.viewModel.getEstimatedTotalSize()).toBe(expected);
+
+      const range = reopened.viewModel.getRangeToRender();
+      const rendered = range ? range[1] - range[0] + 1 : 0;
+      expect(rendered).toBeGreaterThan(0);
+      expect(rendered).toBeLessThanOrEqual(
+        Math.ceil(VIEWPORT_HEIGHT / 100) + 2 * OVERSCAN_COUNT + 1
+      );
+      reopening.dispose();
+      model.dispose();
+
+      console.log(
+        `${size} cells: sized in ${sizing.toFixed(1)} ms, persisted ` +
+          `heights applied in ${loading.toFixed(1)} ms, ${rendered} cells ` +
+          `rendered instead of ${size}`
+      );
+    });
+  }
+});
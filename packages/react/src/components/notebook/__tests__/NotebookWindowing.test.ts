@@ -0,0 +1,126 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Tests for the scroll anchoring of the NotebookWindowing.
+ *
+ * Verifies that when a cell above the first visible cell is resized, the
+ * scroll offset is shifted by the difference:
+ * 1. With its estimated height, when it is measured for the first time
+ * 2. With its previous measured height afterwards
+ * and not shifted for the cells below the anchor. Also verifies that the
+ * heights are persisted for a notebook id only.
+ */
+
+import { describe, it, expect, afterEach } from '@jest/globals';
+import type { ICodeCell } from '@jupyterlab/nbformat';
+import { NotebookModel } from '@jupyterlab/notebook';
+import { Signal } from '@lumino/signaling';
+import { CellHeightCache, NotebookWindowing } from '../NotebookWindowing';
+
+const CELLS = 6;
+
+const ESTIMATED_HEIGHT = 60;
+
+let resize: (entries: any[]) => void = () => undefined;
+
+class FakeResizeObserver {
+  constructor(callback: (entries: any[]) => void) {
+    resize = callback;
+  }
+  observe(): void {
+    // Resized by the tests.
+  }
+  disconnect(): void {
+    // Nothing observed.
+  }
+}
+
+function createNotebook(anchorIndex: number): any {
+  const model = new NotebookModel();
+  const cells: ICodeCell[] = Array.from({ length: CELLS }, (_, i) => ({
+    cell_type: 'code',
+    id: `cell-${i}`,
+    source: `print(${i})`,
+    metadata: {},
+    outputs: [],
+    execution_count: null,
+  }));
+  model.fromJSON({ cells, metadata: {}, nbformat: 4, nbformat_minor: 5 });
+  const node = document.createElement('div');
+  Object.defineProperty(node, 'scrollTop', { value: 500, writable: true });
+  const widgets = Array.from({ length: CELLS }, (_, i) => {
+    const cellNode = document.createElement('div');
+    // The cells above the anchor are scrolled out of the viewport.
+    const bottom = (i - anchorIndex + 1) * ESTIMATED_HEIGHT;
+    cellNode.getBoundingClientRect = () => ({ bottom }) as DOMRect;
+    node.appendChild(cellNode);
+    return { node: cellNode, model: model.cells.get(i), isDisposed: false };
+  });
+  return {
+    model,
+    node,
+    outerNode: node,
+    viewportNode: node,
+    viewModel: {
+      isDisposed: false,
+      estimateWidgetSize: () => ESTIMATED_HEIGHT,
+      setWidgetSize: () => undefined,
+    },
+    widgets,
+    modelChanged: new Signal(node),
+  };
+}
+
+const entry = (target: Element, height: number) => ({
+  target,
+  contentRect: { height },
+});
+
+describe('NotebookWindowing', () => {
+  const ResizeObserver = (globalThis as any).ResizeObserver;
+
+  afterEach(() => {
+    (globalThis as any).ResizeObserver = ResizeObserver;
+  });
+
+  it('shifts the scroll offset when a cell above the anchor resizes', () => {
+    (globalThis as any).ResizeObserver = FakeResizeObserver;
+    const notebook = createNotebook(3);
+    const windowing = new NotebookWindowing(notebook, {
+      notebookId: 'anchoring',
+      cache: new CellHeightCache('anchoring', false),
+    });
+    notebook.node.dispatchEvent(new Event('scroll'));
+
+    // Measured for the first time, from its estimate.
+    resize([entry(notebook.widgets[1].node, 200)]);
+    expect(notebook.node.scrollTop).toBe(500 + 200 - ESTIMATED_HEIGHT);
+    expect(windowing.estimateCellHeight(1)).toBe(200);
+
+    // Measured again, from its previous height.
+    resize([entry(notebook.widgets[1].node, 150)]);
+    expect(notebook.node.scrollTop).toBe(500 + 150 - ESTIMATED_HEIGHT);
+
+    // Below the anchor.
+    resize([entry(notebook.widgets[4].node, 300)]);
+    expect(notebook.node.scrollTop).toBe(500 + 150 - ESTIMATED_HEIGHT);
+
+    windowing.dispose();
+    notebook.model.dispose();
+  });
+
+  it('persists the heights of the notebooks with an id only', async () => {
+    for (const notebookId of ['persisted.ipynb', undefined]) {
+      const cache = new CellHeightCache(notebookId);
+      cache.set('cell-0', 120);
+      await cache.save();
+      const reopened = new CellHeightCache(notebookId);
+      await reopened.load();
+      expect(reopened.get('cell-0')).toBe(notebookId ? 120 : undefined);
+    }
+  });
+});
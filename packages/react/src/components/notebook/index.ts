@@ -10,6 +10,15 @@ export * from './NotebookAdapter';
 export * from './NotebookCommands';
 export * from './NotebookState';
 export * from './NotebookExtensions';
+export * from './NotebookWindowing';
+export * from './NotebookRunner';
+export * from './NotebookParser';
+export * from './NotebookLoader';
+export * from './NotebookLoaderWorker';
+export * from './NotebookSkeleton';
+export * from './NotebookDeltaSaves';
+export * from './NotebookTocIndex';
+export * from './NotebookTocPanel';
 export * from './cell';
 export * from './content';
 export * from './marked';
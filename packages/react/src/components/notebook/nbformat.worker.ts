@@ -0,0 +1,17 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * A WebWorker entrypoint parsing and validating the notebooks off the main
+ * thread, and posting their cells by chunks.
+ */
+import { streamNotebook, type NotebookLoadRequest } from './NotebookParser';
+
+self.onmessage = async (event: MessageEvent<NotebookLoadRequest>) => {
+  for await (const message of streamNotebook(event.data)) {
+    self.postMessage(message);
+  }
+};
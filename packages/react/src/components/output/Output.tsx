@@ -11,11 +11,16 @@ import { Box } from '@datalayer/primer-addons';
 import { useEffect, useState } from 'react';
 import { Lumino } from '../lumino/Lumino';
 import { useJupyter } from '../../jupyter/JupyterUse';
-import { IExecutionPhaseOutput, Kernel } from '../../jupyter/kernel';
+import {
+  IExecutionCacheOptions,
+  IExecutionPhaseOutput,
+  Kernel,
+} from '../../jupyter/kernel';
 import { newUuid } from '../../utils';
 import { KernelActionMenu, KernelProgressBar } from '../kernel';
 import { CodeMirrorEditor } from '../codemirror';
 import { OutputAdapter } from './OutputAdapter';
+import { OutputBlobs } from './OutputBlobs';
 import { OutputRenderer } from './OutputRenderer';
 import { useOutputsStore } from './OutputState';
 
@@ -35,6 +40,17 @@ const DEFAULT_OUTPUTS: IOutput[] = [
 export type IOutputProps = {
   adapter?: OutputAdapter;
   autoRun?: boolean;
+  /**
+   * Opt in the blob store: the outputs referencing stored mime bundles are
+   * resolved, and `OutputAdapter.toJSON` externalizes the large ones.
+   */
+  blobs?: OutputBlobs;
+  /**
+   * Opt in the memoization of the results: the memoized outputs of the code
+   * are shown without executing it, and the successful executions memoized.
+   * Only for code without side effects.
+   */
+  cache?: IExecutionCacheOptions;
   clearTrigger?: number;
   code?: string;
   codePre?: string;
@@ -59,6 +75,8 @@ export type IOutputProps = {
 export const Output = ({
   adapter: propsAdapter,
   autoRun = false,
+  blobs,
+  cache,
   clearTrigger = 0,
   code = '',
   codePre,
@@ -143,7 +161,9 @@ export const Output = ({
           kernel,
           outputs ?? [],
           model,
-          suppressCodeExecutionErrors
+          suppressCodeExecutionErrors,
+          blobs,
+          cache
         );
       setAdapter(nextAdapter);
       outputStore.setAdapter(id, nextAdapter);
@@ -169,13 +189,18 @@ export const Output = ({
     propsOutputs,
     model,
     suppressCodeExecutionErrors,
+    blobs,
+    cache,
     code,
     receipt,
     resolvedSourceId,
   ]);
   useEffect(() => {
     if (adapter) {
-      if (autoRun) {
+      if (autoRun && adapter.cache) {
+        // A memoized result is shown without waiting for the kernel.
+        adapter.execute(code, onExecutionPhaseChanged);
+      } else if (autoRun) {
         adapter.kernel?.ready.then(() => {
           adapter.execute(code, onExecutionPhaseChanged);
         });
@@ -24,7 +24,12 @@ import {
   WIDGET_MIMETYPE,
 } from '../../jupyter/ipywidgets/classic';
 import { requireLoader as loader } from '../../jupyter/ipywidgets/libembed-amd';
-import { IExecutionPhaseOutput, Kernel } from '../../jupyter/kernel';
+import {
+  IExecutionCacheOptions,
+  IExecutionPhaseOutput,
+  Kernel,
+} from '../../jupyter/kernel';
+import { OutputBlobs } from './OutputBlobs';
 import { execute } from './OutputExecutor';
 
 export class OutputAdapter {
@@ -35,17 +40,23 @@ export class OutputAdapter {
   private _rendermime: RenderMimeRegistry;
   private _iPyWidgetsManager: ClassicWidgetManager;
   private _suppressCodeExecutionErrors: boolean;
+  private _blobs?: OutputBlobs;
+  private _cache?: IExecutionCacheOptions;
 
   public constructor(
     id: string,
     kernel?: Kernel,
     outputs?: IOutput[],
     outputAreaModel?: IOutputAreaModel,
-    suppressCodeExecutionErrors: boolean = false
+    suppressCodeExecutionErrors: boolean = false,
+    blobs?: OutputBlobs,
+    cache?: IExecutionCacheOptions
   ) {
     this._id = id;
     this._kernel = kernel;
     this._suppressCodeExecutionErrors = suppressCodeExecutionErrors;
+    this._blobs = blobs;
+    this._cache = cache;
     this._renderers = standardRendererFactories.filter(
       factory => factory.mimeTypes[0] !== 'text/javascript'
     );
@@ -76,6 +87,10 @@ export class OutputAdapter {
       model,
       rendermime: this._rendermime,
     });
+    if (blobs && outputs && OutputBlobs.hasBlobs(outputs)) {
+      // The referenced mime bundles are fetched from the blob store.
+      void this.setOutputs(outputs);
+    }
     if (outputs && outputs[0]) {
       const data = outputs[0].data as any;
       if (data) {
@@ -96,6 +111,19 @@ export class OutputAdapter {
     code: string,
     onExecutionPhaseChanged?: (phaseOutput: IExecutionPhaseOutput) => void
   ) {
+    if (this._cache) {
+      const outputs = await this._getMemoized(code);
+      if (outputs) {
+        await this.setOutputs(outputs);
+        if (this._cache.revalidate) {
+          void this._revalidate(code);
+        }
+        return;
+      }
+      // The kernel may still be starting, the output is shown without one
+      // when the result is memoized.
+      await this._kernel?.ready;
+    }
     if (this._kernel) {
       this.clear();
       const metadata: JSONObject = {};
@@ -109,7 +137,8 @@ export class OutputAdapter {
           this._kernel,
           metadata,
           this._suppressCodeExecutionErrors,
-          onExecutionPhaseChanged
+          onExecutionPhaseChanged,
+          this._cache
         );
         await done;
       }
@@ -126,13 +155,33 @@ export class OutputAdapter {
     this._outputArea.model.clear();
   }
 
-  public setOutputs(outputs: IOutput[]) {
+  public async setOutputs(outputs: IOutput[]) {
+    if (this._blobs && OutputBlobs.hasBlobs(outputs)) {
+      outputs = await this._blobs.resolve(outputs);
+    }
     this._outputArea.model.clear();
     outputs.forEach(output => {
       this._outputArea.model.add(output);
     });
   }
 
+  /**
+   * The outputs to persist, with the large mime bundles moved to the blob
+   * store when the adapter has one.
+   */
+  public async toJSON(): Promise<IOutput[]> {
+    const outputs = this._outputArea.model.toJSON();
+    return this._blobs ? this._blobs.externalize(outputs) : outputs;
+  }
+
+  get cache(): IExecutionCacheOptions | undefined {
+    return this._cache;
+  }
+
+  get blobs(): OutputBlobs | undefined {
+    return this._blobs;
+  }
+
   get kernel(): Kernel | undefined {
     return this._kernel;
   }
@@ -146,6 +195,43 @@ export class OutputAdapter {
     return this._outputArea;
   }
 
+  private async _getMemoized(code: string): Promise<IOutput[] | undefined> {
+    const { cache, kernelspec, dependencies } = this._cache!;
+    const name = kernelspec ?? this._kernel?.kernelSpecName;
+    if (name === undefined) {
+      return undefined;
+    }
+    const key = await cache.key(name, code, dependencies);
+    return key ? cache.get(key) : undefined;
+  }
+
+  /**
+   * Execute the code in the background, the memoized outputs are shown
+   * until they are replaced by the fresh ones.
+   */
+  private async _revalidate(code: string): Promise<void> {
+    if (!this._kernel) {
+      return;
+    }
+    await this._kernel.ready;
+    const executor = this._kernel.execute(code, {
+      model: new OutputAreaModel({ trusted: true }),
+      priority: 'background',
+      suppressCodeExecutionErrors: true,
+      cache: this._cache,
+    });
+    try {
+      await executor?.done;
+    } catch (reason) {
+      // The memoized outputs are kept.
+      console.debug('Failed to revalidate the memoized result.', reason);
+      return;
+    }
+    if (executor) {
+      await this.setOutputs(executor.model.toJSON());
+    }
+  }
+
   private async initKernel() {
     await this._iPyWidgetsManager.ready.promise;
     if (this._kernel) {
@@ -0,0 +1,361 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { URLExt } from '@jupyterlab/coreutils';
+import { ICodeCell, INotebookContent, IOutput } from '@jupyterlab/nbformat';
+import {
+  Contents,
+  ServerConnection,
+  type ServiceManager,
+} from '@jupyterlab/services';
+import { requestAPI } from '../../jupyter/JupyterHandlers';
+
+/**
+ * Output metadata key referencing the mime bundle values moved to the blob store.
+ */
+export const OUTPUT_BLOBS_METADATA_KEY = 'jupyter_react_blobs';
+
+/**
+ * Default size in bytes above which a mime bundle value is moved to the blob store.
+ */
+export const DEFAULT_OUTPUT_BLOBS_THRESHOLD = 64 * 1024;
+
+/**
+ * Reference to a mime bundle value stored in the blob store.
+ */
+export interface IOutputBlobRef {
+  hash: string;
+  size: number;
+}
+
+type IOutputBlobRefs = Record<string, IOutputBlobRef>;
+
+/**
+ * The blobs are immutable, their values are fetched once per page.
+ */
+const blobValues = new Map<string, Promise<unknown>>();
+
+/**
+ * The hashes known to be stored on the server.
+ */
+const storedBlobs = new Set<string>();
+
+const encoder = new TextEncoder();
+
+async function sha256(data: Uint8Array): Promise<string | undefined> {
+  // SubtleCrypto is only available in secure contexts.
+  if (!globalThis.crypto?.subtle) {
+    return undefined;
+  }
+  const digest = await globalThis.crypto.subtle.digest(
+    'SHA-256',
+    data as BufferSource
+  );
+  return Array.from(new Uint8Array(digest))
+    .map(byte => byte.toString(16).padStart(2, '0'))
+    .join('');
+}
+
+function getBlobRefs(output: IOutput): IOutputBlobRefs | undefined {
+  return (output.metadata as any)?.[OUTPUT_BLOBS_METADATA_KEY];
+}
+
+/**
+ * Move the large output mime bundles to the content addressed blob store
+ * of the `jupyter_react` server extension, and restore them.
+ *
+ * A mime bundle value larger than the threshold is removed from the output
+ * data and referenced by its hash in the output metadata, so the notebook
+ * saves carry kilobytes instead of the full figures and images. The same
+ * value is uploaded once.
+ */
+export class OutputBlobs {
+  private _serverSettings: ServerConnection.ISettings;
+  private _threshold?: Promise<number>;
+
+  constructor(options: OutputBlobs.IOptions) {
+    this._serverSettings = options.serverSettings;
+    if (options.threshold !== undefined) {
+      this._threshold = Promise.resolve(options.threshold);
+    }
+  }
+
+  /**
+   * Return the output blobs of the contents of a service manager, patching
+   * them on the first call.
+   */
+  static forManager(serviceManager: ServiceManager.IManager): OutputBlobs {
+    let blobs = Private.managers.get(serviceManager);
+    if (!blobs) {
+      blobs = new OutputBlobs({
+        serverSettings: serviceManager.serverSettings,
+      });
+      blobs.wrapContents(serviceManager.contents);
+      Private.managers.set(serviceManager, blobs);
+    }
+    return blobs;
+  }
+
+  /**
+   * Return the size in bytes above which a mime bundle value is moved to
+   * the blob store: the `threshold` option, else the `blobs.threshold` of
+   * the server extension configuration.
+   */
+  getThreshold(): Promise<number> {
+    if (!this._threshold) {
+      this._threshold = requestAPI<any>(
+        this._serverSettings,
+        'jupyter_react',
+        'config'
+      )
+        .then(
+          config =>
+            config.configuration?.blobs?.threshold ??
+            DEFAULT_OUTPUT_BLOBS_THRESHOLD
+        )
+        .catch(reason => {
+          console.debug('Failed to fetch the output blobs threshold.', reason);
+          return DEFAULT_OUTPUT_BLOBS_THRESHOLD;
+        });
+    }
+    return this._threshold;
+  }
+
+  /**
+   * Whether some outputs reference values of the blob store.
+   */
+  static hasBlobs(outputs: IOutput[]): boolean {
+    return outputs.some(output => getBlobRefs(output) !== undefined);
+  }
+
+  /**
+   * Return the outputs with their large mime bundle values replaced by references.
+   */
+  async externalize(outputs: IOutput[]): Promise<IOutput[]> {
+    const threshold = await this.getThreshold();
+    return Promise.all(
+      outputs.map(output => this._externalizeOutput(output, threshold))
+    );
+  }
+
+  /**
+   * Return the outputs with their referenced mime bundle values restored.
+   */
+  async resolve(outputs: IOutput[]): Promise<IOutput[]> {
+    if (!OutputBlobs.hasBlobs(outputs)) {
+      return outputs;
+    }
+    return Promise.all(outputs.map(output => this._resolveOutput(output)));
+  }
+
+  /**
+   * Return the notebook with the large outputs of its code cells externalized.
+   */
+  async externalizeNotebook(
+    content: INotebookContent
+  ): Promise<INotebookContent> {
+    const cells = await Promise.all(
+      content.cells.map(async cell =>
+        cell.cell_type === 'code'
+          ? {
+              ...cell,
+              outputs: await this.externalize((cell as ICodeCell).outputs),
+            }
+          : cell
+      )
+    );
+    return { ...content, cells };
+  }
+
+  /**
+   * Return the notebook with the outputs of its code cells resolved.
+   */
+  async resolveNotebook(content: INotebookContent): Promise<INotebookContent> {
+    const cells = await Promise.all(
+      content.cells.map(async cell =>
+        cell.cell_type === 'code'
+          ? {
+              ...cell,
+              outputs: await this.resolve((cell as ICodeCell).outputs),
+            }
+          : cell
+      )
+    );
+    return { ...content, cells };
+  }
+
+  /**
+   * Externalize the outputs of the notebooks saved with the contents manager,
+   * and resolve them when the notebooks are loaded.
+   *
+   * The manager is patched in place and returned.
+   */
+  wrapContents(contents: Contents.IManager): Contents.IManager {
+    const get = contents.get.bind(contents);
+    const save = contents.save.bind(contents);
+    contents.get = async (path, options) => {
+      const model = await get(path, options);
+      if (model.type === 'notebook' && model.content) {
+        return {
+          ...model,
+          content: await this.resolveNotebook(model.content),
+        };
+      }
+      return model;
+    };
+    contents.save = async (path, options = {}) => {
+      if (options.type === 'notebook' && options.content) {
+        options = {
+          ...options,
+          content: await this.externalizeNotebook(options.content),
+        };
+      }
+      return save(path, options);
+    };
+    return contents;
+  }
+
+  /**
+   * URL downloading the notebook at path with its blobs inlined.
+   */
+  exportUrl(path: string): string {
+    return URLExt.join(
+      this._serverSettings.baseUrl,
+      'jupyter_react',
+      'blobs',
+      'export',
+      URLExt.encodeParts(path)
+    );
+  }
+
+  private async _externalizeOutput(
+    output: IOutput,
+    threshold: number
+  ): Promise<IOutput> {
+    const data = output.data as Record<string, unknown> | undefined;
+    if (!data) {
+      return output;
+    }
+    let nextData: Record<string, unknown> | undefined;
+    let refs: IOutputBlobRefs | undefined;
+    for (const [mimeType, value] of Object.entries(data)) {
+      const json = JSON.stringify(value);
+      const body = encoder.encode(json);
+      if (body.byteLength <= threshold) {
+        continue;
+      }
+      nextData = nextData ?? { ...data };
+      refs = refs ?? { ...getBlobRefs(output) };
+      const hash = await this._store(json, body);
+      refs[mimeType] = { hash, size: body.byteLength };
+      blobValues.set(hash, Promise.resolve(value));
+      delete nextData[mimeType];
+    }
+    if (!nextData) {
+      return output;
+    }
+    return {
+      ...output,
+      data: nextData,
+      metadata: {
+        ...(output.metadata as any),
+        [OUTPUT_BLOBS_METADATA_KEY]: refs,
+      },
+    } as IOutput;
+  }
+
+  private async _resolveOutput(output: IOutput): Promise<IOutput> {
+    const refs = getBlobRefs(output);
+    if (!refs) {
+      return output;
+    }
+    const data = { ...(output.data as Record<string, unknown>) };
+    await Promise.all(
+      Object.entries(refs).map(async ([mimeType, ref]) => {
+        data[mimeType] = await this._fetch(ref.hash);
+      })
+    );
+    const metadata = { ...(output.metadata as any) };
+    delete metadata[OUTPUT_BLOBS_METADATA_KEY];
+    return { ...output, data, metadata } as IOutput;
+  }
+
+  private async _store(json: string, body: Uint8Array): Promise<string> {
+    const hash = await sha256(body);
+    if (hash && storedBlobs.has(hash)) {
+      return hash;
+    }
+    if (hash) {
+      const response = await ServerConnection.makeRequest(
+        this._blobUrl(hash),
+        { method: 'HEAD' },
+        this._serverSettings
+      );
+      if (response.ok) {
+        storedBlobs.add(hash);
+        return hash;
+      }
+    }
+    const stored = await requestAPI<IOutputBlobRef>(
+      this._serverSettings,
+      'jupyter_react',
+      'blobs',
+      { method: 'POST', body: json }
+    );
+    storedBlobs.add(stored.hash);
+    return stored.hash;
+  }
+
+  private _fetch(hash: string): Promise<unknown> {
+    let value = blobValues.get(hash);
+    if (!value) {
+      value = ServerConnection.makeRequest(
+        this._blobUrl(hash),
+        {},
+        this._serverSettings
+      ).then(response => {
+        if (!response.ok) {
+          throw new ServerConnection.ResponseError(response);
+        }
+        storedBlobs.add(hash);
+        return response.json();
+      });
+      // Do not keep the failures, the next resolve retries.
+      value.catch(() => blobValues.delete(hash));
+      blobValues.set(hash, value);
+    }
+    return value;
+  }
+
+  private _blobUrl(hash: string): string {
+    return URLExt.join(
+      this._serverSettings.baseUrl,
+      'jupyter_react',
+      'blobs',
+      hash
+    );
+  }
+}
+
+export namespace OutputBlobs {
+  export interface IOptions {
+    /**
+     * The settings of the server running the `jupyter_react` extension.
+     */
+    serverSettings: ServerConnection.ISettings;
+    /**
+     * Size in bytes above which a mime bundle value is moved to the blob
+     * store, the one of the server extension configuration by default.
+     */
+    threshold?: number;
+  }
+}
+
+namespace Private {
+  export const managers = new WeakMap<ServiceManager.IManager, OutputBlobs>();
+}
+
+export default OutputBlobs;
@@ -7,7 +7,10 @@
 import { JSONObject } from '@lumino/coreutils';
 import { OutputArea } from '@jupyterlab/outputarea';
 import { KernelMessage } from '@jupyterlab/services';
-import { IExecutionPhaseOutput } from '../../jupyter/kernel';
+import {
+  IExecutionCacheOptions,
+  IExecutionPhaseOutput,
+} from '../../jupyter/kernel';
 import { Kernel } from './../../jupyter/kernel/Kernel';
 
 /**
@@ -20,7 +23,8 @@ export async function execute(
   kernel: Kernel,
   metadata?: JSONObject,
   suppressCodeExecutionErrors: boolean = false,
-  onExecutionPhaseChanged?: (phaseOutput: IExecutionPhaseOutput) => void
+  onExecutionPhaseChanged?: (phaseOutput: IExecutionPhaseOutput) => void,
+  cache?: IExecutionCacheOptions
 ): Promise<KernelMessage.IExecuteReplyMsg | undefined> {
   // Override the default for `stop_on_error`.
   let stopOnError = true;
@@ -36,12 +40,16 @@ export async function execute(
     stopOnError,
     suppressCodeExecutionErrors,
     onExecutionPhaseChanged,
+    cache,
   });
 
-  const future = kernelExecutor!.future;
+  // The execution may be queued by the kernel scheduler. When it was sent
+  // right away, the output future is set synchronously, as the callers
+  // registering message hooks on it expect.
+  const future = kernelExecutor!.future ?? (await kernelExecutor!.sent);
   // TODO fix in upstream jupyterlab if possible...
-  (output as any)._onIOPub = future!.onIOPub;
-  (output as any)._onExecuteReply = future!.onReply;
-  output.future = future!;
-  return future?.done;
+  (output as any)._onIOPub = future.onIOPub;
+  (output as any)._onExecuteReply = future.onReply;
+  output.future = future;
+  return future.done;
 }
@@ -6,6 +6,7 @@
 
 export * from './Output';
 export * from './OutputAdapter';
+export * from './OutputBlobs';
 export * from './OutputExecutor';
 export * from './OutputIPyWidgets';
 export * from './OutputRenderer';
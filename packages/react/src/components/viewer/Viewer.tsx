@@ -9,15 +9,24 @@ import { INotebookContent } from '@jupyterlab/nbformat';
 import InputViewer from './input/InputViewer';
 // import OutputViewer from './output/OutputViewer';
 import { newUuid } from '../../utils/Utils';
+import {
+  IStaticNotebookProps,
+  StaticNotebook,
+} from '../../lazy/StaticNotebook';
 
 export type IViewerProps = {
   nbformat?: INotebookContent;
   nbformatUrl?: string;
   outputs: boolean;
+  /**
+   * Show the static HTML rendering of the notebook by the server until the
+   * notebook content is loaded.
+   */
+  prerender?: IStaticNotebookProps;
 };
 
 export const Viewer = (props: IViewerProps) => {
-  const { nbformat, nbformatUrl } = props;
+  const { nbformat, nbformatUrl, prerender } = props;
   const [model, setModel] = useState<INotebookContent>();
   useEffect(() => {
     if (nbformat) {
@@ -34,6 +43,9 @@ export const Viewer = (props: IViewerProps) => {
         });
     }
   }, [nbformat, nbformatUrl]);
+  if (!model && prerender) {
+    return <StaticNotebook {...prerender} />;
+  }
   return (
     <>
       {model?.cells.map(cell => {
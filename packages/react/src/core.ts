@@ -58,7 +58,7 @@ export {
 // Kernel management - lightweight kernel handling
 export { Kernel } from './jupyter/kernel/Kernel';
 
-export { useKernelsStore } from './jupyter/kernel/KernelState';
+export { useKernelsStore, useKernelState } from './jupyter/kernel/KernelState';
 
 // State management - for advanced usage
 export {
@@ -10,7 +10,7 @@ import { Box } from '@datalayer/primer-addons';
 import { PlayIcon } from '@primer/octicons-react';
 import { JupyterReactTheme } from '../theme';
 import { useJupyter } from '../jupyter/JupyterUse';
-import { useKernelsStore } from '../jupyter/kernel/KernelState';
+import { useKernelState } from '../jupyter/kernel/KernelState';
 import { KernelIndicator } from '../components/kernel/KernelIndicator';
 import { Cell } from '../components/cell/Cell';
 import { useCellsStore } from '../components/cell/CellState';
@@ -25,7 +25,7 @@ for i in range(10):
 const CellExample = () => {
   const { defaultKernel } = useJupyter({ startDefaultKernel: true });
   const cellsStore = useCellsStore();
-  const kernelsStore = useKernelsStore();
+  const kernelState = useKernelState(defaultKernel?.id);
   return (
     <JupyterReactTheme>
       <Box as="h1">Cell</Box>
@@ -33,15 +33,11 @@ const CellExample = () => {
       <Box>Outputs Count: {cellsStore.getOutputsCount(CELL_ID)}</Box>
       <Box>
         Kernel State:{' '}
-        <Label>
-          {defaultKernel && kernelsStore.getExecutionState(defaultKernel.id)}
-        </Label>
+        <Label>{kernelState?.executionState}</Label>
       </Box>
       <Box>
         Kernel Phase:{' '}
-        <Label>
-          {defaultKernel && kernelsStore.getExecutionPhase(defaultKernel.id)}
-        </Label>
+        <Label>{kernelState?.executionPhase}</Label>
       </Box>
       <Box>
         <KernelIndicator
@@ -13,6 +13,16 @@ import { JupyterReactTheme } from '../theme';
 
 import NBFORMAT from './notebooks/NotebookExample1.ipynb.json';
 
+// Time to the first interactive cell since the page navigation, measured
+// when the notebook panel is rendered.
+new PerformanceObserver(list => {
+  list
+    .getEntriesByName('jupyter-react:notebook_render')
+    .forEach(entry =>
+      console.log(`First interactive cell in ${entry.duration.toFixed(0)} ms`)
+    );
+}).observe({ type: 'measure', buffered: true });
+
 const NotebookNbformatExample = () => {
   const { serviceManager, defaultKernel } = useJupyter({
     startDefaultKernel: true,
@@ -29,6 +39,7 @@ const NotebookNbformatExample = () => {
           height="calc(100vh - 2.6rem)" // (Height - Toolbar Height).
           extensions={extensions}
           Toolbar={NotebookToolbar}
+          streamingLoad
         />
       ) : (
         <></>
@@ -4,7 +4,7 @@
  * MIT License
  */
 
-import { useMemo, useState } from 'react';
+import { useEffect, useMemo, useState } from 'react';
 import { createRoot } from 'react-dom/client';
 import { Button } from '@primer/react';
 import { Box } from '@datalayer/primer-addons';
@@ -12,6 +12,8 @@ import { INotebookContent } from '@jupyterlab/nbformat';
 import { useJupyter } from '../jupyter';
 import { JupyterReactTheme } from '../theme/JupyterReactTheme';
 import { Notebook } from '../components/notebook/Notebook';
+import { useNotebookStore } from '../components/notebook/NotebookState';
+import { NotebookTocPanel } from '../components/notebook/NotebookTocPanel';
 import { NotebookToolbar } from '../components/notebook/toolbar/NotebookToolbar';
 import { TocExtension } from './extensions/toc/TocExtension';
 import { ReactLayoutFactory } from './extensions/toc/ReactLayoutFactory';
@@ -19,32 +21,79 @@ import { JupyterLayoutFactory } from './extensions/toc/JupyterLayoutFactory';
 
 import NBFORMAT from './notebooks/NotebookToCExample.ipynb.json';
 
+const NOTEBOOK_ID = 'notebook-toc-id';
+
+type TocLayout = 'react' | 'jupyter' | 'incremental';
+
+/**
+ * Table of contents maintained from the cell changes, see NotebookTocIndex.
+ */
+const IncrementalToc = () => {
+  const adapter = useNotebookStore(state =>
+    state.selectNotebookAdapter(NOTEBOOK_ID)
+  );
+  const [activeCellIndex, setActiveCellIndex] = useState(0);
+  useEffect(() => {
+    const notebook = adapter?.notebook;
+    const update = () => setActiveCellIndex(notebook!.activeCellIndex);
+    notebook?.activeCellChanged.connect(update);
+    return () => {
+      notebook?.activeCellChanged.disconnect(update);
+    };
+  }, [adapter]);
+  const index = adapter?.tocIndex;
+  return index ? (
+    <Box
+      position="fixed"
+      top="2.6rem"
+      right={0}
+      width="240px"
+      height="calc(100vh - 2.6rem)"
+      sx={{ zIndex: 1000, backgroundColor: 'canvas.default' }}
+    >
+      <NotebookTocPanel
+        index={index}
+        activeCellIndex={activeCellIndex}
+        onSelect={heading => {
+          adapter.notebook.activeCellIndex = heading.cellIndex;
+          adapter.notebook.scrollToItem(heading.cellIndex, 'start');
+        }}
+      />
+    </Box>
+  ) : null;
+};
+
 const NotebookTOCExample = () => {
   const { serviceManager, defaultKernel } = useJupyter({
     startDefaultKernel: true,
   });
-  const [layout, setLayout] = useState<'react' | 'jupyter'>('jupyter');
+  const [layout, setLayout] = useState<TocLayout>('jupyter');
   const extensions = useMemo(
-    () => [
-      new TocExtension({
-        factory:
-          layout === 'react'
-            ? new ReactLayoutFactory()
-            : new JupyterLayoutFactory(),
-      }),
-    ],
+    () =>
+      layout === 'incremental'
+        ? []
+        : [
+            new TocExtension({
+              factory:
+                layout === 'react'
+                  ? new ReactLayoutFactory()
+                  : new JupyterLayoutFactory(),
+            }),
+          ],
     [layout]
   );
   return (
     <JupyterReactTheme>
-      <Box>
-        <Button
-          onClick={() => {
-            setLayout(layout === 'react' ? 'jupyter' : 'react');
-          }}
-        >
-          Use {layout === 'react' ? 'Jupyter' : 'React'} Layout
-        </Button>
+      <Box display="flex" sx={{ gap: 2 }}>
+        {(['jupyter', 'react', 'incremental'] as const).map(value => (
+          <Button
+            key={value}
+            variant={layout === value ? 'primary' : 'default'}
+            onClick={() => setLayout(value)}
+          >
+            {value[0].toUpperCase() + value.slice(1)} Layout
+          </Button>
+        ))}
       </Box>
       {serviceManager && defaultKernel && (
         <Notebook
@@ -53,11 +102,12 @@ const NotebookTOCExample = () => {
           nbformat={NBFORMAT as INotebookContent}
           key={layout}
           extensions={extensions}
-          id="notebook-toc-id"
+          id={NOTEBOOK_ID}
           height="calc(100vh - 2.6rem)" // (Height - Toolbar Height).
           Toolbar={NotebookToolbar}
         />
       )}
+      {layout === 'incremental' && <IncrementalToc />}
     </JupyterReactTheme>
   );
 };
@@ -12,7 +12,7 @@ import { Box } from '@datalayer/primer-addons';
 import { useJupyter } from '../jupyter';
 import { Kernel } from '../jupyter/kernel/Kernel';
 import { JupyterReactTheme } from '../theme/JupyterReactTheme';
-import { useKernelsStore } from '../jupyter/kernel/KernelState';
+import { useKernelState } from '../jupyter/kernel/KernelState';
 import { KernelIndicator } from '../components/kernel/KernelIndicator';
 import { Output } from '../components/output/Output';
 import { useOutputsStore } from './../components/output/OutputState';
@@ -156,8 +156,8 @@ const OutputEditorExample = () => {
 const OutputEmptyExample = () => {
   const { kernelManager, serviceManager } = useJupyter();
   const outputStore = useOutputsStore();
-  const kernelsStore = useKernelsStore();
   const [kernel, setKernel] = useState<Kernel>();
+  const kernelState = useKernelState(kernel?.id);
   useEffect(() => {
     if (serviceManager && kernelManager) {
       const kernel = new Kernel({
@@ -181,8 +181,8 @@ const OutputEmptyExample = () => {
       <Text as="h1">Output with empty Output</Text>
       {kernel && (
         <>
-          <Box>Kernel State: {kernelsStore.getExecutionState(kernel.id)}</Box>
-          <Box>Kernel Phase: {kernelsStore.getExecutionPhase(kernel.id)}</Box>
+          <Box>Kernel State: {kernelState?.executionState}</Box>
+          <Box>Kernel Phase: {kernelState?.executionPhase}</Box>
           <Box>
             <KernelIndicator kernel={kernel.connection} />
           </Box>
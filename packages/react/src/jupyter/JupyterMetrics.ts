@@ -0,0 +1,96 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { URLExt } from '@jupyterlab/coreutils';
+import { ServerConnection } from '@jupyterlab/services';
+
+/**
+ * The performance marks reported to the `jupyter_react` server extension.
+ */
+export type JupyterMetricsMark =
+  | 'kernel_ready'
+  | 'first_output'
+  | 'notebook_render';
+
+export interface IJupyterMark {
+  name: JupyterMetricsMark;
+  /**
+   * Milliseconds since the page navigation.
+   */
+  duration: number;
+}
+
+/**
+ * Delay in milliseconds to batch the marks in a single request.
+ */
+const FLUSH_DELAY = 1000;
+
+let serverSettings: ServerConnection.ISettings | undefined;
+const recordedMarks = new Set<JupyterMetricsMark>();
+let pendingMarks: IJupyterMark[] = [];
+let flushTimeout: ReturnType<typeof setTimeout> | undefined;
+
+function flushJupyterMarks(): void {
+  if (flushTimeout !== undefined) {
+    clearTimeout(flushTimeout);
+    flushTimeout = undefined;
+  }
+  if (!serverSettings || pendingMarks.length === 0) {
+    return;
+  }
+  const body = JSON.stringify({ marks: pendingMarks });
+  pendingMarks = [];
+  const url = URLExt.join(
+    serverSettings.baseUrl,
+    'jupyter_react',
+    'metrics',
+    'marks'
+  );
+  // The request outlives the page when it is hidden or unloaded.
+  ServerConnection.makeRequest(
+    url,
+    { method: 'POST', body, keepalive: true },
+    serverSettings
+  ).catch(error => console.debug('Failed to report the marks.', error));
+}
+
+/**
+ * Report the performance marks of the page to the server, disabled by default.
+ *
+ * The marks are exported with the server metrics by `jupyter_react/metrics`.
+ */
+export function enableJupyterMetrics(
+  settings: ServerConnection.ISettings
+): void {
+  const enabled = serverSettings !== undefined;
+  serverSettings = settings;
+  if (!enabled && typeof document !== 'undefined') {
+    document.addEventListener('visibilitychange', () => {
+      if (document.visibilityState === 'hidden') {
+        flushJupyterMarks();
+      }
+    });
+  }
+  if (pendingMarks.length > 0 && flushTimeout === undefined) {
+    flushTimeout = setTimeout(flushJupyterMarks, FLUSH_DELAY);
+  }
+}
+
+/**
+ * Record a mark once per page, as a `performance.measure` since the navigation.
+ */
+export function markJupyter(name: JupyterMetricsMark): void {
+  if (recordedMarks.has(name) || typeof performance === 'undefined') {
+    return;
+  }
+  recordedMarks.add(name);
+  const duration = performance.now();
+  performance.measure?.(`jupyter-react:${name}`, { start: 0, end: duration });
+  pendingMarks.push({ name, duration });
+  if (serverSettings && flushTimeout === undefined) {
+    flushTimeout = setTimeout(flushJupyterMarks, FLUSH_DELAY);
+  }
+}
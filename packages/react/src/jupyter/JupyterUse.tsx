@@ -17,6 +17,13 @@ import { Kernel } from './kernel';
  * The type for Jupyter props.
  */
 export type IJupyterProps = {
+  /**
+   * Whether to hydrate the service manager from the jupyter_react
+   * server extension bootstrap endpoint, in a single round trip.
+   *
+   * Falls back to the individual requests if the endpoint is not available.
+   */
+  bootstrap?: boolean;
   /**
    * Whether the component is collaborative or not.
    */
@@ -53,6 +60,14 @@ export type IJupyterProps = {
    * Jupyter Server Token.
    */
   jupyterServerToken?: string;
+  /**
+   * Whether the kernel and terminal connections share one websocket, the
+   * multiplexed websocket of the jupyter_react server extension.
+   *
+   * It avoids the browser limits of connections per host on the pages
+   * with many kernels.
+   */
+  multiplexWebSockets?: boolean;
   /*
    * Create a serveless Jupyter.
    */
@@ -61,6 +76,13 @@ export type IJupyterProps = {
    * Jupyter Service Manager.
    */
   serviceManager?: ServiceManager.IManager;
+  /**
+   * Whether to claim the default kernel from the pre-warmed kernel pool
+   * of the jupyter_react server extension.
+   *
+   * Falls back to start a new kernel if the pool is not available.
+   */
+  pooledKernel?: boolean;
   /**
    * Whether to start the default kernel or not.
    */
@@ -8,6 +8,7 @@ export * from './JupyterAuthError';
 export * from './JupyterConfig';
 export * from './JupyterDefaults';
 export * from './JupyterHandlers';
+export * from './JupyterMetrics';
 export * from './JupyterUse';
 export * from './collaboration';
 export * from './ipywidgets';
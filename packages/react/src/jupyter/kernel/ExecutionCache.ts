@@ -0,0 +1,332 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { IOutput } from '@jupyterlab/nbformat';
+import { ServerConnection } from '@jupyterlab/services';
+import { requestAPI } from '../JupyterHandlers';
+
+/**
+ * Default time to live of a memoized result, one day.
+ */
+export const DEFAULT_EXECUTION_CACHE_TTL = 24 * 60 * 60 * 1000;
+
+/**
+ * Default maximum number of memoized results kept by the browser.
+ */
+export const DEFAULT_EXECUTION_CACHE_MAX_ENTRIES = 500;
+
+const DEFAULT_DATABASE_NAME = 'jupyter-react-execution-cache';
+
+const OBJECT_STORE_NAME = 'results';
+
+const ACCESSED_INDEX_NAME = 'accessed';
+
+/**
+ * Opt-in memoization of an execution.
+ */
+export type IExecutionCacheOptions = {
+  cache: ExecutionCache;
+  /**
+   * Kernelspec name of the key, the one of the kernel by default. Giving it
+   * lets an output show a memoized result without a kernel.
+   */
+  kernelspec?: string;
+  /**
+   * Key declared by the user for what the result depends on besides the
+   * code, e.g. the version of a dataset.
+   */
+  dependencies?: string;
+  /**
+   * Execute the code in the background after serving a memoized result,
+   * and replace it with the fresh outputs.
+   */
+  revalidate?: boolean;
+};
+
+type IExecutionCacheEntry = {
+  key: string;
+  outputs: IOutput[];
+  /**
+   * Epoch times in milliseconds.
+   */
+  created: number;
+  accessed: number;
+};
+
+const encoder = new TextEncoder();
+
+async function sha256(text: string): Promise<string | undefined> {
+  // SubtleCrypto is only available in secure contexts.
+  if (!globalThis.crypto?.subtle) {
+    return undefined;
+  }
+  const digest = await globalThis.crypto.subtle.digest(
+    'SHA-256',
+    encoder.encode(text) as BufferSource
+  );
+  return Array.from(new Uint8Array(digest))
+    .map(byte => byte.toString(16).padStart(2, '0'))
+    .join('');
+}
+
+function promisify<T>(request: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+/**
+ * The memoized results of the browser, in IndexedDB when available.
+ */
+class LocalResults {
+  private _db?: Promise<IDBDatabase>;
+  private _memory?: Map<string, IExecutionCacheEntry>;
+
+  constructor(name: string) {
+    if (typeof indexedDB === 'undefined') {
+      this._memory = new Map();
+      return;
+    }
+    const request = indexedDB.open(name, 1);
+    request.onupgradeneeded = () => {
+      const store = request.result.createObjectStore(OBJECT_STORE_NAME, {
+        keyPath: 'key',
+      });
+      store.createIndex(ACCESSED_INDEX_NAME, 'accessed');
+    };
+    this._db = promisify(request);
+  }
+
+  async get(key: string): Promise<IExecutionCacheEntry | undefined> {
+    if (this._memory) {
+      const entry = this._memory.get(key);
+      if (entry) {
+        // Reinsert the entry, the map is kept in the access order.
+        this._memory.delete(key);
+        this._memory.set(key, entry);
+      }
+      return entry;
+    }
+    const store = await this._store('readonly');
+    return promisify<IExecutionCacheEntry | undefined>(store.get(key));
+  }
+
+  async put(entry: IExecutionCacheEntry): Promise<void> {
+    if (this._memory) {
+      this._memory.delete(entry.key);
+      this._memory.set(entry.key, entry);
+      return;
+    }
+    const store = await this._store('readwrite');
+    await promisify(store.put(entry));
+  }
+
+  async delete(key: string): Promise<void> {
+    if (this._memory) {
+      this._memory.delete(key);
+      return;
+    }
+    const store = await this._store('readwrite');
+    await promisify(store.delete(key));
+  }
+
+  async clear(): Promise<void> {
+    if (this._memory) {
+      this._memory.clear();
+      return;
+    }
+    const store = await this._store('readwrite');
+    await promisify(store.clear());
+  }
+
+  /**
+   * Remove the least recently accessed entries beyond the maximum.
+   */
+  async evict(maxEntries: number): Promise<void> {
+    if (this._memory) {
+      for (const key of this._memory.keys()) {
+        if (this._memory.size <= maxEntries) {
+          break;
+        }
+        this._memory.delete(key);
+      }
+      return;
+    }
+    const store = await this._store('readwrite');
+    let excess = (await promisify(store.count())) - maxEntries;
+    if (excess <= 0) {
+      return;
+    }
+    const cursors = store.index(ACCESSED_INDEX_NAME).openCursor();
+    await new Promise<void>((resolve, reject) => {
+      cursors.onsuccess = () => {
+        const cursor = cursors.result;
+        if (!cursor || excess <= 0) {
+          resolve();
+          return;
+        }
+        cursor.delete();
+        excess--;
+        cursor.continue();
+      };
+      cursors.onerror = () => reject(cursors.error);
+    });
+  }
+
+  private async _store(mode: IDBTransactionMode): Promise<IDBObjectStore> {
+    const db = await this._db!;
+    return db
+      .transaction(OBJECT_STORE_NAME, mode)
+      .objectStore(OBJECT_STORE_NAME);
+  }
+}
+
+/**
+ * Memoized execution results, the nbformat outputs of idempotent code.
+ *
+ * A result is keyed by the hash of the kernelspec, the code and the
+ * dependencies key declared by the user. The results are kept in the
+ * browser IndexedDB, expire after the ttl and the least recently used ones
+ * are evicted beyond the maximum. With server settings, they are also
+ * shared through the `jupyter_react` server extension store, so a
+ * read-mostly page shows the outputs of its cells without starting a kernel.
+ *
+ * The cache is opt-in per execution, only the code without side effects
+ * should be memoized.
+ */
+export class ExecutionCache {
+  private _local: LocalResults;
+  private _serverSettings?: ServerConnection.ISettings;
+  private _ttl: number;
+  private _maxEntries: number;
+
+  constructor(options: ExecutionCache.IOptions = {}) {
+    this._local = new LocalResults(options.name ?? DEFAULT_DATABASE_NAME);
+    this._serverSettings = options.serverSettings;
+    this._ttl = options.ttl ?? DEFAULT_EXECUTION_CACHE_TTL;
+    this._maxEntries =
+      options.maxEntries ?? DEFAULT_EXECUTION_CACHE_MAX_ENTRIES;
+  }
+
+  /**
+   * The key of an execution, undefined if it can not be hashed.
+   */
+  key(
+    kernelspec: string,
+    code: string,
+    dependencies = ''
+  ): Promise<string | undefined> {
+    return sha256(JSON.stringify([kernelspec, code, dependencies]));
+  }
+
+  /**
+   * Return the memoized outputs of a key, looked up in the browser then on
+   * the server.
+   */
+  async get(key: string): Promise<IOutput[] | undefined> {
+    const now = Date.now();
+    try {
+      const entry = await this._local.get(key);
+      if (entry && (this._ttl <= 0 || now - entry.created <= this._ttl)) {
+        this._local
+          .put({ ...entry, accessed: now })
+          .catch(error => console.debug('Failed to touch the result.', error));
+        return entry.outputs;
+      }
+    } catch (error) {
+      console.debug('Failed to read the execution cache.', error);
+    }
+    if (!this._serverSettings) {
+      return undefined;
+    }
+    try {
+      const { outputs, created } = await requestAPI<{
+        outputs: IOutput[];
+        created: number;
+      }>(this._serverSettings, 'jupyter_react', `results/${key}`);
+      await this._putLocal({
+        key,
+        outputs,
+        created: created * 1000,
+        accessed: now,
+      }).catch(error =>
+        console.debug('Failed to write the execution cache.', error)
+      );
+      return outputs;
+    } catch (error) {
+      if (
+        !(error instanceof ServerConnection.ResponseError) ||
+        error.response.status !== 404
+      ) {
+        console.debug('Failed to fetch the memoized result.', error);
+      }
+      return undefined;
+    }
+  }
+
+  /**
+   * Memoize the outputs of a key.
+   */
+  async set(key: string, outputs: IOutput[]): Promise<void> {
+    const now = Date.now();
+    try {
+      await this._putLocal({ key, outputs, created: now, accessed: now });
+    } catch (error) {
+      console.debug('Failed to write the execution cache.', error);
+    }
+    if (this._serverSettings) {
+      await requestAPI<void>(
+        this._serverSettings,
+        'jupyter_react',
+        `results/${key}`,
+        { method: 'PUT', body: JSON.stringify({ outputs }) }
+      );
+    }
+  }
+
+  /**
+   * Forget the outputs of a key, in the browser only.
+   */
+  async delete(key: string): Promise<void> {
+    await this._local.delete(key);
+  }
+
+  /**
+   * Forget the outputs memoized by the browser.
+   */
+  async clear(): Promise<void> {
+    await this._local.clear();
+  }
+
+  private async _putLocal(entry: IExecutionCacheEntry): Promise<void> {
+    await this._local.put(entry);
+    await this._local.evict(this._maxEntries);
+  }
+}
+
+export namespace ExecutionCache {
+  export interface IOptions {
+    /**
+     * Name of the IndexedDB database.
+     */
+    name?: string;
+    /**
+     * Settings of the server sharing the results, none by default.
+     */
+    serverSettings?: ServerConnection.ISettings;
+    /**
+     * Milliseconds after which a result expires, 0 to never expire.
+     */
+    ttl?: number;
+    /**
+     * Maximum number of results kept by the browser.
+     */
+    maxEntries?: number;
+  }
+}
+
+export default ExecutionCache;
@@ -16,11 +16,16 @@ import { ISessionConnection } from '@jupyterlab/services/lib/session/session';
 import { find } from '@lumino/algorithm';
 import { PromiseDelegate } from '@lumino/coreutils';
 import { getCookie, newUuid } from '../../utils/Utils';
+import { requestAPI } from '../JupyterHandlers';
+import { markJupyter } from '../JupyterMetrics';
+import type { IExecutionCacheOptions } from './ExecutionCache';
 import KernelExecutor, {
   IExecutionPhaseOutput,
   IOPubMessageHook,
   ShellMessageHook,
 } from './KernelExecutor';
+import KernelScheduler, { ExecutionPriority } from './KernelScheduler';
+import type KernelTracer from './KernelTracer';
 
 const JUPYTER_REACT_PATH_COOKIE_NAME = 'jupyter-react-kernel-path';
 
@@ -39,7 +44,10 @@ export class Kernel {
   private _kernelSpecName: string;
   private _kernelType: string;
   private _path: string;
+  private _pooled: boolean;
   private _ready: PromiseDelegate<void>;
+  private _scheduler: KernelScheduler;
+  private _tracer?: KernelTracer;
   private _session: ISessionConnection;
   private _sessionId: string;
   private _sessionManager: Session.IManager;
@@ -54,6 +62,9 @@ export class Kernel {
       kernelModel,
       path,
       sessionManager,
+      maxInFlight,
+      pooled = false,
+      tracer,
     } = props;
     this._kernelSpecManager = kernelspecsManager;
     this._kernelManager = kernelManager;
@@ -61,10 +72,52 @@ export class Kernel {
     this._kernelType = kernelType ?? 'notebook';
     this._kernelSpecName = kernelSpecName;
     this._sessionManager = sessionManager;
+    this._pooled = pooled;
+    this._tracer = tracer;
     this._ready = new PromiseDelegate();
+    this._scheduler = new KernelScheduler({
+      getKernelId: () => this._id,
+      maxInFlight,
+    });
     this.requestKernel(kernelModel, path);
   }
 
+  /**
+   * Create the session with a pre-warmed kernel of the `jupyter_react`
+   * server extension pool, it starts a new kernel if the pool is empty.
+   *
+   * @returns The session, or undefined if the extension is not available
+   */
+  private async startPooledSession(): Promise<ISessionConnection | undefined> {
+    try {
+      const model = await requestAPI<Session.IModel>(
+        this._sessionManager.serverSettings,
+        'jupyter_react',
+        'kernels/pool/sessions',
+        {
+          method: 'POST',
+          body: JSON.stringify({
+            name: this._kernelName,
+            path: this._path,
+            type: this._kernelType,
+            kernel: {
+              name: this._kernelSpecName,
+            },
+          }),
+        }
+      );
+      return this._sessionManager.connectTo({
+        model,
+        kernelConnectionOptions: {
+          handleComms: true,
+        },
+      });
+    } catch (error) {
+      console.warn('The kernel pool is not available:', error);
+      return undefined;
+    }
+  }
+
   private async requestKernel(
     kernelModel?: JupyterKernel.IModel,
     propsPath?: string
@@ -107,21 +160,26 @@ export class Kernel {
       }
       this._path = path;
       try {
-        this._session = await this._sessionManager.startNew(
-          {
-            name: this._kernelName,
-            path: this._path,
-            type: this._kernelType,
-            kernel: {
-              name: this._kernelSpecName,
+        const pooledSession = this._pooled
+          ? await this.startPooledSession()
+          : undefined;
+        this._session =
+          pooledSession ??
+          (await this._sessionManager.startNew(
+            {
+              name: this._kernelName,
+              path: this._path,
+              type: this._kernelType,
+              kernel: {
+                name: this._kernelSpecName,
+              },
             },
-          },
-          {
-            kernelConnectionOptions: {
-              handleComms: true,
-            },
-          }
-        );
+            {
+              kernelConnectionOptions: {
+                handleComms: true,
+              },
+            }
+          ));
       } catch (error) {
         console.error('Failed to start new kernel session:', error);
         return;
@@ -132,6 +190,7 @@ export class Kernel {
       if (this._connectionStatus === 'connected') {
         this._clientId = this._session.kernel!.clientId;
         this._id = this._session.kernel!.id;
+        markJupyter('kernel_ready');
         this._ready.resolve();
       }
     };
@@ -179,6 +238,10 @@ export class Kernel {
     return this._kernelSpecManager;
   }
 
+  get kernelSpecName(): string {
+    return this._kernelSpecName;
+  }
+
   get path(): string {
     return this._path;
   }
@@ -199,13 +262,29 @@ export class Kernel {
     return this._sessionManager;
   }
 
+  /**
+   * The tracer of the kernel executions, if enabled.
+   */
+  get tracer(): KernelTracer | undefined {
+    return this._tracer;
+  }
+
+  /**
+   * The scheduler of the kernel executions.
+   */
+  get scheduler(): KernelScheduler {
+    return this._scheduler;
+  }
+
   /**
    * Execute a code snippet
    *
    * @param code The code snippet
    * @param options Callbacks on IOPub messages and on reply message,
-   *  outputs model to populate and execution options
-   * @returns The kernel executor
+   *  outputs model to populate, execution and scheduling options
+   * @returns The kernel executor, or the queued one if deduplicated with
+   *  `dedupKey`, in which case the model, hooks and phase callback of this
+   *  call are not used
    */
   execute(
     code: string,
@@ -219,6 +298,13 @@ export class Kernel {
       allowStdin,
       suppressCodeExecutionErrors = false,
       onExecutionPhaseChanged,
+      coalesceOutputs,
+      flushInterval,
+      maxStreamLength,
+      priority,
+      dedupKey,
+      signal,
+      cache,
     }: {
       model?: IOutputAreaModel;
       iopubMessageHooks?: IOPubMessageHook[];
@@ -229,6 +315,13 @@ export class Kernel {
       allowStdin?: boolean;
       suppressCodeExecutionErrors?: boolean;
       onExecutionPhaseChanged?: (phaseOutput: IExecutionPhaseOutput) => void;
+      coalesceOutputs?: boolean;
+      flushInterval?: number;
+      maxStreamLength?: number;
+      priority?: ExecutionPriority;
+      dedupKey?: string;
+      signal?: AbortSignal;
+      cache?: IExecutionCacheOptions;
     } = {}
   ): KernelExecutor | undefined {
     if (this._kernelConnection) {
@@ -236,17 +329,26 @@ export class Kernel {
         connection: this._kernelConnection,
         model,
         onExecutionPhaseChanged,
+        coalesceOutputs,
+        flushInterval,
+        maxStreamLength,
+        tracer: this._tracer,
+        cache: cache && { kernelspec: this._kernelSpecName, ...cache },
       });
-      kernelExecutor.execute(code, {
-        iopubMessageHooks,
-        shellMessageHooks,
-        silent,
-        stopOnError,
-        storeHistory,
-        allowStdin,
-        suppressCodeExecutionErrors,
-      });
-      return kernelExecutor;
+      return this._scheduler.schedule(
+        kernelExecutor,
+        code,
+        {
+          iopubMessageHooks,
+          shellMessageHooks,
+          silent,
+          stopOnError,
+          storeHistory,
+          allowStdin,
+          suppressCodeExecutionErrors,
+        },
+        { priority, key: dedupKey, signal }
+      );
     }
   }
 
@@ -280,6 +382,7 @@ export class Kernel {
    * Shutdown the kernel
    */
   async shutdown(): Promise<void> {
+    this._scheduler.cancelAll();
     await this._session.kernel?.shutdown();
     this.connection?.dispose();
   }
@@ -342,6 +445,23 @@ export namespace Kernel {
      * Kernel model
      */
     kernelModel?: JupyterKernel.IModel;
+    /**
+     * Maximum number of executions sent to the kernel before it replies,
+     * unlimited by default. The executions beyond it are queued, and sent
+     * after the kernel replies to the previous ones.
+     */
+    maxInFlight?: number;
+    /**
+     * Whether to claim a pre-warmed kernel from the `jupyter_react`
+     * server extension pool, when no kernel model is given. The pooled
+     * kernels run in the server root directory, a new kernel is started
+     * for a path in another directory
+     */
+    pooled?: boolean;
+    /**
+     * Tracer recording the timeline of the kernel executions
+     */
+    tracer?: KernelTracer;
   };
 }
 
@@ -4,14 +4,7 @@
  * MIT License
  */
 
-import {
-  IDisplayData,
-  IDisplayUpdate,
-  IExecuteResult,
-  IMimeBundle,
-  IOutput,
-  IStream,
-} from '@jupyterlab/nbformat';
+import { IMimeBundle, IOutput, IStream } from '@jupyterlab/nbformat';
 import { IOutputAreaModel, OutputAreaModel } from '@jupyterlab/outputarea';
 import { Kernel as JupyterKernel, KernelMessage } from '@jupyterlab/services';
 import { IClearOutputMsg } from '@jupyterlab/services/lib/kernel/messages';
@@ -19,7 +12,27 @@ import { PromiseDelegate } from '@lumino/coreutils';
 import { ISignal, Signal } from '@lumino/signaling';
 import { toKernelState } from '../../components/kernel';
 import { outputsAsString } from '../../utils/Utils';
+import { markJupyter } from '../JupyterMetrics';
+import type { IExecutionCacheOptions } from './ExecutionCache';
 import { ExecutionPhase, KernelsState, kernelsStore } from './KernelState';
+import {
+  DEFAULT_MAX_STREAM_LENGTH,
+  OutputCoalescer,
+  truncationNotice,
+} from './OutputCoalescer';
+import type { ExecutionTrace, KernelTracer } from './KernelTracer';
+
+const OUTPUT_MESSAGE_TYPES = new Set<string>([
+  'execute_result',
+  'display_data',
+  'stream',
+  'error',
+]);
+
+const streamText = (output: IOutput): string => {
+  const text = (output as IStream).text;
+  return Array.isArray(text) ? text.join('') : text;
+};
 
 export type IOPubMessageHook = (
   msg: KernelMessage.IIOPubMessage
@@ -53,6 +66,29 @@ export type IKernelExecutorOptions = {
    * @returns
    */
   onExecutionPhaseChanged?: (phaseOutput: IExecutionPhaseOutput) => void;
+  /**
+   * Buffer the outputs and apply them to the model once per animation
+   * frame, or per `flushInterval`, merging the consecutive stream chunks.
+   */
+  coalesceOutputs?: boolean;
+  /**
+   * Interval in milliseconds between two coalesced flushes,
+   * once per animation frame by default.
+   */
+  flushInterval?: number;
+  /**
+   * Maximum number of characters of a coalesced stream output, in the
+   * buffer and in the model, its middle is truncated beyond.
+   */
+  maxStreamLength?: number;
+  /**
+   * Tracer recording the timeline of the execution.
+   */
+  tracer?: KernelTracer;
+  /**
+   * Memoize the outputs of a successful execution.
+   */
+  cache?: IExecutionCacheOptions;
 };
 
 /**
@@ -95,11 +131,34 @@ export class KernelExecutor {
   private _onExecutionPhaseChanged?: (
     phaseOutput: IExecutionPhaseOutput
   ) => void;
+  private _coalescer?: OutputCoalescer;
+  private _maxStreamLength: number;
+  private _truncatedStream?: {
+    index: number;
+    name: string;
+    head: string;
+    truncated: number;
+  };
+  private _cancelled = false;
+  private _iopubMessageHooks: IOPubMessageHook[] = [];
+  private _trace?: ExecutionTrace;
+  private _cache?: IExecutionCacheOptions;
+  private _sent = new PromiseDelegate<
+    JupyterKernel.IFuture<
+      KernelMessage.IExecuteRequestMsg,
+      KernelMessage.IExecuteReplyMsg
+    >
+  >();
 
   public constructor({
     connection,
     model,
     onExecutionPhaseChanged,
+    coalesceOutputs = false,
+    flushInterval,
+    maxStreamLength,
+    tracer,
+    cache,
   }: IKernelExecutorOptions) {
     this._executed = new PromiseDelegate<IOutputAreaModel>();
     this._kernelConnection = connection;
@@ -107,6 +166,16 @@ export class KernelExecutor {
     this._outputs = [];
     this._kernelState = kernelsStore.getState();
     this._onExecutionPhaseChanged = onExecutionPhaseChanged;
+    this._trace = tracer?.trace(connection.id);
+    this._cache = cache;
+    this._maxStreamLength = maxStreamLength ?? DEFAULT_MAX_STREAM_LENGTH;
+    if (coalesceOutputs) {
+      this._coalescer = new OutputCoalescer({
+        flush: this._applyOutputs,
+        flushInterval,
+        maxStreamLength,
+      });
+    }
   }
 
   /**
@@ -171,9 +240,16 @@ export class KernelExecutor {
       stop_on_error: stopOnError,
       store_history: storeHistory,
     });
+    this._trace?.sent(this._future.msg.header.msg_id);
     this._future.onIOPub = this._onIOPub;
     this._future.onReply = this._onReply;
+    this._sent.resolve(this._future);
     iopubMessageHooks.forEach(hook => this._future!.registerMessageHook(hook));
+    // The hooks registered while the execution was queued.
+    this._iopubMessageHooks.forEach(hook =>
+      this._future!.registerMessageHook(hook)
+    );
+    this._iopubMessageHooks = [];
     this._future.onStdin = msg => {
       if (KernelMessage.isInputRequestMsg(msg)) {
         // FIXME Implement this...
@@ -181,7 +257,12 @@ export class KernelExecutor {
       }
     };
     // Wait for future to be done before resolving the exectud promise.
-    this._future.done.then(() => {
+    this._future.done.then(reply => {
+      this._coalescer?.flush();
+      this._trace?.finish();
+      if (this._cache && reply.content.status === 'ok') {
+        void this._memoize(code, this._cache);
+      }
       this._modelChanged.emit(this._model);
       this._executed.resolve(this._model);
       // We prevent from rewriting execution phase
@@ -217,11 +298,55 @@ export class KernelExecutor {
     return this._executed.promise;
   }
 
+  /**
+   * Cancel the execution if it was not sent to the kernel.
+   *
+   * @returns Whether the execution was cancelled
+   */
+  cancel(): boolean {
+    if (this._future || this._cancelled) {
+      return false;
+    }
+    this._cancelled = true;
+    this._executed.promise.catch(reason => console.debug(reason));
+    this._executed.reject('Execution cancelled.');
+    this._sent.promise.catch(reason => console.debug(reason));
+    this._sent.reject('Execution cancelled.');
+    return true;
+  }
+
+  /**
+   * Fail the execution if it was not sent to the kernel, e.g. when sending
+   * it throws.
+   *
+   * @returns Whether the execution was failed
+   */
+  fail(reason: unknown): boolean {
+    if (this._future || this._cancelled) {
+      return false;
+    }
+    this._cancelled = true;
+    this._executed.promise.catch(reason => console.debug(reason));
+    this._executed.reject(reason);
+    this._sent.promise.catch(reason => console.debug(reason));
+    this._sent.reject(reason);
+    return true;
+  }
+
+  /**
+   * Whether the execution was cancelled before it was sent to the kernel.
+   */
+  get cancelled(): boolean {
+    return this._cancelled;
+  }
+
   /**
    * Clear the kernel executor previous results.
    */
   clear(): void {
     this._shellMessageHooks.length = 0;
+    this._coalescer?.clear();
+    this._truncatedStream = undefined;
     this._outputs.length = 0;
     this._model.clear();
     if (this._phaseChangeCallback) {
@@ -230,7 +355,11 @@ export class KernelExecutor {
   }
 
   registerIOPubMessageHook = (msg: IOPubMessageHook) => {
-    this._future?.registerMessageHook(msg);
+    if (this._future) {
+      this._future.registerMessageHook(msg);
+    } else {
+      this._iopubMessageHooks.push(msg);
+    }
   };
 
   /**
@@ -245,6 +374,19 @@ export class KernelExecutor {
     return this._future;
   }
 
+  /**
+   * Promise that resolves with the future once the execution is sent to
+   * the kernel, it may be queued by the kernel scheduler.
+   */
+  get sent(): Promise<
+    JupyterKernel.IFuture<
+      KernelMessage.IExecuteRequestMsg,
+      KernelMessage.IExecuteReplyMsg
+    >
+  > {
+    return this._sent.promise;
+  }
+
   /**
    * Promise that resolves when the execution is done.
    */
@@ -302,32 +444,22 @@ export class KernelExecutor {
     if (this._future?.msg.header.msg_id !== message.parent_header.msg_id) {
       return;
     }
+    this._trace?.message(message);
     const messageType: KernelMessage.IOPubMessageType = message.header.msg_type;
     const output = { ...message.content, output_type: messageType };
+    if (OUTPUT_MESSAGE_TYPES.has(messageType)) {
+      markJupyter('first_output');
+    }
     switch (messageType) {
       case 'execute_result':
-        this._outputs.push(message.content as IExecuteResult);
-        this._outputsChanged.emit(this._outputs);
-        this._model.add(output);
-        this._modelChanged.emit(this._model);
-        break;
       case 'display_data':
-        this._outputs.push(message.content as IDisplayData);
-        this._outputsChanged.emit(this._outputs);
-        this._model.add(output);
-        this._modelChanged.emit(this._model);
-        break;
       case 'stream':
-        this._outputs.push(message.content as IStream);
-        this._outputsChanged.emit(this._outputs);
-        this._model.add(output);
-        this._modelChanged.emit(this._model);
+        this._addOutput(output, message.content as IOutput);
         break;
       case 'error':
-        this._outputs.push(message.content as IStream);
-        this._outputsChanged.emit(this._outputs);
-        this._model.add(output);
-        this._modelChanged.emit(this._model);
+        this._addOutput(output, message.content as IOutput);
+        // The error is in the model when the phase changes.
+        this._coalescer?.flush();
         if (this._stopOnError) {
           kernelsStore
             .getState()
@@ -343,15 +475,14 @@ export class KernelExecutor {
         break;
       case 'clear_output': {
         const wait = (message as IClearOutputMsg).content.wait;
+        this._coalescer?.flush();
+        this._truncatedStream = undefined;
         this._model.clear(wait);
         break;
       }
       case 'update_display_data': {
-        this._outputs.push(message.content as IDisplayUpdate);
-        this._outputsChanged.emit(this._outputs);
         // FIXME this needs more advanced analysis see OutputArea
-        this._model.add(output);
-        this._modelChanged.emit(this._model);
+        this._addOutput(output, message.content as IOutput);
         break;
       }
       case 'status': {
@@ -374,6 +505,8 @@ export class KernelExecutor {
     if (this._future?.msg.header.msg_id !== message.parent_header.msg_id) {
       return;
     }
+    this._trace?.message(message);
+    this._trace?.stamp('reply');
     this._shellMessageHooks.forEach(hook => hook(message));
     const content = message.content;
     if (content.status !== 'ok') {
@@ -410,13 +543,144 @@ export class KernelExecutor {
           data: (page as any).data as IMimeBundle,
           metadata: {},
         };
+        this._addOutput(output);
+      }
+    }
+  };
+
+  private async _memoize(
+    code: string,
+    { cache, kernelspec, dependencies }: IExecutionCacheOptions
+  ): Promise<void> {
+    const outputs = this._model.toJSON();
+    const key = await cache.key(
+      kernelspec ?? this._kernelConnection.name,
+      code,
+      dependencies
+    );
+    if (key) {
+      await cache
+        .set(key, outputs)
+        .catch(error => console.debug('Failed to memoize the result.', error));
+    }
+  }
+
+  /**
+   * Add an output to the model, and its message content to the outputs.
+   */
+  private _addOutput(output: IOutput, content: IOutput = output): void {
+    if (this._coalescer) {
+      this._coalescer.add(output);
+      return;
+    }
+    this._outputs.push(content);
+    this._model.add(output);
+    this._emitOutputs();
+  }
+
+  private _applyOutputs = (outputs: IOutput[]): void => {
+    for (const output of outputs) {
+      if (output.output_type === 'stream') {
+        this._applyStream(output as IStream);
+      } else {
+        this._truncatedStream = undefined;
         this._outputs.push(output);
-        this._outputsChanged.emit(this._outputs);
         this._model.add(output);
-        this._modelChanged.emit(this._model);
       }
     }
+    this._emitOutputs();
   };
+
+  /**
+   * Merge a coalesced stream into the model, the middle of the merged
+   * stream output is truncated once longer than `maxStreamLength`. The
+   * outputs hold the merged stream output too.
+   */
+  private _applyStream(stream: IStream): void {
+    const last = this._model.length - 1;
+    const truncated = this._truncatedStream;
+    let index: number;
+    let text: string;
+    let merged: boolean;
+    let rebased = false;
+    if (truncated?.index === last && truncated.name === stream.name) {
+      // The model merges a stream with the untruncated text it keeps, so
+      // the stream is merged with the truncated text in a scratch model.
+      const scratch = new OutputAreaModel();
+      scratch.add(this._model.get(last).toJSON());
+      scratch.add(stream);
+      text = streamText(scratch.get(0).toJSON());
+      scratch.dispose();
+      index = last;
+      merged = true;
+      rebased = true;
+    } else {
+      this._truncatedStream = undefined;
+      this._model.add(stream);
+      index = this._model.length - 1;
+      text = streamText(this._model.get(index).toJSON());
+      merged = index === last;
+    }
+    const bounded = this._truncateStream(index, stream.name, text);
+    const output: IStream = {
+      output_type: 'stream',
+      name: stream.name,
+      text: bounded,
+    };
+    if (rebased || bounded !== text) {
+      this._model.set(index, output);
+    }
+    const previous = this._outputs[this._outputs.length - 1];
+    if (
+      merged &&
+      previous?.output_type === 'stream' &&
+      (previous as IStream).name === stream.name
+    ) {
+      this._outputs[this._outputs.length - 1] = output;
+    } else {
+      this._outputs.push(output);
+    }
+  }
+
+  /**
+   * Return the text of a stream output with its middle truncated once
+   * longer than `maxStreamLength`.
+   *
+   * Once truncated, the tail is trimmed back to half the maximum length
+   * when it reaches the maximum, as the coalescer does.
+   */
+  private _truncateStream(index: number, name: string, text: string): string {
+    const half = Math.floor(this._maxStreamLength / 2);
+    let state = this._truncatedStream;
+    let tail: string;
+    if (state) {
+      tail = text.slice(
+        state.head.length + truncationNotice(state.truncated).length
+      );
+      if (tail.length <= this._maxStreamLength) {
+        return text;
+      }
+    } else {
+      if (text.length <= this._maxStreamLength) {
+        return text;
+      }
+      state = { index, name, head: text.slice(0, half), truncated: 0 };
+      tail = text.slice(half);
+    }
+    state.truncated += tail.length - half;
+    this._truncatedStream = state;
+    return (
+      state.head +
+      truncationNotice(state.truncated) +
+      tail.slice(tail.length - half)
+    );
+  }
+
+  private _emitOutputs(): void {
+    this._outputsChanged.emit(this._outputs);
+    this._modelChanged.emit(this._model);
+    this._trace?.rendered();
+  }
 }
 
 export default KernelExecutor;
@@ -0,0 +1,277 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import type { KernelExecutor } from './KernelExecutor';
+import { kernelsStore } from './KernelState';
+
+/**
+ * Default number of executions sent to the kernel before it replies,
+ * unlimited so the executions are sent as soon as they are scheduled.
+ */
+export const DEFAULT_MAX_IN_FLIGHT = Infinity;
+
+/**
+ * Priority lane of an execution, the interactive executions are sent
+ * before the queued background ones, which wait for the kernel to be idle.
+ */
+export type ExecutionPriority = 'interactive' | 'background';
+
+type ScheduledExecution = {
+  executor: KernelExecutor;
+  code: string;
+  options: Parameters<KernelExecutor['execute']>[1];
+  priority: ExecutionPriority;
+  key?: string;
+  submittedAt: number;
+};
+
+/**
+ * Schedule the executions of a kernel.
+ *
+ * The interactive executions are sent to the kernel with at most
+ * `maxInFlight` of them waiting for their reply, so the kernel pipelines
+ * them on its shell channel. The background executions are queued until
+ * no execution is in flight, so an interactive execution overtakes the
+ * background ones that were not sent yet. A queued execution can be
+ * cancelled before it reaches the kernel, and executions submitted with
+ * the same key while queued are deduplicated.
+ *
+ * The window is unlimited by default: the interactive executions are sent
+ * right away, and an execution following one which fails is aborted by
+ * the kernel with `stop_on_error`. With a limited window, the executions
+ * queued behind a failed one are sent after its reply, so they are not
+ * aborted. The background executions are sent without `stop_on_error`
+ * unless it is set, so their failure never aborts the interactive ones.
+ */
+export class KernelScheduler {
+  private _getKernelId: () => string | undefined;
+  private _maxInFlight: number;
+  private _lanes: Record<ExecutionPriority, ScheduledExecution[]> = {
+    interactive: [],
+    background: [],
+  };
+  private _inFlight = 0;
+  private _started = 0;
+  private _totalWait = 0;
+  private _lastWait = 0;
+  private _maxWait = 0;
+
+  constructor(options: KernelScheduler.IOptions) {
+    this._getKernelId = options.getKernelId;
+    this._maxInFlight = Math.max(
+      1,
+      options.maxInFlight ?? DEFAULT_MAX_IN_FLIGHT
+    );
+  }
+
+  /**
+   * Number of executions waiting to be sent to the kernel.
+   */
+  get queued(): number {
+    return this._lanes.interactive.length + this._lanes.background.length;
+  }
+
+  /**
+   * Number of executions sent to the kernel and waiting for their reply.
+   */
+  get inFlight(): number {
+    return this._inFlight;
+  }
+
+  /**
+   * Maximum number of executions sent to the kernel before it replies.
+   */
+  get maxInFlight(): number {
+    return this._maxInFlight;
+  }
+  set maxInFlight(maxInFlight: number) {
+    this._maxInFlight = Math.max(1, maxInFlight);
+    this._pump();
+  }
+
+  /**
+   * Schedule the execution of the code with the executor.
+   *
+   * @returns The executor, or the one of the queued execution with the same key
+   */
+  schedule(
+    executor: KernelExecutor,
+    code: string,
+    options: Parameters<KernelExecutor['execute']>[1] = {},
+    {
+      priority = 'interactive',
+      key,
+      signal,
+    }: KernelScheduler.IScheduleOptions = {}
+  ): KernelExecutor {
+    if (key !== undefined) {
+      const queued = this._find(execution => execution.key === key);
+      if (queued) {
+        return queued.executor;
+      }
+    }
+    if (signal?.aborted) {
+      executor.cancel();
+      return executor;
+    }
+    signal?.addEventListener('abort', () => this.cancel(executor), {
+      once: true,
+    });
+    this._lanes[priority].push({
+      executor,
+      code,
+      options,
+      priority,
+      key,
+      submittedAt: performance.now(),
+    });
+    this._pump();
+    return executor;
+  }
+
+  /**
+   * Cancel an execution that was not sent to the kernel.
+   *
+   * @returns Whether the execution was cancelled
+   */
+  cancel(executor: KernelExecutor): boolean {
+    const execution = this._find(execution => execution.executor === executor);
+    if (!execution) {
+      return false;
+    }
+    const lane = this._lanes[execution.priority];
+    lane.splice(lane.indexOf(execution), 1);
+    executor.cancel();
+    this._publish();
+    return true;
+  }
+
+  /**
+   * Cancel all the executions that were not sent to the kernel.
+   *
+   * @returns The number of cancelled executions
+   */
+  cancelAll(): number {
+    const executions = [
+      ...this._lanes.interactive,
+      ...this._lanes.background,
+    ];
+    this._lanes.interactive = [];
+    this._lanes.background = [];
+    executions.forEach(execution => execution.executor.cancel());
+    this._publish();
+    return executions.length;
+  }
+
+  private _find(
+    predicate: (execution: ScheduledExecution) => boolean
+  ): ScheduledExecution | undefined {
+    return (
+      this._lanes.interactive.find(predicate) ??
+      this._lanes.background.find(predicate)
+    );
+  }
+
+  private _next(): ScheduledExecution | undefined {
+    if (this._inFlight >= this._maxInFlight) {
+      return undefined;
+    }
+    return (
+      this._lanes.interactive.shift() ??
+      (this._inFlight === 0 ? this._lanes.background.shift() : undefined)
+    );
+  }
+
+  private _pump(): void {
+    let execution: ScheduledExecution | undefined;
+    while ((execution = this._next())) {
+      // Cancelled directly with the executor.
+      if (execution.executor.cancelled) {
+        continue;
+      }
+      this._send(execution);
+    }
+    this._publish();
+  }
+
+  private _send(execution: ScheduledExecution): void {
+    const wait = performance.now() - execution.submittedAt;
+    this._started++;
+    this._totalWait += wait;
+    this._lastWait = wait;
+    this._maxWait = Math.max(this._maxWait, wait);
+    const { executor } = execution;
+    const options = { ...execution.options };
+    if (
+      execution.priority === 'background' &&
+      options.stopOnError === undefined
+    ) {
+      options.stopOnError = false;
+    }
+    try {
+      executor.execute(execution.code, options);
+    } catch (error) {
+      console.error('[KernelScheduler] Failed to send the execution:', error);
+      executor.fail(error);
+      this._pump();
+      return;
+    }
+    this._inFlight++;
+    const settled = () => {
+      this._inFlight--;
+      this._pump();
+    };
+    executor.future!.done.then(settled, settled);
+  }
+
+  private _publish(): void {
+    const id = this._getKernelId();
+    if (!id) {
+      return;
+    }
+    kernelsStore.getState().setSchedulerState(id, {
+      queued: this.queued,
+      inFlight: this._inFlight,
+      lastWait: this._lastWait,
+      meanWait: this._started ? this._totalWait / this._started : 0,
+      maxWait: this._maxWait,
+    });
+  }
+}
+
+export namespace KernelScheduler {
+  export interface IOptions {
+    /**
+     * Return the id of the kernel, to publish the scheduler state.
+     */
+    getKernelId: () => string | undefined;
+    /**
+     * Maximum number of executions sent to the kernel before it replies,
+     * unlimited by default.
+     */
+    maxInFlight?: number;
+  }
+
+  export interface IScheduleOptions {
+    /**
+     * Priority lane of the execution.
+     */
+    priority?: ExecutionPriority;
+    /**
+     * Deduplication key, an execution submitted with the key of a queued
+     * execution returns the queued executor. The deduplicated executor is
+     * not sent, so its outputs model, hooks and phase callback are not
+     * used: the results are read from the returned executor.
+     */
+    key?: string;
+    /**
+     * Cancel the execution when aborted, if it was not sent to the kernel.
+     */
+    signal?: AbortSignal;
+  }
+}
+
+export default KernelScheduler;
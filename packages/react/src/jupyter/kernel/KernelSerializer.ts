@@ -0,0 +1,109 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { KernelMessage, ServerConnection } from '@jupyterlab/services';
+import {
+  deserialize as deserializeLegacy,
+  serialize as serializeLegacy,
+} from '@jupyterlab/services/lib/kernel/serialize';
+
+/**
+ * The binary kernel websocket protocol of the Jupyter server.
+ */
+export const KERNEL_WEBSOCKET_PROTOCOL_V1 =
+  KernelMessage.supportedKernelWebSocketProtocols.v1KernelWebsocketJupyterOrg;
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder('utf8');
+
+function decodeJSON(data: ArrayBuffer, start: number, end: number): any {
+  return JSON.parse(decoder.decode(new Uint8Array(data, start, end - start)));
+}
+
+function asBytes(buffer: ArrayBuffer | ArrayBufferView): Uint8Array {
+  // A view may only cover a part of its buffer.
+  return ArrayBuffer.isView(buffer)
+    ? new Uint8Array(buffer.buffer, buffer.byteOffset, buffer.byteLength)
+    : new Uint8Array(buffer);
+}
+
+/**
+ * Deserialize a message of the `v1.kernel.websocket.jupyter.org` protocol.
+ *
+ * The message is a list of little endian 64 bits offsets followed by the
+ * channel, the header, the parent header, the metadata, the content and
+ * the binary buffers. The buffers are views on the received data, so a
+ * numpy array sent to a widget model is never copied.
+ */
+export function deserializeV1(data: ArrayBuffer): KernelMessage.IMessage {
+  const view = new DataView(data);
+  const count = Number(view.getBigUint64(0, true));
+  const offsets = new Array<number>(count);
+  for (let i = 0; i < count; i++) {
+    offsets[i] = Number(view.getBigUint64(8 * (i + 1), true));
+  }
+  const buffers: DataView[] = [];
+  for (let i = 5; i < count - 1; i++) {
+    buffers.push(new DataView(data, offsets[i], offsets[i + 1] - offsets[i]));
+  }
+  return {
+    channel: decoder.decode(
+      new Uint8Array(data, offsets[0], offsets[1] - offsets[0])
+    ),
+    header: decodeJSON(data, offsets[1], offsets[2]),
+    parent_header: decodeJSON(data, offsets[2], offsets[3]),
+    metadata: decodeJSON(data, offsets[3], offsets[4]),
+    content: decodeJSON(data, offsets[4], offsets[5]),
+    buffers,
+  } as KernelMessage.IMessage;
+}
+
+/**
+ * Serialize a message with the `v1.kernel.websocket.jupyter.org` protocol.
+ *
+ * The frame is allocated once, and the buffers are copied once in it.
+ */
+export function serializeV1(msg: KernelMessage.IMessage): ArrayBuffer {
+  const parts = [
+    encoder.encode(msg.channel),
+    encoder.encode(JSON.stringify(msg.header)),
+    encoder.encode(
+      msg.parent_header == null ? '{}' : JSON.stringify(msg.parent_header)
+    ),
+    encoder.encode(JSON.stringify(msg.metadata)),
+    encoder.encode(JSON.stringify(msg.content)),
+    ...(msg.buffers ?? []).map(asBytes),
+  ];
+  const count = parts.length + 1;
+  const offsets = [8 * (1 + count)];
+  for (const part of parts) {
+    offsets.push(offsets[offsets.length - 1] + part.byteLength);
+  }
+  const frame = new Uint8Array(offsets[offsets.length - 1]);
+  const view = new DataView(frame.buffer);
+  view.setBigUint64(0, BigInt(count), true);
+  offsets.forEach((offset, i) =>
+    view.setBigUint64(8 * (i + 1), BigInt(offset), true)
+  );
+  parts.forEach((part, i) => frame.set(part, offsets[i]));
+  return frame.buffer;
+}
+
+/**
+ * Kernel messages serializer of the server settings, handling the binary
+ * protocol without copying the buffers and the legacy one as JupyterLab does.
+ */
+export const kernelMessageSerializer: ServerConnection.ISettings['serializer'] =
+  {
+    serialize: (msg: KernelMessage.IMessage, protocol?: string) =>
+      protocol === KERNEL_WEBSOCKET_PROTOCOL_V1
+        ? serializeV1(msg)
+        : serializeLegacy(msg, protocol),
+    deserialize: (data: ArrayBuffer, protocol?: string) =>
+      protocol === KERNEL_WEBSOCKET_PROTOCOL_V1
+        ? deserializeV1(data)
+        : deserializeLegacy(data, protocol),
+  };
@@ -16,13 +16,30 @@ export enum ExecutionPhase {
   completed_with_warning = 'COMPLETED_WITH_WARNING',
 }
 
+/**
+ * State of the execution scheduler of a kernel, the wait times are in milliseconds.
+ */
+export type IKernelSchedulerState = {
+  queued: number;
+  inFlight: number;
+  lastWait: number;
+  meanWait: number;
+  maxWait: number;
+};
+
 export type IKernelState = {
   id: string;
   executionState?: ExecutionState;
   executionPhase?: ExecutionPhase;
+  scheduler?: IKernelSchedulerState;
 };
 
 export interface IKernelsState {
+  /**
+   * The kernel states by id. The map and the states are immutable, an
+   * update replaces the states of the updated kernels only, so a selector
+   * of one kernel state changes when that kernel is updated.
+   */
   kernels: Map<string, IKernelState>;
 }
 
@@ -31,48 +48,151 @@ export type KernelsState = IKernelsState & {
   setExecutionState: (id: string, executionState: ExecutionState) => void;
   getExecutionPhase: (id: string) => ExecutionPhase | undefined;
   setExecutionPhase: (id: string, executionState: ExecutionPhase) => void;
+  getSchedulerState: (id: string) => IKernelSchedulerState | undefined;
+  setSchedulerState: (id: string, scheduler: IKernelSchedulerState) => void;
 };
 
-export const kernelsStore = createStore<KernelsState>((set, get) => ({
+/**
+ * The kernel states updated since the last commit to the store.
+ */
+const pending = new Map<string, IKernelState>();
+
+let commitScheduled = false;
+
+function isSameKernelState(a?: IKernelState, b?: IKernelState): boolean {
+  return (
+    a !== undefined &&
+    b !== undefined &&
+    a.executionState === b.executionState &&
+    a.executionPhase === b.executionPhase &&
+    a.scheduler === b.scheduler
+  );
+}
+
+function commit(): void {
+  commitScheduled = false;
+  if (pending.size === 0) {
+    return;
+  }
+  const committed = kernelsStore.getState().kernels;
+  let kernels: Map<string, IKernelState> | undefined;
+  for (const [id, kernel] of pending) {
+    // The updates of a batch may leave a kernel as it was.
+    if (!isSameKernelState(committed.get(id), kernel)) {
+      kernels = kernels ?? new Map(committed);
+      kernels.set(id, kernel);
+    }
+  }
+  pending.clear();
+  if (kernels) {
+    kernelsStore.setState({ kernels });
+  }
+}
+
+function scheduleCommit(): void {
+  if (commitScheduled) {
+    return;
+  }
+  commitScheduled = true;
+  // The animation frames are paused in the hidden pages.
+  const useAnimationFrame =
+    typeof requestAnimationFrame !== 'undefined' &&
+    !(typeof document !== 'undefined' && document.hidden);
+  if (useAnimationFrame) {
+    requestAnimationFrame(commit);
+  } else {
+    queueMicrotask(commit);
+  }
+}
+
+function getKernel(id: string): IKernelState | undefined {
+  return pending.get(id) ?? kernelsStore.getState().kernels.get(id);
+}
+
+function updateKernel<K extends keyof Omit<IKernelState, 'id'>>(
+  id: string,
+  key: K,
+  value: IKernelState[K]
+): void {
+  const kernel = getKernel(id);
+  if (kernel && kernel[key] === value) {
+    return;
+  }
+  pending.set(id, { ...(kernel ?? { id }), [key]: value });
+  scheduleCommit();
+}
+
+/**
+ * Store of the kernel states.
+ *
+ * The updates are batched, they are committed to the store once per
+ * animation frame, or microtask in the hidden pages, so a burst of kernel
+ * messages notifies the subscribers once. The getters return the updated
+ * values before they are committed.
+ */
+export const kernelsStore = createStore<KernelsState>(() => ({
   kernels: new Map<string, IKernelState>(),
   getExecutionState: (id: string) => {
-    return get().kernels.get(id)?.executionState;
+    return getKernel(id)?.executionState;
   },
   setExecutionState: (id: string, executionState: ExecutionState) => {
-    const kernels = get().kernels;
-    const k = kernels.get(id);
-    if (k) {
-      k.executionState = executionState;
-    } else {
-      kernels.set(id, {
-        id,
-        executionState: executionState,
-      });
-    }
-    set((state: KernelsState) => ({ kernels }));
+    updateKernel(id, 'executionState', executionState);
   },
   getExecutionPhase: (id: string) => {
-    return get().kernels.get(id)?.executionPhase;
+    return getKernel(id)?.executionPhase;
   },
   setExecutionPhase: (id: string, executionPhase: ExecutionPhase) => {
-    const kernels = get().kernels;
-    const k = kernels.get(id);
-    if (k) {
-      k.executionPhase = executionPhase;
-    } else {
-      kernels.set(id, {
-        id,
-        executionPhase,
-      });
-    }
-    set((state: KernelsState) => ({ kernels }));
+    updateKernel(id, 'executionPhase', executionPhase);
+  },
+  getSchedulerState: (id: string) => {
+    return getKernel(id)?.scheduler;
+  },
+  setSchedulerState: (id: string, scheduler: IKernelSchedulerState) => {
+    updateKernel(id, 'scheduler', scheduler);
   },
 }));
 
+/**
+ * Commit the pending kernel state updates to the store now.
+ */
+export function flushKernelsState(): void {
+  commit();
+}
+
+/**
+ * Subscribe to the committed changes of a kernel state.
+ *
+ * @returns The function unsubscribing the listener
+ */
+export function subscribeKernelState(
+  id: string,
+  listener: (
+    kernel: IKernelState | undefined,
+    previous: IKernelState | undefined
+  ) => void
+): () => void {
+  return kernelsStore.subscribe((state, previousState) => {
+    const kernel = state.kernels.get(id);
+    const previous = previousState.kernels.get(id);
+    if (kernel !== previous) {
+      listener(kernel, previous);
+    }
+  });
+}
+
 export function useKernelsStore(): KernelsState;
 export function useKernelsStore<T>(selector: (state: KernelsState) => T): T;
 export function useKernelsStore<T>(selector?: (state: KernelsState) => T) {
   return useStore(kernelsStore, selector!);
 }
 
+/**
+ * The state of a kernel, the component re-renders only when it changes.
+ */
+export function useKernelState(id?: string): IKernelState | undefined {
+  return useStore(kernelsStore, state =>
+    id === undefined ? undefined : state.kernels.get(id)
+  );
+}
+
 export default useKernelsStore;
@@ -0,0 +1,286 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { KernelMessage, ServerConnection } from '@jupyterlab/services';
+import { requestAPI } from '../JupyterHandlers';
+
+/**
+ * Default number of traces kept by a tracer.
+ */
+export const DEFAULT_MAX_TRACES = 500;
+
+/**
+ * Milliseconds since the execution was queued, undefined if not reached.
+ */
+export type IExecutionTimings = {
+  queued: number;
+  sent?: number;
+  busy?: number;
+  firstOutput?: number;
+  lastOutput?: number;
+  idle?: number;
+  reply?: number;
+  rendered?: number;
+};
+
+/**
+ * Durations in milliseconds attributing the latency of an execution:
+ * - `queue`: waiting in the kernel scheduler.
+ * - `dispatch`: from the request to the kernel going busy, i.e. the
+ *   network and the kernel queue.
+ * - `firstOutput`: from the kernel going busy to the first output.
+ * - `run`: the kernel busy with the execution.
+ * - `render`: from the last output to the model update, i.e. the
+ *   frontend buffering and rendering.
+ * - `total`: from the queueing to the reply.
+ */
+export type IExecutionPhases = {
+  queue?: number;
+  dispatch?: number;
+  firstOutput?: number;
+  run?: number;
+  render?: number;
+  total?: number;
+};
+
+export type IExecutionTrace = {
+  msgId?: string;
+  kernelId: string;
+  /**
+   * Epoch time in milliseconds of the queueing.
+   */
+  startTime: number;
+  timings: IExecutionTimings;
+  phases: IExecutionPhases;
+  /**
+   * Count and approximate bytes, the JSON length of the content and the
+   * buffers length, of the IOPub and reply messages per type.
+   */
+  messages: Record<string, { count: number; bytes: number }>;
+};
+
+function duration(start?: number, end?: number): number | undefined {
+  return start === undefined || end === undefined
+    ? undefined
+    : Math.max(0, end - start);
+}
+
+/**
+ * The trace of one execution, filled by the KernelExecutor.
+ */
+export class ExecutionTrace {
+  private _tracer: KernelTracer;
+  private _kernelId: string;
+  private _msgId?: string;
+  private _queued = performance.now();
+  private _timings: Omit<IExecutionTimings, 'queued'> = {};
+  private _messages: IExecutionTrace['messages'] = {};
+  private _finished = false;
+
+  constructor(tracer: KernelTracer, kernelId: string) {
+    this._tracer = tracer;
+    this._kernelId = kernelId;
+  }
+
+  /**
+   * Record the time of a step, once.
+   */
+  stamp(step: keyof Omit<IExecutionTimings, 'queued'>): void {
+    if (this._timings[step] === undefined) {
+      this._timings[step] = performance.now() - this._queued;
+    }
+  }
+
+  /**
+   * Record the request sent to the kernel.
+   */
+  sent(msgId: string): void {
+    this._msgId = msgId;
+    this.stamp('sent');
+  }
+
+  /**
+   * Count a message received for the execution.
+   */
+  message(msg: KernelMessage.IMessage): void {
+    const type = msg.header.msg_type;
+    const messages = (this._messages[type] = this._messages[type] ?? {
+      count: 0,
+      bytes: 0,
+    });
+    messages.count++;
+    messages.bytes += JSON.stringify(msg.content).length;
+    for (const buffer of msg.buffers ?? []) {
+      messages.bytes += buffer.byteLength;
+    }
+    if (type === 'status') {
+      const state = (msg.content as KernelMessage.IStatusMsg['content'])
+        .execution_state;
+      if (state === 'busy') {
+        this.stamp('busy');
+      } else if (state === 'idle') {
+        this.stamp('idle');
+      }
+    } else if (
+      type === 'stream' ||
+      type === 'display_data' ||
+      type === 'execute_result' ||
+      type === 'error' ||
+      type === 'update_display_data'
+    ) {
+      this.stamp('firstOutput');
+      this._timings.lastOutput = performance.now() - this._queued;
+    }
+  }
+
+  /**
+   * Record the outputs applied to the model.
+   */
+  rendered(): void {
+    this._timings.rendered = performance.now() - this._queued;
+  }
+
+  /**
+   * End the trace and add it to the tracer.
+   */
+  finish(): void {
+    if (this._finished) {
+      return;
+    }
+    this._finished = true;
+    this._tracer.add(this);
+  }
+
+  get kernelId(): string {
+    return this._kernelId;
+  }
+
+  get msgId(): string | undefined {
+    return this._msgId;
+  }
+
+  get queuedAt(): number {
+    return this._queued;
+  }
+
+  get phases(): IExecutionPhases {
+    const t = this._timings;
+    return {
+      queue: duration(0, t.sent),
+      dispatch: duration(t.sent, t.busy),
+      firstOutput: duration(t.busy, t.firstOutput),
+      run: duration(t.busy, t.idle),
+      render: duration(t.lastOutput, t.rendered),
+      total: duration(0, t.reply ?? t.idle),
+    };
+  }
+
+  toJSON(): IExecutionTrace {
+    return {
+      msgId: this._msgId,
+      kernelId: this._kernelId,
+      startTime: performance.timeOrigin + this._queued,
+      timings: { queued: 0, ...this._timings },
+      phases: this.phases,
+      messages: this._messages,
+    };
+  }
+}
+
+/**
+ * Opt-in tracer of the kernel executions.
+ *
+ * Each finished execution is kept in a bounded list and its phases are
+ * added to the browser performance timeline as `jupyter-react:<phase>`
+ * measures, so they show in the devtools next to the rendering. The traces
+ * can be exported as JSON, or reported to the `jupyter_react` server
+ * extension which aggregates them in its Prometheus metrics.
+ */
+export class KernelTracer {
+  private _maxTraces: number;
+  private _traces: ExecutionTrace[] = [];
+
+  constructor(options: KernelTracer.IOptions = {}) {
+    this._maxTraces = options.maxTraces ?? DEFAULT_MAX_TRACES;
+  }
+
+  /**
+   * Start the trace of an execution, queued now.
+   */
+  trace(kernelId: string): ExecutionTrace {
+    return new ExecutionTrace(this, kernelId);
+  }
+
+  /**
+   * Add a finished trace.
+   */
+  add(trace: ExecutionTrace): void {
+    this._traces.push(trace);
+    if (this._traces.length > this._maxTraces) {
+      this._traces.shift();
+    }
+    const { timings } = trace.toJSON();
+    const phases: [keyof IExecutionPhases, number?, number?][] = [
+      ['queue', 0, timings.sent],
+      ['dispatch', timings.sent, timings.busy],
+      ['run', timings.busy, timings.idle],
+      ['render', timings.lastOutput, timings.rendered],
+    ];
+    for (const [phase, start, end] of phases) {
+      if (start !== undefined && end !== undefined) {
+        performance.measure?.(`jupyter-react:${phase}`, {
+          start: trace.queuedAt + start,
+          end: trace.queuedAt + end,
+          detail: { msgId: trace.msgId, kernelId: trace.kernelId },
+        });
+      }
+    }
+  }
+
+  /**
+   * The finished traces, oldest first.
+   */
+  get traces(): ExecutionTrace[] {
+    return this._traces;
+  }
+
+  /**
+   * Remove the finished traces.
+   */
+  clear(): void {
+    this._traces = [];
+  }
+
+  toJSON(): { traces: IExecutionTrace[] } {
+    return { traces: this._traces.map(trace => trace.toJSON()) };
+  }
+
+  /**
+   * Report the finished traces to the server extension, and remove them.
+   */
+  async report(serverSettings: ServerConnection.ISettings): Promise<void> {
+    if (this._traces.length === 0) {
+      return;
+    }
+    const body = JSON.stringify(this.toJSON());
+    this.clear();
+    await requestAPI<void>(serverSettings, 'jupyter_react', 'metrics/traces', {
+      method: 'POST',
+      body,
+    });
+  }
+}
+
+export namespace KernelTracer {
+  export interface IOptions {
+    /**
+     * Maximum number of finished traces kept.
+     */
+    maxTraces?: number;
+  }
+}
+
+export default KernelTracer;
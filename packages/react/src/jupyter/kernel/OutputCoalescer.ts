@@ -0,0 +1,203 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { IOutput, IStream, StreamType } from '@jupyterlab/nbformat';
+
+/**
+ * Default maximum number of characters of a stream output.
+ */
+export const DEFAULT_MAX_STREAM_LENGTH = 1024 * 1024;
+
+/**
+ * Return the notice replacing the truncated middle of a stream.
+ */
+export const truncationNotice = (truncated: number): string =>
+  `\n... [${truncated} characters truncated] ...\n`;
+
+/**
+ * Consecutive stream chunks of the same name, truncated in the middle
+ * once longer than the maximum length.
+ */
+type StreamBuffer = {
+  name: StreamType;
+  head?: string;
+  chunks: string[];
+  length: number;
+  truncated: number;
+};
+
+function isStreamBuffer(item: IOutput | StreamBuffer): item is StreamBuffer {
+  return (item as StreamBuffer).chunks !== undefined;
+}
+
+/**
+ * Buffer the outputs of an execution and flush them at most once per
+ * animation frame, or per interval.
+ *
+ * The consecutive stream chunks with the same name are merged, so a loop
+ * printing thousands of lines produces a single output per flush. The
+ * memory held between two flushes is bounded, the middle of a stream
+ * longer than `maxStreamLength` is replaced by a truncation notice. The
+ * `KernelExecutor` bounds the stream outputs of its model the same way.
+ */
+export class OutputCoalescer {
+  private _flush: (outputs: IOutput[]) => void;
+  private _flushInterval?: number;
+  private _maxStreamLength: number;
+  private _pending: (IOutput | StreamBuffer)[] = [];
+  private _animationFrame?: number;
+  private _timeout?: ReturnType<typeof setTimeout>;
+
+  constructor(options: OutputCoalescer.IOptions) {
+    this._flush = options.flush;
+    this._flushInterval = options.flushInterval;
+    this._maxStreamLength =
+      options.maxStreamLength ?? DEFAULT_MAX_STREAM_LENGTH;
+  }
+
+  /**
+   * Number of outputs waiting for the next flush.
+   */
+  get pending(): number {
+    return this._pending.length;
+  }
+
+  /**
+   * Buffer an output until the next flush.
+   */
+  add(output: IOutput): void {
+    if (output.output_type === 'stream') {
+      const stream = output as IStream;
+      const text = Array.isArray(stream.text)
+        ? stream.text.join('')
+        : stream.text;
+      const last = this._pending[this._pending.length - 1];
+      if (last && isStreamBuffer(last) && last.name === stream.name) {
+        this._append(last, text);
+      } else {
+        const buffer: StreamBuffer = {
+          name: stream.name,
+          chunks: [],
+          length: 0,
+          truncated: 0,
+        };
+        this._pending.push(buffer);
+        this._append(buffer, text);
+      }
+    } else {
+      this._pending.push(output);
+    }
+    this._schedule();
+  }
+
+  /**
+   * Flush the buffered outputs now.
+   */
+  flush(): void {
+    this._cancel();
+    if (this._pending.length === 0) {
+      return;
+    }
+    const outputs = this._pending.map(item =>
+      isStreamBuffer(item) ? this._toStream(item) : item
+    );
+    this._pending = [];
+    this._flush(outputs);
+  }
+
+  /**
+   * Drop the buffered outputs.
+   */
+  clear(): void {
+    this._cancel();
+    this._pending = [];
+  }
+
+  private _append(buffer: StreamBuffer, text: string): void {
+    buffer.chunks.push(text);
+    buffer.length += text.length;
+    const half = Math.floor(this._maxStreamLength / 2);
+    // Once truncated, the tail is trimmed back to half the maximum length
+    // when it reaches the maximum, to join the chunks in amortized linear time.
+    const limit =
+      buffer.head === undefined
+        ? this._maxStreamLength
+        : half + this._maxStreamLength;
+    if (buffer.length <= limit) {
+      return;
+    }
+    let tail = buffer.chunks.join('');
+    if (buffer.head === undefined) {
+      buffer.head = tail.slice(0, half);
+      tail = tail.slice(half);
+    }
+    buffer.truncated += tail.length - half;
+    tail = tail.slice(tail.length - half);
+    buffer.chunks = [tail];
+    buffer.length = half + tail.length;
+  }
+
+  private _toStream(buffer: StreamBuffer): IStream {
+    let text = buffer.chunks.join('');
+    if (buffer.head !== undefined) {
+      text = buffer.head + truncationNotice(buffer.truncated) + text;
+    }
+    return { output_type: 'stream', name: buffer.name, text };
+  }
+
+  private _schedule(): void {
+    if (this._animationFrame !== undefined || this._timeout !== undefined) {
+      return;
+    }
+    // The animation frames are paused in the hidden pages.
+    const useAnimationFrame =
+      this._flushInterval === undefined &&
+      typeof requestAnimationFrame !== 'undefined' &&
+      !(typeof document !== 'undefined' && document.hidden);
+    if (useAnimationFrame) {
+      this._animationFrame = requestAnimationFrame(() => {
+        this._animationFrame = undefined;
+        this.flush();
+      });
+    } else {
+      this._timeout = setTimeout(() => {
+        this._timeout = undefined;
+        this.flush();
+      }, this._flushInterval ?? 16);
+    }
+  }
+
+  private _cancel(): void {
+    if (this._animationFrame !== undefined) {
+      cancelAnimationFrame(this._animationFrame);
+      this._animationFrame = undefined;
+    }
+    if (this._timeout !== undefined) {
+      clearTimeout(this._timeout);
+      this._timeout = undefined;
+    }
+  }
+}
+
+export namespace OutputCoalescer {
+  export interface IOptions {
+    /**
+     * Apply the coalesced outputs.
+     */
+    flush: (outputs: IOutput[]) => void;
+    /**
+     * Interval in milliseconds between two flushes, once per animation
+     * frame by default.
+     */
+    flushInterval?: number;
+    /**
+     * Maximum number of characters of a stream buffered between two flushes.
+     */
+    maxStreamLength?: number;
+  }
+}
+
+export default OutputCoalescer;
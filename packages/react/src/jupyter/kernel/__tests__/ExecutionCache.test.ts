@@ -0,0 +1,63 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Tests for the ExecutionCache, without IndexedDB nor server.
+ *
+ * Verifies that:
+ * 1. The memoized outputs are returned by key
+ * 2. The expired results are missed
+ * 3. The least recently used results are evicted beyond the maximum
+ * 4. The key depends on the kernelspec, the code and the dependencies
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { IOutput } from '@jupyterlab/nbformat';
+import { ExecutionCache } from '../ExecutionCache';
+
+const OUTPUTS: IOutput[] = [
+  { output_type: 'stream', name: 'stdout', text: 'hello\n' },
+];
+
+describe('ExecutionCache', () => {
+  it('returns the memoized outputs', async () => {
+    const cache = new ExecutionCache();
+    await cache.set('a', OUTPUTS);
+    expect(await cache.get('a')).toEqual(OUTPUTS);
+    expect(await cache.get('b')).toBeUndefined();
+  });
+
+  it('misses the expired results', async () => {
+    const cache = new ExecutionCache({ ttl: 1 });
+    await cache.set('a', OUTPUTS);
+    await new Promise(resolve => setTimeout(resolve, 10));
+    expect(await cache.get('a')).toBeUndefined();
+  });
+
+  it('evicts the least recently used results', async () => {
+    const cache = new ExecutionCache({ maxEntries: 2 });
+    await cache.set('a', OUTPUTS);
+    await cache.set('b', OUTPUTS);
+    await cache.get('a');
+    await cache.set('c', OUTPUTS);
+    expect(await cache.get('a')).toEqual(OUTPUTS);
+    expect(await cache.get('b')).toBeUndefined();
+    expect(await cache.get('c')).toEqual(OUTPUTS);
+  });
+
+  it('keys the kernelspec, the code and the dependencies', async () => {
+    const cache = new ExecutionCache();
+    const key = await cache.key('python3', 'print(1)', 'v1');
+    if (key === undefined) {
+      // SubtleCrypto is not available in this environment.
+      return;
+    }
+    expect(key).toMatch(/^[0-9a-f]{64}$/);
+    expect(await cache.key('python3', 'print(1)', 'v1')).toBe(key);
+    expect(await cache.key('python3', 'print(1)', 'v2')).not.toBe(key);
+    expect(await cache.key('julia', 'print(1)', 'v1')).not.toBe(key);
+  });
+});
@@ -0,0 +1,168 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the IOPub output pipeline of the KernelExecutor.
+ *
+ * A fake kernel connection streams the output of a loop printing one line
+ * per message, and reports for the direct and the coalesced modes:
+ * 1. The messages handled per second
+ * 2. The main thread time spent in the handlers and the model updates
+ * 3. The number of model changes, i.e. the React re-renders
+ * It also verifies that the coalesced stream outputs are truncated in the
+ * middle, in the buffer and in the model, and that the direct mode keeps
+ * the message contents in the outputs.
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { IStream } from '@jupyterlab/nbformat';
+import { Kernel as JupyterKernel, KernelMessage } from '@jupyterlab/services';
+import { PromiseDelegate } from '@lumino/coreutils';
+import { KernelExecutor } from '../KernelExecutor';
+import { OutputCoalescer } from '../OutputCoalescer';
+
+const MESSAGES = 20000;
+
+/**
+ * Fake kernel connection whose execute future is driven by the benchmark.
+ */
+class FakeConnection {
+  id = 'benchmark-kernel';
+  connectionStatus = 'connected';
+  future: any;
+
+  requestExecute(): JupyterKernel.IFuture<
+    KernelMessage.IExecuteRequestMsg,
+    KernelMessage.IExecuteReplyMsg
+  > {
+    const done = new PromiseDelegate<KernelMessage.IExecuteReplyMsg>();
+    this.future = {
+      msg: { header: { msg_id: 'execute' } },
+      done: done.promise,
+      resolve: done,
+      registerMessageHook: () => undefined,
+    };
+    return this.future;
+  }
+
+  stream(index: number): void {
+    this.future.onIOPub({
+      header: { msg_type: 'stream' },
+      parent_header: { msg_id: 'execute' },
+      content: { name: 'stdout', text: `line ${index}\n` },
+    } as any);
+  }
+
+  async finish(): Promise<void> {
+    this.future.resolve.resolve({} as any);
+    await this.future.done;
+  }
+}
+
+async function run(coalesceOutputs: boolean) {
+  const connection = new FakeConnection();
+  const executor = new KernelExecutor({
+    connection: connection as any,
+    coalesceOutputs,
+    // The benchmark flushes itself, every 16 messages as one animation
+    // frame of a kernel printing a line per millisecond.
+    flushInterval: 1000,
+  });
+  let modelChanges = 0;
+  executor.modelChanged.connect(() => {
+    modelChanges++;
+  });
+  executor.execute('for i in range(20000): print(f"line {i}")');
+  let elapsed = 0;
+  for (let index = 0; index < MESSAGES; index++) {
+    const start = performance.now();
+    connection.stream(index);
+    if (coalesceOutputs && index % 16 === 15) {
+      (executor as any)._coalescer.flush();
+    }
+    elapsed += performance.now() - start;
+  }
+  const start = performance.now();
+  await connection.finish();
+  elapsed += performance.now() - start;
+  const text = executor.model
+    .toJSON()
+    .map(output => (output as IStream).text)
+    .join('');
+  console.log(
+    `${coalesceOutputs ? 'coalesced' : 'direct'}: ` +
+      `${Math.round(MESSAGES / (elapsed / 1000))} messages/s, ` +
+      `${elapsed.toFixed(1)} ms main thread, ${modelChanges} model changes`
+  );
+  return { elapsed, modelChanges, text };
+}
+
+describe('KernelExecutor IOPub benchmark', () => {
+  it('coalesces the stream outputs', async () => {
+    const direct = await run(false);
+    const coalesced = await run(true);
+    expect(coalesced.text).toEqual(direct.text);
+    expect(coalesced.modelChanges).toBeLessThan(direct.modelChanges / 10);
+  });
+
+  it('keeps the message contents in the direct outputs', async () => {
+    const connection = new FakeConnection();
+    const executor = new KernelExecutor({ connection: connection as any });
+    executor.execute('print("line 0")');
+    connection.stream(0);
+    await connection.finish();
+    expect(executor.outputs).toEqual([{ name: 'stdout', text: 'line 0\n' }]);
+  });
+
+  it('truncates the middle of the streams in the model', async () => {
+    const connection = new FakeConnection();
+    const executor = new KernelExecutor({
+      connection: connection as any,
+      coalesceOutputs: true,
+      flushInterval: 1000,
+      maxStreamLength: 100,
+    });
+    executor.execute('for i in range(1000): print(f"line {i}")');
+    for (let index = 0; index < 1000; index++) {
+      connection.stream(index);
+      if (index % 16 === 15) {
+        (executor as any)._coalescer.flush();
+      }
+    }
+    await connection.finish();
+    expect(executor.model.length).toBe(1);
+    expect(executor.outputs).toHaveLength(1);
+    const text = (executor.model.toJSON()[0] as IStream).text as string;
+    expect(text.startsWith('line 0\nline 1\n')).toBe(true);
+    expect(text).toContain('characters truncated');
+    expect(text.endsWith('line 999\n')).toBe(true);
+    expect(text.length).toBeLessThan(200);
+    expect((executor.outputs[0] as IStream).text).toEqual(text);
+  });
+
+  it('truncates the middle of the buffered streams', () => {
+    const flushed: string[] = [];
+    const coalescer = new OutputCoalescer({
+      flush: outputs =>
+        outputs.forEach(output =>
+          flushed.push((output as IStream).text as string)
+        ),
+      flushInterval: 1000,
+      maxStreamLength: 100,
+    });
+    for (let index = 0; index < 1000; index++) {
+      coalescer.add({
+        output_type: 'stream',
+        name: 'stdout',
+        text: '0123456789',
+      });
+    }
+    coalescer.flush();
+    expect(flushed).toHaveLength(1);
+    expect(flushed[0]).toContain('characters truncated');
+    expect(flushed[0].length).toBeLessThan(200);
+  });
+});
@@ -0,0 +1,159 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Tests for the KernelScheduler.
+ *
+ * Verifies that:
+ * 1. At most maxInFlight executions are sent before the kernel replies
+ * 2. The interactive executions overtake the queued background ones, which
+ *    wait for the kernel to be idle and are sent without stop_on_error
+ * 3. The queued executions with the same key are deduplicated
+ * 4. The queued executions are cancelled before reaching the kernel
+ * 5. The executions are sent right away with the default unlimited window
+ * 6. An execution failing to be sent is failed and the next one is sent
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { PromiseDelegate } from '@lumino/coreutils';
+import { KernelScheduler } from '../KernelScheduler';
+import { kernelsStore } from '../KernelState';
+
+/**
+ * Fake executor recording the order of the sent executions.
+ */
+class FakeExecutor {
+  cancelled = false;
+  failure?: unknown;
+  future?: { done: Promise<void> };
+  options?: { stopOnError?: boolean };
+  reply = new PromiseDelegate<void>();
+
+  constructor(private _sent: string[]) {}
+
+  execute(code: string, options: { stopOnError?: boolean }): void {
+    if (code === 'disposed') {
+      throw new Error('Kernel connection is disposed');
+    }
+    this._sent.push(code);
+    this.options = options;
+    this.future = { done: this.reply.promise };
+  }
+
+  cancel(): boolean {
+    this.cancelled = true;
+    return true;
+  }
+
+  fail(reason: unknown): boolean {
+    this.failure = reason;
+    return true;
+  }
+}
+
+function createScheduler(maxInFlight?: number) {
+  const sent: string[] = [];
+  const scheduler = new KernelScheduler({
+    getKernelId: () => 'scheduled-kernel',
+    maxInFlight,
+  });
+  const schedule = (
+    code: string,
+    options: KernelScheduler.IScheduleOptions = {}
+  ) => {
+    const executor = new FakeExecutor(sent);
+    return scheduler.schedule(executor as any, code, {}, options) as any;
+  };
+  return { scheduler, schedule, sent };
+}
+
+describe('KernelScheduler', () => {
+  it('pipelines up to maxInFlight executions', async () => {
+    const { scheduler, schedule, sent } = createScheduler(2);
+    const first = schedule('a');
+    schedule('b');
+    schedule('c');
+    expect(sent).toEqual(['a', 'b']);
+    expect(scheduler.queued).toBe(1);
+    expect(
+      kernelsStore.getState().getSchedulerState('scheduled-kernel')
+    ).toMatchObject({ queued: 1, inFlight: 2 });
+    first.reply.resolve();
+    await first.future.done;
+    await Promise.resolve();
+    expect(sent).toEqual(['a', 'b', 'c']);
+  });
+
+  it('sends the interactive executions first', async () => {
+    const { schedule, sent } = createScheduler(1);
+    const first = schedule('a');
+    schedule('background', { priority: 'background' });
+    schedule('interactive');
+    first.reply.resolve();
+    await first.future.done;
+    await Promise.resolve();
+    expect(sent).toEqual(['a', 'interactive']);
+  });
+
+  it('deduplicates and cancels the queued executions', () => {
+    const { scheduler, schedule, sent } = createScheduler(1);
+    schedule('a');
+    const queued = schedule('usage', { key: 'usage' });
+    expect(schedule('usage', { key: 'usage' })).toBe(queued);
+    const controller = new AbortController();
+    const aborted = schedule('b', { signal: controller.signal });
+    controller.abort();
+    expect(aborted.cancelled).toBe(true);
+    expect(scheduler.cancelAll()).toBe(1);
+    expect(queued.cancelled).toBe(true);
+    expect(sent).toEqual(['a']);
+  });
+
+  it('sends the executions right away by default', () => {
+    const { scheduler, schedule, sent } = createScheduler();
+    const executors = ['a', 'b', 'c', 'd', 'e', 'f'].map(code =>
+      schedule(code)
+    );
+    expect(sent).toEqual(['a', 'b', 'c', 'd', 'e', 'f']);
+    expect(scheduler.queued).toBe(0);
+    expect(executors.every(executor => executor.future)).toBe(true);
+  });
+
+  it('queues the background executions while the kernel is busy', async () => {
+    const { scheduler, schedule, sent } = createScheduler();
+    const first = schedule('a');
+    const usage = schedule('usage', { priority: 'background', key: 'usage' });
+    expect(schedule('usage', { priority: 'background', key: 'usage' })).toBe(
+      usage
+    );
+    const second = schedule('b');
+    expect(sent).toEqual(['a', 'b']);
+    expect(scheduler.queued).toBe(1);
+    first.reply.resolve();
+    await first.future.done;
+    await Promise.resolve();
+    expect(sent).toEqual(['a', 'b']);
+    second.reply.resolve();
+    await second.future.done;
+    await Promise.resolve();
+    expect(sent).toEqual(['a', 'b', 'usage']);
+    expect(usage.options.stopOnError).toBe(false);
+    expect(second.options.stopOnError).toBeUndefined();
+  });
+
+  it('fails the executions which cannot be sent', async () => {
+    const { scheduler, schedule, sent } = createScheduler(1);
+    const first = schedule('a');
+    const failed = schedule('disposed');
+    schedule('b');
+    first.reply.resolve();
+    await first.future.done;
+    await Promise.resolve();
+    expect(failed.failure).toBeInstanceOf(Error);
+    expect(sent).toEqual(['a', 'b']);
+    expect(scheduler.inFlight).toBe(1);
+  });
+});
@@ -0,0 +1,86 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the binary kernel websocket protocol.
+ *
+ * A comm message carrying a 50 MB array, as a numpy array sent to a widget,
+ * is serialized and deserialized with the JupyterLab serializer and the
+ * zero-copy one, reporting the throughput of the round trip.
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { KernelMessage } from '@jupyterlab/services';
+import {
+  deserialize,
+  serialize,
+} from '@jupyterlab/services/lib/kernel/serialize';
+import {
+  KERNEL_WEBSOCKET_PROTOCOL_V1,
+  kernelMessageSerializer,
+} from '../KernelSerializer';
+
+const SIZE = 50 * 1024 * 1024;
+
+function createMessage(): KernelMessage.IMessage {
+  const array = new Uint8Array(SIZE);
+  for (let i = 0; i < SIZE; i += 4096) {
+    array[i] = i % 251;
+  }
+  return {
+    channel: 'iopub',
+    header: {
+      date: new Date().toISOString(),
+      msg_id: 'benchmark',
+      msg_type: 'comm_msg',
+      session: 'benchmark',
+      username: '',
+      version: '5.3',
+    },
+    parent_header: {},
+    metadata: {},
+    content: { comm_id: 'widget', data: { method: 'update' } },
+    buffers: [new DataView(array.buffer)],
+  } as KernelMessage.IMessage;
+}
+
+function roundTrip(
+  name: string,
+  serializer: {
+    serialize: (msg: KernelMessage.IMessage, protocol?: string) => any;
+    deserialize: (data: ArrayBuffer, protocol?: string) => any;
+  }
+): KernelMessage.IMessage {
+  const msg = createMessage();
+  const start = performance.now();
+  const data = serializer.serialize(msg, KERNEL_WEBSOCKET_PROTOCOL_V1);
+  const serialized = performance.now();
+  const received = serializer.deserialize(data, KERNEL_WEBSOCKET_PROTOCOL_V1);
+  const end = performance.now();
+  const megabytes = SIZE / 1024 / 1024;
+  console.log(
+    `${name}: serialize ${(serialized - start).toFixed(1)} ms, ` +
+      `deserialize ${(end - serialized).toFixed(1)} ms, ` +
+      `${Math.round(megabytes / ((end - start) / 1000))} MB/s`
+  );
+  return received;
+}
+
+describe('Kernel websocket binary protocol benchmark', () => {
+  it('round trips a 50 MB buffer without copies', () => {
+    roundTrip('jupyterlab', { serialize, deserialize });
+    const received = roundTrip('zero-copy', kernelMessageSerializer);
+    const buffer = received.buffers![0] as DataView;
+    expect(buffer.byteLength).toBe(SIZE);
+    expect(buffer.getUint8(4096)).toBe(4096 % 251);
+    // The buffer is a view on the received frame.
+    expect(buffer.byteOffset).toBeGreaterThan(0);
+    expect(received.content).toEqual({
+      comm_id: 'widget',
+      data: { method: 'update' },
+    });
+  });
+});
@@ -0,0 +1,102 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Stress benchmark of the kernels store.
+ *
+ * 50 kernels each execute 1,000 short cells, every cell moving its kernel
+ * to running, busy, idle and completed. One subscriber per kernel selects
+ * its kernel state, as the kernel indicators do, and the benchmark reports:
+ * 1. The main thread time spent in the updates and the subscribers
+ * 2. The number of store notifications and of per kernel changes
+ * when the messages of all the kernels are received in a frame, and when
+ * every message is received in its own frame.
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import {
+  ExecutionPhase,
+  flushKernelsState,
+  kernelsStore,
+  subscribeKernelState,
+} from '../KernelState';
+
+const KERNELS = 50;
+
+const CELLS = 1000;
+
+describe('Kernels store benchmark', () => {
+  it('notifies the subscribers of a kernel once per batch', async () => {
+    const ids = Array.from({ length: KERNELS }, (_, i) => `stress-${i}`);
+    let notifications = 0;
+    let changes = 0;
+    const unsubscribe = [
+      kernelsStore.subscribe(() => notifications++),
+      ...ids.map(id => subscribeKernelState(id, () => changes++)),
+    ];
+    const state = kernelsStore.getState();
+    let elapsed = 0;
+    for (let cell = 0; cell < CELLS; cell++) {
+      const start = performance.now();
+      // The messages of the kernels received in a frame.
+      for (const id of ids) {
+        state.setExecutionPhase(id, ExecutionPhase.running);
+        state.setExecutionState(id, 'connected-busy');
+        state.setExecutionState(id, 'connected-idle');
+        state.setExecutionPhase(id, ExecutionPhase.completed);
+      }
+      flushKernelsState();
+      elapsed += performance.now() - start;
+      // Yield, the subscribers may re-render.
+      await Promise.resolve();
+    }
+    unsubscribe.forEach(dispose => dispose());
+    console.log(
+      `${KERNELS} kernels x ${CELLS} cells: ${elapsed.toFixed(1)} ms, ` +
+        `${notifications} store notifications, ${changes} kernel changes`
+    );
+    // The cells leave the kernels in the same state, only the first batch
+    // changes it.
+    expect(notifications).toBe(1);
+    expect(changes).toBe(KERNELS);
+    expect(state.getExecutionPhase('stress-0')).toBe(ExecutionPhase.completed);
+    expect(kernelsStore.getState().kernels.get('stress-0')).toEqual({
+      id: 'stress-0',
+      executionPhase: ExecutionPhase.completed,
+      executionState: 'connected-idle',
+    });
+  });
+
+  it('notifies the subscribers of the updated kernel only', async () => {
+    const ids = Array.from({ length: KERNELS }, (_, i) => `frame-${i}`);
+    let notifications = 0;
+    let changes = 0;
+    const unsubscribe = [
+      kernelsStore.subscribe(() => notifications++),
+      ...ids.map(id => subscribeKernelState(id, () => changes++)),
+    ];
+    const state = kernelsStore.getState();
+    const start = performance.now();
+    for (let cell = 0; cell < CELLS; cell++) {
+      for (const id of ids) {
+        state.setExecutionPhase(id, ExecutionPhase.running);
+        flushKernelsState();
+        state.setExecutionPhase(id, ExecutionPhase.completed);
+        flushKernelsState();
+      }
+    }
+    const elapsed = performance.now() - start;
+    unsubscribe.forEach(dispose => dispose());
+    console.log(
+      `${KERNELS} kernels x ${CELLS} cells, a frame per message: ` +
+        `${elapsed.toFixed(1)} ms, ${notifications} store notifications, ` +
+        `${changes} kernel changes`
+    );
+    expect(notifications).toBe(KERNELS * CELLS * 2);
+    // Each notification reaches the subscriber of the updated kernel only.
+    expect(changes).toBe(notifications);
+  });
+});
@@ -4,6 +4,11 @@
  * MIT License
  */
 
+export * from './ExecutionCache';
 export * from './Kernel';
 export * from './KernelExecutor';
+export * from './KernelScheduler';
+export * from './KernelSerializer';
 export * from './KernelState';
+export * from './KernelTracer';
+export * from './OutputCoalescer';
@@ -0,0 +1,121 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { URLExt } from '@jupyterlab/coreutils';
+import {
+  Kernel,
+  KernelSpec,
+  ServerConnection,
+  Session,
+} from '@jupyterlab/services';
+import { requestAPI } from '../JupyterHandlers';
+
+/**
+ * The document returned by the jupyter_react server extension
+ * bootstrap endpoint, gathering in one round trip what the
+ * service manager fetches at startup.
+ *
+ * A section is null if it could not be fetched, the reason
+ * being reported in `errors`.
+ */
+export type IJupyterBootstrap = {
+  config: {
+    extension: string;
+    version: string;
+    configuration: Record<string, any>;
+  };
+  kernelspecs: KernelSpec.ISpecModels | null;
+  sessions: Session.IModel[] | null;
+  kernels: Kernel.IModel[] | null;
+  settings: Record<string, any> | null;
+  workspaces: Record<string, any> | null;
+  errors: Record<string, string>;
+};
+
+/**
+ * The server API endpoints answered from the bootstrap document.
+ */
+const BOOTSTRAP_ENDPOINTS: Record<string, keyof IJupyterBootstrap> = {
+  'api/kernelspecs': 'kernelspecs',
+  'api/sessions': 'sessions',
+  'api/kernels': 'kernels',
+  'api/settings': 'settings',
+  'api/workspaces': 'workspaces',
+};
+
+/**
+ * Fetch the bootstrap document from the jupyter_react server extension.
+ *
+ * @returns The bootstrap document, or undefined if the server
+ * does not provide it.
+ */
+export const fetchJupyterBootstrap = async (
+  serverSettings: ServerConnection.ISettings
+): Promise<IJupyterBootstrap | undefined> => {
+  try {
+    // Allow the browser to revalidate with the ETag.
+    return await requestAPI<IJupyterBootstrap>(
+      serverSettings,
+      'jupyter_react',
+      'bootstrap',
+      { cache: 'no-cache' }
+    );
+  } catch (reason) {
+    console.warn('The Jupyter React bootstrap has failed with reason', reason);
+    return undefined;
+  }
+};
+
+/**
+ * Create server settings which answer the first GET request of each
+ * bootstrapped endpoint from the bootstrap document, so the service
+ * manager hydrates without any further round trip. Later requests
+ * go to the server.
+ *
+ * A request is matched on its pathname, ignoring the token and the
+ * cache buster parameters, and answered from the document only if it
+ * has no other parameter.
+ */
+export const createBootstrapServerSettings = (
+  serverSettings: ServerConnection.ISettings,
+  bootstrap: IJupyterBootstrap
+): ServerConnection.ISettings => {
+  const pending = new Map<string, unknown>();
+  for (const [endpoint, section] of Object.entries(BOOTSTRAP_ENDPOINTS)) {
+    if (bootstrap[section] !== null && bootstrap[section] !== undefined) {
+      const url = new URL(URLExt.join(serverSettings.baseUrl, endpoint));
+      pending.set(url.pathname, bootstrap[section]);
+    }
+  }
+  const fetch = (input: RequestInfo, init?: RequestInit) => {
+    const method =
+      init?.method ?? (typeof input === 'string' ? 'GET' : input.method);
+    if (method.toUpperCase() === 'GET' && pending.size > 0) {
+      const url = new URL(typeof input === 'string' ? input : input.url);
+      url.searchParams.delete('token');
+      // With the `no-store` cache of the server settings, `makeRequest`
+      // appends the timestamp of the request as a cache buster.
+      for (const [key, value] of Array.from(url.searchParams)) {
+        if (value === '' && /^\d+$/.test(key)) {
+          url.searchParams.delete(key);
+        }
+      }
+      const pathname = url.pathname.replace(/\/$/, '');
+      if (url.search === '' && pending.has(pathname)) {
+        const body = pending.get(pathname);
+        pending.delete(pathname);
+        return Promise.resolve(
+          new Response(JSON.stringify(body), {
+            status: 200,
+            headers: { 'Content-Type': 'application/json' },
+          })
+        );
+      }
+    }
+    return serverSettings.fetch(input, init);
+  };
+  return ServerConnection.makeSettings({ ...serverSettings, fetch });
+};
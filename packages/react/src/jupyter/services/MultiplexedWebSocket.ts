@@ -0,0 +1,344 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import { KERNEL_WEBSOCKET_PROTOCOL_V1 } from '../kernel/KernelSerializer';
+
+/**
+ * Path of the multiplexed websocket of the `jupyter_react` server extension.
+ */
+export const MULTIPLEXED_WEBSOCKET_PATH = 'jupyter_react/mux';
+
+/**
+ * Milliseconds the multiplexed websocket is kept open without channels, so
+ * a reconnecting kernel reuses it.
+ */
+const IDLE_TIMEOUT = 5000;
+
+const KERNEL_URL_PATTERN = /^(.*\/)api\/kernels\/([^/]+)\/channels\/?$/;
+
+const TERMINAL_URL_PATTERN = /^(.*\/)terminals\/websocket\/([^/]+)\/?$/;
+
+const encoder = new TextEncoder();
+
+const decoder = new TextDecoder('utf8');
+
+type IChannelRequest =
+  | { kind: 'kernel'; kernel_id: string; session_id?: string }
+  | { kind: 'terminal'; name: string };
+
+type IOperation = {
+  op: 'opened' | 'closed';
+  channel: string;
+  reason?: string;
+};
+
+let channelCount = 0;
+
+function asBytes(payload: string | ArrayBuffer | ArrayBufferView): Uint8Array {
+  if (typeof payload === 'string') {
+    return encoder.encode(payload);
+  }
+  // A view may only cover a part of its buffer.
+  return ArrayBuffer.isView(payload)
+    ? new Uint8Array(payload.buffer, payload.byteOffset, payload.byteLength)
+    : new Uint8Array(payload);
+}
+
+/**
+ * Frame the payload of a channel: a little endian uint32 length and the
+ * utf-8 id of the channel followed by the payload.
+ */
+export function packFrame(
+  channelId: string,
+  payload: string | ArrayBuffer | ArrayBufferView
+): ArrayBuffer {
+  const channel = encoder.encode(channelId);
+  const data = asBytes(payload);
+  const frame = new Uint8Array(4 + channel.byteLength + data.byteLength);
+  new DataView(frame.buffer).setUint32(0, channel.byteLength, true);
+  frame.set(channel, 4);
+  frame.set(data, 4 + channel.byteLength);
+  return frame.buffer;
+}
+
+/**
+ * Return the channel id and the payload of a frame.
+ */
+export function unpackFrame(frame: ArrayBuffer): [string, ArrayBuffer] {
+  const length = new DataView(frame).getUint32(0, true);
+  const channelId = decoder.decode(new Uint8Array(frame, 4, length));
+  // The kernel messages deserializer reads its offsets from the start of
+  // the buffer, so the payload is copied once.
+  return [channelId, frame.slice(4 + length)];
+}
+
+/**
+ * The websocket carrying the channels of the kernels and terminals of a
+ * server, opened on the first channel.
+ */
+class WebSocketMultiplexer {
+  private _url: string;
+  private _ws?: WebSocket;
+  private _open = false;
+  private _channels = new Map<string, MultiplexedWebSocket>();
+  /**
+   * The channels requested and not yet answered by the server.
+   */
+  private _pending = new Map<string, IChannelRequest>();
+  private _idleTimeout?: ReturnType<typeof setTimeout>;
+
+  constructor(url: string) {
+    this._url = url;
+  }
+
+  open(socket: MultiplexedWebSocket, request: IChannelRequest): void {
+    clearTimeout(this._idleTimeout);
+    this._channels.set(socket.channelId, socket);
+    this._pending.set(socket.channelId, request);
+    if (this._open) {
+      this._sendOpen(socket.channelId, request);
+    } else if (!this._ws) {
+      this._connect();
+    }
+  }
+
+  close(channelId: string): void {
+    if (!this._channels.delete(channelId)) {
+      return;
+    }
+    this._pending.delete(channelId);
+    if (this._open) {
+      this._ws!.send(JSON.stringify({ op: 'close', channel: channelId }));
+    }
+    if (this._channels.size === 0) {
+      this._idleTimeout = setTimeout(() => {
+        const ws = this._ws;
+        this._ws = undefined;
+        this._open = false;
+        ws?.close();
+      }, IDLE_TIMEOUT);
+    }
+  }
+
+  send(
+    channelId: string,
+    payload: string | ArrayBuffer | ArrayBufferView
+  ): void {
+    if (this._open) {
+      this._ws!.send(packFrame(channelId, payload));
+    }
+  }
+
+  private _connect(): void {
+    const ws = new WebSocket(this._url);
+    ws.binaryType = 'arraybuffer';
+    ws.onopen = () => {
+      if (this._ws !== ws) {
+        return;
+      }
+      this._open = true;
+      for (const [channelId, request] of this._pending) {
+        this._sendOpen(channelId, request);
+      }
+    };
+    ws.onmessage = event => {
+      if (this._ws === ws) {
+        this._onMessage(event);
+      }
+    };
+    ws.onclose = () => {
+      if (this._ws !== ws) {
+        return;
+      }
+      this._ws = undefined;
+      this._open = false;
+      const channels = [...this._channels.values()];
+      this._channels.clear();
+      this._pending.clear();
+      // The kernel connections reconnect on an abnormal closure.
+      channels.forEach(channel =>
+        channel._closed(1006, 'The multiplexed websocket closed.')
+      );
+    };
+    this._ws = ws;
+  }
+
+  private _sendOpen(channelId: string, request: IChannelRequest): void {
+    this._ws!.send(
+      JSON.stringify({ op: 'open', channel: channelId, ...request })
+    );
+  }
+
+  private _onMessage(event: MessageEvent): void {
+    if (typeof event.data === 'string') {
+      const { op, channel: channelId, reason } = JSON.parse(
+        event.data
+      ) as IOperation;
+      const channel = this._channels.get(channelId);
+      if (!channel) {
+        return;
+      }
+      this._pending.delete(channelId);
+      if (op === 'opened') {
+        channel._opened();
+      } else if (op === 'closed') {
+        this._channels.delete(channelId);
+        channel._closed(1011, reason ?? '');
+      }
+      return;
+    }
+    const [channelId, payload] = unpackFrame(event.data as ArrayBuffer);
+    this._channels.get(channelId)?._receive(payload);
+  }
+}
+
+const multiplexers = new Map<string, WebSocketMultiplexer>();
+
+/**
+ * A websocket of a kernel or a terminal carried by the multiplexed
+ * websocket of the `jupyter_react` server extension.
+ *
+ * It is a drop-in for the `WebSocket` of the server settings: the kernel
+ * and terminal connections of all the components of a page share one
+ * websocket per server, instead of one or more per kernel, so the browser
+ * limit of connections per host is not reached and one handshake is made.
+ * The other websockets, e.g. the collaboration ones, are native.
+ *
+ * The kernel channels use the `v1.kernel.websocket.jupyter.org` protocol.
+ */
+export class MultiplexedWebSocket {
+  static readonly CONNECTING = 0;
+  static readonly OPEN = 1;
+  static readonly CLOSING = 2;
+  static readonly CLOSED = 3;
+
+  readonly CONNECTING = 0;
+  readonly OPEN = 1;
+  readonly CLOSING = 2;
+  readonly CLOSED = 3;
+
+  readonly channelId = `channel-${++channelCount}`;
+  readonly url: string;
+  readonly extensions = '';
+  readonly bufferedAmount = 0;
+  binaryType: BinaryType = 'arraybuffer';
+  protocol = '';
+  readyState: number = MultiplexedWebSocket.CONNECTING;
+
+  onopen: ((event: Event) => void) | null = null;
+  onmessage: ((event: MessageEvent) => void) | null = null;
+  onclose: ((event: CloseEvent) => void) | null = null;
+  onerror: ((event: Event) => void) | null = null;
+
+  private _multiplexer!: WebSocketMultiplexer;
+  private _text = false;
+  private _listeners = new Map<string, Set<(event: any) => void>>();
+
+  constructor(url: string | URL, protocols?: string | string[]) {
+    this.url = url.toString();
+    const parsed = new URL(this.url);
+    const requested = typeof protocols === 'string' ? [protocols] : protocols;
+    const kernel = parsed.pathname.match(KERNEL_URL_PATTERN);
+    const terminal = parsed.pathname.match(TERMINAL_URL_PATTERN);
+    let request: IChannelRequest;
+    let base: string;
+    if (kernel && requested?.includes(KERNEL_WEBSOCKET_PROTOCOL_V1)) {
+      base = kernel[1];
+      request = {
+        kind: 'kernel',
+        kernel_id: decodeURIComponent(kernel[2]),
+        session_id: parsed.searchParams.get('session_id') ?? undefined,
+      };
+      this.protocol = KERNEL_WEBSOCKET_PROTOCOL_V1;
+    } else if (terminal) {
+      base = terminal[1];
+      request = { kind: 'terminal', name: decodeURIComponent(terminal[2]) };
+    } else {
+      // Not multiplexed.
+      return new WebSocket(url, protocols) as unknown as MultiplexedWebSocket;
+    }
+    this._text = request.kind === 'terminal';
+    const token = parsed.searchParams.get('token');
+    const muxUrl =
+      `${parsed.origin}${base}${MULTIPLEXED_WEBSOCKET_PATH}` +
+      (token ? `?token=${encodeURIComponent(token)}` : '');
+    let multiplexer = multiplexers.get(muxUrl);
+    if (!multiplexer) {
+      multiplexer = new WebSocketMultiplexer(muxUrl);
+      multiplexers.set(muxUrl, multiplexer);
+    }
+    this._multiplexer = multiplexer;
+    multiplexer.open(this, request);
+  }
+
+  send(data: string | ArrayBuffer | ArrayBufferView): void {
+    if (this.readyState !== MultiplexedWebSocket.OPEN) {
+      throw new Error('The websocket is not open.');
+    }
+    this._multiplexer.send(this.channelId, data);
+  }
+
+  close(code = 1000, reason = ''): void {
+    if (this.readyState >= MultiplexedWebSocket.CLOSING) {
+      return;
+    }
+    this._multiplexer.close(this.channelId);
+    this._closed(code, reason);
+  }
+
+  addEventListener(type: string, listener: (event: any) => void): void {
+    if (!this._listeners.has(type)) {
+      this._listeners.set(type, new Set());
+    }
+    this._listeners.get(type)!.add(listener);
+  }
+
+  removeEventListener(type: string, listener: (event: any) => void): void {
+    this._listeners.get(type)?.delete(listener);
+  }
+
+  /**
+   * @internal Called by the multiplexer when the server opened the channel.
+   */
+  _opened(): void {
+    this.readyState = MultiplexedWebSocket.OPEN;
+    this._dispatch('open', new Event('open'));
+  }
+
+  /**
+   * @internal Called by the multiplexer with a payload of the channel.
+   */
+  _receive(payload: ArrayBuffer): void {
+    const data = this._text ? decoder.decode(payload) : payload;
+    this._dispatch('message', new MessageEvent('message', { data }));
+  }
+
+  /**
+   * @internal Called when the channel or the multiplexed websocket closed.
+   */
+  _closed(code: number, reason: string): void {
+    if (this.readyState === MultiplexedWebSocket.CLOSED) {
+      return;
+    }
+    const opened = this.readyState !== MultiplexedWebSocket.CONNECTING;
+    this.readyState = MultiplexedWebSocket.CLOSED;
+    if (!opened && code !== 1000) {
+      this._dispatch('error', new Event('error'));
+    }
+    this._dispatch(
+      'close',
+      new CloseEvent('close', { code, reason, wasClean: code === 1000 })
+    );
+  }
+
+  private _dispatch(type: string, event: Event): void {
+    const handler = (this as any)[`on${type}`];
+    handler?.call(this, event);
+    this._listeners.get(type)?.forEach(listener => listener.call(this, event));
+  }
+}
+
+export default MultiplexedWebSocket;
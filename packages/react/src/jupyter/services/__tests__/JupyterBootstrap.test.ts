@@ -0,0 +1,110 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Tests for the server settings hydrated from the bootstrap document.
+ *
+ * The requests go through `ServerConnection.makeRequest` with the server
+ * settings of the Jupyter component, which append a cache buster and the
+ * token to the URLs. Verifies that:
+ * 1. The first GET of a bootstrapped endpoint is answered from the document
+ * 2. The later GETs, the other methods and the requests with parameters go
+ *    to the server
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { ServerConnection } from '@jupyterlab/services';
+import { createServerSettings } from '../../../utils/Utils';
+import {
+  createBootstrapServerSettings,
+  type IJupyterBootstrap,
+} from '../JupyterBootstrap';
+
+const BASE_URL = 'http://localhost:8686/api/jupyter-server/';
+
+const bootstrap: IJupyterBootstrap = {
+  config: { extension: 'jupyter_react', version: '0', configuration: {} },
+  kernelspecs: { default: 'python3', kernelspecs: {} },
+  sessions: [],
+  kernels: null,
+  settings: null,
+  workspaces: null,
+  errors: { kernels: 'Unavailable' },
+};
+
+function createSettings() {
+  const requests = new Array<string>();
+  const settings = createServerSettings(BASE_URL, 'secret');
+  const fetch = (input: RequestInfo) => {
+    const request = input as Request;
+    requests.push(`${request.method} ${request.url}`);
+    return Promise.resolve(
+      new Response(JSON.stringify({ from: 'server' }), { status: 200 })
+    );
+  };
+  return {
+    requests,
+    settings: createBootstrapServerSettings(
+      ServerConnection.makeSettings({ ...settings, fetch }),
+      bootstrap
+    ),
+  };
+}
+
+describe('createBootstrapServerSettings', () => {
+  it('answers the first GET of the endpoints from the bootstrap', async () => {
+    const { requests, settings } = createSettings();
+    expect(settings.init.cache).toBe('no-store');
+
+    let response = await ServerConnection.makeRequest(
+      `${BASE_URL}api/kernelspecs`,
+      {},
+      settings
+    );
+    expect(await response.json()).toEqual(bootstrap.kernelspecs);
+    response = await ServerConnection.makeRequest(
+      `${BASE_URL}api/sessions`,
+      { method: 'GET' },
+      settings
+    );
+    expect(await response.json()).toEqual([]);
+    expect(requests).toEqual([]);
+
+    response = await ServerConnection.makeRequest(
+      `${BASE_URL}api/kernelspecs`,
+      {},
+      settings
+    );
+    expect(await response.json()).toEqual({ from: 'server' });
+    expect(requests).toHaveLength(1);
+    expect(requests[0]).toMatch(/^GET .*\/api\/kernelspecs\?\d+/);
+  });
+
+  it('sends the other requests to the server', async () => {
+    const { requests, settings } = createSettings();
+    // Not bootstrapped.
+    await ServerConnection.makeRequest(`${BASE_URL}api/kernels`, {}, settings);
+    await ServerConnection.makeRequest(`${BASE_URL}api/contents`, {}, settings);
+    // Not a GET.
+    await ServerConnection.makeRequest(
+      `${BASE_URL}api/sessions`,
+      { method: 'POST', body: '{}' },
+      settings
+    );
+    // With parameters.
+    await ServerConnection.makeRequest(
+      `${BASE_URL}api/kernelspecs?refresh=1`,
+      {},
+      settings
+    );
+    expect(requests.map(request => request.split('?')[0])).toEqual([
+      `GET ${BASE_URL}api/kernels`,
+      `GET ${BASE_URL}api/contents`,
+      `POST ${BASE_URL}api/sessions`,
+      `GET ${BASE_URL}api/kernelspecs`,
+    ]);
+  });
+});
@@ -0,0 +1,141 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Benchmark of the page load with 30 embeds, each with its kernel.
+ *
+ * A fake server websocket makes a handshake in HANDSHAKE_MS and, as the
+ * browsers do following RFC 6455, opens one websocket at a time per host.
+ * The benchmark reports the time until the 30 kernel connections are open
+ * and the number of websockets, with one websocket per kernel and with the
+ * multiplexed websocket.
+ */
+
+import { describe, it, expect, beforeAll, afterAll } from '@jest/globals';
+import { KERNEL_WEBSOCKET_PROTOCOL_V1 } from '../../kernel/KernelSerializer';
+import {
+  MultiplexedWebSocket,
+  packFrame,
+  unpackFrame,
+} from '../MultiplexedWebSocket';
+
+const EMBEDS = 30;
+
+const HANDSHAKE_MS = 20;
+
+/**
+ * Fake websocket of a server, the multiplexed one answers the openings.
+ */
+class FakeWebSocket {
+  static connections = 0;
+  static connecting: Promise<void> = Promise.resolve();
+
+  binaryType = 'blob';
+  protocol = '';
+  readyState = 0;
+  onopen: ((event: any) => void) | null = null;
+  onmessage: ((event: any) => void) | null = null;
+  onclose: ((event: any) => void) | null = null;
+
+  constructor(
+    public url: string,
+    protocols?: string[]
+  ) {
+    FakeWebSocket.connections++;
+    this.protocol = protocols?.[0] ?? '';
+    // One websocket in the connecting state per host.
+    FakeWebSocket.connecting = FakeWebSocket.connecting.then(
+      () =>
+        new Promise<void>(resolve =>
+          setTimeout(() => {
+            this.readyState = 1;
+            this.onopen?.({});
+            resolve();
+          }, HANDSHAKE_MS)
+        )
+    );
+  }
+
+  send(data: string | ArrayBuffer): void {
+    if (typeof data === 'string') {
+      const { op, channel } = JSON.parse(data);
+      if (op === 'open') {
+        setTimeout(() =>
+          this.onmessage?.({
+            data: JSON.stringify({ op: 'opened', channel }),
+          })
+        );
+      }
+    }
+  }
+
+  close(): void {
+    this.readyState = 3;
+  }
+}
+
+function kernelUrl(index: number): string {
+  return (
+    `ws://localhost:8888/api/kernels/kernel-${index}/channels` +
+    `?session_id=s${index}&token=t`
+  );
+}
+
+async function openAll(
+  create: (url: string) => { onopen: ((event: any) => void) | null }
+): Promise<number> {
+  const start = performance.now();
+  await Promise.all(
+    Array.from(
+      { length: EMBEDS },
+      (_, i) =>
+        new Promise(resolve => {
+          create(kernelUrl(i)).onopen = resolve;
+        })
+    )
+  );
+  return performance.now() - start;
+}
+
+describe('Multiplexed websocket benchmark', () => {
+  const NativeWebSocket = globalThis.WebSocket;
+
+  beforeAll(() => {
+    (globalThis as any).WebSocket = FakeWebSocket;
+  });
+
+  afterAll(() => {
+    (globalThis as any).WebSocket = NativeWebSocket;
+  });
+
+  it('opens the kernel connections of 30 embeds', async () => {
+    FakeWebSocket.connections = 0;
+    const direct = await openAll(
+      url => new FakeWebSocket(url, [KERNEL_WEBSOCKET_PROTOCOL_V1])
+    );
+    const directConnections = FakeWebSocket.connections;
+    FakeWebSocket.connections = 0;
+    const multiplexed = await openAll(
+      url => new MultiplexedWebSocket(url, [KERNEL_WEBSOCKET_PROTOCOL_V1])
+    );
+    console.log(
+      `${EMBEDS} embeds: one websocket per kernel ${direct.toFixed(0)} ms ` +
+        `(${directConnections} websockets), multiplexed ` +
+        `${multiplexed.toFixed(0)} ms (${FakeWebSocket.connections} websocket)`
+    );
+    expect(directConnections).toBe(EMBEDS);
+    expect(FakeWebSocket.connections).toBe(1);
+    expect(multiplexed).toBeLessThan(direct);
+  });
+
+  it('frames the payloads of the channels', () => {
+    const [channelId, payload] = unpackFrame(
+      packFrame('channel-é', new Uint8Array([1, 2, 3]))
+    );
+    expect(channelId).toBe('channel-é');
+    expect(Array.from(new Uint8Array(payload))).toEqual([1, 2, 3]);
+  });
+});
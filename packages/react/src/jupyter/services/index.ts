@@ -4,7 +4,9 @@
  * MIT License
  */
 
+export * from './JupyterBootstrap';
 export * from './JupyterServices';
+export * from './MultiplexedWebSocket';
 export * from './ServiceManagerLite';
 export * from './ServiceManagerLess';
 export * from './serviceManagerUtils';
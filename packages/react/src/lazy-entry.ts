@@ -43,6 +43,14 @@ export {
   type IJupyterSkeletonProps,
 } from './lazy/JupyterSkeleton';
 
+// Server rendering shown before the Jupyter components are loaded
+export {
+  StaticNotebook,
+  fetchStaticNotebook,
+  getStaticNotebookUrl,
+  type IStaticNotebookProps,
+} from './lazy/StaticNotebook';
+
 // Re-export types for convenience (types don't add bundle size)
 export type { ILazyCellProps } from './lazy/LazyCell';
 export type { ILazyNotebookProps } from './lazy/LazyNotebook';
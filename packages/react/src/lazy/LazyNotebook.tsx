@@ -7,6 +7,7 @@
 import React, { lazy, Suspense } from 'react';
 import type { INotebookProps } from '../components/notebook/Notebook';
 import { JupyterSkeleton } from './JupyterSkeleton';
+import { IStaticNotebookProps, StaticNotebook } from './StaticNotebook';
 
 /**
  * Lazy-loaded Notebook component
@@ -26,6 +27,10 @@ export interface ILazyNotebookProps extends INotebookProps {
    * Height of the skeleton loader
    */
   skeletonHeight?: string;
+  /**
+   * Show the static HTML rendering of the notebook by the server while loading
+   */
+  prerender?: IStaticNotebookProps;
 }
 
 /**
@@ -38,12 +43,22 @@ export interface ILazyNotebookProps extends INotebookProps {
  *   serviceManager={serviceManager}
  *   nbformat={notebookContent}
  * />
+ *
+ * // Show the server rendering until the notebook is loaded
+ * <LazyNotebook
+ *   id="my-notebook"
+ *   path="dashboard.ipynb"
+ *   serviceManager={serviceManager}
+ *   prerender={{ path: 'dashboard.ipynb', baseUrl }}
+ * />
  * ```
  */
 export const LazyNotebook: React.FC<
   React.PropsWithChildren<ILazyNotebookProps>
-> = ({ fallback, skeletonHeight = '400px', ...notebookProps }) => {
-  const defaultFallback = (
+> = ({ fallback, skeletonHeight = '400px', prerender, ...notebookProps }) => {
+  const defaultFallback = prerender ? (
+    <StaticNotebook skeletonHeight={skeletonHeight} {...prerender} />
+  ) : (
     <JupyterSkeleton height={skeletonHeight} componentType="notebook" />
   );
 
@@ -7,6 +7,7 @@
 import React, { lazy, Suspense } from 'react';
 import type { IViewerProps } from '../components/viewer/Viewer';
 import { JupyterSkeleton } from './JupyterSkeleton';
+import { StaticNotebook } from './StaticNotebook';
 
 /**
  * Lazy-loaded Viewer component
@@ -44,7 +45,12 @@ export const LazyViewer: React.FC<ILazyViewerProps> = ({
   skeletonHeight = '300px',
   ...viewerProps
 }) => {
-  const defaultFallback = (
+  const defaultFallback = viewerProps.prerender ? (
+    <StaticNotebook
+      skeletonHeight={skeletonHeight}
+      {...viewerProps.prerender}
+    />
+  ) : (
     <JupyterSkeleton height={skeletonHeight} componentType="viewer" />
   );
 
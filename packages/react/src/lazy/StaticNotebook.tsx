@@ -0,0 +1,117 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+import React, { useEffect, useState } from 'react';
+import { JupyterSkeleton } from './JupyterSkeleton';
+
+export interface IStaticNotebookProps {
+  /**
+   * Path of the notebook on the Jupyter server
+   */
+  path: string;
+  /**
+   * Base URL of the Jupyter server running the `jupyter_react` extension
+   */
+  baseUrl: string;
+  /**
+   * Token of the Jupyter server, when not authenticated with cookies
+   */
+  token?: string;
+  /**
+   * Already fetched HTML, e.g. inlined in the page by the server
+   */
+  html?: string;
+  /**
+   * Height of the skeleton loader shown until the HTML is fetched
+   */
+  skeletonHeight?: string;
+}
+
+/**
+ * The fetched HTML by URL, the server revalidates it with its ETag.
+ */
+const staticNotebooks = new Map<string, Promise<string>>();
+
+/**
+ * URL of the static HTML rendering of a notebook.
+ */
+export function getStaticNotebookUrl(baseUrl: string, path: string): string {
+  const parts = path.split('/').map(part => encodeURIComponent(part));
+  return `${baseUrl.replace(/\/$/, '')}/jupyter_react/render/${parts.join('/')}`;
+}
+
+/**
+ * Fetch the static HTML rendering of a notebook, once per page.
+ */
+export function fetchStaticNotebook(
+  baseUrl: string,
+  path: string,
+  token?: string
+): Promise<string> {
+  const url = getStaticNotebookUrl(baseUrl, path);
+  let html = staticNotebooks.get(url);
+  if (!html) {
+    html = fetch(url, {
+      credentials: 'same-origin',
+      headers: token ? { Authorization: `token ${token}` } : {},
+    }).then(response => {
+      if (!response.ok) {
+        throw new Error(`Failed to render ${path}: ${response.status}`);
+      }
+      return response.text();
+    });
+    html.catch(() => staticNotebooks.delete(url));
+    staticNotebooks.set(url, html);
+  }
+  return html;
+}
+
+/**
+ * Static HTML rendering of a notebook by the server, with the highlighted
+ * code, the markdown and the stored outputs.
+ *
+ * It does not depend on JupyterLab so it is shown in milliseconds, as the
+ * fallback of the lazy Notebook and Viewer until they replace it.
+ */
+export const StaticNotebook: React.FC<IStaticNotebookProps> = ({
+  path,
+  baseUrl,
+  token,
+  html: propsHtml,
+  skeletonHeight = '400px',
+}) => {
+  const [html, setHtml] = useState<string | undefined>(propsHtml);
+  useEffect(() => {
+    if (propsHtml) {
+      setHtml(propsHtml);
+      return;
+    }
+    let disposed = false;
+    fetchStaticNotebook(baseUrl, path, token)
+      .then(html => {
+        if (!disposed) {
+          setHtml(html);
+        }
+      })
+      .catch(error => console.warn(error));
+    return () => {
+      disposed = true;
+    };
+  }, [path, baseUrl, token, propsHtml]);
+  if (!html) {
+    return (
+      <JupyterSkeleton height={skeletonHeight} componentType="notebook" />
+    );
+  }
+  return (
+    <div
+      className="jp-ReactStaticNotebook-container"
+      dangerouslySetInnerHTML={{ __html: html }}
+    />
+  );
+};
+
+export default StaticNotebook;
@@ -26,3 +26,4 @@ export * from './LazyTerminal';
 export * from './LazyConsole';
 export * from './LazyViewer';
 export * from './JupyterSkeleton';
+export * from './StaticNotebook';
@@ -18,7 +18,12 @@ import {
   createLiteServiceManager,
   DEFAULT_KERNEL_NAME,
 } from '../jupyter';
-import { ServiceManagerLess } from '../jupyter/services';
+import {
+  createBootstrapServerSettings,
+  fetchJupyterBootstrap,
+  IJupyterBootstrap,
+  ServiceManagerLess,
+} from '../jupyter/services';
 import { JupyterLabAppAdapter } from '../components/jupyterlab';
 import { Kernel } from '../jupyter/kernel/Kernel';
 import { IJupyterConfig, loadJupyterConfig } from '../jupyter/JupyterConfig';
@@ -46,6 +51,10 @@ export type KernelTransfer = {
 };
 
 export type JupyterReactState = {
+  /**
+   * The document fetched from the bootstrap endpoint, if requested.
+   */
+  bootstrap?: IJupyterBootstrap;
   cellsStore: CellsState;
   consoleStore: ConsoleState;
   jupyterConfig?: IJupyterConfig;
@@ -71,6 +80,7 @@ export type JupyterReactState = {
    * Set the JupyterLabAdapter.
    */
   setJupyterLabAdapter: (jupyterLabAdapter: JupyterLabAppAdapter) => void;
+  setBootstrap: (bootstrap?: IJupyterBootstrap) => void;
   setJupyterConfig: (configuration?: IJupyterConfig) => void;
   setServiceManager: (serviceManager?: ServiceManager.IManager) => void;
   setVersion: (version: string) => void;
@@ -91,6 +101,7 @@ const DEFAULT_CONFIG: IJupyterConfig = loadJupyterConfig({
 
 export const jupyterReactStore = createStore<JupyterReactState>((set, get) => ({
   version: '',
+  bootstrap: undefined,
   jupyterLabAdapter: undefined,
   jupyterConfig: DEFAULT_CONFIG,
   kernelIsLoading: true,
@@ -106,6 +117,9 @@ export const jupyterReactStore = createStore<JupyterReactState>((set, get) => ({
   setJupyterLabAdapter: (jupyterLabAdapter: JupyterLabAppAdapter) => {
     set(_state => ({ jupyterLabAdapter }));
   },
+  setBootstrap: (bootstrap?: IJupyterBootstrap) => {
+    set(_state => ({ bootstrap }));
+  },
   setJupyterConfig: (jupyterConfig?: IJupyterConfig) => {
     set(_state => ({ jupyterConfig }));
   },
@@ -158,12 +172,15 @@ export function useJupyterReactStoreFromProps(
   props: IJupyterProps
 ): JupyterReactState {
   const {
+    bootstrap = false,
     defaultKernelName = DEFAULT_KERNEL_NAME,
     initCode = '',
     jupyterServerToken = props.serviceManager?.serverSettings.token,
     jupyterServerUrl = props.serviceManager?.serverSettings.baseUrl,
     lite = false,
+    multiplexWebSockets = false,
     serverless,
+    pooledKernel = false,
     serviceManager: propsServiceManager,
     startDefaultKernel = false,
     terminals = false,
@@ -233,11 +250,27 @@ export function useJupyterReactStoreFromProps(
         });
         return;
       }
-      const serverSettings = createServerSettings(
+      let serverSettings = createServerSettings(
         jupyterConfig.jupyterServerUrl,
-        jupyterConfig.jupyterServerToken
+        jupyterConfig.jupyterServerToken,
+        multiplexWebSockets
       );
-      ensureJupyterAuth(serverSettings).then(isAuth => {
+      const authenticate = async () => {
+        if (bootstrap) {
+          const bootstrapDocument = await fetchJupyterBootstrap(serverSettings);
+          if (bootstrapDocument) {
+            // The bootstrap request is authenticated, no need to check again.
+            jupyterReactStore.getState().setBootstrap(bootstrapDocument);
+            serverSettings = createBootstrapServerSettings(
+              serverSettings,
+              bootstrapDocument
+            );
+            return true;
+          }
+        }
+        return ensureJupyterAuth(serverSettings);
+      };
+      authenticate().then(isAuth => {
         if (!isAuth) {
           const loginUrl =
             getJupyterServerUrl() + '/login?next=' + window.location;
@@ -300,6 +333,7 @@ export function useJupyterReactStoreFromProps(
           kernelManager: serviceManager.kernels,
           kernelspecsManager: serviceManager.kernelspecs,
           sessionManager: serviceManager.sessions,
+          pooled: pooledKernel,
         });
         defaultKernel.ready.then(async () => {
           if (initCode) {
@@ -23,6 +23,7 @@ import { readCellOperation } from '../operations/readCell';
 import { readAllCellsOperation } from '../operations/readAllCells';
 import { runCellOperation } from '../operations/runCell';
 import { executeCodeOperation } from '../operations/executeCode';
+import { applyBatchOperation } from '../operations/applyBatch';
 import type { ToolExecutor, ToolExecutionContext } from '../core/interfaces';
 
 /**
@@ -59,6 +60,11 @@ class MockExecutor implements ToolExecutor {
           executionCount: 1,
         };
 
+      case 'applyBatch':
+        return (
+          params as { operations: Array<{ op: string; index?: number }> }
+        ).operations.map(({ op, index }) => ({ op, success: true, index }));
+
       case 'runCell':
       case 'updateCell':
       case 'deleteCell':
@@ -160,6 +166,42 @@ describe('OperationRunner', () => {
     });
   });
 
+  describe('applyBatch operation', () => {
+    it('should return the result of each operation', async () => {
+      const result = await runner.execute(
+        applyBatchOperation,
+        {
+          operations: [
+            { op: 'insert', type: 'markdown', source: '# Title', index: 0 },
+            { op: 'update', index: '1', source: 'x = 42' },
+            { op: 'move', from: 1, to: 0 },
+            { op: 'clearOutputs', index: 2 },
+            { op: 'delete', index: 3 },
+          ],
+        },
+        { ...baseContext, format: 'json' }
+      );
+
+      expect(typeof result).toBe('object');
+      expect(result).toHaveProperty('success', true);
+      expect(result).toHaveProperty('results');
+      const { results } = result as { results: Array<{ index?: number }> };
+      expect(results).toHaveLength(5);
+      // The string index is coerced.
+      expect(results[1].index).toBe(1);
+    });
+
+    it('should throw error with an unknown operation', async () => {
+      await expect(
+        runner.execute(
+          applyBatchOperation,
+          { operations: [{ op: 'rename', index: 0 }] } as unknown,
+          baseContext
+        )
+      ).rejects.toThrow(/Invalid parameters/);
+    });
+  });
+
   describe('readCell operation', () => {
     it('should return structured data with format=json', async () => {
       const result = await runner.execute(
@@ -164,6 +164,15 @@ export function zodToToolParameters(
           innerTypeName === 'boolean'
         ) {
           prop.items = { type: 'boolean' };
+        } else if (
+          innerTypeName === 'ZodObject' ||
+          innerTypeName === 'object' ||
+          innerTypeName === 'ZodDiscriminatedUnion' ||
+          innerTypeName === 'ZodUnion' ||
+          innerTypeName === 'union'
+        ) {
+          // Objects, e.g. the operations of a batch, described by the field
+          prop.items = { type: 'object' };
         } else {
           // Default to string items for unknown inner types
           prop.items = { type: 'string' };
@@ -0,0 +1,39 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Apply batch tool definition.
+ *
+ * @module tools/definitions/applyBatch
+ */
+
+import type { ToolDefinition } from '../core/schema';
+import { zodToToolParameters } from '../core/zodUtils';
+import { applyBatchParamsSchema } from '../schemas/applyBatch';
+
+export const applyBatchTool: ToolDefinition = {
+  name: 'datalayer_applyBatch',
+  displayName: 'Edit Notebook Cells in Batch',
+  toolReferenceName: 'applyBatch',
+  description:
+    'Applies an ordered list of cell operations (insert, update, move, delete, clearOutputs) to a Jupyter notebook in one transaction, without executing the cells. Prefer it over repeated insertCell, updateCell and deleteCells calls when editing many cells. Each index refers to the notebook as left by the previous operations. Returns the result of each operation.',
+
+  parameters: zodToToolParameters(applyBatchParamsSchema),
+
+  operation: 'applyBatch',
+
+  config: {
+    confirmationMessage: (params: { operations: unknown[] }) =>
+      `Apply ${params.operations.length} cell operation${params.operations.length !== 1 ? 's' : ''}?`,
+    invocationMessage: (params: { operations: unknown[] }) =>
+      `Applying ${params.operations.length} cell operation${params.operations.length !== 1 ? 's' : ''}`,
+    requiresConfirmation: true,
+    canBeReferencedInPrompt: true,
+    priority: 'medium',
+  },
+
+  tags: ['cell', 'notebook', 'manipulation', 'batch'],
+};
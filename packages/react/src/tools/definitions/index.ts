@@ -17,3 +17,4 @@ export * from './readCell';
 export * from './readAllCells';
 export * from './runCell';
 export * from './executeCode';
+export * from './applyBatch';
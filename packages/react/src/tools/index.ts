@@ -18,6 +18,7 @@ import { readCellTool } from './definitions/readCell';
 import { readAllCellsTool } from './definitions/readAllCells';
 import { runCellTool } from './definitions/runCell';
 import { executeCodeTool } from './definitions/executeCode';
+import { applyBatchTool } from './definitions/applyBatch';
 
 // Import all operations
 import { insertCellOperation } from './operations/insertCell';
@@ -27,6 +28,7 @@ import { readCellOperation } from './operations/readCell';
 import { readAllCellsOperation } from './operations/readAllCells';
 import { runCellOperation } from './operations/runCell';
 import { executeCodeOperation } from './operations/executeCode';
+import { applyBatchOperation } from './operations/applyBatch';
 
 // Import types
 import type { ToolDefinition } from './core/schema';
@@ -43,6 +45,7 @@ export const notebookToolDefinitions: ToolDefinition[] = [
   readAllCellsTool,
   runCellTool,
   executeCodeTool,
+  applyBatchTool,
 ];
 
 /**
@@ -60,6 +63,7 @@ export const notebookToolOperations: Record<
   readAllCells: readAllCellsOperation,
   runCell: runCellOperation,
   executeCode: executeCodeOperation,
+  applyBatch: applyBatchOperation,
 };
 
 /**
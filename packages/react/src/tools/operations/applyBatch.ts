@@ -0,0 +1,111 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Batched cell mutations operation for notebooks
+ *
+ * @module tools/operations/applyBatch
+ */
+
+import type { ToolOperation, ToolExecutionContext } from '../core/interfaces';
+import { validateWithZod } from '../core/zodUtils';
+import {
+  applyBatchParamsSchema,
+  type ApplyBatchParams,
+} from '../schemas/applyBatch';
+
+/**
+ * Result of one operation of the batch.
+ */
+export interface BatchOperationResult {
+  op: string;
+  success: boolean;
+  index?: number;
+  cellId?: string;
+  diff?: string;
+  error?: string;
+}
+
+/**
+ * Result from applyBatch operation.
+ */
+export interface ApplyBatchResult {
+  success: boolean;
+  results: BatchOperationResult[];
+  message: string;
+}
+
+/**
+ * Apply batch operation - inserts, updates, moves, deletes cells and clears
+ * their outputs in one notebook transaction.
+ *
+ * Unlike a sequence of insertCell, updateCell and deleteCells calls, the
+ * cells are not executed and the collaborators receive one update.
+ *
+ * @example
+ * ```typescript
+ * await applyBatchOperation.execute(
+ *   {
+ *     operations: [
+ *       { op: 'insert', type: 'markdown', source: '# Title', index: 0 },
+ *       { op: 'update', index: 1, source: 'x = 42' },
+ *       { op: 'delete', index: 5 },
+ *     ],
+ *   },
+ *   { documentId: 'file:///notebook.ipynb', executor }
+ * );
+ * ```
+ */
+export const applyBatchOperation: ToolOperation<
+  ApplyBatchParams,
+  ApplyBatchResult
+> = {
+  name: 'applyBatch',
+
+  async execute(
+    params: unknown,
+    context: ToolExecutionContext
+  ): Promise<ApplyBatchResult> {
+    // Validate params using Zod schema
+    const { operations } = validateWithZod(
+      applyBatchParamsSchema,
+      params,
+      this.name
+    );
+    const { documentId } = context;
+
+    if (!documentId) {
+      throw new Error('Document ID is required for applyBatch operation.');
+    }
+
+    if (!context.executor) {
+      throw new Error('Executor is required for applyBatch operation.');
+    }
+
+    try {
+      // NOTE: Don't pass 'id' - DefaultExecutor injects it automatically
+      const results = ((await context.executor.execute(this.name, {
+        operations,
+      })) ?? []) as BatchOperationResult[];
+
+      const applied = results.filter(result => result.success).length;
+      const failure = results.find(
+        result => !result.success && result.error
+      );
+      return {
+        success: applied === operations.length,
+        results,
+        message: failure
+          ? `Applied ${applied} of ${operations.length} operation(s): ${failure.error}`
+          : `Applied ${applied} operation(s)`,
+      };
+    } catch (error) {
+      const errorMessage =
+        error instanceof Error ? error.message : String(error);
+      throw new Error(`Failed to apply the batch: ${errorMessage}`);
+    }
+  },
+};
@@ -0,0 +1,74 @@
+/*
+ * Copyright (c) 2021-2023 Datalayer, Inc.
+ *
+ * MIT License
+ */
+
+/**
+ * Zod schema for applyBatch operation parameters
+ *
+ * @module tools/schemas/applyBatch
+ */
+
+import { z } from 'zod';
+
+/**
+ * Cell index coercing string numbers (LLMs often pass "0" instead of 0).
+ */
+const cellIndex = (description: string) =>
+  z.preprocess(
+    val => (typeof val === 'string' ? parseInt(val, 10) : val),
+    z.number().int().nonnegative().describe(description)
+  );
+
+/**
+ * Schema for applyBatch parameters
+ *
+ * Validates an ordered, non-empty list of cell operations discriminated by
+ * their `op` field.
+ */
+export const applyBatchParamsSchema = z.object({
+  operations: z
+    .array(
+      z.discriminatedUnion('op', [
+        z.object({
+          op: z.literal('insert'),
+          type: z
+            .enum(['code', 'markdown', 'raw'])
+            .describe("Cell type: 'code', 'markdown', or 'raw'"),
+          source: z.string().optional().describe('Cell source content'),
+          index: cellIndex(
+            'Insert position (0-based index). If omitted, cell is inserted at the end.'
+          ).optional(),
+        }),
+        z.object({
+          op: z.literal('update'),
+          index: cellIndex('Cell index (0-based)'),
+          source: z.string().describe('New cell source content'),
+        }),
+        z.object({
+          op: z.literal('move'),
+          from: cellIndex('Current cell index (0-based)'),
+          to: cellIndex('New cell index (0-based)'),
+        }),
+        z.object({
+          op: z.literal('delete'),
+          index: cellIndex('Cell index (0-based)'),
+        }),
+        z.object({
+          op: z.literal('clearOutputs'),
+          index: cellIndex('Cell index (0-based)'),
+        }),
+      ])
+    )
+    .min(1)
+    .describe(
+      'Ordered cell operations. Each index refers to the notebook as left ' +
+        'by the previous operations of the batch.'
+    ),
+});
+
+/**
+ * TypeScript type inferred from Zod schema.
+ */
+export type ApplyBatchParams = z.infer<typeof applyBatchParamsSchema>;
@@ -17,3 +17,4 @@ export * from './readCell';
 export * from './executeCode';
 export * from './runCell';
 export * from './readAllCells';
+export * from './applyBatch';
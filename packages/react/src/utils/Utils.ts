@@ -9,6 +9,8 @@ import { ServerConnection } from '@jupyterlab/services';
 import { UUID } from '@lumino/coreutils';
 import { ulid } from 'ulid';
 import { requestAPI } from '../jupyter';
+import { kernelMessageSerializer } from '../jupyter/kernel/KernelSerializer';
+import { MultiplexedWebSocket } from '../jupyter/services/MultiplexedWebSocket';
 
 export const newUlid = () => {
   return ulid();
@@ -27,30 +29,31 @@ export const cellSourceAsString = (cell: ICell) => {
 };
 
 export const outputsAsString = (outputs: IOutput[]) => {
-  let result = '';
+  // Joined once, the repeated concatenation is quadratic on large outputs.
+  const result: string[] = [];
   outputs.forEach(output => {
     switch (output.output_type) {
       case 'display_data': {
         if (output.text) {
-          result = result + output.text + '\n';
+          result.push(`${output.text}\n`);
         }
         break;
       }
       case 'update_display_data': {
         if (output.text) {
-          result = result + output.text + '\n';
+          result.push(`${output.text}\n`);
         }
         break;
       }
       case 'stream': {
         if (output.text) {
-          result = result + output.text + '\n';
+          result.push(`${output.text}\n`);
         }
         break;
       }
       case 'error': {
         if (output.text) {
-          result = result + output.text + '\n';
+          result.push(`${output.text}\n`);
         }
         break;
       }
@@ -60,7 +63,7 @@ export const outputsAsString = (outputs: IOutput[]) => {
             (output.data as any)['text/html'] ??
             (output.data as any)['text/plain'] ??
             '';
-          result = result + display + '\n';
+          result.push(`${display}\n`);
         }
         break;
       }
@@ -72,7 +75,7 @@ export const outputsAsString = (outputs: IOutput[]) => {
       }
     }
   });
-  return result;
+  return result.join('');
 };
 
 export const getCookie = (name: string): string | null => {
@@ -116,17 +119,25 @@ export const ensureJupyterAuth = async (
 };
 
 /*
- *
+ * Create the server settings, the kernel and terminal websockets share the
+ * multiplexed websocket of the jupyter_react server extension when
+ * multiplexWebSockets is set.
  */
 export const createServerSettings = (
   jupyterServerUrl: string,
-  jupyterServerToken: string
+  jupyterServerToken: string,
+  multiplexWebSockets = false
 ) => {
   return ServerConnection.makeSettings({
     baseUrl: jupyterServerUrl,
     wsUrl: jupyterServerUrl.replace(/^http/, 'ws'),
     token: jupyterServerToken,
     appendToken: true,
+    // The binary protocol buffers are passed to the widgets without copies.
+    serializer: kernelMessageSerializer,
+    ...(multiplexWebSockets && {
+      WebSocket: MultiplexedWebSocket as unknown as typeof WebSocket,
+    }),
     init: {
       mode: 'cors',
       credentials: 'include',
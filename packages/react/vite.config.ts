@@ -249,6 +249,8 @@ export default defineConfig(({ mode }) => {
       sourcemap: mode !== 'production',
       minify: mode === 'production',
       emptyOutDir: mode === 'production',
+      // Emit .vite/manifest.json for the server extension static handler
+      manifest: mode !== 'production',
       lib:
         mode === 'production'
           ? {
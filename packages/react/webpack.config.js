@@ -83,6 +83,10 @@ module.exports = {
         __dirname,
         'src/jupyter/lite/pyodide-kernel/comlink.worker.ts'
       ),
+      './nbformat.worker.js': path.resolve(
+        __dirname,
+        'src/components/notebook/nbformat.worker.ts'
+      ),
     },
     fallback: {
       assert: require.resolve('assert/'),